@@ -0,0 +1,129 @@
+"""This module holds helpers shared by the persistent indexes of installation data."""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from utility.logger_util import RobustRootLogger
+from utility.system.path import Path
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+T = TypeVar("T")
+
+CHUNK_RESOURCES = 64  # Sources smaller than this are batched together when handed to a worker process.
+
+
+def file_stamp(
+    path: os.PathLike | str,
+) -> list[int] | None:
+    """Returns the [size, mtime_ns] of a file or directory, or None if it cannot be stat'd.
+
+    An index records the stamp of every file it was built from and re-reads a file whose stamp changed.
+    """
+    try:
+        stat_result = os.stat(path)  # noqa: PTH116
+    except OSError:
+        return None
+    return [stat_result.st_size, stat_result.st_mtime_ns]
+
+
+def resource_table_checksum(
+    resources: list[tuple[str, int, int, int]],
+) -> int:
+    """Returns the crc32 of a source's table of (resname, type id, offset, size) resources.
+
+    Along with the file stamp, it tells whether the resources an index read from a source are still the same.
+    """
+    return zlib.crc32("|".join(f"{resname}.{type_id}:{offset}:{size}" for resname, type_id, offset, size in resources).encode())
+
+
+def chunk_sources(
+    sources: list[tuple[str, list[T]]],
+    chunk_resources: int = CHUNK_RESOURCES,
+) -> list[list[tuple[str, list[T]]]]:
+    """Groups (source path, resources) pairs into chunks of at least `chunk_resources` resources, largest sources first.
+
+    A chunk is the unit of work handed to a worker process, so small sources do not each cost a round trip.
+    """
+    chunks: list[list[tuple[str, list[T]]]] = []
+    chunk_size: int = chunk_resources
+    for source in sorted(sources, key=lambda source: len(source[1]), reverse=True):
+        if chunk_size >= chunk_resources:
+            chunks.append([])
+            chunk_size = 0
+        chunks[-1].append(source)
+        chunk_size += len(source[1])
+    return chunks
+
+
+def read_index_file(
+    filepath: os.PathLike | str,
+    version: int,
+    description: str,
+    **expected: Any,
+) -> dict[str, Any] | None:
+    """Reads an index file written by write_index_file.
+
+    Args:
+    ----
+        filepath: Path to the index file.
+        version: The version the index is written in now, a file of another version is outdated.
+        description: What the index is, e.g. 'model index', used in the log messages.
+        **expected: Values the file must hold for the index to still be valid, e.g. the installation path.
+
+    Returns:
+    -------
+        The contents of the file, or None if it is missing, unreadable or outdated.
+    """
+    log: Logger = RobustRootLogger()
+    path = Path(filepath)
+    if not path.safe_isfile():
+        return None
+    try:
+        contents: dict[str, Any] = json.loads(path.read_bytes())
+    except Exception:  # noqa: BLE001
+        log.warning("Could not read the %s at '%s', it will be rebuilt.", description, path, exc_info=True)
+        return None
+    if contents.get("version") != version or any(contents.get(key) != value for key, value in expected.items()):
+        log.info("The %s at '%s' is outdated, it will be rebuilt.", description, path)
+        return None
+    return contents
+
+
+def write_index_file(
+    filepath: os.PathLike | str,
+    version: int,
+    description: str,
+    **contents: Any,
+) -> bool:
+    """Writes an index to a json file, through a temporary file so a reader never sees a partly written index.
+
+    Failing to write the file is logged, not raised.
+
+    Args:
+    ----
+        filepath: Path to the index file.
+        version: The version of the index format, stored along with the contents.
+        description: What the index is, e.g. 'model index', used in the log messages.
+        **contents: The json serializable values to store.
+
+    Returns:
+    -------
+        Whether the file was written.
+    """
+    path = Path(filepath)
+    temp_filepath: Path = path.with_name(f"{path.name}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_filepath.write_text(json.dumps({"version": version, **contents}, separators=(",", ":")), encoding="utf-8")
+        os.replace(temp_filepath, path)  # noqa: PTH105
+    except Exception:  # noqa: BLE001
+        RobustRootLogger().warning("Could not write the %s to '%s'", description, path, exc_info=True)
+        return False
+    return True
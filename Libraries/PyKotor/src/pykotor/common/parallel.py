@@ -0,0 +1,48 @@
+"""This module holds a helper to run batch operations over a pool of processes."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence, TypeVar
+
+from utility.logger_util import RobustRootLogger
+
+T = TypeVar("T")
+
+
+def parallel_map(
+    func: Callable[..., T],
+    *iterables: Sequence[Any],
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    task: str = "run the tasks",
+) -> list[T]:
+    """Calls `func` with the items of `iterables` like map, spread over a pool of processes.
+
+    The work is done in this process when there is a single call, when max_workers is 1, when multiprocessing is not
+    available (frozen builds of the patchers exclude it) or when the pool cannot be started or breaks.
+
+    Args:
+    ----
+        func: A module level function, so it can be sent to the worker processes.
+        *iterables: The arguments of each call, one sequence per parameter.
+        max_workers: The number of processes to use, defaults to the number of processors.
+        chunksize: The number of calls sent to a worker process at once.
+        task: What the calls do, e.g. 'compress textures', used in the log message of the fallback.
+
+    Returns:
+    -------
+        The result of each call, in order.
+    """
+    if min(map(len, iterables), default=0) > 1 and max_workers != 1:
+        try:
+            # Imported here: frozen builds of the patchers exclude multiprocessing.
+            from concurrent.futures.process import BrokenProcessPool, ProcessPoolExecutor
+        except ImportError:
+            pass
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers) as executor:
+                    return list(executor.map(func, *iterables, chunksize=chunksize))
+            except (OSError, BrokenProcessPool):
+                RobustRootLogger().warning("Could not %s in parallel, falling back to a single process.", task, exc_info=True)
+    return list(map(func, *iterables))
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import array
 import io
 import mmap
 import os
 import struct
+import sys
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pykotor.common.geometry import Vector2, Vector3, Vector4
 from pykotor.common.language import LocalizedString
@@ -19,6 +21,8 @@ from utility.system.path import Path
 if TYPE_CHECKING:
     from types import TracebackType
 
+    import numpy as np
+
     from typing_extensions import Literal, Self
 
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
@@ -40,6 +44,50 @@ def _endian_char(
     return ">" if big else "<"
 
 
+def _endian_structs(fmt: str) -> tuple[struct.Struct, struct.Struct]:
+    """Returns the (little endian, big endian) compiled structs of a format, indexable by a `big` flag."""
+    return struct.Struct(f"<{fmt}"), struct.Struct(f">{fmt}")
+
+
+_UINT8 = _endian_structs("B")
+_INT8 = _endian_structs("b")
+_UINT16 = _endian_structs("H")
+_INT16 = _endian_structs("h")
+_UINT32 = _endian_structs("I")
+_INT32 = _endian_structs("i")
+_UINT64 = _endian_structs("Q")
+_INT64 = _endian_structs("q")
+_SINGLE = _endian_structs("f")
+_DOUBLE = _endian_structs("d")
+_VECTOR2 = _endian_structs("2f")
+_VECTOR3 = _endian_structs("3f")
+_VECTOR4 = _endian_structs("4f")
+_ARRAY_HEAD = _endian_structs("2I")
+
+_STRUCT_CACHE: dict[str, struct.Struct] = {}
+
+
+def compiled_struct(
+    fmt: str | struct.Struct,
+) -> struct.Struct:
+    """Returns a cached struct.Struct for a format string. Formats without a byte order character are read as little endian.
+
+    Args:
+    ----
+        fmt: A struct format string, or an already compiled struct which is returned as is.
+
+    Returns:
+    -------
+        The compiled struct.
+    """
+    if isinstance(fmt, struct.Struct):
+        return fmt
+    compiled: struct.Struct | None = _STRUCT_CACHE.get(fmt)
+    if compiled is None:
+        compiled = _STRUCT_CACHE[fmt] = struct.Struct(fmt if fmt[:1] in ("@", "=", "<", ">", "!") else f"<{fmt}")
+    return compiled
+
+
 class ArrayHead:
     def __init__(
         self,
@@ -353,8 +401,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(1)
-        return struct.unpack(f"{_endian_char(big)}B", self._stream.read(1) or b"")[0]
+        return _UINT8[big].unpack(self._read_checked(1))[0]
 
     def read_int8(
         self,
@@ -371,8 +418,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(1)
-        return struct.unpack(f"{_endian_char(big)}b", self._stream.read(1) or b"")[0]
+        return _INT8[big].unpack(self._read_checked(1))[0]
 
     def read_uint16(
         self,
@@ -389,8 +435,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(2)
-        return struct.unpack(f"{_endian_char(big)}H", self._stream.read(2) or b"")[0]
+        return _UINT16[big].unpack(self._read_checked(2))[0]
 
     def read_int16(
         self,
@@ -407,8 +452,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(2)
-        return struct.unpack(f"{_endian_char(big)}h", self._stream.read(2) or b"")[0]
+        return _INT16[big].unpack(self._read_checked(2))[0]
 
     def read_uint32(
         self,
@@ -430,8 +474,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(4)
-        unpacked = struct.unpack(f"{_endian_char(big)}I", self._stream.read(4) or b"")[0]
+        unpacked = _UINT32[big].unpack(self._read_checked(4))[0]
 
         if unpacked == 0xFFFFFFFF and max_neg1:  # noqa: PLR2004
             unpacked = -1
@@ -453,8 +496,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(4)
-        return struct.unpack(f"{_endian_char(big)}i", self._stream.read(4) or b"")[0]
+        return _INT32[big].unpack(self._read_checked(4))[0]
 
     def read_uint64(
         self,
@@ -471,8 +513,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}Q", self._stream.read(8) or b"")[0]
+        return _UINT64[big].unpack(self._read_checked(8))[0]
 
     def read_int64(
         self,
@@ -489,8 +530,7 @@ class BinaryReader:
         -------
             An integer from the stream.
         """
-        self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}q", self._stream.read(8) or b"")[0]
+        return _INT64[big].unpack(self._read_checked(8))[0]
 
     def read_single(
         self,
@@ -507,8 +547,7 @@ class BinaryReader:
         -------
             An float from the stream.
         """
-        self.exceed_check(4)
-        return struct.unpack(f"{_endian_char(big)}f", self._stream.read(4) or b"")[0]
+        return _SINGLE[big].unpack(self._read_checked(4))[0]
 
     def read_double(
         self,
@@ -525,8 +564,7 @@ class BinaryReader:
         -------
             An float from the stream.
         """
-        self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}d", self._stream.read(8) or b"")[0]
+        return _DOUBLE[big].unpack(self._read_checked(8))[0]
 
     def read_vector2(
         self,
@@ -543,9 +581,7 @@ class BinaryReader:
         -------
             A new Vector2 instance using floats read from the stream.
         """
-        self.exceed_check(8)
-        x, y = self.read_single(big=big), self.read_single(big=big)
-        return Vector2(x, y)
+        return Vector2(*_VECTOR2[big].unpack(self._read_checked(8)))
 
     def read_vector3(
         self,
@@ -562,13 +598,7 @@ class BinaryReader:
         -------
             A new Vector3 instance using floats read from the stream.
         """
-        self.exceed_check(12)
-        x, y, z = (
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-        )
-        return Vector3(x, y, z)
+        return Vector3(*_VECTOR3[big].unpack(self._read_checked(12)))
 
     def read_vector4(
         self,
@@ -585,14 +615,7 @@ class BinaryReader:
         -------
             A new Vector4 instance using floats read from the stream.
         """
-        self.exceed_check(16)
-        x, y, z, w = (
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-        )
-        return Vector4(x, y, z, w)
+        return Vector4(*_VECTOR4[big].unpack(self._read_checked(16)))
 
     def read_bytes(
         self,
@@ -608,8 +631,101 @@ class BinaryReader:
         -------
             A bytes object containing the read bytes.
         """
-        self.exceed_check(length)
-        return self._stream.read(length) or b""
+        return self._read_checked(length)
+
+    def read_struct(
+        self,
+        fmt: str | struct.Struct,
+    ) -> tuple[Any, ...]:
+        """Reads the values of a struct format from the stream in one call.
+
+        Args:
+        ----
+            fmt: A struct format string or compiled struct. Format strings without a byte order character are little endian.
+
+        Returns:
+        -------
+            A tuple of the unpacked values.
+        """
+        compiled: struct.Struct = compiled_struct(fmt)
+        return compiled.unpack(self._read_checked(compiled.size))
+
+    def read_records(
+        self,
+        fmt: str | struct.Struct,
+        count: int,
+    ) -> list[tuple[Any, ...]]:
+        """Reads a table of `count` consecutive records of a struct format from the stream in one call.
+
+        Args:
+        ----
+            fmt: The format of a single record. Format strings without a byte order character are little endian.
+            count: The number of records.
+
+        Returns:
+        -------
+            A list with a tuple of unpacked values per record.
+        """
+        compiled: struct.Struct = compiled_struct(fmt)
+        if count <= 0:
+            return []
+        return list(compiled.iter_unpack(self._read_checked(compiled.size * count)))
+
+    def read_array(
+        self,
+        typecode: str,
+        count: int,
+        *,
+        big: bool = False,
+        as_numpy: bool = False,
+    ) -> array.array | np.ndarray:
+        """Reads `count` consecutive numbers of the same type from the stream in one call.
+
+        Args:
+        ----
+            typecode: A struct/array typecode of a fixed size number: 'b', 'B', 'h', 'H', 'i', 'I', 'q', 'Q', 'f' or 'd'.
+            count: The number of values.
+            big: Read the values as big endian.
+            as_numpy: Return a numpy array instead of an array.array, requires numpy to be installed.
+
+        Returns:
+        -------
+            An array.array, or a read-only numpy.ndarray viewing the read bytes when `as_numpy` is set.
+        """
+        itemsize: int = struct.calcsize(f"<{typecode}")
+        data: bytes = self._read_checked(itemsize * max(count, 0))
+        if as_numpy:
+            import numpy as np
+
+            return np.frombuffer(data, dtype=np.dtype(typecode).newbyteorder(">" if big else "<"))
+        values: array.array = array.array(typecode)
+        if values.itemsize != itemsize:
+            msg = f"Typecode '{typecode}' does not have a fixed size on this platform."
+            raise ValueError(msg)
+        values.frombytes(data)
+        if big != (sys.byteorder == "big"):
+            values.byteswap()
+        return values
+
+    @staticmethod
+    def decode_fixed_string(
+        data: bytes,
+        encoding: str = "windows-1252",
+        errors: Literal["ignore", "strict", "replace"] = "ignore",
+    ) -> str:
+        """Decodes a fixed size, null padded string field such as a resref, as read_string() would.
+
+        Args:
+        ----
+            data: The bytes of the field.
+            encoding: Encoding of the string.
+            errors: How to handle bytes the encoding cannot decode.
+
+        Returns:
+        -------
+            The string, trimmed at its first null byte.
+        """
+        return data.split(b"\0", 1)[0].decode(encoding, errors=errors)
 
     def read_string(
         self,
@@ -654,6 +770,8 @@ class BinaryReader:
         """Reads a string continuously from the stream up to a specified length or until it hits the terminator character, whichever comes first.
         If length is -1, reads until the terminator is encountered without a length constraint.
 
+        The stream is read in chunks and searched with bytes.find, rather than decoded one byte at a time.
+
         Args:
         ----
             terminator: The terminator character.
@@ -666,26 +784,56 @@ class BinaryReader:
         -------
             A string read from the stream.
         """
-        string: str = ""
-        char: str = ""
-        bytes_read: int = 0
+        terminator_bytes: bytes = terminator.encode(encoding)
+        if length != -1:
+            data: bytes = self.read_bytes(length)
+            end: int = data.find(terminator_bytes)
+            string, _bad_byte = self._decode_terminated(data if end == -1 else data[:end], encoding, strict=strict)
+            return string
 
-        while char != terminator and (length == -1 or bytes_read < length):
-            string += char
-            self.exceed_check(1)
-            char = self.read_bytes(1).decode(encoding=encoding, errors="ignore")
-            bytes_read += 1
-            if not char and strict:
-                break
+        stream = self._stream
+        start: int = stream.tell()
+        buffer: bytes = b""
+        chunk_size: int = 64
+        while True:
+            remaining: int = self.remaining()
+            chunk: bytes = stream.read(min(chunk_size, remaining)) if remaining > 0 else b""
+            if not chunk:
+                string, bad_byte = self._decode_terminated(buffer, encoding, strict=strict)
+                if bad_byte is None:
+                    stream.seek(start + len(buffer))
+                    msg = "This operation would exceed the streams boundaries."
+                    raise OSError(msg)
+                stream.seek(start + bad_byte + 1)
+                return string
+            search_start: int = max(len(buffer) - len(terminator_bytes) + 1, 0)
+            buffer += chunk
+            end = buffer.find(terminator_bytes, search_start)
+            if end != -1:
+                string, bad_byte = self._decode_terminated(buffer[:end], encoding, strict=strict)
+                stream.seek(start + (end + len(terminator_bytes) if bad_byte is None else bad_byte + 1))
+                return string
+            chunk_size *= 2
 
-        if length == -1:
-            return string
+    @staticmethod
+    def _decode_terminated(
+        data: bytes,
+        encoding: str,
+        *,
+        strict: bool,
+    ) -> tuple[str, int | None]:
+        """Decodes the body of a terminated string. When strict, the string ends at the first byte that cannot be decoded.
 
-        # If a length is specified and not all bytes were read, skip the remaining bytes
-        remaining_length = length - bytes_read
-        if remaining_length > 0:
-            self.skip(remaining_length)
-        return string
+        Returns:
+        -------
+            The string and the index of the byte it was cut at, or None if it was not cut.
+        """
+        if not strict:
+            return data.decode(encoding, errors="ignore"), None
+        try:
+            return data.decode(encoding), None
+        except UnicodeDecodeError as e:
+            return data[: e.start].decode(encoding, errors="ignore"), e.start
 
     def read_locstring(
         self,
@@ -713,7 +861,7 @@ class BinaryReader:
     def read_array_head(
         self,
     ) -> ArrayHead:
-        return ArrayHead(self.read_uint32(), self.read_uint32())
+        return ArrayHead(*_ARRAY_HEAD[False].unpack(self._read_checked(8)))
 
     def peek(
         self,
@@ -723,6 +871,16 @@ class BinaryReader:
         self._stream.seek(-length, 1)
         return b"" if data is None else data
 
+    def _read_checked(
+        self,
+        size: int,
+    ) -> bytes:
+        """Reads `size` bytes after the same bounds check as exceed_check(), without its extra method calls."""
+        if self._stream.tell() - self._offset + size > self._size:
+            msg = "This operation would exceed the streams boundaries."
+            raise OSError(msg)
+        return self._stream.read(size) or b""
+
     def exceed_check(
         self,
         num: int,
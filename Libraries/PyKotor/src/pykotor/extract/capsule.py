@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 from typing import TYPE_CHECKING, cast
 
 from pykotor.common.stream import BinaryReader
@@ -11,8 +13,6 @@ from pykotor.tools.misc import is_any_erf_type_file, is_capsule_file, is_rim_fil
 from utility.system.path import Path
 
 if TYPE_CHECKING:
-    import os
-
     from collections.abc import Iterator
 
     from typing_extensions import Self
@@ -23,6 +23,8 @@ class LazyCapsule(FileResource):
 
     Resource data is not actually stored in memory by default but is instead loaded up on demand with the
     LazyCapsule.resource() method. Use the Capsule, RIM, or ERF classes if you want to solely work with capsules in memory.
+
+    The table of contents is cached and only parsed again when the size or mtime of the file changes.
     """
     def __init__(
         self,
@@ -62,6 +64,10 @@ class LazyCapsule(FileResource):
                 write_erf(ERF(ERFType.from_extension(c_filepath.suffix)), c_filepath)
         super().__init__(*ident.unpack(), c_filepath.stat().st_size, 0x0, c_filepath)
 
+        self._toc_stamp: tuple[int, int] | None = None
+        self._toc_resources: list[FileResource] = []
+        self._toc: dict[ResourceIdentifier, FileResource] = {}
+
     def __iter__(
         self,
     ) -> Iterator[FileResource]:
@@ -88,11 +94,7 @@ class LazyCapsule(FileResource):
         -------
             bytes data of the resource or None if not existing.
         """
-        query = ResourceIdentifier(resref, restype)
-        resource: FileResource | None = next(
-            (resource for resource in self.resources() if resource == query),
-            None,
-        )
+        resource: FileResource | None = self._table_of_contents().get(ResourceIdentifier(resref, restype))
         return resource.data() if resource else None
 
     def batch(
@@ -111,28 +113,22 @@ class LazyCapsule(FileResource):
 
         Processing Logic:
         ----------------
-            - Reloads capsule resources from erf/rim if reload is True
-            - Initializes results dict to return
-            - Opens capsule file as binary reader
-            - Loops through queries
-                - Sets result to None
-                - Checks if resource exists in capsule
-                - If so, seeks to offset, reads bytes and sets result
-            - Closes reader
+            - Initializes results dict to return, with None for every query
+            - Looks up every query in the cached table of contents, parsed again only if the file changed
+            - Opens capsule file as binary reader once
+            - Reads the found resources in the order they are stored in the file
             - Returns results dict.
         """
-        results: dict[ResourceIdentifier, ResourceResult | None] = {}
+        results: dict[ResourceIdentifier, ResourceResult | None] = dict.fromkeys(queries)
+        toc: dict[ResourceIdentifier, FileResource] = self._table_of_contents()
+        found: list[tuple[ResourceIdentifier, FileResource]] = sorted(
+            ((query, toc[query]) for query in queries if query in toc),
+            key=lambda item: item[1].offset(),
+        )
+        if not found:
+            return results
         with BinaryReader.from_file(self._filepath) as reader:
-            for query in queries:
-                results[query] = None
-
-                resource: FileResource | None = next(
-                    (resource for resource in self.resources() if resource == query),
-                    None,
-                )
-                if resource is None:
-                    continue
-
+            for query, resource in found:
                 reader.seek(resource.offset())
                 data: bytes = reader.read_bytes(resource.size())
                 results[query] = ResourceResult(
@@ -164,13 +160,7 @@ class LazyCapsule(FileResource):
             - Searches the ERF/RIM for a matching resource
             - Returns True if a match is found, False otherwise.
         """
-        query = ResourceIdentifier(resref, restype)
-        return bool(
-            next(
-                (resource for resource in self.resources() if resource == query),
-                False,
-            )
-        )
+        return ResourceIdentifier(resref, restype) in self._table_of_contents()
 
     def info(
         self,
@@ -190,12 +180,10 @@ class LazyCapsule(FileResource):
 
         Processing Logic:
         ----------------
-            - Check if reload is True and call reload()
-            - Create query object from resref and restype
-            - Return first matching resource.
+            - Parse the table of contents if the size or mtime of the file changed since it was last parsed
+            - Return the first matching resource from the cached table of contents, without reading the file.
         """
-        query = ResourceIdentifier(resref, restype)
-        return next((resource for resource in self.resources() if resource == query), None)
+        return self._table_of_contents().get(ResourceIdentifier(resref, restype))
 
     def resources(
         self,
@@ -212,7 +200,50 @@ class LazyCapsule(FileResource):
 
         Processing Logic:
         ----------------
-            - Check if capsule exists on disk and print error if not
+            - Parse the table of contents if the file changed since it was last parsed
+            - Return a shallow copy of the cached list.
+        """
+        self._table_of_contents()
+        return self._toc_resources[:]
+
+    def _table_of_contents(
+        self,
+    ) -> dict[ResourceIdentifier, FileResource]:
+        """Returns the resources of the capsule keyed by identifier, parsing the file again only if its size or mtime changed."""
+        stat_result: os.stat_result = os.stat(self._filepath)  # noqa: PTH116
+        stamp: tuple[int, int] = (stat_result.st_size, stat_result.st_mtime_ns)
+        if stamp != self._toc_stamp:
+            resources: list[FileResource] = self._read_resources()
+            self._internal = True
+            try:
+                self._toc_resources = resources
+                self._toc = self._build_lookup(resources)
+                self._toc_stamp = stamp
+            finally:
+                self._internal = False
+        return self._toc
+
+    def _invalidate_table_of_contents(self):
+        self._internal = True
+        self._toc_stamp = None
+        self._internal = False
+
+    @staticmethod
+    def _build_lookup(
+        resources: list[FileResource],
+    ) -> dict[ResourceIdentifier, FileResource]:
+        lookup: dict[ResourceIdentifier, FileResource] = {}
+        for resource in resources:
+            lookup.setdefault(resource.identifier(), resource)  # Duplicates: the first entry wins, like a linear search would.
+        return lookup
+
+    def _read_resources(
+        self,
+    ) -> list[FileResource]:
+        """Parses the list of FileResources from the ERF/RIM file.
+
+        Processing Logic:
+        ----------------
             - Open file and read header
             - Call appropriate reload method based on file type
             - Raise error if unknown file type.
@@ -260,9 +291,6 @@ class LazyCapsule(FileResource):
             container.set_data(resname, restype, resdata)
             for resource in self.resources():
                 container.set_data(resource.resname(), resource.restype(), resource.data())
-            self._hash_task_running = True
-            self._file_hash = ""
-            self._hash_task_running = False
 
         if is_rim_file(self._filepath.name):
             container = RIM()
@@ -275,6 +303,7 @@ class LazyCapsule(FileResource):
         else:
             msg = f"File '{self._filepath}' is not a ERF/MOD/SAV/RIM capsule."
             raise NotImplementedError(msg)
+        self._invalidate_table_of_contents()
 
     def delete(
         self,
@@ -304,9 +333,6 @@ class LazyCapsule(FileResource):
                 if resource.resname().lower() == resname.lower() and resource.restype() is restype:
                     continue
                 container.set_data(resource.resname(), resource.restype(), resource.data())
-            self._hash_task_running = True
-            self._file_hash = ""
-            self._hash_task_running = False
 
         if is_rim_file(self._filepath.name):
             container = RIM()
@@ -319,6 +345,7 @@ class LazyCapsule(FileResource):
         else:
             msg = f"File '{self._filepath}' is not a ERF/MOD/SAV/RIM capsule."
             raise NotImplementedError(msg)
+        self._invalidate_table_of_contents()
 
     def as_cached_erf(self, erf_type: ERFType | None = None) -> ERF:
         erf: ERF = ERF() if erf_type is None else ERF(ERFType(erf_type))
@@ -368,23 +395,13 @@ class LazyCapsule(FileResource):
         offset_to_keys = reader.read_uint32()
         offset_to_resources = reader.read_uint32()
 
-        resrefs:  list[str] = []
-        resids:   list[int] = []
-        restypes: list[ResourceType] = []
         reader.seek(offset_to_keys)
-        for _ in range(entry_count):
-            resref = reader.read_string(16)
-            resrefs.append(resref)
-            resids.append(reader.read_uint32())
-            restype = reader.read_uint16()
-            restypes.append(ResourceType.from_id(restype))
-            reader.skip(2)
-
+        keys: list[tuple[bytes, int, int, int]] = reader.read_records("16sIHH", entry_count)  # resref, resid, restype, unused
         reader.seek(offset_to_resources)
-        for i in range(entry_count):
-            res_offset: int = reader.read_uint32()
-            res_size:   int = reader.read_uint32()
-            resources.append(FileResource(resrefs[i], restypes[i], res_size, res_offset, self._filepath))
+        entries: list[tuple[int, int]] = reader.read_records("II", entry_count)  # offset, size
+
+        for (resref, _resid, restype, _), (res_offset, res_size) in zip(keys, entries):
+            resources.append(FileResource(BinaryReader.decode_fixed_string(resref), ResourceType.from_id(restype), res_size, res_offset, self._filepath))
         return resources
 
     def _load_rim(
@@ -420,13 +437,8 @@ class LazyCapsule(FileResource):
         offset_to_entries = reader.read_uint32()
 
         reader.seek(offset_to_entries)
-        for _ in range(entry_count):
-            resref = reader.read_string(16)
-            restype = ResourceType.from_id(reader.read_uint32())
-            reader.skip(4)
-            offset = reader.read_uint32()
-            size = reader.read_uint32()
-            resources.append(FileResource(resref, restype, size, offset, self._filepath))
+        for resref, restype, _resid, offset, size in reader.read_records("16sIIII", entry_count):
+            resources.append(FileResource(BinaryReader.decode_fixed_string(resref), ResourceType.from_id(restype), size, offset, self._filepath))
         return resources
 
 
@@ -464,6 +476,7 @@ class Capsule(LazyCapsule):
             - Reload resources from file.
         """
         self._resources: list[FileResource] = []
+        self._resource_dict: dict[ResourceIdentifier, FileResource] = {}
         super().__init__(path, create_nonexisting=create_nonexisting)
         if reload:
             self.reload()
@@ -519,15 +532,10 @@ class Capsule(LazyCapsule):
 
         Processing Logic:
         ----------------
-            - Reloads capsule resources from erf/rim if reload is True
-            - Initializes results dict to return
-            - Opens capsule file as binary reader
-            - Loops through queries
-                - Sets result to None
-                - Checks if resource exists in capsule
-                - If so, seeks to offset, reads bytes and sets result
-            - Closes reader
-            - Returns results dict.
+            - Reloads the table of contents from the erf/rim if reload is True
+            - Looks up every query in the in-memory table of contents built by the last reload
+            - Opens the capsule file once and reads the found resources in the order they are stored
+            - Returns results dict, with None for the queries not found.
         """
         if reload:
             self.reload()
@@ -554,7 +562,7 @@ class Capsule(LazyCapsule):
 
         Checks if a resource exists:
             - Constructs a ResourceIdentifier from resref and restype
-            - Searches self._resources for a matching resource
+            - Looks it up in the table of contents
             - Returns True if a match is found, False otherwise.
         """
         if reload:
@@ -583,8 +591,7 @@ class Capsule(LazyCapsule):
         Processing Logic:
         ----------------
             - Check if reload is True and call reload()
-            - Create query object from resref and restype
-            - Return first matching resource from internal list.
+            - Look up the resource in the in-memory table of contents built by the last reload, without opening the file.
         """
         if reload:
             self.reload()
@@ -610,10 +617,18 @@ class Capsule(LazyCapsule):
             - Call appropriate reload method based on file type
             - Raise error if unknown file type.
         """
+        resources: list[FileResource] = self._read_resources()
         self._internal = True
-        self._resources = super().resources()
+        self._resources = resources
+        self._resource_dict = self._build_lookup(resources)
         self._internal = False
 
+    def _table_of_contents(
+        self,
+    ) -> dict[ResourceIdentifier, FileResource]:
+        """The in-memory lookup built by the last reload(); the file is not checked for changes."""
+        return self._resource_dict
+
     def delete(
         self,
         resname: str,
@@ -678,4 +693,5 @@ class Capsule(LazyCapsule):
             else:
                 msg = f"Data provided is not a valid ERF/MOD/SAV/RIM format, found '{file_type}'."
                 raise ValueError(msg)
+            capsule._resource_dict = capsule._build_lookup(capsule._resources)  # noqa: SLF001
             return capsule
@@ -1,24 +1,226 @@
 from __future__ import annotations
 
+import lzma
+import mmap
+import os
 import struct
+import threading
 
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 from pykotor.common.stream import BinaryReader, BinaryWriter
 from pykotor.extract.file import FileResource, ResourceIdentifier
 from pykotor.resource.type import ResourceType
+from pykotor.tools.misc import is_bzf_file
 from pykotor.tools.path import CaseAwarePath
-from utility.system.path import PurePath
+from utility.system.path import Path, PurePath
 
 if TYPE_CHECKING:
-    import os
-
     from pykotor.common.misc import Game
 
 
+_BZF_CHUNK_SIZE = 0x10000
+
+
+def _decompress_bzf_resource(
+    data: mmap.mmap | bytes,
+    offset: int,
+    size: int,
+) -> bytes:
+    """Decompresses a resource of a .bzf file: 5 bytes of LZMA properties followed by the raw LZMA stream.
+
+    `size` is the uncompressed size from the BIF table, the compressed data is fed to the decoder until it has all of it.
+    """
+    if size == 0:
+        return b""
+    if offset < 0 or offset + 5 > len(data):
+        msg = "This operation would exceed the streams boundaries."
+        raise OSError(msg)
+    decompressor = lzma.LZMADecompressor(lzma.FORMAT_ALONE)
+    try:
+        output = bytearray(decompressor.decompress(data[offset : offset + 5] + struct.pack("<Q", size)))
+        position: int = offset + 5
+        while not decompressor.eof:
+            if position >= len(data):
+                msg = "The compressed data of the resource is truncated."
+                raise OSError(msg)
+            output += decompressor.decompress(data[position : position + _BZF_CHUNK_SIZE])
+            position += _BZF_CHUNK_SIZE
+    except lzma.LZMAError as e:
+        msg = f"The compressed data of the resource is corrupted: {e}"
+        raise OSError(msg) from e
+    return bytes(output)
+
+
+class BIFMemoryMapPool:
+    """Keeps a small, least-recently-used pool of BIF files memory-mapped so repeated reads skip the open/seek/read cycle.
+
+    Resources of .bzf files (the BIFs of the iOS releases) are LZMA compressed one by one and are decompressed on read.
+
+    Each mapping remembers the size and mtime of its file and is dropped and remapped when either changed, so a
+    replaced or truncated BIF is never read through a stale mapping. Close the mappings of a file before writing to it,
+    Windows does not allow writing to a mapped file.
+    """
+
+    def __init__(
+        self,
+        max_open: int = 8,
+    ):
+        self.max_open: int = max_open
+        self._maps: OrderedDict[str, tuple[tuple[int, int], mmap.mmap]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def read(
+        self,
+        filepath: os.PathLike | str,
+        offset: int,
+        size: int,
+    ) -> bytes:
+        """Returns `size` bytes at `offset` of the file.
+
+        Args:
+        ----
+            filepath: Path to the BIF file.
+            offset: Offset of the data in the file.
+            size: Number of bytes to read.
+
+        Returns:
+        -------
+            The bytes read, decompressed if the file is a .bzf file.
+
+        Raises:
+        ------
+            OSError: The data lies outside the file, is corrupted or the file could not be opened.
+        """
+        key = str(filepath)
+        compressed: bool = is_bzf_file(key)
+        stat_result: os.stat_result = os.stat(key)  # noqa: PTH116
+        stamp: tuple[int, int] = (stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            entry: tuple[tuple[int, int], mmap.mmap] | None = self._maps.get(key)
+            mapped: mmap.mmap | None
+            if entry is not None and entry[0] != stamp:
+                del self._maps[key]
+                entry[1].close()
+                entry = None
+            if entry is None:
+                mapped = self._open(key, stamp)
+            else:
+                mapped = entry[1]
+                self._maps.move_to_end(key)
+            if mapped is not None:
+                if compressed:
+                    return _decompress_bzf_resource(mapped, offset, size)
+                if offset < 0 or offset + size > len(mapped):
+                    msg = "This operation would exceed the streams boundaries."
+                    raise OSError(msg)
+                return mapped[offset:offset + size]
+        if compressed:
+            return _decompress_bzf_resource(BinaryReader.load_file(filepath), offset, size)
+        with BinaryReader.from_file(filepath) as reader:  # Files that cannot be mapped, e.g. empty ones.
+            reader.seek(offset)
+            return reader.read_bytes(size)
+
+    def close(
+        self,
+        filepath: os.PathLike | str | None = None,
+    ):
+        """Unmaps a single file, or every file in the pool if no path is given."""
+        with self._lock:
+            keys: list[str] = list(self._maps) if filepath is None else [str(filepath)]
+            for key in keys:
+                entry: tuple[tuple[int, int], mmap.mmap] | None = self._maps.pop(key, None)
+                if entry is not None:
+                    entry[1].close()
+
+    def _open(
+        self,
+        key: str,
+        stamp: tuple[int, int],
+    ) -> mmap.mmap | None:
+        with open(key, "rb") as file:  # noqa: PTH123
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+        self._maps[key] = (stamp, mapped)
+        while len(self._maps) > self.max_open:
+            self._maps.popitem(last=False)[1][1].close()
+        return mapped
+
+
+BIF_MMAP_POOL = BIFMemoryMapPool()
+"""Pool shared by every Chitin and by FileResource.data() for resources stored in BIF files."""
+
+
+class ChitinResource(FileResource):
+    """A resource listed in the chitin.key.
+
+    Its offset and size are stored in the resource table of its BIF, which is only read the first time the offset,
+    size or data of one of the BIF's resources is needed.
+    """
+
+    _chitin: Chitin
+    _res_id: int
+    _located: bool
+
+    def __init__(
+        self,
+        chitin: Chitin,
+        res_id: int,
+        resname: str,
+        restype: ResourceType,
+        filepath: os.PathLike | str,
+    ):
+        super().__init__(resname, restype, 0, 0, filepath)
+        self.__dict__.update(_chitin=chitin, _res_id=res_id, _located=False)  # Skips __setattr__, see FileResource.__init__.
+
+    def __repr__(self):
+        self._locate()
+        return super().__repr__()
+
+    def _locate(self):
+        if self._located:
+            return
+        resource: FileResource | None = self._chitin._bif_table(self._res_id >> 20).get(self._res_id)  # noqa: SLF001
+        if resource is None:
+            import errno
+
+            msg = f"Resource '{self._identifier}' is listed in the chitin.key but not in its BIF"
+            raise FileNotFoundError(errno.ENOENT, msg, str(self._filepath))
+        self._internal = True
+        try:
+            self._offset = resource.offset()
+            self._size = resource.size()
+            self._located = True
+        finally:
+            self._internal = False
+
+    def offset(self) -> int:
+        self._locate()
+        return self._offset
+
+    def size(self) -> int:
+        self._locate()
+        return self._size
+
+    def data(
+        self,
+        *,
+        reload: bool = False,
+    ) -> bytes:
+        self._locate()
+        return super().data(reload=reload)
+
+
 class Chitin:
     """Chitin object is used for loading the list of resources stored in the chitin.key/.bif files used by the game.
 
+    Only the chitin.key is parsed up front: iterating yields a ChitinResource per key. The resource table of a BIF is
+    read the first time the offset, size or data of one of its resources is requested, and data is served through the
+    shared BIF_MMAP_POOL.
+
     Chitin support is read-only and you cannot write your own key/bif files with this class yet.
     """
 
@@ -34,11 +236,47 @@ class Chitin:
         base_path = self._key_path.parent if base_path is None else base_path
         self._base_path: CaseAwarePath = CaseAwarePath.pathify(base_path)
 
-        self._resources: list[FileResource]
-        self._resource_dict: dict[str, list[FileResource]]
+        self._keys: dict[int, str]
+        self._key_lookup: dict[ResourceIdentifier, int]
+        self._key_table: list[tuple[str, int, int]]
+        self._bifs: list[str]
+        self._bif_paths: list[Path]
+        self._bif_tables: dict[int, dict[int, FileResource]]
+        self._resources: list[ChitinResource]
+        self._bif_resources: dict[str, list[FileResource]] | None
         self.game: Game | None = game
         self.reload()
 
+    @classmethod
+    def from_key_table(  # noqa: PLR0913
+        cls,
+        key_path: os.PathLike | str,
+        key_table: list[tuple[str, int, int]],
+        bifs: list[str],
+        base_path: os.PathLike | str | None = None,
+        game: Game | None = None,
+    ) -> Chitin:
+        """Builds a Chitin from the contents of a chitin.key read earlier, see key_table(), without reading the file again.
+
+        Args:
+        ----
+            key_path: Path to the chitin.key file.
+            key_table: The (resref, restype id, resource id) of every key.
+            bifs: The BIF filenames, relative to `base_path`.
+            base_path: The folder the BIF filenames are relative to, the folder of the chitin.key by default.
+            game: The game of the installation, BIFs are .bzf files on iOS.
+
+        Returns:
+        -------
+            The Chitin, identical to Chitin(key_path, base_path, game) if the chitin.key did not change.
+        """
+        chitin: Chitin = cls.__new__(cls)
+        chitin._key_path = CaseAwarePath.pathify(key_path)
+        chitin._base_path = CaseAwarePath.pathify(chitin._key_path.parent if base_path is None else base_path)
+        chitin.game = game
+        chitin._load_key_table(key_table, bifs)
+        return chitin
+
     def __iter__(
         self,
     ):
@@ -50,24 +288,76 @@ class Chitin:
         return len(self._resources)
 
     def reload(self):
-        """Reload the list of resource info linked from the chitin.key file."""
-        self._resources = []
-        self._resource_dict = {}
+        """Reload the list of resource info linked from the chitin.key file. BIF tables are read again on demand."""
+        self._load_key_table(*self._read_key())
 
-        keys, bifs = self._get_chitin_data()
-        for bif in bifs:  # Loop through all bifs in the chitin.key
-            self._resource_dict[bif] = []
+    def key_table(self) -> tuple[list[tuple[str, int, int]], list[str]]:
+        """Returns what was read from the chitin.key: the (resref, restype id, resource id) of every key and the BIF filenames."""
+        return self._key_table, self._bifs
+
+    def _load_key_table(
+        self,
+        key_table: list[tuple[str, int, int]],
+        bifs: list[str],
+    ):
+        self._key_table = key_table
+        self._bifs = bifs
+        self._keys = {}
+        self._key_lookup = {}
+        for resref, restype_id, res_id in key_table:
+            self._keys[res_id] = resref
+            identifier = ResourceIdentifier(resref, ResourceType.from_id(restype_id))
+            if res_id < self._key_lookup.get(identifier, res_id + 1):  # Duplicates: the lowest bif/resource index wins.
+                self._key_lookup[identifier] = res_id
+        self._bif_tables = {}
+        self._bif_resources = None
+        self._bif_paths = []
+        for bif in bifs:
             absolute_bif_path = self._base_path.joinpath(bif)
             if self.game is not None and self.game.is_ios():  # For some reason, the chitin.key references the .bif path instead of the correct .bzf path.
                 absolute_bif_path = absolute_bif_path.with_suffix(".bzf")
-            self.read_bif(absolute_bif_path, keys, bif)
-
-    def read_bif(
+            self._bif_paths.append(Path(str(absolute_bif_path)))  # Resolve the case once instead of per resource.
+            BIF_MMAP_POOL.close(self._bif_paths[-1])
+        self._resources = [
+            ChitinResource(self, res_id, resref, ResourceType.from_id(restype_id), self._bif_paths[res_id >> 20])
+            for resref, restype_id, res_id in sorted(key_table, key=lambda key: key[2])
+            if res_id >> 20 < len(bifs)
+        ]
+
+    @property
+    def _resource_dict(self) -> dict[str, list[FileResource]]:
+        """The resources of every BIF keyed by BIF filename. Reads every BIF table the first time, reset by reload()."""
+        if self._bif_resources is None:
+            self._bif_resources = {bif: list(self._bif_table(bif_index).values()) for bif_index, bif in enumerate(self._bifs)}
+        return self._bif_resources
+
+    def _bif_table(
         self,
-        bif_path: CaseAwarePath,
+        bif_index: int,
+    ) -> dict[int, FileResource]:
+        """Returns the resources of a BIF keyed by resource id, reading its variable resource table the first time."""
+        table: dict[int, FileResource] | None = self._bif_tables.get(bif_index)
+        if table is None:
+            table = self._bif_tables[bif_index] = self.read_bif(self._bif_paths[bif_index], self._keys)
+        return table
+
+    @staticmethod
+    def read_bif(
+        bif_path: os.PathLike | str,
         keys: dict[int, str],
-        bif_filename: str,
-    ):
+    ) -> dict[int, FileResource]:
+        """Reads the variable resource table of a BIF file.
+
+        Args:
+        ----
+            bif_path: Path to the BIF file.
+            keys: Maps the resource ids of the chitin.key to their resrefs.
+
+        Returns:
+        -------
+            The resources of the BIF keyed by resource id, in the order they are stored in the table.
+        """
+        table: dict[int, FileResource] = {}
         with BinaryReader.from_file(bif_path) as reader:
             _bif_file_type = reader.read_string(4)        # 0x0
             _bif_file_version = reader.read_string(4)     # 0x4
@@ -75,17 +365,19 @@ class Chitin:
             _fixed_resource_count = reader.read_uint32()  # unimplemented/padding (always 0x00000000?)
             resource_offset = reader.read_uint32()        # 0x10 always the value hex 0x14 (dec 20)
             reader.seek(resource_offset)                  # Skip to 0x14
-            for _ in range(resource_count):
-                # Initialize the FileResource and add to this chitin object's collections.
-                resource = FileResource(
-                    resname=keys[reader.read_uint32()],  # resref str
-                    offset=reader.read_uint32(),
-                    size=reader.read_uint32(),
-                    restype=ResourceType.from_id(reader.read_uint32()),
-                    filepath=bif_path,
-                )
-                self._resources.append(resource)
-                self._resource_dict[bif_filename].append(resource)
+            entries: list[tuple[int, int, int, int]] = reader.read_records("IIII", resource_count)
+        for res_id, offset, size, restype_id in entries:
+            resname: str | None = keys.get(res_id)
+            if resname is None:
+                continue  # Not referenced by the chitin.key, the game cannot load it either.
+            table[res_id] = FileResource(
+                resname=resname,
+                offset=offset,
+                size=size,
+                restype=ResourceType.from_id(restype_id),
+                filepath=bif_path,
+            )
+        return table
 
     def save(self):
         """(unfinished) Writes the list of resource info to the chitin.key file and associated .bif files."""
@@ -137,9 +429,22 @@ class Chitin:
             bif_writer.write_uint32(0)   # 0xC padding (always 0x00000000?)
             bif_writer.write_uint32(20)  # 0x10 resource offset
             merged_bytearrays.extend(byte_array_data)
+            BIF_MMAP_POOL.close(absolute_bif_path)  # The file may still be mapped from reading the resources above.
             BinaryWriter.dump(absolute_bif_path, merged_bytearrays)
+        self.reload()
 
     def _get_chitin_data(self) -> tuple[dict[int, str], list[str]]:
+        key_table, bifs = self._read_key()
+        return {res_id: resref for resref, _restype_id, res_id in key_table}, bifs
+
+    def _read_key(self) -> tuple[list[tuple[str, int, int]], list[str]]:
+        """Parses the chitin.key.
+
+        Returns:
+        -------
+            A tuple of: the (resref, restype id, resource id) of every key, and the BIF filenames.
+            The resource id holds the index of the BIF in its top 12 bits and the index inside the BIF in the low 20 bits.
+        """
         with BinaryReader.from_file(self._key_path) as reader:
             # _key_file_type = reader.read_string(4)  # noqa: ERA001
             # _key_file_version = reader.read_string(4)  # noqa: ERA001
@@ -147,31 +452,45 @@ class Chitin:
             bif_count = reader.read_uint32()
             key_count = reader.read_uint32()
             file_table_offset = reader.read_uint32()
-            reader.skip(4)  # key table offset uint32
+            key_table_offset = reader.read_uint32()
 
-            files = []
             reader.seek(file_table_offset)
-            for _ in range(bif_count):
-                reader.skip(4)  # ??? 0x000696E0 in k1, 0x000DDD8A in k2
-                file_offset = reader.read_uint32()
-                file_length = reader.read_uint16()
-                reader.skip(2)  # ??? 0x0001 in K1, 0x0000 in K2
-                files.append((file_offset, file_length))
+            files: list[tuple[int, int, int, int]] = reader.read_records("IIHH", bif_count)
 
             bifs: list[str] = []
-            for file_offset, file_length in files:
+            for _file_size, file_offset, file_length, _drives in files:
                 reader.seek(file_offset)
                 bif = reader.read_string(file_length)
                 bifs.append(bif)
 
-            keys: dict[int, str] = {}
-            for _ in range(key_count):
-                resref = reader.read_string(16)
-                reader.skip(2)  # restype_id uint16
-                res_id = reader.read_uint32()
-                keys[res_id] = resref
+            reader.seek(key_table_offset)
+            key_table: list[tuple[bytes, int, int]] = reader.read_records("16sHI", key_count)
+
+        return [(BinaryReader.decode_fixed_string(resref_bytes), restype_id, res_id) for resref_bytes, restype_id, res_id in key_table], bifs
 
-            return keys, bifs
+    def info(
+        self,
+        resref: str,
+        restype: ResourceType,
+    ) -> FileResource | None:
+        """Returns the FileResource of the specified resource, reading the table of its BIF if needed.
+
+        Args:
+        ----
+            resref: The resource ResRef.
+            restype: The resource type.
+
+        Returns:
+        -------
+            FileResource or None if the resource does not exist.
+        """
+        res_id: int | None = self._key_lookup.get(ResourceIdentifier(resref, restype))
+        if res_id is None:
+            return None
+        bif_index: int = res_id >> 20
+        if bif_index >= len(self._bifs):
+            return None
+        return self._bif_table(bif_index).get(res_id)
 
     def resource(
         self,
@@ -189,11 +508,7 @@ class Chitin:
         -------
             None or bytes data of resource.
         """
-        query = ResourceIdentifier(resref, restype)
-        resource = next(
-            (resource for resource in self._resources if resource == query),
-            None,
-        )
+        resource: FileResource | None = self.info(resref, restype)
         return None if resource is None else resource.data()
 
     def exists(
@@ -214,12 +529,7 @@ class Chitin:
 
         Processes the following logic:
             - Constructs a ResourceIdentifier object from the resref and restype
-            - Iterates through internal _resources list to find matching resource
-            - Returns True if match found, False otherwise.
+            - Looks it up in the keys parsed from the chitin.key, without reading any BIF
+            - Returns True if found, False otherwise.
         """
-        query = ResourceIdentifier(resref, restype)
-        resource = next(
-            (resource for resource in self._resources if resource == query),
-            None,
-        )
-        return resource is not None
+        return ResourceIdentifier(resref, restype) in self._key_lookup
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+import os
+
 from contextlib import suppress
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from pykotor.common.stream import BinaryReader
 from pykotor.resource.type import ResourceType
-from pykotor.tools.misc import is_bif_file, is_capsule_file
 from utility.logger_util import RobustRootLogger
 from utility.misc import generate_hash
 from utility.system.path import Path, PurePath
 
 if TYPE_CHECKING:
-    import os
-
     from typing_extensions import Literal, Self
 
     from pykotor.common.misc import ResRef
 
+# Memoized content hashes keyed by (filepath, offset, size, mtime_ns, hash_algo). Oldest entries are evicted first.
+_CONTENT_HASHES: dict[tuple[str, int, int, int, str], str] = {}
+_CONTENT_HASHES_MAX_SIZE = 65536
+
+
+def _remember_content_hash(key: tuple[str, int, int, int, str], digest: str):
+    if len(_CONTENT_HASHES) >= _CONTENT_HASHES_MAX_SIZE:
+        del _CONTENT_HASHES[next(iter(_CONTENT_HASHES))]
+    _CONTENT_HASHES[key] = digest
+
 
 class FileResource:
     """Stores information for a resource regarding its name, type and where the data can be loaded from."""
+
+    _identifier: ResourceIdentifier
+    _resname: str
+    _restype: ResourceType
+    _size: int
+    _offset: int
+    _filepath: Path
+    inside_capsule: bool
+    inside_bif: bool
+    _path_ident_obj: Path | None  # Built by path_ident() when first needed: joining a path for each resource of a capsule or BIF is slow.
+    _sha256_hash: str
+    _internal: bool
+
     def __init__(
         self,
         resname: str,
@@ -34,35 +55,30 @@ class FileResource:
         # for example attempting to read japanese filenames got me 'resource name '?????? (??2Quad) ' cannot start/end with a whitespace'
         # I don't understand what the point of high-level unicode python strings if I can't even work through the issue?
         assert resname == resname.strip(), f"FileResource cannot be constructed, resource name '{resname}' cannot start/end with whitespace."
-        self._identifier: ResourceIdentifier = ResourceIdentifier(resname, restype)
-
-        self._resname: str = resname
-        self._restype: ResourceType = restype
-        self._size: int = size
-        self._offset: int = offset
-        self._filepath: Path = Path.pathify(filepath)
-
-        self.inside_capsule: bool = is_capsule_file(self._filepath)
-        self.inside_bif: bool = is_bif_file(self._filepath)
-
-        self._file_hash: str = ""
-
-        self._path_ident_obj: Path = (
-            self._filepath / str(self._identifier)
-            if self.inside_capsule or self.inside_bif
-            else self._filepath
+        path: Path = Path.pathify(filepath)
+        suffix: str = path.suffix.lower()  # The checks of is_capsule_file/is_bif_file/is_bzf_file, on the already parsed path.
+
+        # Stored straight into __dict__: nothing is immutable before _internal is set, and going through __setattr__ for
+        # each attribute costs more than the rest of the constructor when an installation creates thousands of resources.
+        self.__dict__.update(
+            _identifier=ResourceIdentifier(resname, restype),
+            _resname=resname,
+            _restype=restype,
+            _size=size,
+            _offset=offset,
+            _filepath=path,
+            inside_capsule=suffix in (".erf", ".mod", ".rim", ".sav"),
+            inside_bif=suffix in (".bif", ".bzf"),  # .bzf: the compressed BIFs of iOS.
+            _path_ident_obj=None,
+            _sha256_hash="",
+            _internal=False,
         )
 
-        self._sha256_hash: str = ""
-        self._internal: bool = False
-        self._hash_task_running: bool = False
-
     def __setattr__(self, name, value):
         if (
             hasattr(self, name)
-            and name not in {"_internal", "_hash_task_running"}
+            and name != "_internal"
             and not getattr(self, "_internal", True)
-            and not getattr(self, "_hash_task_running", True)
         ):
             msg = f"Cannot modify immutable FileResource instance, attempted `setattr({self!r}, {name!r}, {value!r})`"
             raise RuntimeError(msg)
@@ -81,7 +97,7 @@ class FileResource:
         )
 
     def __hash__(self):
-        return hash(self._path_ident_obj)
+        return hash(self.path_ident())
 
     def __str__(self):
         return str(self._identifier)
@@ -95,7 +111,7 @@ class FileResource:
         if isinstance(other, ResourceIdentifier):
             return self.identifier() == other
         if isinstance(other, FileResource):
-            return True if self is other else self._path_ident_obj == other._path_ident_obj
+            return True if self is other else self.path_ident() == other.path_ident()
         return NotImplemented
 
     @classmethod
@@ -156,7 +172,9 @@ class FileResource:
         - else:
             return self.filepath()
         """
-        return self._path_ident_obj
+        if self._path_ident_obj is None:
+            object.__setattr__(self, "_path_ident_obj", self._filepath / str(self._identifier) if self.inside_capsule or self.inside_bif else self._filepath)
+        return self._path_ident_obj  # type: ignore[return-value]
 
     def offset(self) -> int:
         """Offset to where the data is stored, at the filepath."""
@@ -196,7 +214,7 @@ class FileResource:
         try:
             if (
                 self.inside_capsule
-                and self._path_ident_obj.name.lower() == self._path_ident_obj.parent.name.lower()
+                and self.path_ident().name.lower() == self.path_ident().parent.name.lower()
                 and self.filepath().name != self.filepath().parent.name
             ):
                 return self.filepath().is_file()
@@ -231,19 +249,14 @@ class FileResource:
         try:
             if reload:
                 self._index_resource()
-            with BinaryReader.from_file(self._filepath) as file:
-                file.seek(self._offset)
-                data: bytes = file.read_bytes(self._size)
-
-                if not self._hash_task_running:
-
-                    def background_task(res: FileResource, sentdata: bytes):
-                        res._hash_task_running = True  # noqa: SLF001
-                        res._file_hash = generate_hash(sentdata)  # noqa: SLF001
-                        res._hash_task_running = False  # noqa: SLF001
-
-                    with ThreadPoolExecutor(thread_name_prefix="FileResource_SHA1calc") as executor:
-                        executor.submit(background_task, self, data)
+            if self.inside_bif:
+                from pykotor.extract.chitin import BIF_MMAP_POOL  # Prevent circular imports
+
+                data: bytes = BIF_MMAP_POOL.read(self._filepath, self._offset, self._size)
+            else:
+                with BinaryReader.from_file(self._filepath) as file:
+                    file.seek(self._offset)
+                    data = file.read_bytes(self._size)
             return data
         finally:
             self._internal = False
@@ -254,11 +267,123 @@ class FileResource:
         reload: bool = False,
     ) -> str:
         """Returns a lowercase hex string sha1 hash. If FileResource doesn't exist this returns an empty str."""
-        if reload or not self._file_hash:
-            if not self._filepath.safe_isfile():
-                return ""  # FileResource or the capsule doesn't exist on disk.
-            self._file_hash = generate_hash(self.data())
-        return self._file_hash
+        return self.content_hash("sha1", reload=reload)
+
+    def content_hash(
+        self,
+        hash_algo: str = "sha1",
+        *,
+        reload: bool = False,
+    ) -> str:
+        """Returns a lowercase hex string hash of the resource's data, computed on first use.
+
+        Hashes are memoized by (filepath, offset, size, mtime) so modifying the file on disk invalidates them.
+
+        Args:
+        ----
+            hash_algo: Any algorithm supported by hashlib. Default is sha1.
+            reload: Reindex the resource and hash its data again even if a memoized hash exists.
+
+        Returns:
+        -------
+            The hex digest, or an empty str if the FileResource doesn't exist on disk.
+        """
+        key: tuple[str, int, int, int, str] | None = self._content_hash_key(hash_algo)
+        if key is None:
+            return ""  # FileResource or the capsule doesn't exist on disk.
+        if not reload:
+            digest: str | None = _CONTENT_HASHES.get(key)
+            if digest is not None:
+                return digest
+        data: bytes = self.data(reload=reload)
+        key = self._content_hash_key(hash_algo) or key  # The offset/size may have changed after a reload.
+        _remember_content_hash(key, generate_hash(data, hash_algo))
+        return _CONTENT_HASHES[key]
+
+    @staticmethod
+    def content_hashes(
+        resources: Iterable[FileResource],
+        hash_algo: str = "sha1",
+    ) -> dict[FileResource, str]:
+        """Hashes many resources in one pass: each file is opened once and read in offset order.
+
+        Args:
+        ----
+            resources: The resources to hash.
+            hash_algo: Any algorithm supported by hashlib. Default is sha1.
+
+        Returns:
+        -------
+            The hex digest of each resource, an empty str for resources that don't exist on disk.
+        """
+        results: dict[FileResource, str] = {}
+        pending: dict[str, list[tuple[FileResource, tuple[str, int, int, int, str]]]] = {}
+        for resource in resources:
+            key: tuple[str, int, int, int, str] | None = resource._content_hash_key(hash_algo)  # noqa: SLF001
+            if key is None:
+                results[resource] = ""
+                continue
+            digest: str | None = _CONTENT_HASHES.get(key)
+            if digest is None:
+                pending.setdefault(key[0], []).append((resource, key))
+            else:
+                results[resource] = digest
+
+        keys: dict[FileResource, tuple[str, int, int, int, str]] = {resource: key for entries in pending.values() for resource, key in entries}
+        for resource, data in FileResource.iter_data(keys):
+            _remember_content_hash(keys[resource], generate_hash(data, hash_algo))
+            results[resource] = _CONTENT_HASHES[keys[resource]]
+        return results
+
+    @staticmethod
+    def iter_data(
+        resources: Iterable[FileResource],
+    ) -> Iterator[tuple[FileResource, bytes]]:
+        """Reads the data of many resources, opening each file once and reading it in offset order.
+
+        Resources of BIF/BZF files are read through BIF_MMAP_POOL, like data() does, which decompresses BZF resources.
+
+        Args:
+        ----
+            resources: The resources to read.
+
+        Returns:
+        -------
+            An iterator of (resource, data) pairs, grouped by file.
+
+        Raises:
+        ------
+            OSError: A file could not be read. The resources of the files read before it have been yielded.
+        """
+        by_file: dict[Path, list[FileResource]] = {}
+        for resource in resources:
+            by_file.setdefault(resource.filepath(), []).append(resource)
+        for filepath, file_resources in by_file.items():
+            file_resources.sort(key=lambda resource: resource.offset())
+            if file_resources[0].inside_bif:
+                for resource in file_resources:
+                    yield resource, resource.data()
+                continue
+            if not file_resources[0].inside_capsule:  # A loose file is the whole resource, even if it changed size since.
+                data: bytes = BinaryReader.load_file(filepath)
+                for resource in file_resources:
+                    yield resource, data
+                continue
+            with BinaryReader.from_file(filepath) as reader:
+                for resource in file_resources:
+                    reader.seek(resource.offset())
+                    yield resource, reader.read_bytes(resource.size())
+
+    def _content_hash_key(
+        self,
+        hash_algo: str,
+    ) -> tuple[str, int, int, int, str] | None:
+        filepath: str = str(self._filepath)
+        try:
+            mtime_ns: int = os.stat(filepath).st_mtime_ns  # noqa: PTH116
+        except OSError:
+            return None
+        return filepath, self.offset(), self.size(), mtime_ns, hash_algo
 
     def as_file_resource(self) -> Self:
         """For unifying use with LocationResult and ResourceResult."""
@@ -454,7 +579,7 @@ class ResourceIdentifier:
     def __hash__(
         self,
     ):
-        return hash(str(self))
+        return hash(self._cached_filename_str)
 
     def __repr__(
         self,
@@ -6,11 +6,11 @@ import platform
 import sys
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import suppress
+from contextlib import contextmanager
 from copy import copy
 from enum import Enum, IntEnum
 from functools import lru_cache
-from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generator, Iterable, Sequence, overload
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generator, Generic, Iterable, Sequence, TypeVar, overload
 
 from pykotor.common.language import Gender, Language, LocalizedString
 from pykotor.common.misc import Game
@@ -18,11 +18,13 @@ from pykotor.common.stream import BinaryReader
 from pykotor.extract.capsule import Capsule
 from pykotor.extract.chitin import Chitin
 from pykotor.extract.file import FileResource, LocationResult, ResourceIdentifier, ResourceResult
+from pykotor.extract.installation_cache import InstallationIndexCache
+from pykotor.extract.model_index import ModelIndex
+from pykotor.extract.strref_index import StrRefIndex
 from pykotor.extract.talktable import TalkTable
 from pykotor.resource.formats.gff import read_gff
-from pykotor.resource.formats.gff.gff_data import GFFContent, GFFFieldType, GFFList, GFFStruct
+from pykotor.resource.formats.gff.gff_data import GFFFieldType
 from pykotor.resource.formats.tpc import TPC, read_tpc
-from pykotor.resource.formats.twoda.twoda_auto import read_2da
 from pykotor.resource.type import ResourceType
 from pykotor.tools.misc import is_capsule_file, is_erf_file, is_mod_file, is_rim_file
 from pykotor.tools.path import CaseAwarePath
@@ -37,8 +39,6 @@ if TYPE_CHECKING:
     from typing_extensions import Literal
 
     from pykotor.extract.talktable import StringResult
-    from pykotor.resource.formats.gff import GFF
-    from pykotor.resource.formats.twoda.twoda_data import TwoDA
 
 
 # The SearchLocation class is an enumeration that represents different locations for searching.
@@ -95,6 +95,68 @@ class TexturePackNames(Enum):
     GUI = "swpc_tex_gui.erf"
 
 
+TEXTUREPACK_LOCATIONS: dict[SearchLocation, TexturePackNames] = {
+    SearchLocation.TEXTURES_TPA: TexturePackNames.TPA,
+    SearchLocation.TEXTURES_TPB: TexturePackNames.TPB,
+    SearchLocation.TEXTURES_TPC: TexturePackNames.TPC,
+    SearchLocation.TEXTURES_GUI: TexturePackNames.GUI,
+}
+# The locations covered by Installation.strref_index(), the only ones holding GFFs/2DAs that reference the TalkTable.
+STRREF_LOCATIONS: tuple[SearchLocation, ...] = (
+    SearchLocation.OVERRIDE,
+    SearchLocation.MODULES,
+    SearchLocation.RIMS,
+    SearchLocation.CHITIN,
+)
+# The locations covered by Installation.model_index(). Texture packs and streams hold no models.
+MODEL_LOCATIONS: tuple[SearchLocation, ...] = (
+    SearchLocation.OVERRIDE,
+    SearchLocation.MODULES,
+    SearchLocation.RIMS,
+    SearchLocation.CHITIN,
+)
+
+T = TypeVar("T")
+
+
+class _LazySection(Generic[T]):
+    """A resource container of Installation that is loaded the first time it is accessed.
+
+    Assigning the attribute (as the load_* methods do) stores the value and marks the section as loaded.
+    The index cache is written after the load, unless it happens within Installation.batch_loads().
+    """
+
+    def __init__(
+        self,
+        loader: str,
+        default: Callable[[], T],
+    ):
+        self.loader: str = loader
+        self.default: Callable[[], T] = default
+        self.name: str = ""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> _LazySection[T]: ...
+    @overload
+    def __get__(self, instance: Installation, owner: type | None = None) -> T: ...
+    def __get__(self, instance: Installation | None, owner: type | None = None) -> T | _LazySection[T]:
+        if instance is None:
+            return self
+        instance_dict: dict[str, Any] = instance.__dict__
+        if self.name not in instance_dict:
+            instance_dict[self.name] = self.default()  # Loaders may leave the section empty, e.g. if the folder is missing.
+            getattr(instance, self.loader)()
+            if not instance._load_batch_depth:  # noqa: SLF001
+                instance.save_index_cache()
+        return instance_dict[self.name]
+
+    def __set__(self, instance: Installation, value: T):
+        instance.__dict__[self.name] = value
+
+
 HARDCODED_MODULE_NAMES: dict[str, str] = {
     "STUNT_00": "Ebon Hawk - Cutscene (Vision Sequences)",
     "STUNT_03A": "Leviathan - Cutscene (Destroy Taris)",
@@ -130,7 +192,12 @@ HARDCODED_MODULE_NAMES: dict[str, str] = {
 
 
 class Installation:
-    """Installation provides a centralized location for loading resources stored in the game through its various folders and formats."""  # noqa: E501
+    """Installation provides a centralized location for loading resources stored in the game through its various folders and formats.
+
+    Each section (chitin, modules, override, texturepacks, ...) is loaded the first time it is accessed or searched.
+    Call reload_all() to load everything up front. Searches and iteration write the index cache once after loading
+    the sections they need; wrap other code that touches several sections in batch_loads() to do the same.
+    """  # noqa: E501
 
     TEXTURES_TYPES: ClassVar[list[ResourceType]] = [
         ResourceType.TPC,
@@ -138,41 +205,64 @@ class Installation:
         ResourceType.DDS,
     ]
 
+    _modules: _LazySection[dict[str, list[FileResource]]] = _LazySection("load_modules", dict)
+    _lips: _LazySection[dict[str, list[FileResource]]] = _LazySection("load_lips", dict)
+    saves: _LazySection[dict[Path, dict[Path, list[FileResource]]]] = _LazySection("load_saves", dict)
+    _texturepacks: _LazySection[dict[str, list[FileResource]]] = _LazySection("load_textures", dict)
+    _rims: _LazySection[dict[str, list[FileResource]]] = _LazySection("load_rims", dict)
+    _override: _LazySection[dict[str, list[FileResource]]] = _LazySection("load_override", dict)
+    _patch_erf: _LazySection[list[FileResource]] = _LazySection("load_patch_erf", list)  # K1 only patch.erf file
+    _chitin: _LazySection[list[FileResource]] = _LazySection("load_chitin", list)
+    _streammusic: _LazySection[list[FileResource]] = _LazySection("load_streammusic", list)
+    _streamsounds: _LazySection[list[FileResource]] = _LazySection("load_streamsounds", list)
+    _streamwaves: _LazySection[list[FileResource]] = _LazySection("load_voice", list)
+
     def __init__(
         self,
         path: os.PathLike | str,
         *,
         multithread: bool = False,
-        progress_callback: Callable[[int | str, Literal["set_maximum", "increment", "update_maintask_text", "update_subtask_text"]], Any] | None = None
+        progress_callback: Callable[[int | str, Literal["set_maximum", "increment", "update_maintask_text", "update_subtask_text"]], Any] | None = None,
+        index_cache: os.PathLike | str | None = None,
     ):
         self.use_multithreading: bool = multithread  # Tested. Slower on my machine (th3w1zard1)
 
         self._log: Logger = RobustRootLogger()
         self._path: CaseAwarePath = CaseAwarePath.pathify(path)
 
+        # Optional on-disk snapshot of the parsed key/bif tables, capsule tables of contents and folder listings.
+        self._index_cache: InstallationIndexCache | None = None if index_cache is None else InstallationIndexCache.load(index_cache, self._path)
+
         self._talktable: TalkTable = TalkTable(self._path / "dialog.tlk")
         self._female_talktable: TalkTable = TalkTable(self._path / "dialogf.tlk")
 
-        self._modules: dict[str, list[FileResource]] = {}
-        self._lips: dict[str, list[FileResource]] = {}
-        self.saves: dict[Path, dict[Path, list[FileResource]]] = {}
-        self._texturepacks: dict[str, list[FileResource]] = {}
-        self._rims: dict[str, list[FileResource]] = {}
+        self._game: Game | None = None
 
-        self._override: dict[str, list[FileResource]] = {}
+        # Hashed lookup of every indexed resource: identifier -> search location -> resources in search order.
+        self._resource_index: dict[ResourceIdentifier, dict[SearchLocation, list[FileResource]]] = {}
+        self._indexed_identifiers: dict[SearchLocation, set[ResourceIdentifier]] = {}
 
-        self._patch_erf: list[FileResource] = []  # K1 only patch.erf file
-        self._chitin: list[FileResource] = []
-        self._streammusic: list[FileResource] = []
-        self._streamsounds: list[FileResource] = []
-        self._streamwaves: list[FileResource] = []
-        self._game: Game | None = None
+        # Reverse stringref index, built by strref_index() and refreshed there after any of STRREF_LOCATIONS is reindexed.
+        self._strref_index: StrRefIndex | None = None
+        self._strref_index_stale: bool = False
+
+        # Model metadata index, built by model_index() and refreshed there after any of MODEL_LOCATIONS is reindexed.
+        self._model_index: ModelIndex | None = None
+        self._model_index_stale: bool = False
 
-        self._initialized = False
+        # Nesting depth of batch_loads(). The index cache is only written when the outermost batch ends.
+        self._load_batch_depth: int = 0
+        # Locations loaded within batch_loads(), reindexed when the outermost batch ends or before they are searched.
+        self._unindexed_locations: set[SearchLocation] = set()
         self.progress_callback: Callable[[int | str, Literal["set_maximum", "increment", "update_maintask_text", "update_subtask_text"]], Any] | None = progress_callback
-        self.reload_all()
 
     def reload_all(self):
+        """Eagerly (re)loads every section of the installation instead of waiting for them to be accessed."""
+        with self.batch_loads():
+            self._reload_all()
+        self._report_main_progress(f"Finished loading the installation from {self._path}")
+
+    def _reload_all(self):
         if self.progress_callback is not None:
             self.progress_callback(9, "set_maximum")
         self._report_main_progress("Loading chitin...")
@@ -194,19 +284,38 @@ class Installation:
         self.load_saves()
         if self.game().is_k1():
             self._report_main_progress("Loading streamwaves...")
-            self.load_streamwaves()
         elif self.game().is_k2():
             self._report_main_progress("Loading streamvoice...")
-            self.load_streamvoice()
+        self.load_voice()
         self._report_main_progress("Loading override...")
         self.load_override()
-        if self.game().is_k1():
-            patch_erf_path = self.path().joinpath("patch.erf")
-            if patch_erf_path.safe_isfile():
-                self._log.info(f"Game is K1 and 'patch.erf' found at {patch_erf_path.relative_to(self._path.parent)}")
-                self._patch_erf.extend(Capsule(patch_erf_path))
-        self._report_main_progress(f"Finished loading the installation from {self._path}")
-        self._initialized = True
+        self.load_patch_erf()
+
+    @contextmanager
+    def batch_loads(self) -> Generator[None, Any, None]:
+        """Defers writing the index cache until the block ends, so the sections loaded within it are written once.
+
+        Reindexing is deferred as well: a location changed by several loads within the block (the chitin and patch.erf,
+        the texture packs...) is only reindexed once, unless it is searched before the block ends.
+        Batches may be nested, the cache is written and the locations reindexed when the outermost one ends.
+        """
+        self._load_batch_depth += 1
+        try:
+            yield
+        finally:
+            try:
+                if self._load_batch_depth == 1:
+                    while self._unindexed_locations:
+                        self._index_location(next(iter(self._unindexed_locations)))
+            finally:
+                self._load_batch_depth -= 1
+            if not self._load_batch_depth:
+                self.save_index_cache()
+
+    def save_index_cache(self):
+        """Writes the index cache passed to the constructor to disk, if any of the loaded tables changed since it was read."""
+        if self._index_cache is not None:
+            self._index_cache.save()
 
     def _report_main_progress(self, message: str):
         if self.progress_callback:
@@ -242,13 +351,21 @@ class Installation:
                 return filepath, None
             if self.progress_callback:
                 self.progress_callback(f"Indexing capsule '{filepath.relative_to(self._path)}'", "update_subtask_text")
-            resource_list = list(Capsule(filepath))
+            resource_list = self._capsule_resources(filepath)
         except Exception:  # noqa: BLE001
             self._log.exception(f"Error loading file {filepath}")
             return filepath, None
         else:
             return filepath, resource_list
 
+    def _capsule_resources(
+        self,
+        filepath: Path | CaseAwarePath,
+    ) -> list[FileResource]:
+        if self._index_cache is None:
+            return list(Capsule(filepath))
+        return self._index_cache.capsule_resources(filepath)
+
     def load_resources_dict(
         self,
         path: CaseAwarePath,
@@ -272,6 +389,7 @@ class Installation:
         if not r_path.safe_isdir():
             self._log.info("The '%s' folder did not exist when loading the installation at '%s', skipping...", r_path.name, self._path)
             return {}
+        r_path = r_path.__class__(str(r_path))  # Resolves the case of the folder once instead of for every file listed in it.
 
         self._log.info("Loading '%s' from installation...", r_path.relative_to(self._path))
         files_iter = r_path.safe_rglob("*") if recurse else r_path.safe_iterdir()
@@ -331,7 +449,9 @@ class Installation:
 
         resources_list: list[FileResource] = []
 
-        if self.use_multithreading:
+        if self._index_cache is not None:
+            resources_list = self._index_cache.folder_resources(r_path, recurse=recurse, skip_invalid=True)
+        elif self.use_multithreading:
             num_cores = os.cpu_count() or 1
             max_workers = num_cores * 2
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -356,22 +476,36 @@ class Installation:
         chitin_exists: bool | None = chitin_path.safe_isfile()
         if chitin_exists:
             self._log.info("Loading BIFs from chitin.key at '%s'...", self._path)
-            self._chitin = list(Chitin(key_path=chitin_path))
+            # Only the chitin.key is parsed, each BIF table is read when one of its resources is first located or read.
+            self._chitin = list(Chitin(key_path=chitin_path)) if self._index_cache is None else self._index_cache.chitin_resources(chitin_path)
+            self._reindex_location(SearchLocation.CHITIN)
             self._log.info("Done loading chitin")
         elif chitin_exists is False:
             self._log.warning("The chitin.key file did not exist at '%s' when loading the installation, skipping...", self._path)
         elif chitin_exists is None:
             self._log.error("No permissions to the chitin.key file at '%s' when loading the installation, skipping...", self._path)
 
+    def load_patch_erf(self):
+        """Reloads the list of resources in the K1-only 'patch.erf', which is searched along with the Chitin."""
+        self._patch_erf = []
+        if self.game().is_k1():
+            patch_erf_path = self.path().joinpath("patch.erf")
+            if patch_erf_path.safe_isfile():
+                self._log.info(f"Game is K1 and 'patch.erf' found at {patch_erf_path.relative_to(self._path.parent)}")
+                self._patch_erf = self._capsule_resources(patch_erf_path)
+        self._reindex_location(SearchLocation.CHITIN)
+
     def load_lips(
         self,
     ):
         """Reloads the list of modules in the lips folder linked to the Installation."""
         self._lips = self.load_resources_dict(self.lips_path(), capsule_check=is_mod_file)
+        self._reindex_location(SearchLocation.LIPS)
 
     def load_modules(self):
         """Reloads the list of modules files in the modules folder linked to the Installation."""
         self._modules = self.load_resources_dict(self.module_path(), capsule_check=is_capsule_file)
+        self._reindex_location(SearchLocation.MODULES)
 
     def reload_module(self, module: str):
         """Reloads the list of resources in specified module in the modules folder linked to the Installation.
@@ -382,19 +516,23 @@ class Installation:
         """
         if not self._modules or module not in self._modules:
             self.load_modules()
-        self._modules[module] = list(Capsule(self.module_path() / module))
+        self._modules[module] = self._capsule_resources(self.module_path() / module)
+        self._reindex_location(SearchLocation.MODULES)
 
     def load_rims(
         self,
     ):
         """Reloads the list of module files in the rims folder linked to the Installation."""
         self._rims = self.load_resources_dict(self.rims_path(), capsule_check=is_rim_file)
+        self._reindex_location(SearchLocation.RIMS)
 
     def load_textures(
         self,
     ):
         """Reloads the list of modules files in the texturepacks folder linked to the Installation."""
         self._texturepacks = self.load_resources_dict(self.texturepacks_path(), capsule_check=is_erf_file)
+        for location in TEXTUREPACK_LOCATIONS:
+            self._reindex_location(location)
 
     def load_saves(
         self,
@@ -441,7 +579,9 @@ class Installation:
             except (ValueError, Exception):
                 is_k1 = True
                 RobustRootLogger().exception("Failed to get the game of your installation!")
-            if is_k1:
+            if is_k1 and self._index_cache is not None:
+                target_dirs = [CaseAwarePath(folder) for folder in self._index_cache.folder_directories(override_path)]
+            elif is_k1:
                 target_dirs = [f for f in override_path.safe_rglob("*") if f.safe_isdir()]
             target_dirs.append(override_path)
             self._override = {}
@@ -453,6 +593,7 @@ class Installation:
                 RobustRootLogger().exception(f"Failed to get the relative folder of '{folder}' and '{override_path}'")
                 relative_folder = folder.safe_relative_to(override_path).replace("\\", "/")
             self._override[relative_folder] = self.load_resources_list(folder, recurse=True)
+        self._reindex_location(SearchLocation.OVERRIDE)
 
     def reload_override(
         self,
@@ -492,18 +633,21 @@ class Installation:
             override_list.append(resource)
         else:
             override_list[override_list.index(resource)] = resource
+        self._reindex_location(SearchLocation.OVERRIDE)
 
     def load_streammusic(
         self,
     ):
         """Reloads the list of resources in the streammusic folder linked to the Installation."""
         self._streammusic = self.load_resources_list(self.streammusic_path())
+        self._reindex_location(SearchLocation.MUSIC)
 
     def load_streamsounds(
         self,
     ):
         """Reloads the list of resources in the streamsounds folder linked to the Installation."""
         self._streamsounds = self.load_resources_list(self.streamsounds_path())
+        self._reindex_location(SearchLocation.SOUND)
 
     def _quicker_load_resources(self, folder_path: Path) -> list[FileResource]:
         """streamwaves/streamvoice have tens of thousands of audio files, offload here for performance reasons.
@@ -514,6 +658,8 @@ class Installation:
         try:
             if not folder_path.safe_isdir():
                 return files
+            if self._index_cache is not None:
+                return self._index_cache.folder_resources(folder_path, recurse=True)
             stack: list[str] = [str(folder_path)]
             install_path_str = str(self.path())
 
@@ -537,11 +683,117 @@ class Installation:
 
     def load_streamwaves(self):
         """Reloads the list of resources in the streamwaves folder linked to the Installation."""
-        self._streamwaves[:] = self._quicker_load_resources(self._find_resource_folderpath(("streamvoice", "streamwaves")))
+        self._streamwaves = self._quicker_load_resources(self._find_resource_folderpath(("streamvoice", "streamwaves")))
+        self._reindex_location(SearchLocation.VOICE)
 
     def load_streamvoice(self):
         """Reloads the list of resources in the streamvoice folder linked to the Installation."""
-        self._streamwaves[:] = self._quicker_load_resources(self._find_resource_folderpath(("streamwaves", "streamvoice")))
+        self._streamwaves = self._quicker_load_resources(self._find_resource_folderpath(("streamwaves", "streamvoice")))
+        self._reindex_location(SearchLocation.VOICE)
+
+    def load_voice(self):
+        """Reloads the voice-over resources: the streamwaves folder for K1, the streamvoice folder for K2."""
+        game: Game = self.game()
+        if game.is_k1():
+            self.load_streamwaves()
+        elif game.is_k2():
+            self.load_streamvoice()
+
+    # endregion
+
+    # region Resource Index
+    def _location_resource_lists(
+        self,
+        location: SearchLocation,
+    ) -> list[list[FileResource]]:
+        """Returns the resource lists that make up a SearchLocation, in the order they are searched."""
+        if location is SearchLocation.OVERRIDE:
+            return list(self._override.values())
+        if location is SearchLocation.MODULES:
+            return list(self._modules.values())
+        if location is SearchLocation.LIPS:
+            return list(self._lips.values())
+        if location is SearchLocation.RIMS:
+            return list(self._rims.values())
+        if location is SearchLocation.CHITIN:
+            return [self._chitin, self._patch_erf]
+        if location is SearchLocation.MUSIC:
+            return [self._streammusic]
+        if location is SearchLocation.SOUND:
+            return [self._streamsounds]
+        if location is SearchLocation.VOICE:
+            return [self._streamwaves]
+        if location in TEXTUREPACK_LOCATIONS:
+            return [self._texturepacks.get(TEXTUREPACK_LOCATIONS[location].value, [])]
+        return []  # CUSTOM_MODULES/CUSTOM_FOLDERS are passed per-query and never indexed.
+
+    def _reindex_location(
+        self,
+        location: SearchLocation,
+    ):
+        """Replaces every record of `location` in the resource index with the current contents of that location.
+
+        Within batch_loads() the location is only marked, and indexed when the batch ends or before it is searched.
+        """
+        if location in STRREF_LOCATIONS:
+            self._strref_index_stale = True
+        if location in MODEL_LOCATIONS:
+            self._model_index_stale = True
+        if self._load_batch_depth:
+            self._unindexed_locations.add(location)
+            return
+        self._index_location(location)
+
+    def _index_location(
+        self,
+        location: SearchLocation,
+    ):
+        """Indexes the current contents of `location`, replacing its previous records.
+
+        Within a single resource list (one capsule, one folder, the chitin...) only the last resource with a given
+        identifier is kept, which matches how the lists were previously looked up.
+        """
+        # Fetched first: touching a section that was never loaded loads it, which may mark this location again.
+        resource_lists: list[list[FileResource]] = self._location_resource_lists(location)
+        self._unindexed_locations.discard(location)
+        index: dict[ResourceIdentifier, dict[SearchLocation, list[FileResource]]] = self._resource_index
+        for identifier in self._indexed_identifiers.pop(location, ()):
+            records: dict[SearchLocation, list[FileResource]] | None = index.get(identifier)
+            if records is None:
+                continue
+            records.pop(location, None)
+            if not records:
+                del index[identifier]
+
+        indexed: set[ResourceIdentifier] = set()
+        for resource_list in resource_lists:
+            lookup_dict: dict[ResourceIdentifier, FileResource] = {resource.identifier(): resource for resource in resource_list}
+            for identifier, resource in lookup_dict.items():
+                records = index.get(identifier)
+                if records is None:
+                    records = index[identifier] = {}
+                location_records: list[FileResource] | None = records.get(location)
+                if location_records is None:
+                    records[location] = [resource]
+                else:
+                    location_records.append(resource)
+            indexed.update(lookup_dict)
+        self._indexed_identifiers[location] = indexed
+
+    def _indexed_resources(
+        self,
+        identifier: ResourceIdentifier,
+        location: SearchLocation,
+    ) -> list[FileResource]:
+        """Returns the resources matching `identifier` in `location`, in search order. Loads the location if it was never accessed."""
+        if location not in self._indexed_identifiers:
+            self._location_resource_lists(location)  # Accessing a section's container loads and indexes it.
+        if location in self._unindexed_locations:
+            self._index_location(location)
+        records: dict[SearchLocation, list[FileResource]] | None = self._resource_index.get(identifier)
+        if records is None:
+            return []
+        return records.get(location, [])
 
     # endregion
 
@@ -745,21 +997,19 @@ class Installation:
     # region Get FileResources
 
     def __iter__(self) -> Generator[FileResource, Any, None]:
-        if not self._initialized:
-            self.reload_all()
-        yield from self._chitin
-        yield from self._streammusic
-        yield from self._streamsounds
-        yield from self._streamwaves
-        for resources in self._override.values():
-            yield from resources
-        for resources in self._modules.values():
-            yield from resources
-        for resources in self._lips.values():
-            yield from resources
-        for resources in self._texturepacks.values():
-            yield from resources
-        for resources in self._rims.values():
+        with self.batch_loads():  # Loads only the sections that were never accessed.
+            resource_lists: list[list[FileResource]] = [
+                self._chitin,
+                self._streammusic,
+                self._streamsounds,
+                self._streamwaves,
+                *self._override.values(),
+                *self._modules.values(),
+                *self._lips.values(),
+                *self._texturepacks.values(),
+                *self._rims.values(),
+            ]
+        for resources in resource_lists:
             yield from resources
         tlk_path = self._path / "dialog.tlk"
         yield FileResource("dialog", ResourceType.TLK, tlk_path.stat().st_size, 0, tlk_path)
@@ -920,10 +1170,28 @@ class Installation:
             4. Return game with highest score or None if scores are equal or all checks fail
         """
         r_path: CaseAwarePath = CaseAwarePath.pathify(path)
+        # Lowercased names of each directory checked, so a missing file costs a dict lookup rather than a case-insensitive search of its folder.
+        listings: dict[str, dict[str, str] | None] = {}
+        root: str = str(r_path)
 
         def check(x: str) -> bool:
-            c_path: CaseAwarePath = r_path.joinpath(x)
-            return c_path.safe_exists() is not False
+            directory: str = root
+            for part in x.split("/"):
+                if directory not in listings:
+                    try:
+                        listings[directory] = {name.lower(): name for name in os.listdir(directory)}
+                    except (NotADirectoryError, FileNotFoundError):
+                        listings[directory] = {}
+                    except OSError:
+                        listings[directory] = None
+                listing: dict[str, str] | None = listings[directory]
+                if listing is None:
+                    return r_path.joinpath(x).safe_exists() is not False
+                name: str | None = listing.get(part.lower())
+                if name is None:
+                    return False
+                directory = os.path.join(directory, name)  # noqa: PTH118
+            return True
 
         # Checks for each game
         game1_pc_checks: list[bool] = [
@@ -1380,24 +1648,16 @@ class Installation:
         for qident in real_queries:
             locations[qident] = []
 
-        def check_dict(resource_dict: dict[str, list[FileResource]] | CaseInsensitiveDict[list[FileResource]]):
-            for resource_list in resource_dict.values():
-                check_list(resource_list)
-
-        def check_list(resource_list: list[FileResource]):
-            # Index resources by identifier
-            lookup_dict = {resource.identifier(): resource for resource in resource_list}
+        def check_index(location: SearchLocation):
             for query in real_queries:
-                resource = lookup_dict.get(query)
-                if resource is None:
-                    continue
-                location = LocationResult(
-                    resource.filepath(),
-                    resource.offset(),
-                    resource.size(),
-                )
-                location.set_file_resource(resource)
-                locations[query].append(location)
+                for resource in self._indexed_resources(query, location):
+                    location_result = LocationResult(
+                        resource.filepath(),
+                        resource.offset(),
+                        resource.size(),
+                    )
+                    location_result.set_file_resource(resource)
+                    locations[query].append(location_result)
 
         def check_capsules(values: list[Capsule]):
             for capsule in values:
@@ -1441,25 +1701,26 @@ class Installation:
                     locations[identifier].append(location)
 
         function_map: dict[SearchLocation, Callable] = {
-            SearchLocation.OVERRIDE: lambda: check_dict(self._override),
-            SearchLocation.MODULES: lambda: check_dict(self._modules),
-            SearchLocation.LIPS: lambda: check_dict(self._lips),
-            SearchLocation.RIMS: lambda: check_dict(self._rims),
-            SearchLocation.TEXTURES_TPA: lambda: check_list(self._texturepacks[TexturePackNames.TPA.value]),
-            SearchLocation.TEXTURES_TPB: lambda: check_list(self._texturepacks[TexturePackNames.TPB.value]),
-            SearchLocation.TEXTURES_TPC: lambda: check_list(self._texturepacks[TexturePackNames.TPC.value]),
-            SearchLocation.TEXTURES_GUI: lambda: check_list(self._texturepacks[TexturePackNames.GUI.value]),
-            SearchLocation.CHITIN: lambda: check_list(self._chitin) or check_list(self._patch_erf),
-            SearchLocation.MUSIC: lambda: check_list(self._streammusic),
-            SearchLocation.SOUND: lambda: check_list(self._streamsounds),
-            SearchLocation.VOICE: lambda: check_list(self._streamwaves),
+            SearchLocation.OVERRIDE: lambda: check_index(SearchLocation.OVERRIDE),
+            SearchLocation.MODULES: lambda: check_index(SearchLocation.MODULES),
+            SearchLocation.LIPS: lambda: check_index(SearchLocation.LIPS),
+            SearchLocation.RIMS: lambda: check_index(SearchLocation.RIMS),
+            SearchLocation.TEXTURES_TPA: lambda: check_index(SearchLocation.TEXTURES_TPA),
+            SearchLocation.TEXTURES_TPB: lambda: check_index(SearchLocation.TEXTURES_TPB),
+            SearchLocation.TEXTURES_TPC: lambda: check_index(SearchLocation.TEXTURES_TPC),
+            SearchLocation.TEXTURES_GUI: lambda: check_index(SearchLocation.TEXTURES_GUI),
+            SearchLocation.CHITIN: lambda: check_index(SearchLocation.CHITIN),
+            SearchLocation.MUSIC: lambda: check_index(SearchLocation.MUSIC),
+            SearchLocation.SOUND: lambda: check_index(SearchLocation.SOUND),
+            SearchLocation.VOICE: lambda: check_index(SearchLocation.VOICE),
             SearchLocation.CUSTOM_MODULES: lambda: check_capsules(capsules),  # type: ignore[arg-type]
             SearchLocation.CUSTOM_FOLDERS: lambda: check_folders(folders),  # type: ignore[arg-type]
         }
 
-        for item in order:
-            assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
-            function_map.get(item, lambda: None)()
+        with self.batch_loads():
+            for item in order:
+                assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
+                function_map.get(item, lambda: None)()
 
         return locations
 
@@ -1545,15 +1806,7 @@ class Installation:
         def decode_txi(txi_bytes: bytes) -> str:
             return txi_bytes.decode("ascii", errors="ignore").strip()
 
-        def get_txi_from_list(case_resname: str, resource_list: list[FileResource]) -> str:
-            txi_resource: FileResource | None = next(
-                (
-                    resource
-                    for resource in resource_list
-                    if resource.restype() is ResourceType.TXI and resource.identifier().lower_resname == case_resname
-                ),
-                None,
-            )
+        def read_txi(case_resname: str, txi_resource: FileResource | None) -> str:
             if txi_resource is not None:
                 self._log.debug("Found txi resource '%s' at %s", txi_resource.identifier(), txi_resource.filepath().relative_to(self._path.parent))
                 contents = decode_txi(txi_resource.data())
@@ -1563,21 +1816,45 @@ class Installation:
             self._log.debug("'%s.txi' resource not found during texture lookup.", case_resname)
             return ""
 
-        def check_dict(values: dict[str, list[FileResource]]):
-            for resources in values.values():
-                check_list(resources)
+        def get_txi_from_list(case_resname: str, resource_list: list[FileResource]) -> str:
+            txi_resource: FileResource | None = next(
+                (
+                    resource
+                    for resource in resource_list
+                    if resource.restype() is ResourceType.TXI and resource.identifier().lower_resname == case_resname
+                ),
+                None,
+            )
+            return read_txi(case_resname, txi_resource)
 
-        def check_list(resource_list: list[FileResource]):
-            for resource in resource_list:
-                if resource.restype() not in texture_types:
-                    continue
-                case_resname = resource.identifier().lower_resname
-                if case_resname not in case_resnames:
+        def get_txi_from_index(case_resname: str, texture_resource: FileResource, location: SearchLocation) -> str:
+            # The txi must sit next to the texture: inside the same capsule/bif, or loose alongside a loose texture.
+            texture_is_loose: bool = not texture_resource.inside_capsule and not texture_resource.inside_bif
+            txi_resource: FileResource | None = next(
+                (
+                    resource
+                    for resource in self._indexed_resources(ResourceIdentifier(case_resname, ResourceType.TXI), location)
+                    if resource.filepath() == texture_resource.filepath()
+                    or (texture_is_loose and not resource.inside_capsule and not resource.inside_bif)
+                ),
+                None,
+            )
+            return read_txi(case_resname, txi_resource)
+
+        def check_index(location: SearchLocation):
+            for case_resname in copy(case_resnames):
+                resource: FileResource | None = None
+                for texture_type in texture_types:
+                    indexed: list[FileResource] = self._indexed_resources(ResourceIdentifier(case_resname, texture_type), location)
+                    if indexed:
+                        resource = indexed[0]
+                        break
+                if resource is None:
                     continue
                 case_resnames.remove(case_resname)
                 tpc: TPC = read_tpc(resource.data())
                 if resource.restype() is ResourceType.TGA:
-                    tpc.txi = get_txi_from_list(case_resname, resource_list)
+                    tpc.txi = get_txi_from_index(case_resname, resource, location)
                 textures[case_resname] = tpc
 
         def check_capsules(values: list[Capsule]):  # NOTE: This function does not support txi's in the Override folder.
@@ -1621,24 +1898,111 @@ class Installation:
                 textures[texture_file.stem] = tpc
 
         function_map: dict[SearchLocation, Callable] = {
-            SearchLocation.OVERRIDE: lambda: check_dict(self._override),
-            SearchLocation.MODULES: lambda: check_dict(self._modules),
-            SearchLocation.RIMS: lambda: check_dict(self._rims),
-            SearchLocation.TEXTURES_TPA: lambda: check_list(self._texturepacks[TexturePackNames.TPA.value]),
-            SearchLocation.TEXTURES_TPB: lambda: check_list(self._texturepacks[TexturePackNames.TPB.value]),
-            SearchLocation.TEXTURES_TPC: lambda: check_list(self._texturepacks[TexturePackNames.TPC.value]),
-            SearchLocation.TEXTURES_GUI: lambda: check_list(self._texturepacks[TexturePackNames.GUI.value]),
-            SearchLocation.CHITIN: lambda: check_list(self._chitin) or check_list(self._patch_erf),
+            SearchLocation.OVERRIDE: lambda: check_index(SearchLocation.OVERRIDE),
+            SearchLocation.MODULES: lambda: check_index(SearchLocation.MODULES),
+            SearchLocation.RIMS: lambda: check_index(SearchLocation.RIMS),
+            SearchLocation.TEXTURES_TPA: lambda: check_index(SearchLocation.TEXTURES_TPA),
+            SearchLocation.TEXTURES_TPB: lambda: check_index(SearchLocation.TEXTURES_TPB),
+            SearchLocation.TEXTURES_TPC: lambda: check_index(SearchLocation.TEXTURES_TPC),
+            SearchLocation.TEXTURES_GUI: lambda: check_index(SearchLocation.TEXTURES_GUI),
+            SearchLocation.CHITIN: lambda: check_index(SearchLocation.CHITIN),
             SearchLocation.CUSTOM_MODULES: lambda: check_capsules(capsules),
             SearchLocation.CUSTOM_FOLDERS: lambda: check_folders(folders),
         }
 
-        for item in order:
-            assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
-            function_map.get(item, lambda: None)()
+        with self.batch_loads():
+            for item in order:
+                assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
+                function_map.get(item, lambda: None)()
 
         return textures
 
+    def strref_index(
+        self,
+        *,
+        max_workers: int | None = None,
+    ) -> StrRefIndex:
+        """Returns the reverse stringref index of the installation, building it on first use.
+
+        The index covers every LocalizedString of the GFFs and every StrRef column listed in K1Columns2DA/K2Columns2DA,
+        in the override, modules, rims and chitin. Later calls only re-parse the files of sections reloaded since.
+        When the installation was constructed with an `index_cache`, the index is persisted next to it.
+
+        Args:
+        ----
+            max_workers: Maximum number of processes used to parse the GFFs/2DAs. 1 parses them in this process.
+
+        Returns:
+        -------
+            The StrRefIndex, up to date with the loaded sections.
+        """
+        if self._strref_index is None:
+            if self._index_cache is None:
+                self._strref_index = StrRefIndex(installation_path=self._path)
+            else:
+                cache_filepath: Path = self._index_cache.filepath()
+                self._strref_index = StrRefIndex.load(cache_filepath.with_name(f"{cache_filepath.stem}.strrefs.json"), self._path)
+        elif not self._strref_index_stale:
+            return self._strref_index
+
+        # Fetched first: accessing a section that was never loaded loads it, which marks the index stale again.
+        with self.batch_loads():
+            sources: list[tuple[SearchLocation, list[FileResource]]] = [
+                (location, resource_list)
+                for location in STRREF_LOCATIONS
+                for resource_list in self._location_resource_lists(location)
+            ]
+        self._strref_index.update(sources, self._strref_columns(), max_workers=max_workers)
+        self._strref_index.save()
+        self._strref_index_stale = False
+        return self._strref_index
+
+    def model_index(
+        self,
+        *,
+        max_workers: int | None = None,
+    ) -> ModelIndex:
+        """Returns the model metadata index of the installation, building it on first use.
+
+        The index holds the textures, lightmaps, supermodel, node names, animations and bounds of every binary model in
+        the override, modules, rims and chitin, and answers which models use a texture, a lightmap or a supermodel.
+        Later calls only re-scan the files of sections reloaded since. When the installation was constructed with an
+        `index_cache`, the index is persisted next to it.
+
+        Args:
+        ----
+            max_workers: Maximum number of processes used to scan the models. 1 scans them in this process.
+
+        Returns:
+        -------
+            The ModelIndex, up to date with the loaded sections.
+        """
+        if self._model_index is None:
+            if self._index_cache is None:
+                self._model_index = ModelIndex(installation_path=self._path)
+            else:
+                cache_filepath: Path = self._index_cache.filepath()
+                self._model_index = ModelIndex.load(cache_filepath.with_name(f"{cache_filepath.stem}.models.json"), self._path)
+        elif not self._model_index_stale:
+            return self._model_index
+
+        # Fetched first: accessing a section that was never loaded loads it, which marks the index stale again.
+        with self.batch_loads():
+            sources: list[tuple[SearchLocation, list[FileResource]]] = [
+                (location, resource_list)
+                for location in MODEL_LOCATIONS
+                for resource_list in self._location_resource_lists(location)
+            ]
+        self._model_index.update(sources, max_workers=max_workers)
+        self._model_index.save()
+        self._model_index_stale = False
+        return self._model_index
+
+    def _strref_columns(self) -> dict[str, set[str]]:
+        from pykotor.extract.twoda import K1Columns2DA, K2Columns2DA
+
+        return K2Columns2DA.StrRefs.as_dict() if self.game().is_k2() else K1Columns2DA.StrRefs.as_dict()
+
     def find_tlk_entry_references(
         self,
         query_stringref: int,
@@ -1647,14 +2011,14 @@ class Installation:
         capsules: list[Capsule] | None = None,
         folders: list[Path] | None = None,
     ) -> set[FileResource]:
-        """Finds all gffs that utilize this stringref in their localizedstring.
+        """Finds all gffs and 2das that reference this stringref in a localizedstring or a StrRef column.
 
-        If no gffs could not be found the value will return None.
+        The installation's locations are answered from strref_index(), which is built on the first call.
 
         Args:
         ----
             stringref: A number representing the locstring to find.
-            order: The ordered list of locations to check.
+            order: The locations to check.
             capsules: An extra list of capsules to search in.
             folders: An extra list of folders to search in.
 
@@ -1662,8 +2026,6 @@ class Installation:
         -------
             A set of FileResources.
         """
-        capsules = [] if capsules is None else capsules
-        folders = [] if folders is None else folders
         if order is None:
             order = [
                 SearchLocation.CUSTOM_FOLDERS,
@@ -1675,169 +2037,30 @@ class Installation:
             ]
 
         found_resources: set[FileResource] = set()
-        gff_extensions: set[str] = GFFContent.get_extensions()
-        relevant_2da_filenames: dict[str, set[str]] = {}
-        from pykotor.extract.twoda import K1Columns2DA, K2Columns2DA
-        if self.game().is_k1():  # TODO(th3w1zard1): TSL:
-            relevant_2da_filenames = K1Columns2DA.StrRefs.as_dict()
-        elif self.game().is_k2():
-            relevant_2da_filenames = K2Columns2DA.StrRefs.as_dict()
-
-        def check_2da(resource2da: FileResource) -> bool:
-            valid_2da: TwoDA | None = None
-            with suppress(ValueError, OSError):
-                valid_2da = read_2da(resource2da.data())
-            if not valid_2da:
-                print(f"'{resource2da._path_ident_obj}' cannot be loaded, probably corrupted.")
-                return False
-            filename_2da = resource2da.filename().lower()
-            for column_name in relevant_2da_filenames[filename_2da]:
-                if column_name == ">>##HEADER##<<":
-                    for header in valid_2da.get_headers():
-                        try:
-                            stripped_header = header.strip()
-                            if not stripped_header.isdigit():
-                                if stripped_header and stripped_header not in ("****", "*****", "-1"):
-                                    self._log.warning(f"header '{header}' in '{filename_2da}' is invalid, expected a stringref number.")
-                                continue
-                            if int(stripped_header) == query_stringref:
-                                return True
-                        except Exception as e:  # noqa: BLE001
-                            RobustRootLogger().error("Error parsing '%s' header '%s': %s", filename_2da, header, str(e), exc_info=False)
-                else:
-                    try:
-                        for i, cell in enumerate(valid_2da.get_column(column_name)):
-                            stripped_cell = cell.strip()
-                            if not stripped_cell.isdigit():
-                                if stripped_cell and stripped_cell not in ("****", "*****", "-1"):
-                                    self._log.warning(f"column '{column_name}' rowindex {i} in '{filename_2da}' is invalid, expected a stringref number. Instead got '{cell}'")
-                                continue
-                            if int(stripped_cell) == query_stringref:
-                                return True
-                    except Exception as e:  # noqa: BLE001
-                        RobustRootLogger().error("Error parsing '%s' column '%s': %s", filename_2da, column_name, str(e), exc_info=False)
-            return False
-
-        def recurse_gff_lists(gff_list: GFFList) -> bool:
-            for gff_struct in gff_list:
-                result = recurse_gff_structs(gff_struct)
-                if result:
-                    return True
-            return False
-
-        def recurse_gff_structs(gff_struct: GFFStruct) -> bool:
-            for _label, ftype, fval in gff_struct:
-                if ftype == GFFFieldType.List and isinstance(fval, GFFList):
-                    result = recurse_gff_lists(fval)
-                    if result:
-                        return True
-                if ftype == GFFFieldType.Struct and isinstance(fval, GFFStruct):
-                    result = recurse_gff_structs(fval)
-                    if result:
-                        return True
-                if ftype != GFFFieldType.LocalizedString or not isinstance(fval, LocalizedString):
-                    continue
-                if fval.stringref == query_stringref:
-                    return True
-            return False
-
-        def try_get_gff(gff_data: bytes) -> GFF | None:
-            with suppress(OSError, ValueError):
-                return read_gff(gff_data)
-            return None
-
-        def check_dict(resource_dict: dict[str, list[FileResource]]):
-            for resources in resource_dict.values():
-                check_list(resources)
-
-        def check_list(resource_list: list[FileResource]):
-            for resource in resource_list:
-                this_restype: ResourceType = resource.restype()
-                if (
-                    resource.filename().lower() in relevant_2da_filenames
-                    and this_restype is ResourceType.TwoDA
-                    and check_2da(resource)
-                ):
-                    found_resources.add(resource)
-                if this_restype.extension not in gff_extensions:
-                    continue
-                valid_gff: GFF | None = try_get_gff(resource.data())
-                if not valid_gff:
-                    continue
-                if not recurse_gff_structs(valid_gff.root):
-                    continue
-                found_resources.add(resource)
+        if any(location in STRREF_LOCATIONS for location in order):
+            found_resources.update(
+                reference.resource
+                for reference in self.strref_index().references(query_stringref)
+                if reference.location in order
+            )
 
-        def check_capsules(capsules_list: list[Capsule]):
-            for capsule in capsules_list:
-                for resource in capsule.resources():
-                    this_restype: ResourceType = resource.restype()
-                    if (
-                        resource.filename().lower() in relevant_2da_filenames
-                        and this_restype is ResourceType.TwoDA
-                        and check_2da(resource)
-                    ):
-                        found_resources.add(resource)
-                    if this_restype.extension not in gff_extensions:
-                        continue
-                    valid_gff: GFF | None = try_get_gff(resource.data())
-                    if not valid_gff:
-                        continue
-                    if not recurse_gff_structs(valid_gff.root):
+        custom_sources: list[tuple[SearchLocation, list[FileResource]]] = []
+        if capsules and SearchLocation.CUSTOM_MODULES in order:
+            custom_sources.extend((SearchLocation.CUSTOM_MODULES, list(capsule)) for capsule in capsules)
+        if folders and SearchLocation.CUSTOM_FOLDERS in order:
+            folder_resources: list[FileResource] = []
+            for folder in folders:
+                for filepath in Path.pathify(folder).safe_rglob("*"):
+                    if not filepath.safe_isfile():
                         continue
-                    found_resources.add(resource)
-
-        def check_folders(values: list[Path]):
-            relevant_files: set[Path] = set()
-            for folder in values:  # Having two loops makes it easier to filter out irrelevant files when stepping through the 2nd
-                relevant_files.update(
-                    file
-                    for file in folder.safe_rglob("*")
-                    if (
-                        file.suffix
-                        and (
-                            file.suffix[1:].casefold() in gff_extensions
-                            or (file.name.lower() in relevant_2da_filenames and file.suffix.casefold() == ".2da")
-                        )
-                        and file.safe_isfile()
-                    )
-                )
-            for gff_file in relevant_files:
-                restype: ResourceType | None = ResourceType.from_extension(gff_file.suffix)
-                if not restype:
-                    continue
-                fileres = FileResource(
-                    resname=gff_file.stem,
-                    restype=restype,
-                    size=gff_file.stat().st_size,
-                    offset=0,
-                    filepath=gff_file
-                )
-                if restype is ResourceType.TwoDA and check_2da(fileres):
-                    found_resources.add(fileres)
-                else:
-                    gff_data = BinaryReader.load_file(gff_file)
-                    valid_gff: GFF | None = None
-                    with suppress(ValueError, OSError):
-                        valid_gff = read_gff(gff_data)
-                    if not valid_gff:
-                        continue
-                    if not recurse_gff_structs(valid_gff.root):
-                        continue
-                    found_resources.add(fileres)
-
-        function_map: dict[SearchLocation, Callable] = {
-            SearchLocation.OVERRIDE: lambda: check_dict(self._override),
-            SearchLocation.MODULES: lambda: check_dict(self._modules),
-            SearchLocation.RIMS: lambda: check_dict(self._rims),
-            SearchLocation.CHITIN: lambda: check_list(self._chitin) or check_list(self._patch_erf),
-            SearchLocation.CUSTOM_MODULES: lambda: check_capsules(capsules),
-            SearchLocation.CUSTOM_FOLDERS: lambda: check_folders(folders),  # type: ignore[arg-type]
-        }
-
-        for item in order:
-            assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
-            function_map.get(item, lambda: None)()
+                    resource: FileResource | None = self._build_single_resource(filepath)
+                    if resource is not None:
+                        folder_resources.append(resource)
+            custom_sources.append((SearchLocation.CUSTOM_FOLDERS, folder_resources))
+        if custom_sources:
+            custom_index = StrRefIndex()
+            custom_index.update(custom_sources, self._strref_columns(), max_workers=1)
+            found_resources.update(reference.resource for reference in custom_index.references(query_stringref))
 
         return found_resources
 
@@ -1909,16 +2132,15 @@ class Installation:
         for resname in resnames:
             sounds[resname] = None
 
-        def check_dict(values: dict[str, list[FileResource]]):
-            for resources in values.values():
-                check_list(resources)
-
-        def check_list(values: list[FileResource]):
-            for resource in values:
-                if resource.restype() not in sound_formats:
-                    continue
-                case_resname = resource.identifier().lower_resname
-                if case_resname not in case_resnames:
+        def check_index(location: SearchLocation):
+            for case_resname in copy(case_resnames):
+                resource: FileResource | None = None
+                for sformat in sound_formats:
+                    indexed: list[FileResource] = self._indexed_resources(ResourceIdentifier(case_resname, sformat), location)
+                    if indexed:
+                        resource = indexed[0]
+                        break
+                if resource is None:
                     continue
                 self._log.debug("Found sound at '%s'", resource.filepath())
                 case_resnames.remove(case_resname)
@@ -1958,20 +2180,21 @@ class Installation:
                 sounds[sound_file.stem] = deobfuscate_audio(sound_data)
 
         function_map: dict[SearchLocation, Callable] = {
-            SearchLocation.OVERRIDE: lambda: check_dict(self._override),
-            SearchLocation.MODULES: lambda: check_dict(self._modules),
-            SearchLocation.RIMS: lambda: check_dict(self._rims),
-            SearchLocation.CHITIN: lambda: check_list(self._chitin) or check_list(self._patch_erf),
-            SearchLocation.MUSIC: lambda: check_list(self._streammusic),
-            SearchLocation.SOUND: lambda: check_list(self._streamsounds),
-            SearchLocation.VOICE: lambda: check_list(self._streamwaves),
+            SearchLocation.OVERRIDE: lambda: check_index(SearchLocation.OVERRIDE),
+            SearchLocation.MODULES: lambda: check_index(SearchLocation.MODULES),
+            SearchLocation.RIMS: lambda: check_index(SearchLocation.RIMS),
+            SearchLocation.CHITIN: lambda: check_index(SearchLocation.CHITIN),
+            SearchLocation.MUSIC: lambda: check_index(SearchLocation.MUSIC),
+            SearchLocation.SOUND: lambda: check_index(SearchLocation.SOUND),
+            SearchLocation.VOICE: lambda: check_index(SearchLocation.VOICE),
             SearchLocation.CUSTOM_MODULES: lambda: check_capsules(capsules),
             SearchLocation.CUSTOM_FOLDERS: lambda: check_folders(folders),  # type: ignore[arg-type]
         }
 
-        for item in order:
-            assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
-            function_map.get(item, lambda: None)()
+        with self.batch_loads():
+            for item in order:
+                assert isinstance(item, SearchLocation), f"{type(item).__name__}: {item}"
+                function_map.get(item, lambda: None)()
 
         return sounds
 
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import os
+
+from typing import TYPE_CHECKING, Any
+
+from pykotor.common.indexing import file_stamp, read_index_file, write_index_file
+from pykotor.extract.capsule import Capsule
+from pykotor.extract.chitin import Chitin
+from pykotor.extract.file import FileResource, ResourceIdentifier
+from pykotor.resource.type import ResourceType
+from utility.logger_util import RobustRootLogger
+from utility.system.path import Path
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+class InstallationIndexCache:
+    """Persists the parsed tables of an Installation to a json file so later constructions only re-parse what changed.
+
+    The cache records, along with the size and mtime of every source file or directory they were read from:
+        - the keys and BIF filenames of the chitin.key (BIF tables are read on demand, see Chitin)
+        - the table of contents of every capsule (ERF/MOD/RIM/SAV)
+        - the file listings of the loose resource folders (override, streammusic, streamsounds, streamwaves...)
+
+    A stale entry is simply re-parsed and replaced. The listing of a directory holds the size and resource identifier of
+    each of its files and is trusted while the directory's mtime does not change, so the files are not stat'd again.
+    Adding, removing or renaming a file changes that mtime; a file rewritten in place under the same name does not,
+    and keeps its cached size until its directory changes.
+
+    Each table is stored as one flat list of values rather than a list per resource, so that the loaded cache is a
+    few hundred objects for the garbage collector to walk instead of one per resource.
+    """
+
+    VERSION: int = 3
+
+    def __init__(
+        self,
+        filepath: os.PathLike | str,
+        installation_path: os.PathLike | str,
+    ):
+        self._log: Logger = RobustRootLogger()
+        self._filepath: Path = Path(filepath)
+        self._installation_path: str = str(installation_path)
+
+        self._chitin: dict[str, Any] = {}
+        self._capsules: dict[str, dict[str, Any]] = {}
+        self._folders: dict[str, dict[str, Any]] = {}
+        self._modified: bool = False
+
+    @classmethod
+    def load(
+        cls,
+        filepath: os.PathLike | str,
+        installation_path: os.PathLike | str,
+    ) -> InstallationIndexCache:
+        """Loads the cache file at `filepath`. A missing, unreadable or outdated file results in an empty cache.
+
+        Args:
+        ----
+            filepath: Path to the cache file.
+            installation_path: Path to the installation the cache belongs to. A cache of another installation is discarded.
+
+        Returns:
+        -------
+            The cache, either populated from the file or empty.
+        """
+        cache = cls(filepath, installation_path)
+        contents: dict[str, Any] | None = read_index_file(filepath, cls.VERSION, "installation index cache", installation=cache._installation_path)
+        if contents is None:
+            return cache
+        cache._chitin = contents.get("chitin", {})
+        cache._capsules = contents.get("capsules", {})
+        cache._folders = contents.get("folders", {})
+        return cache
+
+    def filepath(self) -> Path:
+        return self._filepath
+
+    def save(
+        self,
+        *,
+        force: bool = False,
+    ):
+        """Writes the cache to disk if anything changed since it was loaded.
+
+        Entries of capsules and folders that no longer exist are dropped. Failing to write the cache is logged, not raised.
+
+        Args:
+        ----
+            force: Write the file even when nothing changed.
+        """
+        if not self._modified and not force:
+            return
+        if write_index_file(
+            self._filepath,
+            self.VERSION,
+            "installation index cache",
+            installation=self._installation_path,
+            chitin=self._chitin,
+            capsules={path: entry for path, entry in self._capsules.items() if os.path.exists(path)},  # noqa: PTH110
+            folders={path: entry for path, entry in self._folders.items() if os.path.exists(path)},  # noqa: PTH110
+        ):
+            self._modified = False
+
+    def chitin_resources(
+        self,
+        key_path: os.PathLike | str,
+    ) -> list[FileResource]:
+        """Returns the resources linked by the chitin.key, parsing the key again only if it changed.
+
+        Only the keys are cached: the BIF tables are read when a resource of the BIF is first used, like a new Chitin does.
+
+        Args:
+        ----
+            key_path: Path to the chitin.key file.
+
+        Returns:
+        -------
+            The list of resources, same as `list(Chitin(key_path))`.
+        """
+        key_str = str(key_path)
+        stamp: list[int] | None = file_stamp(key_str)
+        entry: dict[str, Any] = self._chitin
+        if stamp is not None and entry.get("key") == key_str and entry.get("stamp") == stamp:
+            keys: list[Any] = entry["keys"]
+            return list(Chitin.from_key_table(key_path, list(zip(keys[0::3], keys[1::3], keys[2::3])), entry["bifs"]))
+
+        chitin = Chitin(key_path=key_path)
+        key_table, bifs = chitin.key_table()
+        self._chitin = {
+            "key": key_str,
+            "stamp": stamp,
+            "bifs": bifs,
+            "keys": [value for key in key_table for value in key],
+        }
+        self._modified = True
+        return list(chitin)
+
+    def capsule_resources(
+        self,
+        filepath: os.PathLike | str,
+    ) -> list[FileResource]:
+        """Returns the resources stored in a capsule, parsing its table of contents again only if the file changed.
+
+        Args:
+        ----
+            filepath: Path to the ERF/MOD/RIM/SAV file.
+
+        Returns:
+        -------
+            The list of resources, same as `list(Capsule(filepath))`.
+        """
+        path_str = str(filepath)
+        stamp: list[int] | None = file_stamp(path_str)
+        entry: dict[str, Any] | None = self._capsules.get(path_str)
+        if entry is not None and stamp is not None and entry["stamp"] == stamp:
+            capsule_path: Path = Path(path_str)  # A plain Path: joining onto a CaseAwarePath re-resolves the case of every resource.
+            table: list[Any] = entry["resources"]
+            return [
+                FileResource(resname, ResourceType.from_id(type_id), size, offset, capsule_path)
+                for resname, type_id, offset, size in zip(table[0::4], table[1::4], table[2::4], table[3::4])
+            ]
+
+        resources: list[FileResource] = list(Capsule(filepath))
+        self._capsules[path_str] = {
+            "stamp": stamp,
+            "resources": [value for res in resources for value in (res.resname(), res.restype().type_id, res.offset(), res.size())],
+        }
+        self._modified = True
+        return resources
+
+    def folder_resources(
+        self,
+        folder: os.PathLike | str,
+        *,
+        recurse: bool = False,
+        skip_invalid: bool = False,
+    ) -> list[FileResource]:
+        """Returns the resources of the files in a folder, walking only the directories whose mtime changed.
+
+        Args:
+        ----
+            folder: The folder to list.
+            recurse: Whether to include files in nested subfolders.
+            skip_invalid: Whether to leave out files whose extension is not a known resource type.
+
+        Returns:
+        -------
+            The list of resources, one per file.
+        """
+        resources: list[FileResource] = []
+        stack: list[str] = [str(folder)]
+        while stack:
+            directory: str = stack.pop()
+            files, dirnames = self._directory_listing(directory)
+            if files:
+                # The path of each file is built from this one with with_name(), the folder's path is only parsed once.
+                sibling_path: Path = Path(directory, files[0])
+            for filename, size, resname, extension in zip(files[0::4], files[1::4], files[2::4], files[3::4]):
+                restype: ResourceType = ResourceType.from_extension(extension)
+                if skip_invalid and restype.is_invalid:
+                    continue
+                try:
+                    resources.append(FileResource(resname, restype, size, 0, sibling_path.with_name(filename)))
+                except Exception:  # noqa: BLE001
+                    self._log.exception("Error loading file %s", os.path.join(directory, filename))  # noqa: PTH118
+            if recurse:
+                stack.extend(os.path.join(directory, dirname) for dirname in dirnames)  # noqa: PTH118
+        return resources
+
+    def folder_directories(
+        self,
+        folder: os.PathLike | str,
+    ) -> list[str]:
+        """Returns the paths of every nested subfolder of a folder, walking only the directories whose mtime changed.
+
+        Args:
+        ----
+            folder: The folder to walk.
+
+        Returns:
+        -------
+            A list of directory paths, not including `folder` itself.
+        """
+        directories: list[str] = []
+        stack: list[str] = [str(folder)]
+        while stack:
+            directory: str = stack.pop()
+            subdirectories = [os.path.join(directory, dirname) for dirname in self._directory_listing(directory)[1]]  # noqa: PTH118
+            directories.extend(subdirectories)
+            stack.extend(subdirectories)
+        return directories
+
+    def _directory_listing(
+        self,
+        directory: str,
+    ) -> tuple[list[Any], list[str]]:
+        """Returns the filename, size, resname and extension of every file of a directory, flattened into one list, and the names of its subdirectories."""
+        stamp: list[int] | None = file_stamp(directory)
+        if stamp is None:
+            return [], []
+        entry: dict[str, Any] | None = self._folders.get(directory)
+        if entry is not None and entry["stamp"] == stamp[1]:
+            return entry["files"], entry["dirs"]
+
+        files: list[Any] = []
+        dirnames: list[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for dir_entry in it:
+                    if dir_entry.is_dir():
+                        dirnames.append(dir_entry.name)
+                    elif dir_entry.is_file():
+                        try:
+                            size: int = dir_entry.stat().st_size
+                        except OSError:
+                            continue
+                        identifier: ResourceIdentifier = ResourceIdentifier.from_path(dir_entry.name)
+                        files.extend((dir_entry.name, size, identifier.resname, identifier.restype.extension))
+        except OSError:
+            self._log.warning("Could not list the folder '%s'", directory, exc_info=True)
+            return [], []
+        self._folders[directory] = {"stamp": stamp[1], "files": files, "dirs": dirnames}
+        self._modified = True
+        return files, dirnames
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from pykotor.common.indexing import chunk_sources, file_stamp, read_index_file, resource_table_checksum, write_index_file
+from pykotor.common.misc import Game
+from pykotor.common.parallel import parallel_map
+from pykotor.extract.file import FileResource
+from pykotor.resource.type import ResourceType
+from pykotor.tools.model import ModelInfo, scan_model
+from utility.logger_util import RobustRootLogger
+from utility.system.path import Path
+
+if TYPE_CHECKING:
+    import os
+
+    from pykotor.extract.installation import SearchLocation
+
+
+class ModelReference(NamedTuple):
+    resource: FileResource
+    location: SearchLocation
+    info: ModelInfo
+
+
+def _info_to_row(info: ModelInfo) -> list[Any]:
+    return [
+        info.name,
+        info.supermodel,
+        int(info.game),
+        list(info.textures),
+        list(info.lightmaps),
+        list(info.node_names),
+        list(info.animations),
+        list(info.bounding_box_min),
+        list(info.bounding_box_max),
+        info.radius,
+    ]
+
+
+def _row_to_info(row: list[Any]) -> ModelInfo:
+    name, supermodel, game, textures, lightmaps, node_names, animations, bounding_box_min, bounding_box_max, radius = row
+    return ModelInfo(
+        name,
+        supermodel,
+        Game(game),
+        tuple(textures),
+        tuple(lightmaps),
+        tuple(node_names),
+        tuple(animations),
+        tuple(bounding_box_min),
+        tuple(bounding_box_max),
+        radius,
+    )
+
+
+def _scan_sources(
+    sources: list[tuple[str, list[tuple[str, int, int, int]]]],
+) -> dict[str, list[list[Any]]]:
+    """Scans the headers of the models of each source and returns their metadata rows, keyed by source path.
+
+    Runs in worker processes, so it only takes and returns plain data.
+    """
+    results: dict[str, list[list[Any]]] = {}
+    for source_path, resources in sources:
+        rows: list[list[Any]] = []
+        try:
+            file_resources = [FileResource(resname, ResourceType.from_id(type_id), size, offset, source_path) for resname, type_id, offset, size in resources]
+            for resource, data in FileResource.iter_data(file_resources):  # Decompresses the resources of .bzf files.
+                try:
+                    info: ModelInfo = scan_model(data)
+                except ValueError:
+                    continue  # Corrupted, or an ascii model in the override.
+                rows.append([resource.resname(), resource.restype().type_id, resource.offset(), resource.size(), _info_to_row(info)])
+        except OSError:
+            RobustRootLogger().warning("Could not read '%s' while indexing models", source_path, exc_info=True)
+        results[source_path] = rows
+    return results
+
+
+class ModelIndex:
+    """Metadata of every binary model of an installation, with reverse lookups by texture, lightmap and supermodel.
+
+    The metadata is read by scan_model from the model headers, no MDL objects are built. Like StrRefIndex, the index is
+    built per 'source' (a loose file, a capsule or a BIF), a source is only scanned again when its size, mtime or table of
+    resources changes, and the whole index can be persisted to a json file.
+    """
+
+    VERSION: int = 1
+
+    def __init__(
+        self,
+        filepath: os.PathLike | str | None = None,
+        installation_path: os.PathLike | str = "",
+    ):
+        self._filepath: Path | None = None if filepath is None else Path(filepath)
+        self._installation_path: str = str(installation_path)
+
+        self._sources: dict[str, dict[str, Any]] = {}
+        self._modified: bool = False
+
+        # Lowercase key -> (source path, row) pairs, built from self._sources when first queried.
+        self._lookups: dict[str, dict[str, list[tuple[str, list[Any]]]]] | None = None
+        self._references: dict[tuple[str, int], ModelReference] = {}
+
+    @classmethod
+    def load(
+        cls,
+        filepath: os.PathLike | str,
+        installation_path: os.PathLike | str,
+    ) -> ModelIndex:
+        """Loads the index file at `filepath`. A missing, unreadable or outdated file results in an empty index.
+
+        Args:
+        ----
+            filepath: Path to the index file.
+            installation_path: Path to the installation the index belongs to. An index of another installation is discarded.
+
+        Returns:
+        -------
+            The index, either populated from the file or empty.
+        """
+        index = cls(filepath, installation_path)
+        contents: dict[str, Any] | None = read_index_file(filepath, cls.VERSION, "model index", installation=index._installation_path)
+        if contents is None:
+            return index
+        index._sources = contents.get("sources", {})
+        return index
+
+    def filepath(self) -> Path | None:
+        return self._filepath
+
+    def save(
+        self,
+        *,
+        force: bool = False,
+    ):
+        """Writes the index to disk if it has a filepath and anything changed since it was loaded.
+
+        Failing to write the index is logged, not raised.
+
+        Args:
+        ----
+            force: Write the file even when nothing changed.
+        """
+        if self._filepath is None or (not self._modified and not force):
+            return
+        if write_index_file(
+            self._filepath,
+            self.VERSION,
+            "model index",
+            installation=self._installation_path,
+            sources=self._sources,
+        ):
+            self._modified = False
+
+    def update(
+        self,
+        sources: Iterable[tuple[SearchLocation, list[FileResource]]],
+        *,
+        max_workers: int | None = None,
+    ) -> int:
+        """Brings the index in line with `sources`, scanning only the sources that are new or changed.
+
+        Args:
+        ----
+            sources: (location, resources) pairs. Resources stored in the same file are indexed together as one source.
+            max_workers: Maximum number of processes used to scan the changed sources. 1 scans them in this process.
+
+        Returns:
+        -------
+            The number of sources that were scanned.
+
+        Processing Logic:
+        ----------------
+            - Only MDL resources are considered, ascii and corrupted models are skipped.
+            - Sources that are no longer passed in are dropped from the index.
+        """
+        current: dict[str, tuple[SearchLocation, list[tuple[str, int, int, int]]]] = {}
+        for location, resources in sources:
+            for resource in resources:
+                if resource.restype() is not ResourceType.MDL:
+                    continue
+                source_path = str(resource.filepath())
+                if source_path not in current:
+                    current[source_path] = (location, [])
+                current[source_path][1].append((resource.resname(), ResourceType.MDL.type_id, resource.offset(), resource.size()))
+
+        for source_path in self._sources.keys() - current.keys():
+            del self._sources[source_path]
+            self._modified = True
+            self._lookups = None
+
+        stale: dict[str, dict[str, Any]] = {}
+        for source_path, (location, resources) in current.items():
+            entry: dict[str, Any] = {
+                "location": int(location),
+                "stamp": file_stamp(source_path),
+                "checksum": resource_table_checksum(resources),
+            }
+            cached: dict[str, Any] | None = self._sources.get(source_path)
+            if (
+                cached is not None
+                and cached["location"] == entry["location"]
+                and cached["stamp"] == entry["stamp"]
+                and cached["checksum"] == entry["checksum"]
+            ):
+                continue
+            entry["rows"] = []
+            stale[source_path] = entry
+        if not stale:
+            return 0
+
+        for source_path, rows in self._scan([(source_path, current[source_path][1]) for source_path in stale], max_workers).items():
+            stale[source_path]["rows"] = rows
+        self._sources.update(stale)
+        self._modified = True
+        self._lookups = None
+        return len(stale)
+
+    def _scan(
+        self,
+        sources: list[tuple[str, list[tuple[str, int, int, int]]]],
+        max_workers: int | None,
+    ) -> dict[str, list[list[Any]]]:
+        results: dict[str, list[list[Any]]] = {}
+        for chunk_results in parallel_map(_scan_sources, chunk_sources(sources), max_workers=max_workers, task="index models"):
+            results.update(chunk_results)
+        return results
+
+    def _lookup(self, key: str) -> dict[str, list[tuple[str, list[Any]]]]:
+        if self._lookups is None:
+            lookups: dict[str, dict[str, list[tuple[str, list[Any]]]]] = {
+                "resname": {},
+                "texture": {},
+                "lightmap": {},
+                "supermodel": {},
+            }
+            for source_path, entry in self._sources.items():
+                for row in entry["rows"]:
+                    record: tuple[str, list[Any]] = (source_path, row)
+                    info_row: list[Any] = row[4]
+                    lookups["resname"].setdefault(row[0].lower(), []).append(record)
+                    for texture in info_row[3]:
+                        lookups["texture"].setdefault(texture, []).append(record)
+                    for lightmap in info_row[4]:
+                        lookups["lightmap"].setdefault(lightmap, []).append(record)
+                    if info_row[1].lower() != "null":
+                        lookups["supermodel"].setdefault(info_row[1].lower(), []).append(record)
+            self._lookups = lookups
+            self._references = {}
+        return self._lookups[key]
+
+    def _query(self, key: str, value: str) -> list[ModelReference]:
+        from pykotor.extract.installation import SearchLocation  # Prevent circular imports
+
+        references: list[ModelReference] = []
+        for source_path, row in self._lookup(key).get(value.lower(), ()):
+            resname, type_id, offset, size, info_row = row
+            reference: ModelReference | None = self._references.get((source_path, offset))
+            if reference is None:
+                reference = self._references[(source_path, offset)] = ModelReference(
+                    FileResource(resname, ResourceType.from_id(type_id), size, offset, Path(source_path)),
+                    SearchLocation(self._sources[source_path]["location"]),
+                    _row_to_info(info_row),
+                )
+            references.append(reference)
+        return references
+
+    def models(
+        self,
+        resname: str,
+    ) -> list[ModelReference]:
+        """Returns every indexed copy of the model named `resname`, in no particular order.
+
+        Args:
+        ----
+            resname: The case-insensitive name of the model, without the extension.
+
+        Returns:
+        -------
+            A list of references, empty if no model of that name was indexed.
+        """
+        return self._query("resname", resname)
+
+    def models_using_texture(
+        self,
+        texture: str,
+    ) -> list[ModelReference]:
+        """Returns every indexed model with a mesh that uses `texture` as its diffuse texture.
+
+        Args:
+        ----
+            texture: The case-insensitive resname of the texture.
+
+        Returns:
+        -------
+            A list of references, empty if no indexed model uses the texture.
+        """
+        return self._query("texture", texture)
+
+    def models_using_lightmap(
+        self,
+        lightmap: str,
+    ) -> list[ModelReference]:
+        """Returns every indexed model with a mesh that uses `lightmap` as its lightmap.
+
+        Args:
+        ----
+            lightmap: The case-insensitive resname of the lightmap.
+
+        Returns:
+        -------
+            A list of references, empty if no indexed model uses the lightmap.
+        """
+        return self._query("lightmap", lightmap)
+
+    def children(
+        self,
+        supermodel: str,
+    ) -> list[ModelReference]:
+        """Returns every indexed model whose supermodel is `supermodel`.
+
+        Args:
+        ----
+            supermodel: The case-insensitive name of the supermodel.
+
+        Returns:
+        -------
+            A list of references, empty if no indexed model inherits from the supermodel.
+        """
+        return self._query("supermodel", supermodel)
+
+    def textures(self) -> set[str]:
+        """Returns the lowercase resname of every texture used by at least one indexed model."""
+        return set(self._lookup("texture"))
+
+    def lightmaps(self) -> set[str]:
+        """Returns the lowercase resname of every lightmap used by at least one indexed model."""
+        return set(self._lookup("lightmap"))
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from pykotor.common.indexing import chunk_sources, file_stamp, read_index_file, resource_table_checksum, write_index_file
+from pykotor.common.parallel import parallel_map
+from pykotor.extract.file import FileResource
+from pykotor.resource.formats.gff import read_gff
+from pykotor.resource.formats.gff.gff_data import GFFContent, GFFFieldType
+from pykotor.resource.formats.twoda.twoda_auto import read_2da
+from pykotor.resource.type import ResourceType
+from utility.logger_util import RobustRootLogger
+from utility.system.path import Path
+
+if TYPE_CHECKING:
+    import os
+
+    from pykotor.extract.installation import SearchLocation
+    from pykotor.resource.formats.gff.gff_data import GFFStruct
+
+HEADER_COLUMN = ">>##HEADER##<<"  # Marks 2DAs whose column headers are stringrefs, see K1Columns2DA/K2Columns2DA.
+
+
+class StrRefReference(NamedTuple):
+    resource: FileResource
+    location: SearchLocation
+    field_path: str  # GFF: backslash separated path to the LocalizedString field. 2DA: the column header.
+    row_index: int | None  # 2DA: the row holding the stringref, None for GFF fields and 2DA column headers.
+
+
+def _gff_stringrefs(root: GFFStruct) -> list[tuple[int, str]]:
+    """Returns the (stringref, field path) of every LocalizedString in a GFF that references the TalkTable."""
+    found: list[tuple[int, str]] = []
+    stack: list[tuple[GFFStruct, str]] = [(root, "")]
+    while stack:
+        gff_struct, prefix = stack.pop()
+        for label, field_type, value in gff_struct:
+            field_path = f"{prefix}\\{label}" if prefix else label
+            if field_type is GFFFieldType.LocalizedString:
+                if value.stringref != -1:
+                    found.append((value.stringref, field_path))
+            elif field_type is GFFFieldType.Struct:
+                stack.append((value, field_path))
+            elif field_type is GFFFieldType.List:
+                stack.extend((child, f"{field_path}\\{i}") for i, child in enumerate(value))
+    return found
+
+
+def _twoda_stringrefs(data: bytes, columns: Iterable[str]) -> list[tuple[int, str, int | None]]:
+    """Returns the (stringref, column, row index) of every StrRef cell of a 2DA. Cells that aren't a number are skipped."""
+    twoda = read_2da(data)
+    found: list[tuple[int, str, int | None]] = []
+    for column in columns:
+        if column == HEADER_COLUMN:
+            found.extend((int(header.strip()), header, None) for header in twoda.get_headers() if header.strip().isdigit())
+            continue
+        with suppress(KeyError):
+            found.extend(
+                (int(cell.strip()), column, row_index)
+                for row_index, cell in enumerate(twoda.get_column(column))
+                if cell.strip().isdigit()
+            )
+    return found
+
+
+def _scan_sources(
+    sources: list[tuple[str, list[tuple[str, int, int, int]]]],
+    strref_columns: dict[str, list[str]],
+) -> dict[str, list[list[Any]]]:
+    """Parses the GFFs and StrRef 2DAs of each source and returns their stringref rows, keyed by source path.
+
+    Runs in worker processes, so it only takes and returns plain data.
+    """
+    gff_extensions: set[str] = GFFContent.get_extensions()
+    results: dict[str, list[list[Any]]] = {}
+    for source_path, resources in sources:
+        rows: list[list[Any]] = []
+        try:
+            file_resources = [FileResource(resname, ResourceType.from_id(type_id), size, offset, source_path) for resname, type_id, offset, size in resources]
+            for resource, data in FileResource.iter_data(file_resources):  # Decompresses the resources of .bzf files.
+                resname, restype, offset, size = resource.resname(), resource.restype(), resource.offset(), resource.size()
+                try:
+                    if restype is ResourceType.TwoDA:
+                        columns: list[str] = strref_columns[f"{resname.lower()}.2da"]
+                        rows.extend([strref, resname, restype.type_id, offset, size, column, row_index] for strref, column, row_index in _twoda_stringrefs(data, columns))
+                    elif restype.extension in gff_extensions:
+                        rows.extend([strref, resname, restype.type_id, offset, size, field_path, None] for strref, field_path in _gff_stringrefs(read_gff(data).root))
+                except Exception:  # noqa: BLE001, S112
+                    continue  # Corrupted or not actually a GFF/2DA, neither can reference the TalkTable.
+        except OSError:
+            RobustRootLogger().warning("Could not read '%s' while indexing stringrefs", source_path, exc_info=True)
+        results[source_path] = rows
+    return results
+
+
+class StrRefIndex:
+    """Reverse index from TalkTable stringrefs to the GFF fields and 2DA cells that reference them.
+
+    The index is built from 'sources': files that hold resources, i.e. a loose file, a capsule or a BIF.
+    Each source is only parsed again when its size, mtime or table of resources changes, and the whole
+    index can be persisted to a json file so a later session only re-parses the sources that changed.
+    """
+
+    VERSION: int = 1
+
+    def __init__(
+        self,
+        filepath: os.PathLike | str | None = None,
+        installation_path: os.PathLike | str = "",
+    ):
+        self._filepath: Path | None = None if filepath is None else Path(filepath)
+        self._installation_path: str = str(installation_path)
+
+        self._columns: dict[str, list[str]] = {}
+        self._sources: dict[str, dict[str, Any]] = {}
+        self._modified: bool = False
+
+        # stringref -> (source path, row) pairs, built from self._sources when first queried.
+        self._lookup: dict[int, list[tuple[str, list[Any]]]] | None = None
+        # A GFF usually references many stringrefs, so the FileResources handed out are shared between queries.
+        self._resources: dict[tuple[str, int, int], FileResource] = {}
+
+    @classmethod
+    def load(
+        cls,
+        filepath: os.PathLike | str,
+        installation_path: os.PathLike | str,
+    ) -> StrRefIndex:
+        """Loads the index file at `filepath`. A missing, unreadable or outdated file results in an empty index.
+
+        Args:
+        ----
+            filepath: Path to the index file.
+            installation_path: Path to the installation the index belongs to. An index of another installation is discarded.
+
+        Returns:
+        -------
+            The index, either populated from the file or empty.
+        """
+        index = cls(filepath, installation_path)
+        contents: dict[str, Any] | None = read_index_file(filepath, cls.VERSION, "stringref index", installation=index._installation_path)
+        if contents is None:
+            return index
+        index._columns = contents.get("columns", {})
+        index._sources = contents.get("sources", {})
+        return index
+
+    def filepath(self) -> Path | None:
+        return self._filepath
+
+    def save(
+        self,
+        *,
+        force: bool = False,
+    ):
+        """Writes the index to disk if it has a filepath and anything changed since it was loaded.
+
+        Failing to write the index is logged, not raised.
+
+        Args:
+        ----
+            force: Write the file even when nothing changed.
+        """
+        if self._filepath is None or (not self._modified and not force):
+            return
+        if write_index_file(
+            self._filepath,
+            self.VERSION,
+            "stringref index",
+            installation=self._installation_path,
+            columns=self._columns,
+            sources=self._sources,
+        ):
+            self._modified = False
+
+    def update(
+        self,
+        sources: Iterable[tuple[SearchLocation, list[FileResource]]],
+        strref_columns: dict[str, set[str]],
+        *,
+        max_workers: int | None = None,
+    ) -> int:
+        """Brings the index in line with `sources`, parsing only the sources that are new or changed.
+
+        Args:
+        ----
+            sources: (location, resources) pairs. Resources stored in the same file are indexed together as one source.
+            strref_columns: The StrRef columns of each 2DA, as returned by K1Columns2DA.StrRefs.as_dict().
+            max_workers: Maximum number of processes used to parse the changed sources. 1 parses them in this process.
+
+        Returns:
+        -------
+            The number of sources that were parsed.
+
+        Processing Logic:
+        ----------------
+            - Only GFFs and the 2DAs listed in `strref_columns` are considered.
+            - Sources that are no longer passed in are dropped from the index.
+            - Every source is dropped when `strref_columns` differs from the columns the index was built with.
+        """
+        columns: dict[str, list[str]] = {filename.lower(): sorted(column_names) for filename, column_names in strref_columns.items()}
+        if columns != self._columns:
+            self._columns = columns
+            self._sources = {}
+            self._modified = True
+            self._lookup = None
+
+        gff_extensions: set[str] = GFFContent.get_extensions()
+        current: dict[str, tuple[SearchLocation, list[tuple[str, int, int, int]]]] = {}
+        for location, resources in sources:
+            for resource in resources:
+                restype: ResourceType = resource.restype()
+                if restype is ResourceType.TwoDA:
+                    if f"{resource.resname().lower()}.2da" not in columns:
+                        continue
+                elif restype.extension not in gff_extensions:
+                    continue
+                source_path = str(resource.filepath())
+                if source_path not in current:
+                    current[source_path] = (location, [])
+                current[source_path][1].append((resource.resname(), restype.type_id, resource.offset(), resource.size()))
+
+        for source_path in self._sources.keys() - current.keys():
+            del self._sources[source_path]
+            self._modified = True
+            self._lookup = None
+
+        stale: dict[str, dict[str, Any]] = {}
+        for source_path, (location, resources) in current.items():
+            entry: dict[str, Any] = {
+                "location": int(location),
+                "stamp": file_stamp(source_path),
+                "checksum": resource_table_checksum(resources),
+            }
+            cached: dict[str, Any] | None = self._sources.get(source_path)
+            if (
+                cached is not None
+                and cached["location"] == entry["location"]
+                and cached["stamp"] == entry["stamp"]
+                and cached["checksum"] == entry["checksum"]
+            ):
+                continue
+            entry["rows"] = []
+            stale[source_path] = entry
+        if not stale:
+            return 0
+
+        for source_path, rows in self._scan(
+            [(source_path, current[source_path][1]) for source_path in stale],
+            max_workers,
+        ).items():
+            stale[source_path]["rows"] = rows
+        self._sources.update(stale)
+        self._modified = True
+        self._lookup = None
+        return len(stale)
+
+    def _scan(
+        self,
+        sources: list[tuple[str, list[tuple[str, int, int, int]]]],
+        max_workers: int | None,
+    ) -> dict[str, list[list[Any]]]:
+        chunks: list[list[tuple[str, list[tuple[str, int, int, int]]]]] = chunk_sources(sources)
+        results: dict[str, list[list[Any]]] = {}
+        for chunk_results in parallel_map(_scan_sources, chunks, [self._columns] * len(chunks), max_workers=max_workers, task="index stringrefs"):
+            results.update(chunk_results)
+        return results
+
+    def _stringref_lookup(self) -> dict[int, list[tuple[str, list[Any]]]]:
+        if self._lookup is None:
+            lookup: dict[int, list[tuple[str, list[Any]]]] = {}
+            for source_path, entry in self._sources.items():
+                for row in entry["rows"]:
+                    records: list[tuple[str, list[Any]]] | None = lookup.get(row[0])
+                    if records is None:
+                        lookup[row[0]] = [(source_path, row)]
+                    else:
+                        records.append((source_path, row))
+            self._lookup = lookup
+            self._resources = {}
+        return self._lookup
+
+    def references(
+        self,
+        stringref: int,
+    ) -> list[StrRefReference]:
+        """Returns every GFF field and 2DA cell that references `stringref`.
+
+        Args:
+        ----
+            stringref: The TalkTable entry to look up.
+
+        Returns:
+        -------
+            A list of references, empty if nothing indexed references the stringref.
+        """
+        from pykotor.extract.installation import SearchLocation  # Prevent circular imports
+
+        references: list[StrRefReference] = []
+        for source_path, (_, resname, type_id, offset, size, field_path, row_index) in self._stringref_lookup().get(stringref, ()):
+            resource: FileResource | None = self._resources.get((source_path, offset, type_id))
+            if resource is None:
+                resource = self._resources[(source_path, offset, type_id)] = FileResource(resname, ResourceType.from_id(type_id), size, offset, Path(source_path))
+            references.append(StrRefReference(resource, SearchLocation(self._sources[source_path]["location"]), field_path, row_index))
+        return references
+
+    def batch(
+        self,
+        stringrefs: Iterable[int],
+    ) -> dict[int, list[StrRefReference]]:
+        """Looks up many stringrefs at once.
+
+        Args:
+        ----
+            stringrefs: The TalkTable entries to look up.
+
+        Returns:
+        -------
+            A dictionary mapping each stringref to its references. Stringrefs nothing references map to an empty list.
+        """
+        return {stringref: self.references(stringref) for stringref in stringrefs}
+
+    def stringrefs(self) -> set[int]:
+        """Returns every stringref referenced by at least one indexed resource."""
+        return set(self._stringref_lookup())
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import array
+import os
+import struct
+import sys
+import threading
+
+from collections import OrderedDict
 from typing import TYPE_CHECKING, NamedTuple
 
-from pykotor.common.language import Language
+from pykotor.common.language import Gender, Language
 from pykotor.common.misc import ResRef
-from pykotor.common.stream import BinaryReader
+from pykotor.tools.encoding import decode_bytes_with_fallbacks
 from utility.system.path import Path
 
 if TYPE_CHECKING:
-    import os
+    from typing_extensions import Self
+
+_HEADER = struct.Struct("<4s4sIII")
+_ENTRY_SIZE = 40
+_ENTRY_WORDS = _ENTRY_SIZE // 4
+_SOUND_LENGTH = struct.Struct("<f")
 
 
 class StringResult(NamedTuple):
@@ -26,31 +38,139 @@ class TLKData(NamedTuple):
     sound_length: float
 
 
-class TalkTable:  # TODO: dialogf.tlk
+def _decode(
+    data: bytes,
+    encoding: str | None,
+) -> str:
+    """Decodes like BinaryReader.read_string: undecodable bytes are dropped and the string ends at the first null."""
+    string: str = decode_bytes_with_fallbacks(data, errors="ignore") if encoding is None else data.decode(encoding, errors="ignore")
+    null: int = string.find("\0")
+    return string if null == -1 else string[:null]
+
+
+class _TLKFile:
+    """A TLK file read into memory in one go: the header and entry table are parsed once, texts are decoded on demand.
+
+    No handle is kept open, so the file can still be rewritten (e.g. by a patcher or the TLK editor) while a
+    talktable is in use, which a file mapping would prevent on Windows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stamp: tuple[int, int],
+    ):
+        self.stamp: tuple[int, int] = stamp
+        with open(path, "rb") as file:  # noqa: PTH123
+            self._data: bytes = file.read()
+        if len(self._data) < _HEADER.size:
+            msg = f"'{path}' is too small to be a TLK file."
+            raise OSError(msg)
+        _file_type, _file_version, language_id, self.size, self._texts_offset = _HEADER.unpack_from(self._data)
+        self.language: Language = Language(language_id)
+        self.encoding: str | None = self.language.get_encoding()
+
+        # Ten dwords per entry. A truncated table only loses the entries it is missing.
+        table: memoryview = memoryview(self._data)[_HEADER.size : _HEADER.size + self.size * _ENTRY_SIZE]
+        self._entries: array.array[int] = array.array("I")
+        self._entries.frombytes(table[: len(table) - len(table) % _ENTRY_SIZE])
+        if sys.byteorder == "big":
+            self._entries.byteswap()
+        self.count: int = len(self._entries) // _ENTRY_WORDS
+
+    def close(self):
+        self._data = b""
+
+    def text(
+        self,
+        stringref: int,
+    ) -> str:
+        i: int = stringref * _ENTRY_WORDS
+        start: int = self._texts_offset + self._entries[i + 7]
+        return _decode(self._data[start : start + self._entries[i + 8]], self.encoding)
+
+    def texts(self) -> list[str]:
+        return [self.text(stringref) for stringref in range(self.count)]
+
+    def sound(
+        self,
+        stringref: int,
+    ) -> str:
+        return _decode(self._entries[stringref * _ENTRY_WORDS + 1 : stringref * _ENTRY_WORDS + 5].tobytes(), "windows-1252")
+
+    def entry(
+        self,
+        stringref: int,
+    ) -> TLKData:
+        i: int = stringref * _ENTRY_WORDS
+        return TLKData(
+            flags=self._entries[i],
+            sound_resref=self.sound(stringref),
+            volume_variance=self._entries[i + 5],
+            pitch_variance=self._entries[i + 6],
+            text_offset=self._entries[i + 7],
+            text_length=self._entries[i + 8],
+            sound_length=_SOUND_LENGTH.unpack(self._entries[i + 9 : i + 10].tobytes())[0],
+        )
+
+
+class TalkTable:
     """Talktables are for read-only loading of stringrefs stored in a dialog.tlk file.
 
-    Files are only opened when accessing a stored string, this means that strings are always up to date at
-    the time of access as opposed to TLK objects which may be out of date with its source file.
+    The file is read into memory and its header and entry table are parsed the first time the talktable is accessed,
+    so a lookup is an index into the entry table followed by a slice of the file's data, and decoded texts are kept
+    in a bounded LRU cache. Every access checks the file's size and modification time and rereads the file if either
+    changed, so strings are always up to date at the time of access as opposed to TLK objects which may be out of
+    date with its source file.
+
+    A talktable of a dialog.tlk also consults the dialogf.tlk next to it, if there is one: for the feminine
+    variant of a string, and for stringrefs that only the feminine table has.
     """
 
     def __init__(
         self,
         path: os.PathLike | str,
+        cache_size: int = 4096,
     ):
         self._path: Path = Path.pathify(path)
+        self._female_path: Path | None = self._path.with_name("dialogf.tlk") if self._path.name.lower() == "dialog.tlk" else None
+        self._cache_size: int = cache_size
+
+        self._lock: threading.Lock = threading.Lock()
+        self._files: dict[bool, _TLKFile] = {}  # Keyed by whether it is the feminine table.
+        self._texts: OrderedDict[tuple[bool, int], str] = OrderedDict()
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def path(self) -> Path:
         return self._path
 
+    def close(self):
+        """Releases the loaded files. The talktable stays usable, the files are read again when next accessed."""
+        with self._lock:
+            for tlk_file in self._files.values():
+                tlk_file.close()
+            self._files.clear()
+            self._texts.clear()
+
     def string(
         self,
         stringref: int,
+        gender: Gender = Gender.MALE,
     ) -> str:
         """Access a string from the tlk file.
 
         Args:
         ----
             stringref: The entry id.
+            gender: Gender.FEMALE prefers the string of dialogf.tlk when there is one.
 
         Returns:
         -------
@@ -58,27 +178,20 @@ class TalkTable:  # TODO: dialogf.tlk
         """
         if stringref == -1:
             return ""
-        with BinaryReader.from_file(self._path) as reader:
-            reader.seek(12)
-            entries_count: int = reader.read_uint32()
-            texts_offset: int = reader.read_uint32()
-
-            if stringref >= entries_count:
-                return ""
-
-            tlkdata: TLKData = self._extract_common_tlk_data(reader, stringref)
-            reader.seek(texts_offset + tlkdata.text_offset)
-            return reader.read_string(tlkdata.text_length)
+        with self._lock:
+            return self._string(stringref, gender is Gender.FEMALE)
 
     def sound(
         self,
         stringref: int,
+        gender: Gender = Gender.MALE,
     ) -> ResRef:
         """Access the sound ResRef from the tlk file.
 
         Args:
         ----
             stringref: The entry id.
+            gender: Gender.FEMALE prefers the sound of dialogf.tlk when there is one.
 
         Returns:
         -------
@@ -86,74 +199,75 @@ class TalkTable:  # TODO: dialogf.tlk
         """
         if stringref == -1:
             return ResRef.from_blank()
-        with BinaryReader.from_file(self._path) as reader:
-            reader.seek(12)
-            entries_count = reader.read_uint32()
-            reader.skip(4)
-
-            if stringref >= entries_count:
-                return ResRef.from_blank()
-
-            tlkdata = self._extract_common_tlk_data(reader, stringref)
-            return ResRef(tlkdata.sound_resref)
+        with self._lock:
+            tlk_file: _TLKFile | None = self._entry_file(stringref, gender is Gender.FEMALE)
+            return ResRef.from_blank() if tlk_file is None else ResRef(tlk_file.sound(stringref))
 
-    def _extract_common_tlk_data(
+    def entry(
         self,
-        reader: BinaryReader,
         stringref: int,
-    ) -> TLKData:
-        reader.seek(20 + 40 * stringref)
+        gender: Gender = Gender.MALE,
+    ) -> TLKData | None:
+        """Returns the raw entry of a stringref, or None if the talktable has no such entry.
 
-        return TLKData(
-            flags=reader.read_uint32(),
-            sound_resref=reader.read_string(16),
-            volume_variance=reader.read_uint32(),
-            pitch_variance=reader.read_uint32(),
-            text_offset=reader.read_uint32(),
-            text_length=reader.read_uint32(),
-            sound_length=reader.read_single(),
-        )
+        Args:
+        ----
+            stringref: The entry id.
+            gender: Gender.FEMALE prefers the entry of dialogf.tlk when there is one.
+
+        Returns:
+        -------
+            The entry's flags, sound, variances, text offset/length and sound length.
+        """
+        if stringref == -1:
+            return None
+        with self._lock:
+            tlk_file: _TLKFile | None = self._entry_file(stringref, gender is Gender.FEMALE)
+            return None if tlk_file is None else tlk_file.entry(stringref)
 
     def batch(
         self,
         stringrefs: list[int],
+        gender: Gender = Gender.MALE,
     ) -> dict[int, StringResult]:
         """Loads a list of strings and sound ResRefs from the specified list.
 
-        This is all performed using a single file handle and should be used if loading multiple strings from the tlk file.
+        The file is only checked for changes once for the whole batch.
 
         Args:
         ----
             stringrefs: A list of stringref ints.
+            gender: Gender.FEMALE prefers the strings of dialogf.tlk when there is one.
 
         Returns:
         -------
             Dictionary with stringref keys and Tuples (string, sound) values.
         """
-        with BinaryReader.from_file(self._path) as reader:
-            reader.seek(8)
-            language_id = reader.read_uint32()
-            language: Language = Language(language_id)
-            encoding: str | None = language.get_encoding()
-            entries_count = reader.read_uint32()
-            texts_offset = reader.read_uint32()
-
-            batch: dict[int, StringResult] = {}
-
+        female: bool = gender is Gender.FEMALE
+        batch: dict[int, StringResult] = {}
+        with self._lock:
+            self._refresh()
             for stringref in stringrefs:
-                if stringref == -1 or stringref >= entries_count:
+                tlk_file: _TLKFile | None = None if stringref == -1 else self._entry_file(stringref, female, refresh=False)
+                if tlk_file is None:
                     batch[stringref] = StringResult("", ResRef.from_blank())
-                    continue
-
-                tlkdata: TLKData = self._extract_common_tlk_data(reader, stringref)
+                else:
+                    batch[stringref] = StringResult(self._string(stringref, female, refresh=False), ResRef(tlk_file.sound(stringref)))
+        return batch
 
-                reader.seek(texts_offset + tlkdata.text_offset)
-                string = reader.read_string(tlkdata.text_length, encoding=encoding)
-                sound = ResRef(tlkdata.sound_resref)
+    def strings(
+        self,
+    ) -> list[str]:
+        """Returns the strings of every entry of the tlk file, in stringref order.
 
-                batch[stringref] = StringResult(string, sound)
+        The strings are decoded straight from the file without going through the string cache.
 
-            return batch
+        Returns:
+        -------
+            A list of strings.
+        """
+        with self._lock:
+            return self._tlk_file(female=False).texts()
 
     def size(
         self,
@@ -164,9 +278,8 @@ class TalkTable:  # TODO: dialogf.tlk
         -------
             The number of entries in the talk table.
         """
-        with BinaryReader.from_file(self._path) as reader:
-            reader.seek(12)
-            return reader.read_uint32()  # entries_count
+        with self._lock:
+            return self._tlk_file(female=False).size
 
     def language(
         self,
@@ -177,7 +290,77 @@ class TalkTable:  # TODO: dialogf.tlk
         -------
             The language of the TLK file.
         """
-        with BinaryReader.from_file(self._path) as reader:
-            reader.seek(8)
-            language_id = reader.read_uint32()
-            return Language(language_id)
+        with self._lock:
+            return self._tlk_file(female=False).language
+
+    def _string(
+        self,
+        stringref: int,
+        female: bool,  # noqa: FBT001
+        *,
+        refresh: bool = True,
+    ) -> str:
+        tlk_file: _TLKFile | None = self._entry_file(stringref, female, refresh=refresh)
+        if tlk_file is None:
+            return ""
+        key: tuple[bool, int] = (tlk_file is self._files.get(True), stringref)
+        text: str | None = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = tlk_file.text(stringref)
+            if len(self._texts) > self._cache_size:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return text
+
+    def _entry_file(
+        self,
+        stringref: int,
+        female: bool,  # noqa: FBT001
+        *,
+        refresh: bool = True,
+    ) -> _TLKFile | None:
+        """Returns the file whose entry answers the stringref, preferring the feminine table if `female` is set."""
+        if refresh:
+            self._refresh()
+        masculine: _TLKFile | None = self._files.get(False)
+        feminine: _TLKFile | None = self._files.get(True)
+        for tlk_file in (feminine, masculine) if female else (masculine, feminine):
+            if tlk_file is not None and 0 <= stringref < tlk_file.count:
+                return tlk_file
+        return None
+
+    def _refresh(self):
+        self._tlk_file(female=False)
+        if self._female_path is not None:
+            try:
+                self._tlk_file(female=True)
+            except OSError:
+                self._forget(female=True)
+
+    def _tlk_file(
+        self,
+        *,
+        female: bool,
+    ) -> _TLKFile:
+        """Returns the loaded TLK file, reading it again first if its size or modification time changed."""
+        path: Path | None = self._female_path if female else self._path
+        assert path is not None
+        stat_result: os.stat_result = os.stat(path)  # noqa: PTH116
+        stamp: tuple[int, int] = (stat_result.st_size, stat_result.st_mtime_ns)
+        tlk_file: _TLKFile | None = self._files.get(female)
+        if tlk_file is None or tlk_file.stamp != stamp:
+            self._forget(female=female)
+            tlk_file = self._files[female] = _TLKFile(str(path), stamp)
+        return tlk_file
+
+    def _forget(
+        self,
+        *,
+        female: bool,
+    ):
+        tlk_file: _TLKFile | None = self._files.pop(female, None)
+        if tlk_file is not None:
+            tlk_file.close()
+            for key in [key for key in self._texts if key[0] is female]:
+                del self._texts[key]
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+import array
+import base64
+import bisect
+import re
+import sys
+import zlib
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from pykotor.common.indexing import file_stamp, read_index_file, write_index_file
+from pykotor.extract.talktable import TalkTable
+from utility.system.path import Path
+
+if TYPE_CHECKING:
+    import os
+
+    from pykotor.resource.formats.tlk.tlk_data import TLK
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(folded: str) -> set[str]:
+    return set(_TOKEN.findall(folded))
+
+
+def _trigrams(folded: str) -> set[str]:
+    return {folded[i : i + 3] for i in range(len(folded) - 2)}
+
+
+def _encode_postings(postings: array.array[int]) -> str:
+    """Packs a sorted posting array as the base64 of its zlib compressed little endian bytes."""
+    if sys.byteorder == "big":
+        postings = array.array("I", postings)
+        postings.byteswap()
+    return base64.b64encode(zlib.compress(postings.tobytes())).decode("ascii")
+
+
+def _decode_postings(encoded: str) -> array.array[int]:
+    postings: array.array[int] = array.array("I")
+    postings.frombytes(zlib.decompress(base64.b64decode(encoded)))
+    if sys.byteorder == "big":
+        postings.byteswap()
+    return postings
+
+
+class _Postings:
+    """Maps a key (token or trigram) to the sorted array of stringrefs whose text contains it.
+
+    Postings loaded from an index file stay encoded until a query or an update first needs them.
+    """
+
+    def __init__(
+        self,
+        encoded: dict[str, str] | None = None,
+        decoded: dict[str, array.array[int]] | None = None,
+    ):
+        self._encoded: dict[str, str] = {} if encoded is None else encoded
+        self._decoded: dict[str, array.array[int]] = {} if decoded is None else decoded
+
+    def keys(self) -> set[str]:
+        return self._decoded.keys() | self._encoded.keys()
+
+    def get(
+        self,
+        key: str,
+    ) -> array.array[int]:
+        """Returns the stringrefs of a key, an empty array if there are none. The array must not be modified."""
+        postings: array.array[int] | None = self._decoded.get(key)
+        if postings is None:
+            encoded: str | None = self._encoded.pop(key, None)
+            if encoded is None:
+                return array.array("I")
+            postings = self._decoded[key] = _decode_postings(encoded)
+        return postings
+
+    def add(
+        self,
+        key: str,
+        stringref: int,
+    ) -> bool:
+        """Adds a stringref to a key. Returns True if the key is new."""
+        postings: array.array[int] = self.get(key)
+        if not postings:
+            self._decoded[key] = array.array("I", (stringref,))
+            return True
+        i: int = bisect.bisect_left(postings, stringref)
+        if i == len(postings) or postings[i] != stringref:
+            postings.insert(i, stringref)
+        return False
+
+    def discard(
+        self,
+        key: str,
+        stringref: int,
+    ) -> bool:
+        """Removes a stringref from a key. Returns True if the key no longer has any stringrefs."""
+        postings: array.array[int] = self.get(key)
+        i: int = bisect.bisect_left(postings, stringref)
+        if i < len(postings) and postings[i] == stringref:
+            del postings[i]
+        if postings:
+            return False
+        self._decoded.pop(key, None)
+        return True
+
+    def encoded(self) -> dict[str, str]:
+        return {**self._encoded, **{key: _encode_postings(postings) for key, postings in self._decoded.items()}}
+
+
+def _intersect(
+    postings: Iterable[set[int] | array.array[int]],
+) -> set[int]:
+    """Intersects posting arrays or sets, starting from the shortest."""
+    result: set[int] | None = None
+    for stringrefs in sorted(postings, key=len):
+        result = set(stringrefs) if result is None else result.intersection(stringrefs)
+        if not result:
+            return set()
+    return set() if result is None else result
+
+
+class TLKSearchIndex:
+    """Case-insensitive search index over the texts of a TLK.
+
+    An inverted index maps every word token to the stringrefs whose text contains it, and is updated per entry
+    when a text changes. Substring searches go through a trigram index (every 3 character slice) over the token
+    vocabulary rather than over whole texts: it finds the tokens that contain each word of the substring, the
+    stringrefs of those tokens are the candidates, and only the candidates' texts are checked for the substring.
+    That is a small fraction of the size and build time of a trigram index over every text.
+
+    The index can be persisted to a json file next to the TLK, keyed by the TLK file's size and mtime, so a later
+    session does not have to index the TLK again.
+    """
+
+    VERSION: int = 1
+
+    def __init__(
+        self,
+        filepath: os.PathLike | str | None = None,
+    ):
+        self._filepath: Path | None = None if filepath is None else Path(filepath)
+        self._texts: list[str] = []  # Casefolded text of every entry.
+        self._tokens: _Postings = _Postings()
+        # Derived from the token keys when first needed: sorted tokens for prefix searches and trigram -> tokens.
+        self._vocabulary: list[str] | None = None
+        self._trigrams: dict[str, set[str]] | None = None
+        self._tlk_stamp: list[int] | None = None
+        self._modified: bool = False
+
+    @classmethod
+    def build(
+        cls,
+        source: TLK | TalkTable,
+        filepath: os.PathLike | str | None = None,
+    ) -> TLKSearchIndex:
+        """Indexes every entry of a TLK or a TalkTable.
+
+        Args:
+        ----
+            source: The TLK or TalkTable to index.
+            filepath: Path the index is saved to, or None to keep it in memory only.
+
+        Returns:
+        -------
+            The index.
+        """
+        index = cls(filepath)
+        if isinstance(source, TalkTable):
+            index._tlk_stamp = file_stamp(source.path())
+            texts: Iterable[str] = source.strings()
+        else:
+            texts = (entry.text for entry in source.entries)
+        index._texts = [text.casefold() for text in texts]
+
+        # Stringrefs are visited in ascending order, so appending keeps every posting array sorted.
+        tokens: dict[str, array.array[int]] = {}
+        for stringref, folded in enumerate(index._texts):
+            for token in _tokens(folded):
+                postings: array.array[int] | None = tokens.get(token)
+                if postings is None:
+                    tokens[token] = array.array("I", (stringref,))
+                else:
+                    postings.append(stringref)
+        index._tokens = _Postings(decoded=tokens)
+        index._modified = True
+        return index
+
+    @classmethod
+    def for_talktable(
+        cls,
+        talktable: TalkTable,
+        filepath: os.PathLike | str | None = None,
+    ) -> TLKSearchIndex:
+        """Returns the saved index of a TalkTable's file, or builds and saves a new one if it is missing or outdated.
+
+        Args:
+        ----
+            talktable: The TalkTable to index.
+            filepath: Path of the index file. Defaults to '<tlk filename>.search.json' next to the TLK.
+
+        Returns:
+        -------
+            The index.
+        """
+        tlk_path: Path = talktable.path()
+        index_path: Path = tlk_path.with_name(f"{tlk_path.name}.search.json") if filepath is None else Path(filepath)
+        index: TLKSearchIndex = cls.load(index_path, tlk_path)
+        if index._tlk_stamp is None:
+            index = cls.build(talktable, index_path)
+            index.save()
+        return index
+
+    @classmethod
+    def load(
+        cls,
+        filepath: os.PathLike | str,
+        tlk_path: os.PathLike | str,
+    ) -> TLKSearchIndex:
+        """Loads the index file at `filepath`. A missing, unreadable or outdated file results in an empty index.
+
+        Args:
+        ----
+            filepath: Path to the index file.
+            tlk_path: Path to the TLK the index belongs to. The index is discarded if the TLK's size or mtime changed.
+
+        Returns:
+        -------
+            The index, either populated from the file or empty. An empty index has no TLK stamp.
+        """
+        index = cls(filepath)
+        stamp: list[int] | None = file_stamp(tlk_path)
+        if stamp is None:
+            return index
+        contents: dict[str, Any] | None = read_index_file(filepath, cls.VERSION, "TLK search index", stamp=stamp)
+        if contents is None:
+            return index
+        index._tlk_stamp = stamp
+        index._texts = contents["texts"]
+        index._tokens = _Postings(contents["tokens"])
+        return index
+
+    def filepath(self) -> Path | None:
+        return self._filepath
+
+    def save(
+        self,
+        *,
+        force: bool = False,
+    ):
+        """Writes the index to disk if it has a filepath and anything changed since it was loaded.
+
+        Failing to write the index is logged, not raised. An index with in-memory edits is saved without a TLK stamp,
+        it no longer matches the file and is rebuilt when next loaded, unless the TLK is saved in the meantime and
+        `stamp()` is called afterwards.
+
+        Args:
+        ----
+            force: Write the file even when nothing changed.
+        """
+        if self._filepath is None or (not self._modified and not force):
+            return
+        if write_index_file(
+            self._filepath,
+            self.VERSION,
+            "TLK search index",
+            stamp=self._tlk_stamp,
+            texts=self._texts,
+            tokens=self._tokens.encoded(),
+        ):
+            self._modified = False
+
+    def stamp(
+        self,
+        tlk_path: os.PathLike | str,
+    ):
+        """Records that the index matches the TLK file as it is on disk now, e.g. after the edited TLK was saved."""
+        self._tlk_stamp = file_stamp(tlk_path)
+        self._modified = True
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def update(
+        self,
+        stringref: int,
+        text: str,
+    ):
+        """Reindexes the text of an entry. A stringref past the end appends entries, any skipped ones are empty.
+
+        Args:
+        ----
+            stringref: The entry that changed.
+            text: Its new text.
+        """
+        folded: str = text.casefold()
+        if stringref < len(self._texts):
+            if self._texts[stringref] == folded:
+                return
+            self._remove(stringref)
+        else:
+            self._texts.extend([""] * (stringref + 1 - len(self._texts)))
+        self._add(stringref, folded)
+        self._tlk_stamp = None
+        self._modified = True
+
+    def resize(
+        self,
+        size: int,
+    ):
+        """Drops the entries from `size` onwards, or adds empty entries up to `size`."""
+        for stringref in range(len(self._texts) - 1, size - 1, -1):
+            self._remove(stringref)
+        del self._texts[size:]
+        self._texts.extend([""] * (size - len(self._texts)))
+        self._tlk_stamp = None
+        self._modified = True
+
+    def sync(
+        self,
+        tlk: TLK,
+    ) -> int:
+        """Reindexes every entry of the TLK whose text differs from the indexed text.
+
+        Args:
+        ----
+            tlk: The edited TLK.
+
+        Returns:
+        -------
+            The number of entries that were reindexed.
+        """
+        if len(tlk) < len(self._texts):
+            self.resize(len(tlk))
+        changed = 0
+        for stringref, entry in tlk:
+            if stringref >= len(self._texts) or self._texts[stringref] != entry.text.casefold():
+                self.update(stringref, entry.text)
+                changed += 1
+        return changed
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Returns the stringrefs whose text contains every word of the query, best matches first.
+
+        The last word of the query also matches words it is the start of, so results can be shown while typing.
+
+        Args:
+        ----
+            query: The words to search for. Case is ignored.
+            limit: Maximum number of stringrefs to return.
+
+        Returns:
+        -------
+            Stringrefs ranked by: texts containing the query as written first, then shorter texts, then stringref.
+        """
+        folded: str = query.casefold()
+        words: list[str] = _TOKEN.findall(folded)
+        if not words:
+            return []
+        prefixed: set[int] = set()
+        for token in self._prefixed(words[-1]):
+            prefixed.update(self._tokens.get(token))
+        candidates: set[int] = _intersect([self._tokens.get(word) for word in words[:-1]]) if len(words) > 1 else prefixed
+        if len(words) > 1:
+            candidates &= prefixed
+
+        texts: list[str] = self._texts
+        phrase: str = folded.strip()
+        ranked: list[int] = sorted(candidates, key=lambda stringref: (phrase not in texts[stringref], len(texts[stringref]), stringref))
+        return ranked if limit is None else ranked[:limit]
+
+    def find(
+        self,
+        substring: str,
+    ) -> list[int]:
+        """Returns the stringrefs whose text contains the substring, ignoring case, in ascending order.
+
+        Args:
+        ----
+            substring: The text to search for.
+
+        Returns:
+        -------
+            The matching stringrefs.
+        """
+        folded: str = substring.casefold()
+        texts: list[str] = self._texts
+        words: list[re.Match[str]] = list(_TOKEN.finditer(folded))
+        if not words:
+            return [stringref for stringref, text in enumerate(texts) if folded in text]
+
+        # A word of the substring lies within a token of every matching text. A word with other characters on both
+        # sides of it must be a whole token, the first and last words can be the end or start of a longer one.
+        candidates: list[set[int] | array.array[int]] = []
+        for word in words:
+            if 0 < word.start() and word.end() < len(folded):
+                candidates.append(self._tokens.get(word.group()))
+                continue
+            containing: set[int] = set()
+            for token in self._containing(word.group()):
+                containing.update(self._tokens.get(token))
+            candidates.append(containing)
+        return sorted(stringref for stringref in _intersect(candidates) if folded in texts[stringref])
+
+    def _prefixed(
+        self,
+        prefix: str,
+    ) -> list[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._tokens.keys())
+        start: int = bisect.bisect_left(self._vocabulary, prefix)
+        end: int = bisect.bisect_left(self._vocabulary, f"{prefix}\U0010ffff")
+        return self._vocabulary[start:end]
+
+    def _containing(
+        self,
+        word: str,
+    ) -> list[str]:
+        """Returns the tokens that contain the word."""
+        if len(word) < 3:  # noqa: PLR2004
+            return [token for token in self._tokens.keys() if word in token]
+        if self._trigrams is None:
+            self._trigrams = {}
+            for token in self._tokens.keys():
+                self._add_token_trigrams(token)
+        tokens: set[str] | None = None
+        for trigram in sorted(_trigrams(word), key=lambda trigram: len(self._trigrams.get(trigram, ()))):  # type: ignore[union-attr]
+            tokens = set(self._trigrams.get(trigram, ())) if tokens is None else tokens & self._trigrams.get(trigram, set())
+            if not tokens:
+                return []
+        return [token for token in tokens or () if word in token]
+
+    def _add_token_trigrams(
+        self,
+        token: str,
+    ):
+        assert self._trigrams is not None
+        for trigram in _trigrams(token):
+            self._trigrams.setdefault(trigram, set()).add(token)
+
+    def _token_added(
+        self,
+        token: str,
+    ):
+        self._vocabulary = None
+        if self._trigrams is not None:
+            self._add_token_trigrams(token)
+
+    def _token_removed(
+        self,
+        token: str,
+    ):
+        self._vocabulary = None
+        if self._trigrams is not None:
+            for trigram in _trigrams(token):
+                tokens: set[str] | None = self._trigrams.get(trigram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[trigram]
+
+    def _add(
+        self,
+        stringref: int,
+        folded: str,
+    ):
+        if stringref == len(self._texts):
+            self._texts.append(folded)
+        else:
+            self._texts[stringref] = folded
+        for token in _tokens(folded):
+            if self._tokens.add(token, stringref):
+                self._token_added(token)
+
+    def _remove(
+        self,
+        stringref: int,
+    ):
+        for token in _tokens(self._texts[stringref]):
+            if self._tokens.discard(token, stringref):
+                self._token_removed(token)
+        self._texts[stringref] = ""
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from pykotor.common.stream import BinaryReader
 from pykotor.resource.formats.erf.erf_data import ERF, ERFType
 from pykotor.resource.type import ResourceReader, ResourceType, ResourceWriter, autoclose
 from utility.logger_util import RobustRootLogger
@@ -72,27 +73,15 @@ class ERFBinaryReader(ResourceReader):
             RobustRootLogger().debug("Assuming this is a SAV file")
             self._erf.is_save_erf = True
 
-        resrefs: list[str] = []
-        resids: list[int] = []
-        restypes: list[int] = []
         self._reader.seek(offset_to_keys)
-        for _ in range(entry_count):
-            resrefs.append(self._reader.read_string(16))
-            resids.append(self._reader.read_uint32())
-            restypes.append(self._reader.read_uint16())
-            self._reader.skip(2)
-
-        resoffsets: list[int] = []
-        ressizes: list[int] = []
+        keys: list[tuple[bytes, int, int, int]] = self._reader.read_records("16sIHH", entry_count)  # resref, resid, restype, unused
         self._reader.seek(offset_to_resources)
-        for _ in range(entry_count):
-            resoffsets.append(self._reader.read_uint32())
-            ressizes.append(self._reader.read_uint32())
-
-        for i in range(entry_count):
-            self._reader.seek(resoffsets[i])
-            resdata = self._reader.read_bytes(ressizes[i])
-            self._erf.set_data(resrefs[i], ResourceType.from_id(restypes[i]), resdata)
+        entries: list[tuple[int, int]] = self._reader.read_records("II", entry_count)  # offset, size
+
+        for (resref, _resid, restype, _), (resoffset, ressize) in zip(keys, entries):
+            self._reader.seek(resoffset)
+            resdata = self._reader.read_bytes(ressize)
+            self._erf.set_data(BinaryReader.decode_fixed_string(resref), ResourceType.from_id(restype), resdata)
 
         return self._erf
 
@@ -19,7 +19,7 @@ from utility.system.path import PureWindowsPath
 if TYPE_CHECKING:
     import os
 
-    from collections.abc import Callable, Generator, Iterator
+    from collections.abc import Callable, Generator, Iterable, Iterator
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -908,6 +908,20 @@ class GFFStruct:
         """
         self._fields[label] = _GFFField(GFFFieldType.Vector4, value)
 
+    def set_fields(
+        self,
+        fields: Iterable[tuple[str, GFFFieldType, Any]],
+    ):
+        """Sets the value and field type of many fields at once, same as calling the set_* method of each field's type.
+
+        Args:
+        ----
+            fields: The (label, field type, value) of each field, as iterating a GFFStruct yields them.
+        """
+        struct_fields: dict[str, _GFFField] = self._fields
+        for label, field_type, value in fields:
+            struct_fields[label] = _GFFField(field_type, value)
+
     def set_struct(
         self,
         label: str,
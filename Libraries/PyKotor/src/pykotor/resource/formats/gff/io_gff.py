@@ -1,29 +1,70 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import array
+import struct
+import sys
 
+from typing import TYPE_CHECKING, Any, Sequence
+
+from pykotor.common.geometry import Vector3, Vector4
+from pykotor.common.language import LocalizedString
 from pykotor.common.misc import ResRef
-from pykotor.common.stream import BinaryWriter
+from pykotor.common.stream import BinaryReader
 from pykotor.resource.formats.gff.gff_data import GFF, GFFContent, GFFFieldType, GFFList, GFFStruct
 from pykotor.resource.type import ResourceReader, ResourceWriter, autoclose
 
 if TYPE_CHECKING:
+    from pykotor.common.language import Language
+
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
 
-_COMPLEX_FIELD: set[GFFFieldType] = {
-    GFFFieldType.UInt64,
-    GFFFieldType.Int64,
-    GFFFieldType.Double,
-    GFFFieldType.String,
-    GFFFieldType.ResRef,
-    GFFFieldType.LocalizedString,
-    GFFFieldType.Binary,
-    GFFFieldType.Vector3,
-    GFFFieldType.Vector4,
-}
+_FIELD_TYPES: dict[int, GFFFieldType] = {field_type.value: field_type for field_type in GFFFieldType}
+_FIELD_TYPE_IDS: dict[GFFFieldType, int] = {field_type: field_type.value for field_type in GFFFieldType}
+# UInt8, Int8, UInt16, Int16, UInt32 and Int32 fields store their value in the low bytes of the field's data dword.
+_LAST_SIMPLE_INTEGER: int = GFFFieldType.Int32.value
+_SIMPLE_MASKS: tuple[int, ...] = (0xFF, 0xFF, 0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF)
+_SINGLE_ID: int = GFFFieldType.Single.value
+_STRUCT_ID: int = GFFFieldType.Struct.value
+_LIST_ID: int = GFFFieldType.List.value
+_LANGUAGE_ENCODINGS: dict[Language, str | None] = {}
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+_INT64 = struct.Struct("<q")
+_SINGLE = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+_VECTOR3 = struct.Struct("<3f")
+_VECTOR4 = struct.Struct("<4f")
+_LOCSTRING_HEADER = struct.Struct("<II")
+_HEADER = struct.Struct("<12I")
+
+
+def _language_encoding(
+    language: Language,
+) -> str | None:
+    encoding: str | None = _LANGUAGE_ENCODINGS.get(language, "")
+    if encoding == "":
+        encoding = _LANGUAGE_ENCODINGS[language] = language.get_encoding()
+    return encoding
+
+
+def _field_data_slice(
+    field_data: bytes,
+    offset: int,
+    length: int,
+) -> bytes:
+    if offset + length > len(field_data):
+        msg = "A field's data exceeds the file boundaries."
+        raise ValueError(msg)
+    return field_data[offset : offset + length]
 
 
 class GFFBinaryReader(ResourceReader):
+    """Reads a binary GFF.
+
+    The struct, field and label tables and the field data, field indices and list indices blocks are each read
+    in one call, then the tree is built from them iteratively so deeply nested files cannot exhaust the stack.
+    """
+
     def __init__(
         self,
         source: SOURCE_TYPES,
@@ -60,121 +101,166 @@ class GFFBinaryReader(ResourceReader):
 
         self._gff.content = GFFContent(file_type)
 
-        self._struct_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # struct count
-        self._field_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field count
-        label_offset = self._reader.read_uint32()
-        label_count = self._reader.read_uint32()
-        self._field_data_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field data count
-        self._field_indices_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field indices count
-        self._list_indices_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # list indices count
-
-        self._labels = []
-        self._reader.seek(label_offset)
-        self._labels.extend(self._reader.read_string(16) for _ in range(label_count))
-        self._load_struct(self._gff.root, 0)
+        (
+            self._struct_offset,
+            struct_count,
+            self._field_offset,
+            field_count,
+            label_offset,
+            label_count,
+            self._field_data_offset,
+            _field_data_count,
+            self._field_indices_offset,
+            _field_indices_count,
+            self._list_indices_offset,
+            _list_indices_count,
+        ) = self._reader.read_struct("12I")
 
+        self._reader.seek(label_offset)
+        self._labels = [BinaryReader.decode_fixed_string(label) for (label,) in self._reader.read_records("16s", label_count)]
+        self._reader.seek(self._struct_offset)
+        structs: list[tuple[int, int, int]] = self._reader.read_records("iII", struct_count)
+        self._reader.seek(self._field_offset)
+        fields: list[tuple[int, int, int]] = self._reader.read_records("III", field_count)
+
+        # The data, field indices and list indices blocks are addressed by offset, so they are read through to the end
+        # of the file rather than trusting the byte counts of the header.
+        self._reader.seek(self._field_data_offset)
+        field_data: bytes = self._reader.read_all()
+        self._reader.seek(self._field_indices_offset)
+        field_indices: array.array = self._reader.read_array("I", self._reader.remaining() // 4)
+        self._reader.seek(self._list_indices_offset)
+        list_indices: array.array = self._reader.read_array("I", self._reader.remaining() // 4)
+
+        self._build_tree(structs, fields, field_data, field_indices, list_indices)
         return self._gff
 
-    def _load_struct(
+    def _build_tree(  # noqa: PLR0913, C901, PLR0912, PLR0915
         self,
-        gff_struct: GFFStruct,
-        struct_index: int,
+        structs: list[tuple[int, int, int]],
+        fields: list[tuple[int, int, int]],
+        field_data: bytes,
+        field_indices: array.array,
+        list_indices: array.array,
     ):
-        self._reader.seek(self._struct_offset + struct_index * 12)
-        struct_id, data, field_count = (
-            self._reader.read_int32(),
-            self._reader.read_uint32(),
-            self._reader.read_uint32(),
-        )
-
-        gff_struct.struct_id = struct_id
-
-        if field_count == 1:
-            self._load_field(gff_struct, data)
-        elif field_count > 1:
-            self._reader.seek(self._field_indices_offset + data)
-            indices: list[int] = [self._reader.read_uint32() for _ in range(field_count)]
-            for index in indices:
-                self._load_field(gff_struct, index)
-
-    def _load_field(
+        """Builds the GFF from its tables, one struct at a time from a stack of (GFFStruct, struct index) still to fill.
+
+        A struct referenced by several fields or lists is read into a separate GFFStruct for each. Only a struct that
+        references one of its own ancestors is corrupt: that is a cycle, the tree would never end.
+        """
+        assert self._gff is not None
+        labels: list[str] = self._labels
+        # Whether each struct is an ancestor of the struct being filled. An entry with no GFFStruct marks the point
+        # where the subtree of that struct index is done, all of its descendants having been popped before it.
+        ancestors: bytearray = bytearray(len(structs))
+        stack: list[tuple[GFFStruct | None, int]] = [(self._gff.root, 0)]
+        while stack:
+            gff_struct, struct_index = stack.pop()
+            if gff_struct is None:
+                ancestors[struct_index] = 0
+                continue
+            if ancestors[struct_index]:
+                msg = f"Struct {struct_index} contains itself, the GFF is corrupted."
+                raise ValueError(msg)
+            struct_id, data, field_count = structs[struct_index]
+            gff_struct.struct_id = struct_id
+
+            if field_count == 1:
+                struct_field_indices: Sequence[int] = (data,)
+            elif field_count > 1:
+                struct_field_indices = field_indices[data // 4 : data // 4 + field_count]
+                if len(struct_field_indices) != field_count:
+                    msg = f"The field indices of struct {struct_index} exceed the file boundaries."
+                    raise ValueError(msg)
+            else:
+                continue
+
+            ancestors[struct_index] = 1
+            stack.append((None, struct_index))
+            struct_fields: list[tuple[str, GFFFieldType, Any]] = []
+            for field_index in struct_field_indices:
+                field_type_id, label_id, value = fields[field_index]
+                if field_type_id <= _LAST_SIMPLE_INTEGER:  # The value of UInt8 to Int32 fields is stored in the field itself.
+                    mask: int = _SIMPLE_MASKS[field_type_id]
+                    value &= mask
+                    if field_type_id & 1 and value > mask >> 1:  # The signed types have odd ids.
+                        value -= mask + 1
+                elif field_type_id == GFFFieldType.Struct:
+                    child = GFFStruct()
+                    stack.append((child, value))
+                    value = child
+                elif field_type_id == GFFFieldType.List:
+                    gff_list = GFFList()
+                    count: int = list_indices[value // 4]
+                    child_indices: Sequence[int] = list_indices[value // 4 + 1 : value // 4 + 1 + count]
+                    if len(child_indices) != count:
+                        msg = f"The list '{labels[label_id]}' of struct {struct_index} exceeds the file boundaries."
+                        raise ValueError(msg)
+                    stack.extend((gff_list.add(0), child_index) for child_index in child_indices)
+                    value = gff_list
+                elif field_type_id == GFFFieldType.Single:
+                    value = _SINGLE.unpack(_UINT32.pack(value))[0]
+                elif field_type_id == GFFFieldType.String:
+                    length: int = _UINT32.unpack_from(field_data, value)[0]
+                    value = BinaryReader.decode_fixed_string(_field_data_slice(field_data, value + 4, length))
+                elif field_type_id == GFFFieldType.ResRef:
+                    length = field_data[value]
+                    value = ResRef(BinaryReader.decode_fixed_string(_field_data_slice(field_data, value + 1, length)).strip())
+                elif field_type_id == GFFFieldType.LocalizedString:
+                    value = self._read_locstring(field_data, value)
+                elif field_type_id == GFFFieldType.Binary:
+                    length = _UINT32.unpack_from(field_data, value)[0]
+                    value = _field_data_slice(field_data, value + 4, length)
+                elif field_type_id == GFFFieldType.Vector3:
+                    value = Vector3(*_VECTOR3.unpack_from(field_data, value))
+                elif field_type_id == GFFFieldType.Vector4:
+                    value = Vector4(*_VECTOR4.unpack_from(field_data, value))
+                elif field_type_id == GFFFieldType.UInt64:
+                    value = _UINT64.unpack_from(field_data, value)[0]
+                elif field_type_id == GFFFieldType.Int64:
+                    value = _INT64.unpack_from(field_data, value)[0]
+                elif field_type_id == GFFFieldType.Double:
+                    value = _DOUBLE.unpack_from(field_data, value)[0]
+                else:
+                    msg = f"{field_type_id} is not a valid GFFFieldType"
+                    raise ValueError(msg)
+                struct_fields.append((labels[label_id], _FIELD_TYPES[field_type_id], value))
+            gff_struct.set_fields(struct_fields)
+
+    def _read_locstring(
         self,
-        gff_struct: GFFStruct,
-        field_index: int,
-    ):
-        self._reader.seek(self._field_offset + field_index * 12)
-        field_type_id = self._reader.read_uint32()
-        label_id = self._reader.read_uint32()
-
-        field_type = GFFFieldType(field_type_id)
-        label = self._labels[label_id]
-
-        if field_type in _COMPLEX_FIELD:
-            offset = self._reader.read_uint32()  # relative to field data
-            self._reader.seek(self._field_data_offset + offset)
-            if field_type is GFFFieldType.UInt64:
-                gff_struct.set_uint64(label, self._reader.read_uint64())
-            elif field_type is GFFFieldType.Int64:
-                gff_struct.set_int64(label, self._reader.read_int64())
-            elif field_type is GFFFieldType.Double:
-                gff_struct.set_double(label, self._reader.read_double())
-            elif field_type is GFFFieldType.String:
-                length = self._reader.read_uint32()
-                gff_struct.set_string(label, self._reader.read_string(length))
-            elif field_type is GFFFieldType.ResRef:
-                length = self._reader.read_uint8()
-                resref = ResRef(self._reader.read_string(length).strip())
-                gff_struct.set_resref(label, resref)
-            elif field_type is GFFFieldType.LocalizedString:
-                gff_struct.set_locstring(label, self._reader.read_locstring())
-            elif field_type is GFFFieldType.Binary:
-                length = self._reader.read_uint32()
-                gff_struct.set_binary(label, self._reader.read_bytes(length))
-            elif field_type is GFFFieldType.Vector3:
-                gff_struct.set_vector3(label, self._reader.read_vector3())
-            elif field_type is GFFFieldType.Vector4:
-                gff_struct.set_vector4(label, self._reader.read_vector4())
-        elif field_type is GFFFieldType.Struct:
-            struct_index = self._reader.read_uint32()
-            new_struct = GFFStruct()
-            self._load_struct(new_struct, struct_index)
-            gff_struct.set_struct(label, new_struct)
-        elif field_type is GFFFieldType.List:
-            self._load_list(gff_struct, label)
-        elif field_type is GFFFieldType.UInt8:
-            gff_struct.set_uint8(label, self._reader.read_uint8())
-        elif field_type is GFFFieldType.Int8:
-            gff_struct.set_int8(label, self._reader.read_int8())
-        elif field_type is GFFFieldType.UInt16:
-            gff_struct.set_uint16(label, self._reader.read_uint16())
-        elif field_type is GFFFieldType.Int16:
-            gff_struct.set_int16(label, self._reader.read_int16())
-        elif field_type is GFFFieldType.UInt32:
-            gff_struct.set_uint32(label, self._reader.read_uint32())
-        elif field_type is GFFFieldType.Int32:
-            gff_struct.set_int32(label, self._reader.read_int32())
-        elif field_type is GFFFieldType.Single:
-            gff_struct.set_single(label, self._reader.read_single())
-
-    def _load_list(self, gff_struct: GFFStruct, label: str):
-        offset = self._reader.read_uint32()  # relative to list indices
-        self._reader.seek(self._list_indices_offset + offset)
-        value = GFFList()
-        count = self._reader.read_uint32()
-        list_indices: list[int] = [self._reader.read_uint32() for _ in range(count)]
-        for struct_index in list_indices:
-            value.add(0)
-            child: GFFStruct | None = value.at(len(value) - 1)
-            self._load_struct(child, struct_index)
-        gff_struct.set_list(label, value)
+        field_data: bytes,
+        offset: int,
+    ) -> LocalizedString:
+        """Decodes a LocalizedString from the field data block, same as BinaryReader.read_locstring()."""
+        # Skips the total number of bytes of the localized string.
+        stringref, string_count = _LOCSTRING_HEADER.unpack_from(field_data, offset + 4)
+        locstring = LocalizedString(-1 if stringref == 0xFFFFFFFF else stringref)  # noqa: PLR2004
+        offset += 12
+        for _ in range(string_count):
+            string_id, length = _LOCSTRING_HEADER.unpack_from(field_data, offset)
+            language, gender = LocalizedString.substring_pair(string_id)
+            encoding: str | None = _language_encoding(language)
+            if encoding is None:  # Let the reader guess the encoding, as read_locstring() does.
+                self._reader.seek(self._field_data_offset + offset + 8)
+                string: str = self._reader.read_string(length, encoding=None)
+            else:
+                string = _field_data_slice(field_data, offset + 8, length).decode(encoding, errors="ignore")
+                if "\0" in string:
+                    string = string[: string.index("\0")]
+            locstring.set_data(language, gender, string)
+            offset += 8 + length
+        return locstring
 
 
 class GFFBinaryWriter(ResourceWriter):
+    """Writes a binary GFF.
+
+    The tree is walked once, depth first, numbering structs and fields in the order the game's own files use. The
+    walk fills the struct, field, field index and list index tables as arrays of dwords and appends complex values
+    to the field data block, then every section is copied into a single preallocated buffer.
+    """
+
     def __init__(
         self,
         gff: GFF,
@@ -183,173 +269,174 @@ class GFFBinaryWriter(ResourceWriter):
         super().__init__(target)
         self._gff: GFF = gff
 
-        self._struct_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._field_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._field_data_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._field_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._list_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._structs: array.array[int] = array.array("I")
+        self._fields: array.array[int] = array.array("I")
+        self._field_data: bytearray = bytearray()
+        self._field_indices: array.array[int] = array.array("I")
+        self._list_indices: array.array[int] = array.array("I")
 
-        self._labels: list[str] = []
-
-        self._struct_count: int = 0
-        self._field_count: int = 0
+        self._labels: dict[str, int] = {}
 
     @autoclose
     def write(
         self,
         auto_close: bool = True,
     ):
-        self._build_struct(self._gff.root)
-
-        struct_offset = 56
-        struct_count = self._struct_writer.size() // 12
-        field_offset = struct_offset + self._struct_writer.size()
-        field_count = self._field_writer.size() // 12
-        label_offset = field_offset + self._field_writer.size()
-        label_count = len(self._labels)
-        field_data_offset = label_offset + len(self._labels) * 16
-        field_data_count = self._field_data_writer.size()
-        field_indices_offset = field_data_offset + self._field_data_writer.size()
-        field_indices_count = self._field_indices_writer.size()
-        list_indices_offset = field_indices_offset + self._field_indices_writer.size()
-        list_indices_count = self._list_indices_writer.size()
-
-        self._writer.write_string(self._gff.content.value)
-        self._writer.write_string("V3.2")
-        self._writer.write_uint32(struct_offset)
-        self._writer.write_uint32(struct_count)
-        self._writer.write_uint32(field_offset)
-        self._writer.write_uint32(field_count)
-        self._writer.write_uint32(label_offset)
-        self._writer.write_uint32(label_count)
-        self._writer.write_uint32(field_data_offset)
-        self._writer.write_uint32(field_data_count)
-        self._writer.write_uint32(field_indices_offset)
-        self._writer.write_uint32(field_indices_count)
-        self._writer.write_uint32(list_indices_offset)
-        self._writer.write_uint32(list_indices_count)
-
-        self._writer.write_bytes(self._struct_writer.data())
-        self._writer.write_bytes(self._field_writer.data())
-        for label in self._labels:
-            self._writer.write_string(label, string_length=16)
-        self._writer.write_bytes(self._field_data_writer.data())
-        self._writer.write_bytes(self._field_indices_writer.data())
-        self._writer.write_bytes(self._list_indices_writer.data())
-
-    def _build_struct(
+        try:
+            self._build_tables()
+        except OverflowError as e:
+            msg = "A struct ID or field value does not fit the field's type."
+            raise ValueError(msg) from e
+
+        if sys.byteorder == "big":
+            for table in (self._structs, self._fields, self._field_indices, self._list_indices):
+                table.byteswap()
+        sections: list[bytes] = [
+            self._structs.tobytes(),
+            self._fields.tobytes(),
+            b"".join(label.ljust(16, "\0")[:16].encode("windows-1252") for label in self._labels),
+            self._field_data,
+            self._field_indices.tobytes(),
+            self._list_indices.tobytes(),
+        ]
+
+        header: list[int] = []
+        offset = _HEADER.size + 8
+        for section, count in zip(
+            sections,
+            (len(self._structs) // 3, len(self._fields) // 3, len(self._labels), len(self._field_data), len(sections[4]), len(sections[5])),
+        ):
+            header.extend((offset, count))
+            offset += len(section)
+
+        data = bytearray(offset)
+        data[:8] = f"{self._gff.content.value}V3.2".encode("windows-1252")
+        _HEADER.pack_into(data, 8, *header)
+        for section, section_offset in zip(sections, header[::2]):
+            data[section_offset : section_offset + len(section)] = section
+        self._writer.write_bytes(data)
+
+    def _build_tables(self):
+        """Walks the tree once, filling the struct, field, field index and list index tables and the field data block.
+
+        Processing Logic:
+        ----------------
+            - Structs and fields are numbered in pre-order: a nested struct and everything below it is numbered before the next field of its parent.
+            - A struct with several fields reserves its block of field indices when it is visited, each slot is filled when its field is visited.
+            - A list reserves its count and struct indices the same way.
+            - Labels are numbered in the order they first appear.
+        """
+        structs: array.array[int] = self._structs
+        fields: array.array[int] = self._fields
+        field_data: bytearray = self._field_data
+        field_indices: array.array[int] = self._field_indices
+        list_indices: array.array[int] = self._list_indices
+        labels: dict[str, int] = self._labels
+
+        # Pending work, popped in pre-order. A struct is (None, None, struct, list index slot or -1) and a field is
+        # (field type id, label, value, field index slot or -1).
+        stack: list[tuple[Any, Any, Any, int]] = [(None, None, self._gff.root, -1)]
+        while stack:
+            field_type_id, label, item, slot = stack.pop()
+
+            if field_type_id is None:
+                if slot != -1:
+                    list_indices[slot] = len(structs) // 3
+                gff_struct: GFFStruct = item
+                struct_id: int = gff_struct.struct_id
+                struct_fields: list[tuple[str, GFFFieldType, Any]] = list(gff_struct)
+                field_count: int = len(struct_fields)
+                if field_count == 0:
+                    structs.extend((0xFFFFFFFF if struct_id == -1 else struct_id, 0xFFFFFFFF, 0))
+                elif field_count == 1:
+                    structs.extend((0xFFFFFFFF if struct_id == -1 else struct_id, len(fields) // 3, 1))
+                    child_label, field_type, field_value = struct_fields[0]
+                    stack.append((_FIELD_TYPE_IDS[field_type], child_label, field_value, -1))
+                else:
+                    first_slot: int = len(field_indices)
+                    structs.extend((0xFFFFFFFF if struct_id == -1 else struct_id, first_slot * 4, field_count))
+                    field_indices.extend([0] * field_count)
+                    stack.extend(
+                        (_FIELD_TYPE_IDS[field_type], child_label, field_value, first_slot + i)
+                        for i, (child_label, field_type, field_value) in reversed(list(enumerate(struct_fields)))
+                    )
+                continue
+
+            if slot != -1:
+                field_indices[slot] = len(fields) // 3
+            label_index: int | None = labels.get(label)
+            if label_index is None:
+                label_index = labels[label] = len(labels)
+            value: Any = item
+
+            if field_type_id <= _LAST_SIMPLE_INTEGER:
+                if field_type_id & 1:  # Signed
+                    if not -0x80000000 <= value <= 0x7FFFFFFF:  # noqa: PLR2004
+                        msg = f"Value {value} of field '{label}' does not fit a signed 32-bit integer."
+                        raise ValueError(msg)
+                    fields.extend((field_type_id, label_index, value & 0xFFFFFFFF))
+                else:
+                    fields.extend((field_type_id, label_index, 0xFFFFFFFF if value == -1 else value))
+            elif field_type_id == _SINGLE_ID:
+                fields.extend((field_type_id, label_index, _UINT32.unpack(_SINGLE.pack(value))[0]))
+            elif field_type_id == _STRUCT_ID:
+                fields.extend((field_type_id, label_index, len(structs) // 3))
+                stack.append((None, None, value, -1))
+            elif field_type_id == _LIST_ID:
+                list_offset: int = len(list_indices) * 4
+                fields.extend((field_type_id, label_index, list_offset))
+                list_indices.append(len(value))
+                list_indices.extend([0] * len(value))
+                first_slot = list_offset // 4 + 1
+                stack.extend((None, None, child, first_slot + i) for i, child in reversed(list(enumerate(value))))
+            else:
+                fields.extend((field_type_id, label_index, len(field_data)))
+                self._write_field_data(_FIELD_TYPES[field_type_id], value)
+
+    def _write_field_data(
         self,
-        gff_struct: GFFStruct,
-    ):
-        self._struct_count += 1
-        struct_id = gff_struct.struct_id
-        field_count = len(gff_struct)
-
-        self._struct_writer.write_uint32(struct_id, max_neg1=True)
-
-        if field_count == 0:
-            self._struct_writer.write_uint32(0xFFFFFFFF)
-            self._struct_writer.write_uint32(0)
-        elif field_count == 1:
-            self._struct_writer.write_uint32(self._field_count)
-            self._struct_writer.write_uint32(field_count)
-
-            for label, field_type, value in gff_struct:
-                self._build_field(label, value, field_type)
-        elif field_count > 1:
-            self._write_large_struct(field_count, gff_struct)
-
-    def _write_large_struct(self, field_count: int, gff_struct: GFFStruct):
-        self._struct_writer.write_uint32(self._field_indices_writer.size())
-        self._struct_writer.write_uint32(field_count)
-
-        self._field_indices_writer.end()
-        pos = self._field_indices_writer.position()
-        self._field_indices_writer.write_bytes(b"\x00\x00\x00\x00" * field_count)
-
-        for i, (label, field_type, value) in enumerate(gff_struct):
-            self._field_indices_writer.seek(pos + i * 4)
-            self._field_indices_writer.write_uint32(self._field_count)
-            self._build_field(label, value, field_type)
-
-    def _build_list(
-        self,
-        gff_list: GFFList,
-    ):
-        self._list_indices_writer.end()
-        self._list_indices_writer.write_uint32(len(gff_list))
-        pos = self._list_indices_writer.position()
-        self._list_indices_writer.write_bytes(b"\x00\x00\x00\x00" * len(gff_list))
-        for i, gff_struct in enumerate(gff_list):
-            self._list_indices_writer.seek(pos + i * 4)
-            self._list_indices_writer.write_uint32(self._struct_count)
-            self._build_struct(gff_struct)
-
-    def _build_field(
-        self,
-        label: str,
-        value: Any,
         field_type: GFFFieldType,
+        value: Any,
     ):
-        self._field_count += 1
-        field_type_id = field_type.value
-        label_index = self._label_index(label)
-
-        self._field_writer.write_uint32(field_type_id)
-        self._field_writer.write_uint32(label_index)
-
-        if field_type in _COMPLEX_FIELD:
-            self._field_writer.write_uint32(self._field_data_writer.size())
-
-            self._field_data_writer.end()
-            if field_type is GFFFieldType.UInt64:
-                self._field_data_writer.write_uint64(value)
-            elif field_type is GFFFieldType.Int64:
-                self._field_data_writer.write_int64(value)
-            elif field_type is GFFFieldType.Double:
-                self._field_data_writer.write_double(value)
-            elif field_type is GFFFieldType.String:
-                self._field_data_writer.write_string(value, prefix_length=4)
-            elif field_type is GFFFieldType.ResRef:
-                self._field_data_writer.write_string(str(value), prefix_length=1)
-            elif field_type is GFFFieldType.LocalizedString:
-                self._field_data_writer.write_locstring(value)
-            elif field_type is GFFFieldType.Binary:
-                self._field_data_writer.write_uint32(len(value))
-                self._field_data_writer.write_bytes(value)
-            elif field_type is GFFFieldType.Vector4:
-                self._field_data_writer.write_vector4(value)
-            elif field_type is GFFFieldType.Vector3:
-                self._field_data_writer.write_vector3(value)
-        elif field_type is GFFFieldType.Struct:
-            self._field_writer.write_uint32(self._struct_count)
-            self._build_struct(value)
-        elif field_type is GFFFieldType.List:
-            self._field_writer.write_uint32(self._list_indices_writer.size())
-            self._build_list(value)
-        elif field_type is GFFFieldType.UInt8:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int8:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.UInt16:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int16:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.UInt32:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int32:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.Single:
-            self._field_writer.write_single(value)
+        field_data: bytearray = self._field_data
+        if field_type is GFFFieldType.UInt64:
+            field_data += _UINT64.pack(value)
+        elif field_type is GFFFieldType.Int64:
+            field_data += _INT64.pack(value)
+        elif field_type is GFFFieldType.Double:
+            field_data += _DOUBLE.pack(value)
+        elif field_type is GFFFieldType.String:
+            field_data += _UINT32.pack(len(value))
+            field_data += value.encode("windows-1252")
+        elif field_type is GFFFieldType.ResRef:
+            resref = str(value)
+            if len(resref) > 0xFF:  # noqa: PLR2004
+                msg = "The string length is too large for a prefix length of 1."
+                raise ValueError(msg)
+            field_data.append(len(resref))
+            field_data += resref.encode("windows-1252")
+        elif field_type is GFFFieldType.LocalizedString:
+            self._write_locstring(value)
+        elif field_type is GFFFieldType.Binary:
+            field_data += _UINT32.pack(len(value))
+            field_data += value
+        elif field_type is GFFFieldType.Vector4:
+            field_data += _VECTOR4.pack(value.x, value.y, value.z, value.w)
+        elif field_type is GFFFieldType.Vector3:
+            field_data += _VECTOR3.pack(value.x, value.y, value.z)
         else:
             msg = f"Unknown field type '{field_type}'"
             raise ValueError(msg)
 
-    def _label_index(
+    def _write_locstring(
         self,
-        label: str,
-    ) -> int:
-        if label in self._labels:
-            return self._labels.index(label)
-        self._labels.append(label)
-        return len(self._labels) - 1
+        value: LocalizedString,
+    ):
+        chunks: list[bytes] = [_LOCSTRING_HEADER.pack(0xFFFFFFFF if value.stringref == -1 else value.stringref, len(value))]
+        for language, gender, substring in value:
+            # The length prefix counts characters, matching BinaryWriter.write_locstring.
+            chunks.append(_LOCSTRING_HEADER.pack(LocalizedString.substring_id(language, gender), len(substring)))
+            chunks.append(substring.encode(_language_encoding(language) or "windows-1252", errors="replace"))
+        locstring_data: bytes = b"".join(chunks)
+        self._field_data += _UINT32.pack(len(locstring_data))
+        self._field_data += locstring_data
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import struct
+
 from typing import TYPE_CHECKING
 
-from pykotor.common.geometry import SurfaceMaterial, Vector2, Vector3, Vector4
+from pykotor.common.geometry import Vector2, Vector3, Vector4
 from pykotor.common.misc import Color, Game
 from pykotor.common.stream import BinaryReader, BinaryWriter
 from pykotor.resource.formats.mdl.mdl_data import (
@@ -18,13 +20,64 @@ from pykotor.resource.formats.mdl.mdl_data import (
     MDLNode,
     MDLNodeFlags,
     MDLSkin,
+    surface_material,
 )
 
+try:
+    import numpy as np
+
+    from pykotor.resource.formats.mdl.mdl_data import FACE_DTYPE
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 if TYPE_CHECKING:
-    from pykotor.common.stream import BinaryWriterBytearray
+    from numpy.typing import NDArray
+
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
 
 
+def _mdx_column(
+    mdx_data: bytearray,
+    count: int,
+    stride: int,
+    offset: int,
+    width: int,
+) -> NDArray[np.float32]:
+    """Returns one attribute of every vertex of an MDX block as a (count, width) array that views the block in place."""
+    if not count:
+        return np.zeros((0, width), dtype=np.float32)
+    return np.ndarray((count, width), dtype="<f4", buffer=mdx_data, offset=offset, strides=(stride, 4))
+
+
+def _mdx_rows(
+    mdx_data: bytearray,
+    count: int,
+    stride: int,
+    offset: int,
+    width: int,
+) -> list[tuple[float, ...]]:
+    """Returns one attribute of every vertex of an MDX block as tuples, for when numpy is not available."""
+    row = struct.Struct(f"<{width}f")
+    return [row.unpack_from(mdx_data, i * stride + offset) for i in range(count)]
+
+
+def _decompress_quaternions(
+    compressed: NDArray[np.uint32],
+) -> NDArray[np.float32]:
+    """Decompresses quaternions packed into 4 bytes, the same way as Vector4.from_compressed but for many at once."""
+    compressed = compressed.astype(np.int64)
+    x: NDArray[np.float64] = 1 - (compressed & 0x7FF) / 1023
+    y: NDArray[np.float64] = 1 - ((compressed >> 11) & 0x7FF) / 1023
+    z: NDArray[np.float64] = 1 - (compressed >> 22) / 511
+    squared: NDArray[np.float64] = x**2 + y**2 + z**2
+    inside: NDArray[np.bool_] = squared < 1.0
+    lengths: NDArray[np.float64] = np.where(inside, 1.0, np.sqrt(squared))
+    w: NDArray[np.float64] = np.where(inside, -np.sqrt(np.maximum(1.0 - squared, 0.0)), 0.0)
+    return np.column_stack((x / lengths, y / lengths, z / lengths, w)).astype(np.float32)
+
+
 class _ModelHeader:
     SIZE = 196
 
@@ -82,33 +135,6 @@ class _ModelHeader:
         self.name_offsets_count2 = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        self.geometry.write(writer)
-        writer.write_uint8(self.model_type)
-        writer.write_uint8(self.unknown0)
-        writer.write_uint8(self.padding0)
-        writer.write_uint8(self.fog)
-        writer.write_uint32(self.unknown1)
-        writer.write_uint32(self.offset_to_animations)
-        writer.write_uint32(self.animation_count)
-        writer.write_uint32(self.animation_count2)
-        writer.write_uint32(self.unknown2)
-        writer.write_vector3(self.bounding_box_min)
-        writer.write_vector3(self.bounding_box_max)
-        writer.write_single(self.radius)
-        writer.write_single(self.anim_scale)
-        writer.write_string(self.supermodel, string_length=32, encoding="ascii", errors="ignore")
-        writer.write_uint32(self.offset_to_super_root)
-        writer.write_uint32(self.unknown3)
-        writer.write_uint32(self.mdx_size)
-        writer.write_uint32(self.mdx_offset)
-        writer.write_uint32(self.offset_to_name_offsets)
-        writer.write_uint32(self.name_offsets_count)
-        writer.write_uint32(self.name_offsets_count2)
-
 
 class _GeometryHeader:
     SIZE = 80
@@ -152,19 +178,6 @@ class _GeometryHeader:
         self.padding = reader.read_bytes(3)
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint32(self.function_pointer0)
-        writer.write_uint32(self.function_pointer1)
-        writer.write_string(self.model_name, string_length=32, encoding="ascii")
-        writer.write_uint32(self.root_node_offset)
-        writer.write_uint32(self.node_count)
-        writer.write_bytes(self.unknown0)
-        writer.write_uint8(self.geometry_type)
-        writer.write_bytes(self.padding)
-
 
 class _AnimationHeader:
     SIZE = _GeometryHeader.SIZE + 56
@@ -195,76 +208,6 @@ class _AnimationHeader:
         self.unknown0 = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        self.geometry.write(writer)
-        writer.write_single(self.duration)
-        writer.write_single(self.transition)
-        writer.write_string(self.root, string_length=32, encoding="ascii")
-        writer.write_uint32(self.offset_to_events)
-        writer.write_uint32(self.event_count)
-        writer.write_uint32(self.event_count2)
-        writer.write_uint32(self.unknown0)
-
-
-class _Animation:
-    def __init__(
-        self,
-    ):
-        self.header: _AnimationHeader = _AnimationHeader()
-        self.events: list[_EventStructure] = []
-        self.w_nodes: list[_Node] = []
-
-    def read(
-        self,
-        reader: BinaryReader,
-    ) -> _Animation:
-        self.header = _AnimationHeader().read(reader)
-
-        # read events
-        return self
-
-    def write(
-        self,
-        writer: BinaryWriter,
-        game: Game,
-    ):
-        self.header.write(writer)
-        for event in self.events:
-            event.write(writer)
-        for node in self.w_nodes:
-            node.write(writer, game)
-
-    def events_offset(
-        self,
-    ) -> int:
-        # Always after header
-        return _AnimationHeader.SIZE
-
-    def events_size(
-        self,
-    ) -> int:
-        return _EventStructure.SIZE * len(self.events)
-
-    def nodes_offset(
-        self,
-    ) -> int:
-        """Returns offset of the first node relative to the start of the animation data."""
-        # Always after events
-        return self.events_offset() + self.events_size()
-
-    def nodes_size(
-        self,
-    ):
-        return sum(node.calc_size(Game.K1) for node in self.w_nodes)
-
-    def size(
-        self,
-    ) -> int:
-        return self.nodes_offset() + self.nodes_size()
-
 
 class _EventStructure:
     SIZE = 36
@@ -283,16 +226,10 @@ class _EventStructure:
         self.event_name = reader.read_terminated_string("\0", 32)
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_single(self.activation_time)
-        writer.write_string(self.event_name, string_length=32, encoding="ascii")
-
 
 class _Controller:
     SIZE = 16
+    BEZIER_FLAG = 0x10  # Set in the column count of controllers with Bezier keys.
 
     def __init__(
         self,
@@ -318,18 +255,6 @@ class _Controller:
         self.unknown1 = reader.read_bytes(3)
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint32(self.type_id)
-        writer.write_uint16(self.unknown0)
-        writer.write_uint16(self.row_count)
-        writer.write_uint16(self.key_offset)
-        writer.write_uint16(self.data_offset)
-        writer.write_uint8(self.column_count)
-        writer.write_bytes(self.unknown1)
-
 
 class _Node:
     SIZE = 80
@@ -357,10 +282,6 @@ class _Node:
         self.skin: _SkinmeshHeader | None = None
         self.children_offsets: list[int] = []
 
-        self.w_children = []
-        self.w_controllers: list[_Controller] = []
-        self.w_controller_data: list[float] = []
-
     def read(
         self,
         reader: BinaryReader,
@@ -382,154 +303,6 @@ class _Node:
         self.children_offsets = [reader.read_uint32() for _ in range(self.header.children_count)]
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-        game: Game,
-    ):
-        assert self.header is not None
-        self.header.write(writer)
-
-        if self.trimesh:
-            self.trimesh.write(writer, game)
-
-        if self.trimesh:
-            self._write_trimesh_data(writer)
-        for child_offset in self.children_offsets:
-            writer.write_uint32(child_offset)
-
-        for controller in self.w_controllers:
-            controller.write(writer)
-
-        for controller_data in self.w_controller_data:
-            writer.write_single(controller_data)
-
-        if len(self.children_offsets) != self.header.children_count:
-            msg = f"Number of child offsets in array does not match header count in {self.header.name_id} ({len(self.children_offsets)} vs {self.header.children_count})."
-            raise ValueError(msg)
-
-    def _write_trimesh_data(self, writer: BinaryWriter):
-        assert self.trimesh is not None
-        for count in self.trimesh.indices_counts:
-            writer.write_uint32(count)
-        for offset in self.trimesh.indices_offsets:
-            writer.write_uint32(offset)
-        for counter in self.trimesh.inverted_counters:
-            writer.write_uint32(counter)
-
-        for face in self.trimesh.faces:
-            writer.write_uint16(face.vertex1)
-            writer.write_uint16(face.vertex2)
-            writer.write_uint16(face.vertex3)
-
-        for vertex in self.trimesh.vertices:
-            writer.write_vector3(vertex)
-        for face in self.trimesh.faces:
-            face.write(writer)
-
-    def all_headers_size(
-        self,
-        game: Game,
-    ) -> int:
-        size = _Node.SIZE
-        if self.trimesh:
-            size += _TrimeshHeader.K1_SIZE if game == Game.K1 else _TrimeshHeader.K2_SIZE
-        return size
-
-    def indices_counts_offset(
-        self,
-        game: Game,
-    ) -> int:
-        return self.all_headers_size(game)
-
-    def indices_offsets_offset(
-        self,
-        game: Game,
-    ) -> int:
-        offset = self.indices_counts_offset(game)
-        if self.trimesh:
-            offset += len(self.trimesh.indices_counts) * 4
-        return offset
-
-    def inverted_counters_offset(
-        self,
-        game: Game,
-    ) -> int:
-        offset = self.indices_offsets_offset(game)
-        if self.trimesh:
-            offset += len(self.trimesh.indices_offsets) * 4
-        return offset
-
-    def indices_offset(
-        self,
-        game: Game,
-    ) -> int:
-        offset = self.inverted_counters_offset(game)
-        if self.trimesh:
-            offset += len(self.trimesh.inverted_counters) * 4
-        return offset
-
-    def vertices_offset(
-        self,
-        game: Game,
-    ) -> int:
-        offset = self.indices_offset(game)
-        if self.trimesh:
-            offset += len(self.trimesh.faces) * 3 * 2
-        return offset
-
-    def faces_offset(
-        self,
-        game: Game,
-    ) -> int:
-        size = self.vertices_offset(game)
-        if self.trimesh:
-            size += self.trimesh.vertices_size()
-        return size
-
-    def children_offsets_offset(
-        self,
-        game: Game,
-    ) -> int:
-        size = self.faces_offset(game)
-        if self.trimesh:
-            size += self.trimesh.faces_size()
-        return size
-
-    def children_offsets_size(
-        self,
-    ) -> int:
-        assert self.header is not None
-        return 4 * self.header.children_count
-
-    def controllers_offset(
-        self,
-        game: Game,
-    ) -> int:
-        return self.children_offsets_offset(game) + self.children_offsets_size()
-
-    def controllers_size(
-        self,
-    ) -> int:
-        return _Controller.SIZE * len(self.w_controllers)
-
-    def controller_data_offset(
-        self,
-        game: Game,
-    ) -> int:
-        return self.controllers_offset(game) + self.controllers_size()
-
-    def controller_data_size(
-        self,
-    ) -> int:
-        return len(self.w_controller_data) * 4
-
-    def calc_size(
-        self,
-        game: Game,
-    ) -> int:
-        return self.controller_data_offset(game) + self.controller_data_size()
-
 
 class _NodeHeader:
     SIZE = 80
@@ -581,31 +354,6 @@ class _NodeHeader:
         self.controller_data_length2 = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint16(self.type_id)
-        writer.write_uint16(self.node_id)
-        writer.write_uint16(self.name_id)
-        writer.write_uint16(self.padding0)
-        writer.write_uint32(self.offset_to_root)
-        writer.write_uint32(self.offset_to_parent)
-        writer.write_vector3(self.position)
-        writer.write_single(self.orientation.w)
-        writer.write_single(self.orientation.x)
-        writer.write_single(self.orientation.y)
-        writer.write_single(self.orientation.z)
-        writer.write_uint32(self.offset_to_children)
-        writer.write_uint32(self.children_count)
-        writer.write_uint32(self.children_count2)
-        writer.write_uint32(self.offset_to_controllers)
-        writer.write_uint32(self.controller_count)
-        writer.write_uint32(self.controller_count2)
-        writer.write_uint32(self.offset_to_controller_data)
-        writer.write_uint32(self.controller_data_length)
-        writer.write_uint32(self.controller_data_length2)
-
 
 class _MDXDataFlags:
     VERTEX = 0x0001
@@ -698,6 +446,8 @@ class _TrimeshHeader:
 
         self.faces: list[_Face] = []
         self.vertices: list[Vector3] = []
+        self.face_array: NDArray | None = None  # Read instead of faces and vertices if numpy is available.
+        self.vertex_array: NDArray[np.float32] | None = None
         self.indices_offsets: list[int] = []
         self.indices_counts: list[int] = []
         self.inverted_counters: list[int] = []
@@ -777,92 +527,16 @@ class _TrimeshHeader:
         reader: BinaryReader,
     ):
         reader.seek(self.vertices_offset)
-        self.vertices = [reader.read_vector3() for _ in range(self.vertex_count)]
+        if numpy_available:
+            self.vertex_array = np.frombuffer(bytearray(reader.read_bytes(self.vertex_count * 12)), dtype="<f4").reshape(-1, 3)
+        else:
+            self.vertices = [reader.read_vector3() for _ in range(self.vertex_count)]
 
         reader.seek(self.offset_to_faces)
-        self.faces = [_Face().read(reader) for _ in range(self.faces_count)]
-
-    def write(
-        self,
-        writer: BinaryWriter,
-        game: Game,
-    ):
-        writer.write_uint32(self.function_pointer0)
-        writer.write_uint32(self.function_pointer1)
-        writer.write_uint32(self.offset_to_faces)
-        writer.write_uint32(self.faces_count)
-        writer.write_uint32(self.faces_count2)
-        writer.write_vector3(self.bounding_box_min)
-        writer.write_vector3(self.bounding_box_max)
-        writer.write_single(self.radius)
-        writer.write_vector3(self.average)
-        writer.write_vector3(self.diffuse)
-        writer.write_vector3(self.ambient)
-        writer.write_uint32(self.transparency_hint)
-        writer.write_string(self.texture1, string_length=32, encoding="ascii")
-        writer.write_string(self.texture2, string_length=32, encoding="ascii")
-        writer.write_bytes(self.unknown0)
-        writer.write_uint32(self.offset_to_indices_counts)
-        writer.write_uint32(self.indices_counts_count)
-        writer.write_uint32(self.indices_counts_count2)
-        writer.write_uint32(self.offset_to_indices_offset)
-        writer.write_uint32(self.indices_offsets_count)
-        writer.write_uint32(self.indices_offsets_count2)
-        writer.write_uint32(self.offset_to_counters)
-        writer.write_uint32(self.counters_count)
-        writer.write_uint32(self.counters_count2)
-        writer.write_bytes(self.unknown1)
-        writer.write_bytes(self.saber_unknowns)
-        writer.write_uint32(self.unknown2)
-        writer.write_vector2(self.uv_direction)
-        writer.write_single(self.uv_jitter)
-        writer.write_single(self.uv_speed)
-        writer.write_uint32(self.mdx_data_size)
-        writer.write_uint32(self.mdx_data_bitmap)
-        writer.write_uint32(self.mdx_vertex_offset)
-        writer.write_uint32(self.mdx_normal_offset)
-        writer.write_uint32(self.mdx_color_offset)
-        writer.write_uint32(self.mdx_texture1_offset)
-        writer.write_uint32(self.mdx_texture2_offset)
-        writer.write_uint32(self.unknown3)
-        writer.write_uint32(self.unknown4)
-        writer.write_uint32(self.unknown5)
-        writer.write_uint32(self.unknown6)
-        writer.write_uint32(self.unknown7)
-        writer.write_uint32(self.unknown8)
-        writer.write_uint16(self.vertex_count)
-        writer.write_uint16(self.texture_count)
-        writer.write_uint8(self.has_lightmap)
-        writer.write_uint8(self.rotate_texture)
-        writer.write_uint8(self.background)
-        writer.write_uint8(self.has_shadow)
-        writer.write_uint8(self.beaming)
-        writer.write_uint8(self.render)
-        writer.write_uint8(self.unknown9)
-        writer.write_uint8(self.unknown10)
-        writer.write_single(self.total_area)
-        writer.write_uint32(self.unknown11)
-        if game == Game.K2:
-            writer.write_uint32(self.unknown12)
-            writer.write_uint32(self.unknown13)
-        writer.write_uint32(self.mdx_data_offset)
-        writer.write_uint32(self.vertices_offset)
-
-    def header_size(
-        self,
-        game: Game,
-    ) -> int:
-        return _TrimeshHeader.K1_SIZE if game == Game.K1 else _TrimeshHeader.K2_SIZE
-
-    def faces_size(
-        self,
-    ) -> int:
-        return len(self.faces) * _Face.SIZE
-
-    def vertices_size(
-        self,
-    ) -> int:
-        return len(self.vertices) * 12
+        if numpy_available:
+            self.face_array = np.frombuffer(bytearray(reader.read_bytes(self.faces_count * _Face.SIZE)), dtype=FACE_DTYPE)
+        else:
+            self.faces = [_Face().read(reader) for _ in range(self.faces_count)]
 
 
 class _DanglymeshHeader:
@@ -890,18 +564,6 @@ class _DanglymeshHeader:
         self.unknown0 = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint32(self.offset_to_contraints)
-        writer.write_uint32(self.constraints_count)
-        writer.write_uint32(self.constraints_count2)
-        writer.write_single(self.displacement)
-        writer.write_single(self.tightness)
-        writer.write_single(self.period)
-        writer.write_uint32(self.unknown0)
-
 
 class _SkinmeshHeader:
     def __init__(
@@ -963,30 +625,6 @@ class _SkinmeshHeader:
         self.tbones = [reader.read_vector3() for _ in range(self.tbones_count)]
         self.qbones = [reader.read_vector4() for _ in range(self.qbones_count)]
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_int32(self.unknown2)
-        writer.write_int32(self.unknown3)
-        writer.write_int32(self.unknown4)
-        writer.write_uint32(self.offset_to_mdx_weights)
-        writer.write_uint32(self.offset_to_mdx_bones)
-        writer.write_uint32(self.offset_to_bonemap)
-        writer.write_uint32(self.bonemap_count)
-        writer.write_uint32(self.offset_to_qbones)
-        writer.write_uint32(self.qbones_count)
-        writer.write_uint32(self.qbones_count2)
-        writer.write_uint32(self.offset_to_tbones)
-        writer.write_uint32(self.tbones_count)
-        writer.write_uint32(self.tbones_count2)
-        writer.write_uint32(self.offset_to_unknown0)
-        writer.write_uint32(self.unknown0_count)
-        writer.write_uint32(self.unknown0_count2)
-        for i in range(16):
-            writer.write_uint32(self.bones[i])
-        writer.write_uint32(self.unknown1)
-
 
 class _SaberHeader:
     def __init__(
@@ -1008,15 +646,6 @@ class _SaberHeader:
         self.unknown1 = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint32(self.offset_to_vertices)
-        writer.write_uint32(self.offset_to_texcoords)
-        writer.write_uint32(self.offset_to_normals)
-        writer.write_uint32(self.unknown0)
-
 
 class _LightHeader:
     def __init__(
@@ -1074,34 +703,6 @@ class _LightHeader:
         self.fading_light = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_uint32(self.offset_to_unknown0)
-        writer.write_uint32(self.unknown0_count)
-        writer.write_uint32(self.unknown0_count2)
-        writer.write_uint32(self.offset_to_flare_sizes)
-        writer.write_uint32(self.flare_sizes_count)
-        writer.write_uint32(self.flare_sizes_count2)
-        writer.write_uint32(self.offset_to_flare_positions)
-        writer.write_uint32(self.flare_positions_count)
-        writer.write_uint32(self.flare_positions_count2)
-        writer.write_uint32(self.offset_to_flare_colors)
-        writer.write_uint32(self.flare_colors_count)
-        writer.write_uint32(self.flare_colors_count2)
-        writer.write_uint32(self.offset_to_flare_textures)
-        writer.write_uint32(self.flare_textures_count)
-        writer.write_uint32(self.flare_colors_count2)
-        writer.write_single(self.flare_radius)
-        writer.write_uint32(self.light_priority)
-        writer.write_uint32(self.ambient_only)
-        writer.write_uint32(self.dynamic_type)
-        writer.write_uint32(self.affect_dynamic)
-        writer.write_uint32(self.shadow)
-        writer.write_uint32(self.flare)
-        writer.write_uint32(self.fading_light)
-
 
 class _EmitterHeader:
     def __init__(
@@ -1150,29 +751,6 @@ class _EmitterHeader:
         self.flags = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_single(self.dead_space)
-        writer.write_single(self.blast_radius)
-        writer.write_single(self.blast_length)
-        writer.write_uint32(self.branch_count)
-        writer.write_single(self.smoothing)
-        writer.write_vector2(self.grid)
-        writer.write_string(self.update, string_length=32, encoding="ascii")
-        writer.write_string(self.render, string_length=32, encoding="ascii")
-        writer.write_string(self.blend, string_length=32, encoding="ascii")
-        writer.write_string(self.texture, string_length=32, encoding="ascii")
-        writer.write_string(self.chunk_name, string_length=32, encoding="ascii")
-        writer.write_uint32(self.twosided_texture)
-        writer.write_uint32(self.loop)
-        writer.write_uint32(self.render_order)
-        writer.write_uint32(self.frame_blending)
-        writer.write_string(self.depth_texture, string_length=32, encoding="ascii")
-        writer.write_uint8(self.unknown0)
-        writer.write_uint32(self.flags)
-
 
 class _ReferenceHeader:
     def __init__(
@@ -1189,13 +767,6 @@ class _ReferenceHeader:
         self.reattachable = reader.read_uint32()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_string(self.model, string_length=32, encoding="ascii")
-        writer.write_uint32(self.reattachable)
-
 
 class _Face:
     SIZE = 32
@@ -1228,20 +799,6 @@ class _Face:
         self.vertex3 = reader.read_uint16()
         return self
 
-    def write(
-        self,
-        writer: BinaryWriter,
-    ):
-        writer.write_vector3(self.normal)
-        writer.write_single(self.plane_coefficient)
-        writer.write_uint32(self.material)
-        writer.write_uint16(self.adjacent1)
-        writer.write_uint16(self.adjacent2)
-        writer.write_uint16(self.adjacent3)
-        writer.write_uint16(self.vertex1)
-        writer.write_uint16(self.vertex2)
-        writer.write_uint16(self.vertex3)
-
 
 class MDLBinaryReader:
     def __init__(
@@ -1318,6 +875,7 @@ class MDLBinaryReader:
         node.position = bin_node.header.position
         node.orientation = bin_node.header.orientation
 
+        mdx_data: bytearray | None = None
         if bin_node.trimesh:
             node.mesh = MDLMesh()
             node.mesh.shadow = bool(bin_node.trimesh.has_shadow)
@@ -1336,101 +894,37 @@ class MDLBinaryReader:
             node.mesh.area = bin_node.trimesh.total_area
             node.mesh.saber_unknowns = bin_node.trimesh.saber_unknowns
 
-            node.mesh.vertex_positions = bin_node.trimesh.vertices
-
-            if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.NORMAL and self._reader_ext:
-                node.mesh.vertex_normals = []
-            if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE1 and self._reader_ext:
-                node.mesh.vertex_uv1 = []
-            if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE2 and self._reader_ext:
-                node.mesh.vertex_uv2 = []
-
-            mdx_offset = bin_node.trimesh.mdx_data_offset
-            mdx_block_size = bin_node.trimesh.mdx_data_size
-            for i in range(len(bin_node.trimesh.vertices)):
-                if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.NORMAL and self._reader_ext:
-                    self._reader_ext.seek(
-                        mdx_offset
-                        + i * mdx_block_size
-                        + bin_node.trimesh.mdx_normal_offset
-                    )
-                    x, y, z = (
-                        self._reader_ext.read_single(),
-                        self._reader_ext.read_single(),
-                        self._reader_ext.read_single(),
-                    )
-                    node.mesh.vertex_normals.append(Vector3(x, y, z))
-
-                if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE1 and self._reader_ext:
-                    self._reader_ext.seek(
-                        mdx_offset
-                        + i * mdx_block_size
-                        + bin_node.trimesh.mdx_texture1_offset
-                    )
-                    u, v = (
-                        self._reader_ext.read_single(),
-                        self._reader_ext.read_single(),
-                    )
-                    node.mesh.vertex_uv1.append(Vector2(u, v))
-
-                if bin_node.trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE2 and self._reader_ext:
-                    self._reader_ext.seek(
-                        mdx_offset
-                        + i * mdx_block_size
-                        + bin_node.trimesh.mdx_texture2_offset,
-                    )
-                    u, v = (
-                        self._reader_ext.read_single(),
-                        self._reader_ext.read_single(),
-                    )
-                    node.mesh.vertex_uv2.append(Vector2(u, v))
-
-            for bin_face in bin_node.trimesh.faces:
-                face = MDLFace()
-                node.mesh.faces.append(face)
-                face.v1 = bin_face.vertex1
-                face.v2 = bin_face.vertex2
-                face.v3 = bin_face.vertex3
-                face.a1 = bin_face.adjacent1
-                face.a2 = bin_face.adjacent2
-                face.a3 = bin_face.adjacent3
-                face.normal = bin_face.normal
-                face.coefficient = int(bin_face.plane_coefficient)
-                face.material = SurfaceMaterial(bin_face.material)
+            mdx_data = self._read_mdx_data(bin_node.trimesh)
+            if numpy_available:
+                self._load_mesh_arrays(node.mesh, bin_node.trimesh, mdx_data)
+            else:
+                self._load_mesh_objects(node.mesh, bin_node.trimesh, mdx_data)
 
         if bin_node.skin:
+            assert bin_node.trimesh is not None
             node.skin = MDLSkin()
             node.skin.bone_indices = bin_node.skin.bones
             node.skin.bonemap = bin_node.skin.bonemap
             node.skin.tbones = bin_node.skin.tbones
             node.skin.qbones = bin_node.skin.qbones
 
-            if self._reader_ext:
-                for i in range(len(bin_node.trimesh.vertices)):
-                    vertex_bone = MDLBoneVertex()
-                    node.skin.vertex_bones.append(vertex_bone)
-
-                    mdx_offset = (
-                        bin_node.trimesh.mdx_data_offset
-                        + i * bin_node.trimesh.mdx_data_size
+            if mdx_data is not None:
+                count, stride = bin_node.trimesh.vertex_count, bin_node.trimesh.mdx_data_size
+                if numpy_available:
+                    node.skin.vertex_bone_array = np.stack(
+                        (
+                            _mdx_column(mdx_data, count, stride, bin_node.skin.offset_to_mdx_weights, 4),
+                            _mdx_column(mdx_data, count, stride, bin_node.skin.offset_to_mdx_bones, 4),
+                        ),
+                        axis=1,
                     )
-                    self._reader_ext.seek(mdx_offset + bin_node.skin.offset_to_mdx_bones)
-                    t1 = self._reader_ext.read_single()
-                    t2 = self._reader_ext.read_single()
-                    t3 = self._reader_ext.read_single()
-                    t4 = self._reader_ext.read_single()
-                    vertex_bone.vertex_indices = (t1, t2, t3, t4)
-
-                    mdx_offset = (
-                        bin_node.trimesh.mdx_data_offset
-                        + i * bin_node.trimesh.mdx_data_size
-                    )
-                    self._reader_ext.seek(mdx_offset + bin_node.skin.offset_to_mdx_weights)
-                    w1 = self._reader_ext.read_single()
-                    w2 = self._reader_ext.read_single()
-                    w3 = self._reader_ext.read_single()
-                    w4 = self._reader_ext.read_single()
-                    vertex_bone.vertex_weights = (w1, w2, w3, w4)
+                else:
+                    weights = _mdx_rows(mdx_data, count, stride, bin_node.skin.offset_to_mdx_weights, 4)
+                    for i, indices in enumerate(_mdx_rows(mdx_data, count, stride, bin_node.skin.offset_to_mdx_bones, 4)):
+                        vertex_bone = MDLBoneVertex()
+                        vertex_bone.vertex_indices = indices
+                        vertex_bone.vertex_weights = weights[i]
+                        node.skin.vertex_bones.append(vertex_bone)
 
         for child_offset in bin_node.children_offsets:
             child_node = self._load_node(child_offset)
@@ -1446,6 +940,73 @@ class MDLBinaryReader:
 
         return node
 
+    def _read_mdx_data(
+        self,
+        trimesh: _TrimeshHeader,
+    ) -> bytearray | None:
+        """Reads the MDX data of every vertex of a mesh in a single slice, or returns None if there is no MDX source."""
+        if self._reader_ext is None:
+            return None
+        self._reader_ext.seek(trimesh.mdx_data_offset)
+        return bytearray(self._reader_ext.read_bytes(trimesh.vertex_count * trimesh.mdx_data_size))
+
+    def _load_mesh_arrays(
+        self,
+        mesh: MDLMesh,
+        trimesh: _TrimeshHeader,
+        mdx_data: bytearray | None,
+    ):
+        """Stores the vertices and faces of a mesh as arrays, the mesh builds the per vertex objects if they are used."""
+        mesh.position_array = trimesh.vertex_array
+        mesh.face_array = trimesh.face_array
+        if mesh.face_array is not None:
+            # MDLFace.coefficient is an integer, keep the arrays in line with the objects.
+            mesh.face_array["coefficient"] = mesh.face_array["coefficient"].astype(np.int32)
+        if mdx_data is None:
+            return
+
+        count, stride = trimesh.vertex_count, trimesh.mdx_data_size
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.NORMAL:
+            mesh.normal_array = _mdx_column(mdx_data, count, stride, trimesh.mdx_normal_offset, 3)
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE1:
+            mesh.uv1_array = _mdx_column(mdx_data, count, stride, trimesh.mdx_texture1_offset, 2)
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE2:
+            mesh.uv2_array = _mdx_column(mdx_data, count, stride, trimesh.mdx_texture2_offset, 2)
+        # The offset of the tangent space is the eighth of the MDX offsets, after those of the four texture coordinates.
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.BUMPMAP and trimesh.unknown5 != 0xFFFFFFFF:  # noqa: PLR2004
+            mesh.tangent_space_array = _mdx_column(mdx_data, count, stride, trimesh.unknown5, 9).reshape(-1, 3, 3)
+
+    def _load_mesh_objects(
+        self,
+        mesh: MDLMesh,
+        trimesh: _TrimeshHeader,
+        mdx_data: bytearray | None,
+    ):
+        """Stores the vertices and faces of a mesh as lists of objects, for when numpy is not available."""
+        mesh.vertex_positions = trimesh.vertices
+        for bin_face in trimesh.faces:
+            face = MDLFace()
+            mesh.faces.append(face)
+            face.v1 = bin_face.vertex1
+            face.v2 = bin_face.vertex2
+            face.v3 = bin_face.vertex3
+            face.a1 = bin_face.adjacent1
+            face.a2 = bin_face.adjacent2
+            face.a3 = bin_face.adjacent3
+            face.normal = bin_face.normal
+            face.coefficient = int(bin_face.plane_coefficient)
+            face.material = surface_material(bin_face.material)
+        if mdx_data is None:
+            return
+
+        count, stride = trimesh.vertex_count, trimesh.mdx_data_size
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.NORMAL:
+            mesh.vertex_normals = [Vector3(*row) for row in _mdx_rows(mdx_data, count, stride, trimesh.mdx_normal_offset, 3)]
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE1:
+            mesh.vertex_uv1 = [Vector2(*row) for row in _mdx_rows(mdx_data, count, stride, trimesh.mdx_texture1_offset, 2)]
+        if trimesh.mdx_data_bitmap & _MDXDataFlags.TEXTURE2:
+            mesh.vertex_uv2 = [Vector2(*row) for row in _mdx_rows(mdx_data, count, stride, trimesh.mdx_texture2_offset, 2)]
+
     def _load_anim(
         self,
         offset,
@@ -1482,45 +1043,162 @@ class MDLBinaryReader:
         offset: int,
         data_offset: int,
     ) -> MDLController:
+        """Reads a controller, its key times and its values.
+
+        The key offset and the data offset of a controller index the controller data of the node as floats. Orientations
+        with 2 columns are quaternions compressed into 4 bytes, and the 0x10 bit of the column count marks Bezier keys,
+        which hold the in and out tangents after each value.
+        """
         self._reader.seek(offset)
         bin_controller = _Controller().read(self._reader)
 
-        row_count = bin_controller.row_count
-        column_count = bin_controller.column_count
-
-        self._reader.seek(data_offset + bin_controller.key_offset)
-        time_keys = [self._reader.read_single() for _ in range(row_count)]
+        row_count: int = bin_controller.row_count
+        bezier: bool = bool(bin_controller.column_count & _Controller.BEZIER_FLAG)
+        column_count: int = (bin_controller.column_count & ~_Controller.BEZIER_FLAG) * (3 if bezier else 1)
+        compressed: bool = bin_controller.type_id == MDLControllerType.ORIENTATION and column_count == 2  # noqa: PLR2004
 
-        # There are some special cases when reading controller data rows.
+        controller = MDLController()
+        controller.controller_type = bin_controller.type_id  # type: ignore[assignment]
+        controller.bezier = bezier
+
+        self._reader.seek(data_offset + bin_controller.key_offset * 4)
+        time_data: bytes = self._reader.read_bytes(row_count * 4)
+        self._reader.seek(data_offset + bin_controller.data_offset * 4)
+        value_data: bytes = self._reader.read_bytes(row_count * (4 if compressed else 4 * column_count))
+
+        if numpy_available:
+            times: NDArray[np.float32] = np.frombuffer(time_data, dtype="<f4")
+            if compressed:
+                values: NDArray[np.float32] = _decompress_quaternions(np.frombuffer(value_data, dtype="<u4"))
+            else:
+                values = np.frombuffer(value_data, dtype="<f4").reshape(row_count, column_count)
+            controller.key_array = np.column_stack((times, values)).astype(np.float32)
+            return controller
 
-        # Orientation data stored in controllers is sometimes compressed into 4 bytes. We need to check for that and
-        # uncompress the quaternion if that is the case.
-        if (
-            bin_controller.type_id == MDLControllerType.ORIENTATION
-            and bin_controller.column_count == 2
-        ):
+        time_keys: tuple[float, ...] = struct.unpack(f"<{row_count}f", time_data)
+        if compressed:
             data: list[list[float]] = []
-            for _ in range(bin_controller.row_count):
-                compressed = self._reader.read_uint32()
-                decompressed = Vector4.from_compressed(compressed)
+            for compressed_value in struct.unpack(f"<{row_count}I", value_data):
+                decompressed = Vector4.from_compressed(compressed_value)
                 data.append([decompressed.x, decompressed.y, decompressed.z, decompressed.w])
         else:
-            self._reader.seek(data_offset + bin_controller.data_offset * 4)
-            data = [
-                [self._reader.read_single() for _ in range(column_count)]
-                for _ in range(row_count)
-            ]
-
-        controller = MDLController()
-        controller.controller_type = bin_controller.type_id
-        controller.rows = [
-            MDLControllerRow(time_keys[i], data[i])
-            for i in range(row_count)
-        ]
+            flat: tuple[float, ...] = struct.unpack(f"<{row_count * column_count}f", value_data)
+            data = [list(flat[i * column_count : (i + 1) * column_count]) for i in range(row_count)]
+        controller.rows = [MDLControllerRow(time_keys[i], data[i]) for i in range(row_count)]
         return controller
 
 
+# The binary structures the writer packs directly, see the classes above for what each field is.
+_GEOMETRY_HEADER_FORMAT = "II32sII28sB3s"
+_MODEL_HEADER_STRUCT = struct.Struct(f"<{_GEOMETRY_HEADER_FORMAT}4B5I8f32s7I")
+_ANIMATION_HEADER_STRUCT = struct.Struct(f"<{_GEOMETRY_HEADER_FORMAT}2f32s4I")
+_EVENT_STRUCT = struct.Struct("<f32s")
+_NODE_HEADER_STRUCT = struct.Struct("<4H2I7f9I")
+_CONTROLLER_STRUCT = struct.Struct("<IHHHHB3s")
+_TRIMESH_HEADER_FORMAT = "5I16fI32s32s24s9I12s8sI4f13I2H8BfI"
+_K1_TRIMESH_HEADER_STRUCT = struct.Struct(f"<{_TRIMESH_HEADER_FORMAT}2I")
+_K2_TRIMESH_HEADER_STRUCT = struct.Struct(f"<{_TRIMESH_HEADER_FORMAT}4I")
+_FACE_STRUCT = struct.Struct("<4fI6H")
+_FILE_HEADER_SIZE = 12  # Every offset in the MDL is relative to the end of the file header.
+_MDX_TERMINATORS = {"positions": 10000000.0, "normals": 0.0, "uv1": 0.0, "uv2": 0.0}
+
+
+def _fixed_string(
+    value: str,
+    errors: str = "strict",
+) -> bytes:
+    """Encodes a string padded or truncated to 32 characters, like BinaryWriter.write_string with a string_length."""
+    return value.ljust(32, "\0")[:32].encode("ascii", errors=errors)
+
+
+class _NodeLayout:
+    """Where a node and each of its blocks go in the MDL, worked out before anything is written.
+
+    Offsets are relative to the MDL data, the mesh blocks are relative to the start of the node.
+    """
+
+    def __init__(
+        self,
+        node: MDLNode,
+        name_id: int,
+        offset: int,
+        game: Game,
+    ):
+        self.node: MDLNode = node
+        self.name_id: int = name_id
+        self.offset: int = offset
+        self.children_offsets: list[int] = []
+
+        self.positions: NDArray[np.float32] | list[Vector3] = []
+        self.faces: NDArray | list[MDLFace] = []
+        self.has_mdx: bool = False  # Only the meshes of the geometry have MDX data.
+        self.mdx_data_offset: int = 0
+        self.mdx_columns: list[tuple[str, NDArray[np.float32] | list[Vector2] | list[Vector3], int]] = []
+
+        size: int = _Node.SIZE
+        if node.mesh is not None:
+            mesh: MDLMesh = node.mesh
+            if numpy_available:
+                self.positions, self.faces = mesh.position_array, mesh.face_array
+            else:
+                self.positions, self.faces = mesh.vertex_positions, mesh.faces
+            size += _TrimeshHeader.K1_SIZE if game == Game.K1 else _TrimeshHeader.K2_SIZE
+            self.headers_size: int = size
+            self.indices_offset: int = size + 12  # After the indices count, indices offset and inverted counter arrays.
+            self.vertices_offset: int = self.indices_offset + 6 * len(self.faces)
+            self.faces_offset: int = self.vertices_offset + 12 * len(self.positions)
+            size = self.faces_offset + _Face.SIZE * len(self.faces)
+        self.children_offset: int = size
+        self.controllers_offset: int = self.children_offset + 4 * len(node.children)
+
+        # The key times of each controller are followed by its values, the offsets index the controller data as floats.
+        self.controllers: list[tuple[int, int, int, int, int]] = []
+        self.controller_data: list[float] = []
+        for controller in node.controllers:
+            key_offset: int = len(self.controller_data)
+            if numpy_available:
+                keys: NDArray[np.float32] = controller.key_array
+                row_count, column_count = keys.shape[0], keys.shape[1] - 1
+                self.controller_data.extend(keys[:, 0].tolist())
+                self.controller_data.extend(keys[:, 1:].ravel().tolist())
+            else:
+                row_count, column_count = len(controller.rows), len(controller.rows[0].data) if controller.rows else 0
+                self.controller_data.extend(row.time for row in controller.rows)
+                for row in controller.rows:
+                    self.controller_data.extend(row.data)
+            if controller.bezier:
+                column_count = column_count // 3 | _Controller.BEZIER_FLAG
+            self.controllers.append((controller.controller_type, row_count, key_offset, key_offset + row_count, column_count))
+        self.controller_data_offset: int = self.controllers_offset + _Controller.SIZE * len(self.controllers)
+        self.size: int = self.controller_data_offset + 4 * len(self.controller_data)
+
+    def plan_mdx(
+        self,
+        mdx_offset: int,
+    ) -> int:
+        """Picks the vertex attributes written to the MDX, returns the offset after the vertices of the node."""
+        mesh: MDLMesh | None = self.node.mesh
+        assert mesh is not None
+        self.has_mdx = True
+        self.mdx_data_offset = mdx_offset
+        if numpy_available:
+            columns = (("positions", self.positions), ("normals", mesh.normal_array), ("uv1", mesh.uv1_array), ("uv2", mesh.uv2_array))
+        else:
+            columns = (("positions", self.positions), ("normals", mesh.vertex_normals), ("uv1", mesh.vertex_uv1), ("uv2", mesh.vertex_uv2))
+        self.mdx_columns = [(name, values, 2 if name in ("uv1", "uv2") else 3) for name, values in columns if values is not None and len(values)]
+        return mdx_offset + (len(self.positions) + 1) * self.mdx_stride()
+
+    def mdx_stride(self) -> int:
+        return 4 * sum(width for _, _, width in self.mdx_columns)
+
+
 class MDLBinaryWriter:
+    """Writes an MDL and its MDX.
+
+    The size and offset of every block of both files is planned first, in one pass over the nodes, then the blocks are
+    packed straight into buffers of the final size.
+    """
+
     def __init__(
         self,
         mdl: MDL,
@@ -1531,386 +1209,394 @@ class MDLBinaryWriter:
 
         self._target: TARGET_TYPES = target
         self._target_ext: TARGET_TYPES = target_ext
-        self._writer: BinaryWriterBytearray = BinaryWriter.to_bytearray()
-        self._writer_ext: BinaryWriterBytearray = BinaryWriter.to_bytearray()
 
         self.game: Game = Game.K1
 
-        self._name_offsets: list[int] = []
-        self._anim_offsets: list[int] = []
-        self._node_offsets: list[int] = []
-
-        self._bin_anim_nodes: dict[str, _Node] = {}
-        self._mdl_nodes: list[MDLNode] = []
-        self._bin_nodes: list[_Node] = []
-        self._bin_anims: list[_Animation] = []
-        self._names: list[str] = []
-        self._file_header: _ModelHeader = _ModelHeader()
-
     def write(
         self,
         auto_close: bool = True,
     ):
-        self._mdl_nodes = self._mdl.all_nodes()
-        self._bin_nodes = [_Node() for _ in self._mdl_nodes]
-        self._bin_anims = [_Animation() for _ in self._mdl.anims]
-        self._names = [node.name for node in self._mdl_nodes]
-
-        self._anim_offsets = [0 for _ in self._bin_anims]
-        self._node_offsets = [0 for _ in self._bin_nodes]
-        self._file_header = _ModelHeader()
-
-        self._update_all_data()
-
-        self._calc_top_offsets()
-        self._calc_inner_offsets()
-
-        self._write_all()
+        mdl_nodes: list[MDLNode] = self._mdl.all_nodes()
+        names: list[str] = [node.name for node in mdl_nodes]
+        name_ids: dict[str, int] = {}
+        for name_id, name in enumerate(names):
+            name_ids.setdefault(name, name_id)
+        # Children are looked up through the last geometry node of each name, animation nodes included.
+        sources: dict[int, MDLNode] = {name_ids[node.name]: node for node in mdl_nodes}
+
+        offset: int = _ModelHeader.SIZE + 4 * len(names)
+        name_offsets: list[int] = []
+        for name in names:
+            name_offsets.append(offset)
+            offset += len(name) + 1
+
+        offset_to_animations: int = offset
+        offset += 4 * len(self._mdl.anims)
+        anim_layouts: list[tuple[int, MDLAnimation, list[_NodeLayout]]] = []
+        for anim in self._mdl.anims:
+            anim_offset: int = offset
+            offset += _AnimationHeader.SIZE + _EventStructure.SIZE * len(anim.events)
+            layouts, offset = self._plan_nodes(anim.all_nodes(), offset, name_ids, sources)
+            anim_layouts.append((anim_offset, anim, layouts))
+
+        root_offset: int = offset
+        node_layouts, mdl_size = self._plan_nodes(mdl_nodes, root_offset, name_ids, sources)
+
+        mdx_size: int = 0
+        for layout in node_layouts:
+            if layout.node.mesh is not None:
+                mdx_size = layout.plan_mdx(mdx_size)
+
+        mdl_data = bytearray(_FILE_HEADER_SIZE + mdl_size)
+        mdx_data = bytearray(mdx_size)
+        struct.pack_into("<3I", mdl_data, 0, 0, mdl_size, mdx_size)
+        _MODEL_HEADER_STRUCT.pack_into(
+            mdl_data,
+            _FILE_HEADER_SIZE,
+            _GeometryHeader.K1_FUNCTION_POINTER0,
+            _GeometryHeader.K1_FUNCTION_POINTER1,
+            _fixed_string(self._mdl.name),
+            root_offset,
+            len(mdl_nodes),  # TODO: need to include supermodel in count
+            b"",
+            2,
+            b"",
+            0,  # TODO: model type
+            0,
+            0,
+            0,  # TODO: fog
+            0,
+            offset_to_animations,
+            len(self._mdl.anims),
+            len(self._mdl.anims),
+            0,
+            *(0.0,) * 8,  # TODO: bounding box, radius and animation scale
+            _fixed_string(self._mdl.supermodel, errors="ignore"),
+            root_offset,
+            0,
+            mdx_size,
+            0,
+            _ModelHeader.SIZE,
+            len(names),
+            len(names),
+        )
+        struct.pack_into(f"<{len(names)}I", mdl_data, _FILE_HEADER_SIZE + _ModelHeader.SIZE, *name_offsets)
+        names_data: bytes = "".join(f"{name}\0" for name in names).encode("ascii")
+        names_offset: int = _FILE_HEADER_SIZE + _ModelHeader.SIZE + 4 * len(names)
+        mdl_data[names_offset : names_offset + len(names_data)] = names_data
+
+        struct.pack_into(
+            f"<{len(anim_layouts)}I",
+            mdl_data,
+            _FILE_HEADER_SIZE + offset_to_animations,
+            *(anim_offset for anim_offset, _, _ in anim_layouts),
+        )
+        for anim_offset, anim, layouts in anim_layouts:
+            self._write_anim(mdl_data, anim_offset, anim)
+            for index, layout in enumerate(layouts):
+                self._write_node(mdl_data, mdx_data, layout, root_offset if index else 0)
+        for index, layout in enumerate(node_layouts):
+            self._write_node(mdl_data, mdx_data, layout, root_offset if index else 0)
+
+        mdl_writer: BinaryWriter = BinaryWriter.to_auto(self._target)
+        mdl_writer.write_bytes(bytes(mdl_data))
+        mdx_writer: BinaryWriter | None = None
+        if self._target_ext is not None:
+            mdx_writer = BinaryWriter.to_auto(self._target_ext)
+            mdx_writer.write_bytes(bytes(mdx_data))
 
         if auto_close:
-            self._writer.close()
-            if self._writer_ext:
-                self._writer_ext.close()
+            mdl_writer.close()
+            if mdx_writer is not None:
+                mdx_writer.close()
 
-    def _update_all_data(
+    def _plan_nodes(
         self,
-    ):
-        for i, bin_node in enumerate(self._bin_nodes):
-            self._update_node(bin_node, self._mdl_nodes[i])
-
-        for i, bin_anim in enumerate(self._bin_anims):
-            self._update_anim(bin_anim, self._mdl.anims[i])
+        nodes: list[MDLNode],
+        offset: int,
+        name_ids: dict[str, int],
+        sources: dict[int, MDLNode],
+    ) -> tuple[list[_NodeLayout], int]:
+        """Lays out one list of nodes (the geometry or the nodes of an animation) from `offset`.
+
+        Returns:
+        -------
+            The layout of every node, and the offset after the last one.
+        """
+        layouts: list[_NodeLayout] = []
+        offsets_by_name_id: dict[int, list[int]] = {}
+        for node in nodes:
+            name_id: int | None = name_ids.get(node.name)
+            if name_id is None:
+                msg = f"The animation node '{node.name}' does not match any node of the model."
+                raise ValueError(msg)
+            layout = _NodeLayout(node, name_id, offset, self.game)
+            layouts.append(layout)
+            offsets_by_name_id.setdefault(name_id, []).append(offset)
+            offset += layout.size
+
+        for layout in layouts:
+            layout.children_offsets = [
+                child_offset
+                for child in sources[layout.name_id].children
+                for child_offset in offsets_by_name_id.get(name_ids[child.name], ())
+            ]
+            if len(layout.children_offsets) != len(layout.node.children):
+                msg = f"Number of child offsets in array does not match header count in {layout.name_id} ({len(layout.children_offsets)} vs {len(layout.node.children)})."
+                raise ValueError(msg)
+        return layouts, offset
 
-    def _update_node(
+    def _write_anim(
         self,
-        bin_node: _Node,
-        mdl_node: MDLNode,
+        mdl_data: bytearray,
+        anim_offset: int,
+        anim: MDLAnimation,
     ):
-        assert bin_node.header is not None
-        bin_node.header.type_id = self._node_type(mdl_node)
-        bin_node.header.position = mdl_node.position
-        bin_node.header.orientation = mdl_node.orientation
-        bin_node.header.children_count = bin_node.header.children_count2 = len(mdl_node.children)
-        bin_node.header.name_id = self._names.index(mdl_node.name)
-        bin_node.header.node_id = self._get_node_id(bin_node)
-
-        # Determine the appropriate function pointer values to write
         if self.game == Game.K1:
-            if mdl_node.skin:
-                fp0 = _TrimeshHeader.K1_SKIN_FUNCTION_POINTER0
-                fp1 = _TrimeshHeader.K1_SKIN_FUNCTION_POINTER1
-            elif mdl_node.dangly:
-                fp0 = _TrimeshHeader.K1_DANGLY_FUNCTION_POINTER0
-                fp1 = _TrimeshHeader.K1_DANGLY_FUNCTION_POINTER1
-            else:
-                fp0 = _TrimeshHeader.K1_FUNCTION_POINTER0
-                fp1 = _TrimeshHeader.K1_FUNCTION_POINTER1
-        elif mdl_node.skin:
-            fp0 = _TrimeshHeader.K2_SKIN_FUNCTION_POINTER0
-            fp1 = _TrimeshHeader.K2_SKIN_FUNCTION_POINTER1
-        elif mdl_node.dangly:
-            fp0 = _TrimeshHeader.K2_DANGLY_FUNCTION_POINTER0
-            fp1 = _TrimeshHeader.K2_DANGLY_FUNCTION_POINTER1
+            function_pointers = (_GeometryHeader.K1_ANIM_FUNCTION_POINTER0, _GeometryHeader.K1_ANIM_FUNCTION_POINTER1)
         else:
-            fp0 = _TrimeshHeader.K2_FUNCTION_POINTER0
-            fp1 = _TrimeshHeader.K2_FUNCTION_POINTER1
-
-        if mdl_node.mesh:
-            bin_node.trimesh = _TrimeshHeader()
-            bin_node.trimesh.function_pointer0 = fp0
-            bin_node.trimesh.function_pointer1 = fp1
-            bin_node.trimesh.average = mdl_node.mesh.average
-            bin_node.trimesh.radius = mdl_node.mesh.radius
-            bin_node.trimesh.bounding_box_max = mdl_node.mesh.bb_max
-            bin_node.trimesh.bounding_box_min = mdl_node.mesh.bb_min
-            bin_node.trimesh.total_area = mdl_node.mesh.area
-            bin_node.trimesh.texture1 = mdl_node.mesh.texture_1
-            bin_node.trimesh.texture2 = mdl_node.mesh.texture_2
-            bin_node.trimesh.diffuse = mdl_node.mesh.diffuse.bgr_vector3()
-            bin_node.trimesh.ambient = mdl_node.mesh.ambient.bgr_vector3()
-            bin_node.trimesh.render = mdl_node.mesh.render
-            bin_node.trimesh.transparency_hint = mdl_node.mesh.transparency_hint
-            bin_node.trimesh.uv_jitter = mdl_node.mesh.uv_jitter
-            bin_node.trimesh.uv_speed = mdl_node.mesh.uv_jitter_speed
-            bin_node.trimesh.uv_direction.x = mdl_node.mesh.uv_direction_x
-            bin_node.trimesh.uv_direction.y = mdl_node.mesh.uv_direction_y
-            bin_node.trimesh.has_lightmap = mdl_node.mesh.has_lightmap
-            bin_node.trimesh.rotate_texture = mdl_node.mesh.rotate_texture
-            bin_node.trimesh.background = mdl_node.mesh.background_geometry
-            bin_node.trimesh.has_shadow = mdl_node.mesh.shadow
-            bin_node.trimesh.beaming = mdl_node.mesh.beaming
-            bin_node.trimesh.render = mdl_node.mesh.render
-            bin_node.trimesh.dirt_enabled = mdl_node.mesh.dirt_enabled  # TODO: undefined??
-            bin_node.trimesh.dirt_texture = mdl_node.mesh.dirt_texture  # TODO: undefined??
-            bin_node.trimesh.saber_unknowns = mdl_node.mesh.saber_unknowns  # TODO: wrong type??
-
-            bin_node.trimesh.vertex_count = len(mdl_node.mesh.vertex_positions)
-            bin_node.trimesh.vertices = mdl_node.mesh.vertex_positions
-
-            bin_node.trimesh.indices_counts = [len(mdl_node.mesh.faces) * 3]
-            bin_node.trimesh.indices_counts_count = bin_node.trimesh.indices_counts_count2 = 1
-
-            bin_node.trimesh.indices_offsets = [0]  # Placeholder to be updated with offsets - do not remove line
-            bin_node.trimesh.indices_offsets_count = bin_node.trimesh.indices_offsets_count2 = 1
-
-            bin_node.trimesh.inverted_counters = [0]
-            bin_node.trimesh.counters_count = bin_node.trimesh.counters_count2 = 1
-
-            bin_node.trimesh.faces_count = bin_node.trimesh.faces_count2 = len(mdl_node.mesh.faces)
-            for face in mdl_node.mesh.faces:
-                bin_face = _Face()
-                bin_node.trimesh.faces.append(bin_face)
-                bin_face.vertex1 = face.v1
-                bin_face.vertex2 = face.v2
-                bin_face.vertex3 = face.v3
-                bin_face.adjacent1 = face.a1
-                bin_face.adjacent2 = face.a2
-                bin_face.adjacent3 = face.a3
-                bin_face.material = face.material.value
-                bin_face.plane_coefficient = face.coefficient
-                bin_face.normal = face.normal
-
-        data_offset = 0
-        key_offset = 0
-        for mdl_controller in mdl_node.controllers:
-            bin_controller = _Controller()
-            bin_controller.type_id = mdl_controller.controller_type
-            bin_controller.row_count = len(mdl_controller.rows)
-            bin_controller.column_count = len(mdl_controller.rows[0].data)
-            bin_controller.key_offset = key_offset
-            data_offset += len(mdl_controller.rows)
-            bin_controller.data_offset = data_offset
-            bin_node.w_controllers.append(bin_controller)
-            data_offset += len(mdl_controller.rows) * len(mdl_controller.rows[0].data)
-            key_offset += data_offset
-
-        bin_node.w_controller_data = []
-        for controller in mdl_node.controllers:
-            for row in controller.rows:
-                bin_node.w_controller_data.append(row.time)
-            for row in controller.rows:
-                bin_node.w_controller_data.extend(row.data)
-
-        bin_node.header.controller_count = bin_node.header.controller_count2 = len(mdl_node.controllers)
-        bin_node.header.controller_data_length = bin_node.header.controller_data_length2 = len(bin_node.w_controller_data)
-
-    def _update_anim(
-        self,
-        bin_anim: _Animation,
-        mdl_anim: MDLAnimation,
-    ):
-        if self.game == Game.K1:
-            bin_anim.header.geometry.function_pointer0 = _GeometryHeader.K1_ANIM_FUNCTION_POINTER0
-            bin_anim.header.geometry.function_pointer1 = _GeometryHeader.K1_ANIM_FUNCTION_POINTER1
-        else:
-            bin_anim.header.geometry.function_pointer0 = _GeometryHeader.K2_ANIM_FUNCTION_POINTER0
-            bin_anim.header.geometry.function_pointer1 = _GeometryHeader.K2_ANIM_FUNCTION_POINTER1
-
-        bin_anim.header.geometry.geometry_type = 5
-        bin_anim.header.geometry.model_name = mdl_anim.name
-        bin_anim.header.geometry.node_count = 0
-        bin_anim.header.duration = mdl_anim.anim_length
-        bin_anim.header.transition = mdl_anim.transition_length
-        bin_anim.header.root = mdl_anim.root_model
-        bin_anim.header.event_count = bin_anim.header.event_count2 = len(mdl_anim.events)
-
-        for mdl_event in mdl_anim.events:
-            bin_event = _EventStructure()
-            bin_event.event_name = mdl_event.name
-            bin_event.activation_time = mdl_event.activation_time
-            bin_anim.events.append(bin_event)
-
-        all_nodes = mdl_anim.all_nodes()
-        bin_nodes = []
-        for mdl_node in all_nodes:
-            bin_node = _Node()
-            self._update_node(bin_node, mdl_node)
-            bin_nodes.append(bin_node)
-        bin_anim.w_nodes = bin_nodes
-
-    def _update_mdx(
-        self,
-        bin_node: _Node,
-        mdl_node: MDLNode,
-    ):
-        assert bin_node.trimesh is not None
-        assert mdl_node.mesh is not None
-
-        bin_node.trimesh.mdx_data_offset = self._writer_ext.size()
-
-        bin_node.trimesh.mdx_vertex_offset = 0xFFFFFFFF
-        bin_node.trimesh.mdx_normal_offset = 0xFFFFFFFF
-        bin_node.trimesh.mdx_texture1_offset = 0xFFFFFFFF
-        bin_node.trimesh.mdx_texture2_offset = 0xFFFFFFFF
-        bin_node.trimesh.mdx_data_bitmap = 0
-
-        suboffset = 0
-        if mdl_node.mesh.vertex_positions:
-            bin_node.trimesh.mdx_vertex_offset = suboffset
-            bin_node.trimesh.mdx_data_bitmap |= _MDXDataFlags.VERTEX
-            suboffset += 12
-
-        if mdl_node.mesh.vertex_normals:
-            bin_node.trimesh.mdx_normal_offset = suboffset
-            bin_node.trimesh.mdx_data_bitmap |= _MDXDataFlags.NORMAL
-            suboffset += 12
-
-        if mdl_node.mesh.vertex_uv1:
-            bin_node.trimesh.mdx_texture1_offset = suboffset
-            bin_node.trimesh.mdx_data_bitmap |= _MDXDataFlags.TEXTURE1
-            suboffset += 8
-
-        if mdl_node.mesh.vertex_uv2:
-            bin_node.trimesh.mdx_texture2_offset = suboffset
-            bin_node.trimesh.mdx_data_bitmap |= _MDXDataFlags.TEXTURE2
-            suboffset += 8
-
-        bin_node.trimesh.mdx_data_size = suboffset
-
-        for i, position in enumerate(mdl_node.mesh.vertex_positions):
-            if mdl_node.mesh.vertex_positions:
-                self._writer_ext.write_vector3(position)
-            if mdl_node.mesh.vertex_normals:
-                self._writer_ext.write_vector3(mdl_node.mesh.vertex_normals[i])
-            if mdl_node.mesh.vertex_uv1:
-                self._writer_ext.write_vector2(mdl_node.mesh.vertex_uv1[i])
-            if mdl_node.mesh.vertex_uv2:
-                self._writer_ext.write_vector2(mdl_node.mesh.vertex_uv2[i])
-
-        # Why does the mdl/mdx format have this? I have no idea.
-        if mdl_node.mesh.vertex_positions:
-            self._writer_ext.write_vector3(Vector3(10000000, 10000000, 10000000))
-        if mdl_node.mesh.vertex_normals:
-            self._writer_ext.write_vector3(Vector3.from_null())
-        if mdl_node.mesh.vertex_uv1:
-            self._writer_ext.write_vector2(Vector2.from_null())
-        if mdl_node.mesh.vertex_uv2:
-            self._writer_ext.write_vector2(Vector2.from_null())
-
-    def _calc_top_offsets(
-        self,
-    ):
-        offset_to_name_offsets = _ModelHeader.SIZE
-
-        offset_to_names = offset_to_name_offsets + 4 * len(self._names)
-        name_offset = offset_to_names
-        for name in self._names:
-            self._name_offsets.append(name_offset)
-            name_offset += len(name) + 1
-
-        offset_to_anim_offsets = name_offset
-        offset_to_anims = name_offset + (4 * len(self._bin_anims))
-        anim_offset = offset_to_anims
-        for i, anim in enumerate(self._bin_anims):
-            self._anim_offsets[i] = anim_offset
-            anim_offset += anim.size()
-
-        offset_to_node_offset = anim_offset
-        node_offset = offset_to_node_offset
-        for i, bin_node in enumerate(self._bin_nodes):
-            self._node_offsets[i] = node_offset
-            node_offset += bin_node.calc_size(self.game)
-
-        self._file_header.geometry.root_node_offset = offset_to_node_offset
-        self._file_header.offset_to_name_offsets = offset_to_name_offsets
-        self._file_header.offset_to_super_root = 0
-        self._file_header.offset_to_animations = offset_to_anim_offsets
-
-    def _calc_inner_offsets(
-        self,
-    ):
-        for i, bin_anim in enumerate(self._bin_anims):
-            bin_anim.header.offset_to_events = self._anim_offsets[i] + bin_anim.events_offset()
-            bin_anim.header.geometry.root_node_offset = self._anim_offsets[i] + bin_anim.nodes_offset()
-
-            node_offsets = []
-            node_offset = self._anim_offsets[i] + bin_anim.nodes_offset()
-            for bin_node in bin_anim.w_nodes:
-                node_offsets.append(node_offset)
-                node_offset += bin_node.calc_size(self.game)
-
-            for j, _bin_node in enumerate(bin_anim.w_nodes):
-                self._calc_node_offset(j, bin_anim.w_nodes, node_offsets)
-
-        for i, _bin_node in enumerate(self._bin_nodes):
-            self._calc_node_offset(i, self._bin_nodes, self._node_offsets)
+            function_pointers = (_GeometryHeader.K2_ANIM_FUNCTION_POINTER0, _GeometryHeader.K2_ANIM_FUNCTION_POINTER1)
+        events_offset: int = anim_offset + _AnimationHeader.SIZE
+        _ANIMATION_HEADER_STRUCT.pack_into(
+            mdl_data,
+            _FILE_HEADER_SIZE + anim_offset,
+            *function_pointers,
+            _fixed_string(anim.name),
+            events_offset + _EventStructure.SIZE * len(anim.events),
+            0,
+            b"",
+            5,
+            b"",
+            anim.anim_length,
+            anim.transition_length,
+            _fixed_string(anim.root_model),
+            events_offset,
+            len(anim.events),
+            len(anim.events),
+            0,
+        )
+        for i, event in enumerate(anim.events):
+            _EVENT_STRUCT.pack_into(
+                mdl_data,
+                _FILE_HEADER_SIZE + events_offset + i * _EventStructure.SIZE,
+                event.activation_time,
+                _fixed_string(event.name),
+            )
 
-    def _calc_node_offset(
+    def _write_node(
         self,
-        index: int,
-        bin_nodes: list[_Node],
-        bin_offsets: list[int],
+        mdl_data: bytearray,
+        mdx_data: bytearray,
+        layout: _NodeLayout,
+        offset_to_parent: int,
     ):
-        bin_node = bin_nodes[index]
-        node_offset = bin_offsets[index]
-
-        for bin_child in self._get_bin_children(bin_node, bin_nodes):
-            child_index = bin_nodes.index(bin_child)
-            offset = bin_offsets[child_index]
-            bin_node.children_offsets.append(offset)
-
-        assert bin_node.header is not None
-        bin_node.header.offset_to_children = node_offset + bin_node.children_offsets_offset(self.game)
-        bin_node.header.offset_to_controllers = node_offset + bin_node.controllers_offset(self.game)
-        bin_node.header.offset_to_controller_data = node_offset + bin_node.controller_data_offset(self.game)
-        bin_node.header.offset_to_root = 0
-        bin_node.header.offset_to_parent = self._node_offsets[0] if index != 0 else 0
-
-        if bin_node.trimesh:
-            self._calc_trimesh_offsets(node_offset, bin_node)
+        node: MDLNode = layout.node
+        offset: int = _FILE_HEADER_SIZE + layout.offset
+        _NODE_HEADER_STRUCT.pack_into(
+            mdl_data,
+            offset,
+            self._node_type(node),
+            layout.name_id,
+            layout.name_id,
+            0,
+            0,
+            offset_to_parent,
+            node.position.x,
+            node.position.y,
+            node.position.z,
+            node.orientation.w,
+            node.orientation.x,
+            node.orientation.y,
+            node.orientation.z,
+            layout.offset + layout.children_offset,
+            len(layout.children_offsets),
+            len(layout.children_offsets),
+            layout.offset + layout.controllers_offset,
+            len(layout.controllers),
+            len(layout.controllers),
+            layout.offset + layout.controller_data_offset,
+            len(layout.controller_data),
+            len(layout.controller_data),
+        )
+        if node.mesh is not None:
+            self._write_mesh(mdl_data, mdx_data, layout)
+
+        struct.pack_into(f"<{len(layout.children_offsets)}I", mdl_data, offset + layout.children_offset, *layout.children_offsets)
+        for i, controller in enumerate(layout.controllers):
+            type_id, row_count, key_offset, data_offset, column_count = controller
+            _CONTROLLER_STRUCT.pack_into(
+                mdl_data,
+                offset + layout.controllers_offset + i * _Controller.SIZE,
+                type_id,
+                0xFFFF,
+                row_count,
+                key_offset,
+                data_offset,
+                column_count,
+                b"",
+            )
+        struct.pack_into(f"<{len(layout.controller_data)}f", mdl_data, offset + layout.controller_data_offset, *layout.controller_data)
 
-    def _calc_trimesh_offsets(
+    def _write_mesh(
         self,
-        node_offset: int,
-        bin_node: _Node,
+        mdl_data: bytearray,
+        mdx_data: bytearray,
+        layout: _NodeLayout,
     ):
-        assert bin_node.trimesh is not None
-        bin_node.trimesh.offset_to_counters = node_offset + bin_node.inverted_counters_offset(self.game)
-        bin_node.trimesh.offset_to_indices_counts = node_offset + bin_node.indices_counts_offset(self.game)
-        bin_node.trimesh.offset_to_indices_offset = node_offset + bin_node.indices_offsets_offset(self.game)
-        bin_node.trimesh.indices_offsets = [node_offset + bin_node.indices_offset(self.game)]
-
-        bin_node.trimesh.offset_to_faces = node_offset + bin_node.faces_offset(self.game)
-        bin_node.trimesh.vertices_offset = node_offset + bin_node.vertices_offset(self.game)
+        """Writes the trimesh header, the vertices and the faces of a node to the MDL, and its vertex attributes to the MDX.
+
+        Processing Logic:
+        ----------------
+            - The MDX rows of every vertex are followed by a terminating row, 10000000 for the positions and 0 for the
+              rest.
+        """
+        node: MDLNode = layout.node
+        mesh: MDLMesh | None = node.mesh
+        assert mesh is not None
+        offset: int = _FILE_HEADER_SIZE + layout.offset
+        vertex_count, face_count = len(layout.positions), len(layout.faces)
 
-    def _get_node_id(
-        self,
-        bin_node: _Node,
-    ) -> int:
-        assert bin_node.header is not None
-        name_index = bin_node.header.name_id
-        for mdl_node in self._mdl_nodes:
-            if self._names.index(mdl_node.name) == name_index:
-                return self._mdl_nodes.index(mdl_node)
-        raise ValueError
-
-    def _get_bin_children(
-        self,
-        bin_node: _Node,
-        all_nodes: list[_Node],
-    ) -> list[_Node]:
-        assert bin_node.header is not None
-        # check the name_id for bin_node
-        # get the corresponding mdl_node
-        # find name_ids of all children
-        # from all_nodes list pick the nodes with the same name_ids
-        name_id = bin_node.header.name_id
-        mdl_node = None
-        for mdlnode in self._mdl_nodes:
-            if self._names.index(mdlnode.name) == name_id:
-                mdl_node = mdlnode
-        if mdl_node is None:
-            raise ValueError
-
-        child_name_ids = []
-        for mdlnode in mdl_node.children:
-            child_name_id = self._names.index(mdlnode.name)
-            child_name_ids.append(child_name_id)
-
-        bin_children = []
-        for child_name_id in child_name_ids:
-            bin_children.extend(binnode for binnode in all_nodes if binnode.header.name_id == child_name_id)
-        return bin_children
+        if self.game == Game.K1:
+            if node.skin is not None:
+                function_pointers = (_TrimeshHeader.K1_SKIN_FUNCTION_POINTER0, _TrimeshHeader.K1_SKIN_FUNCTION_POINTER1)
+            elif node.dangly is not None:
+                function_pointers = (_TrimeshHeader.K1_DANGLY_FUNCTION_POINTER0, _TrimeshHeader.K1_DANGLY_FUNCTION_POINTER1)
+            else:
+                function_pointers = (_TrimeshHeader.K1_FUNCTION_POINTER0, _TrimeshHeader.K1_FUNCTION_POINTER1)
+        elif node.skin is not None:
+            function_pointers = (_TrimeshHeader.K2_SKIN_FUNCTION_POINTER0, _TrimeshHeader.K2_SKIN_FUNCTION_POINTER1)
+        elif node.dangly is not None:
+            function_pointers = (_TrimeshHeader.K2_DANGLY_FUNCTION_POINTER0, _TrimeshHeader.K2_DANGLY_FUNCTION_POINTER1)
+        else:
+            function_pointers = (_TrimeshHeader.K2_FUNCTION_POINTER0, _TrimeshHeader.K2_FUNCTION_POINTER1)
+
+        # Vertex, normal, color, texture 1 and texture 2 offsets within an MDX row, unused attributes are 0xFFFFFFFF.
+        mdx_offsets: dict[str, int] = {}
+        mdx_bitmap: int = 0
+        column: int = 0
+        for name, _, width in layout.mdx_columns:
+            mdx_offsets[name] = column
+            column += 4 * width
+        for name, flag in (("positions", _MDXDataFlags.VERTEX), ("normals", _MDXDataFlags.NORMAL), ("uv1", _MDXDataFlags.TEXTURE1), ("uv2", _MDXDataFlags.TEXTURE2)):
+            if name in mdx_offsets:
+                mdx_bitmap |= flag
+        unused: int = 0xFFFFFFFF if layout.has_mdx else 0
+
+        headers_offset: int = layout.offset + layout.headers_size
+        trimesh_struct: struct.Struct = _K1_TRIMESH_HEADER_STRUCT if self.game == Game.K1 else _K2_TRIMESH_HEADER_STRUCT
+        trimesh_struct.pack_into(
+            mdl_data,
+            offset + _Node.SIZE,
+            *function_pointers,
+            layout.offset + layout.faces_offset,
+            face_count,
+            face_count,
+            mesh.bb_min.x,
+            mesh.bb_min.y,
+            mesh.bb_min.z,
+            mesh.bb_max.x,
+            mesh.bb_max.y,
+            mesh.bb_max.z,
+            mesh.radius,
+            mesh.average.x,
+            mesh.average.y,
+            mesh.average.z,
+            *mesh.diffuse.bgr_vector3(),
+            *mesh.ambient.bgr_vector3(),
+            mesh.transparency_hint,
+            _fixed_string(mesh.texture_1),
+            _fixed_string(mesh.texture_2),
+            b"",
+            headers_offset,  # Indices counts
+            1,
+            1,
+            headers_offset + 4,  # Indices offsets
+            1,
+            1,
+            headers_offset + 8,  # Inverted counters
+            1,
+            1,
+            b"\xFF" * 8,
+            bytes(mesh.saber_unknowns),
+            0,
+            mesh.uv_direction_x,
+            mesh.uv_direction_y,
+            mesh.uv_jitter,
+            mesh.uv_jitter_speed,
+            layout.mdx_stride(),
+            mdx_bitmap,
+            mdx_offsets.get("positions", unused),
+            mdx_offsets.get("normals", unused),
+            0xFFFFFFFF,
+            mdx_offsets.get("uv1", unused),
+            mdx_offsets.get("uv2", unused),
+            *(0xFFFFFFFF,) * 6,
+            vertex_count,
+            1,
+            mesh.has_lightmap,
+            mesh.rotate_texture,
+            mesh.background_geometry,
+            mesh.shadow,
+            mesh.beaming,
+            mesh.render,
+            0,
+            0,
+            mesh.area,
+            0,
+            *((0, 0) if self.game == Game.K2 else ()),
+            layout.mdx_data_offset,
+            layout.offset + layout.vertices_offset,
+        )
+        struct.pack_into("<3I", mdl_data, offset + layout.headers_size, face_count * 3, layout.offset + layout.indices_offset, 0)
+
+        indices_offset: int = offset + layout.indices_offset
+        vertices_offset: int = offset + layout.vertices_offset
+        faces_offset: int = offset + layout.faces_offset
+        if numpy_available:
+            faces: NDArray = layout.faces
+            mdl_data[indices_offset:vertices_offset] = np.ascontiguousarray(faces["vertices"], dtype="<u2").tobytes()
+            mdl_data[vertices_offset:faces_offset] = np.ascontiguousarray(layout.positions, dtype="<f4").tobytes()
+            mdl_data[faces_offset : faces_offset + _Face.SIZE * face_count] = faces.astype(FACE_DTYPE, copy=False).tobytes()
+        else:
+            struct.pack_into(f"<{3 * face_count}H", mdl_data, indices_offset, *(v for face in layout.faces for v in (face.v1, face.v2, face.v3)))
+            struct.pack_into(f"<{3 * vertex_count}f", mdl_data, vertices_offset, *(c for vertex in layout.positions for c in (vertex.x, vertex.y, vertex.z)))
+            for i, face in enumerate(layout.faces):
+                _FACE_STRUCT.pack_into(
+                    mdl_data,
+                    faces_offset + i * _Face.SIZE,
+                    face.normal.x,
+                    face.normal.y,
+                    face.normal.z,
+                    face.coefficient,
+                    int(face.material),
+                    face.a1,
+                    face.a2,
+                    face.a3,
+                    face.v1,
+                    face.v2,
+                    face.v3,
+                )
+
+        if not layout.mdx_columns:
+            return
+        stride: int = layout.mdx_stride()
+        if numpy_available:
+            block: NDArray[np.float32] = np.zeros((vertex_count + 1, stride // 4), dtype="<f4")
+            column = 0
+            for name, values, width in layout.mdx_columns:
+                block[:vertex_count, column : column + width] = values
+                block[vertex_count, column : column + width] = _MDX_TERMINATORS[name]
+                column += width
+            mdx_data[layout.mdx_data_offset : layout.mdx_data_offset + block.nbytes] = block.tobytes()
+        else:
+            rows: list[float] = []
+            for i in range(vertex_count):
+                for _, values, width in layout.mdx_columns:
+                    value: Vector2 | Vector3 = values[i]
+                    rows.extend((value.x, value.y, value.z) if width == 3 else (value.x, value.y))  # noqa: PLR2004
+            for name, _, width in layout.mdx_columns:
+                rows.extend((_MDX_TERMINATORS[name],) * width)
+            struct.pack_into(f"<{len(rows)}f", mdx_data, layout.mdx_data_offset, *rows)
 
     def _node_type(
         self,
@@ -1926,57 +1612,3 @@ class MDLBinaryWriter:
         # if node.light: type_id = type_id | MDLNodeFlags.LIGHT
         # if node.reference: type_id = type_id | MDLNodeFlags.REFERENCE
         return type_id
-
-    def _write_all(
-        self,
-    ):
-        for i, bin_node in enumerate(self._bin_nodes):
-            if bin_node.trimesh:
-                self._update_mdx(bin_node, self._mdl_nodes[i])
-
-        self._file_header.geometry.function_pointer0 = _GeometryHeader.K1_FUNCTION_POINTER0
-        self._file_header.geometry.function_pointer1 = _GeometryHeader.K1_FUNCTION_POINTER1
-        self._file_header.geometry.model_name = self._mdl.name
-        self._file_header.geometry.node_count = len(self._mdl_nodes)  # TODO: need to include supermodel in count
-        self._file_header.geometry.geometry_type = 2
-        self._file_header.offset_to_super_root = self._file_header.geometry.root_node_offset
-        self._file_header.mdx_size = self._writer_ext.size()
-
-        # TODO self._file_header.model_type = 0
-        # TODO self._file_header.fog = 0
-        self._file_header.animation_count = self._file_header.animation_count2 = len(self._mdl.anims)
-        # TODO self._file_header.bounding_box_min
-        # TODO self._file_header.bounding_box_max
-        # TODO self._file_header.radius
-        # TODO self._file_header.anim_scale
-        self._file_header.supermodel = self._mdl.supermodel
-        # TODO self._file_header.mdx_size
-        # TODO self._file_header.mdx_offset
-        self._file_header.name_offsets_count = self._file_header.name_offsets_count2 = len(self._names)
-
-        self._file_header.write(self._writer)
-
-        for name_offset in self._name_offsets:
-            self._writer.write_uint32(name_offset)
-
-        for name in self._names:
-            self._writer.write_string(name + "\0", encoding="ascii")
-
-        for anim_offset in self._anim_offsets:
-            self._writer.write_uint32(anim_offset)
-
-        for bin_anim in self._bin_anims:
-            bin_anim.write(self._writer, self.game)
-        for bin_node in self._bin_nodes:
-            bin_node.write(self._writer, self.game)
-
-        # Write to MDL
-        mdl_writer = BinaryWriter.to_auto(self._target)
-        mdl_writer.write_uint32(0)
-        mdl_writer.write_uint32(self._writer.size())
-        mdl_writer.write_uint32(self._writer_ext.size())
-        mdl_writer.write_bytes(self._writer.data())
-
-        # Write to MDX
-        if self._target_ext is not None:
-            BinaryWriter.to_auto(self._target_ext).write_bytes(self._writer_ext.data())
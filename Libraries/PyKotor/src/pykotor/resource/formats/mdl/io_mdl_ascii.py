@@ -1,15 +1,404 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable
+import math
 
-from pykotor.common.geometry import AxisAngle, Vector4
+from typing import TYPE_CHECKING, Any, Callable
+
+from pykotor.common.geometry import Vector2, Vector3, Vector4
+from pykotor.common.misc import Color
 from pykotor.common.stream import BinaryReader, BinaryWriter
-from pykotor.resource.formats.mdl.mdl_data import MDL, MDLControllerType
+from pykotor.resource.formats.mdl.mdl_data import (
+    MDL,
+    MDLAnimation,
+    MDLBoneVertex,
+    MDLController,
+    MDLControllerRow,
+    MDLDangly,
+    MDLEmitter,
+    MDLEvent,
+    MDLFace,
+    MDLLight,
+    MDLMesh,
+    MDLNode,
+    MDLReference,
+    MDLSaber,
+    MDLSkin,
+    MDLWalkmesh,
+    surface_material,
+)
+from utility.logger_util import RobustRootLogger
+
+try:
+    import numpy as np
+
+    from pykotor.resource.formats.mdl.mdl_data import FACE_DTYPE
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
 
 if TYPE_CHECKING:
-    from pykotor.resource.formats.mdl.mdl_data import MDLController, MDLNode
+    from numpy.typing import NDArray
+
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
 
+# The controllers of each kind of node, by their name in ASCII models. The values are the controller types of binary models.
+_BASE_CONTROLLERS: dict[str, int] = {"position": 8, "orientation": 20, "scale": 36}
+_MESH_CONTROLLERS: dict[str, int] = {**_BASE_CONTROLLERS, "selfillumcolor": 100, "alpha": 132}
+_LIGHT_CONTROLLERS: dict[str, int] = {
+    **_BASE_CONTROLLERS,
+    "color": 76,
+    "radius": 88,
+    "shadowradius": 96,
+    "verticaldisplacement": 100,
+    "multiplier": 140,
+}
+_EMITTER_CONTROLLERS: dict[str, int] = {
+    **_BASE_CONTROLLERS,
+    "alphaEnd": 80,
+    "alphaStart": 84,
+    "birthrate": 88,
+    "bounce_co": 92,
+    "combinetime": 96,
+    "drag": 100,
+    "fps": 104,
+    "frameEnd": 108,
+    "frameStart": 112,
+    "grav": 116,
+    "lifeExp": 120,
+    "mass": 124,
+    "p2p_bezier2": 128,
+    "p2p_bezier3": 132,
+    "particleRot": 136,
+    "randvel": 140,
+    "sizeStart": 144,
+    "sizeEnd": 148,
+    "sizeStart_y": 152,
+    "sizeEnd_y": 156,
+    "spread": 160,
+    "threshold": 164,
+    "velocity": 168,
+    "xsize": 172,
+    "ysize": 176,
+    "blurlength": 180,
+    "lightningDelay": 184,
+    "lightningRadius": 188,
+    "lightningScale": 192,
+    "lightningSubDiv": 196,
+    "lightningzigzag": 200,
+    "alphaMid": 216,
+    "percentStart": 220,
+    "percentMid": 224,
+    "percentEnd": 228,
+    "sizeMid": 232,
+    "sizeMid_y": 236,
+    "m_fRandomBirthRate": 240,
+    "targetsize": 252,
+    "numcontrolpts": 256,
+    "controlptradius": 260,
+    "controlptdelay": 264,
+    "tangentspread": 268,
+    "tangentlength": 272,
+    "colorMid": 284,
+    "colorEnd": 380,
+    "colorStart": 392,
+    "detonate": 502,
+}
+_ORIENTATION_CONTROLLER = 20
+
+
+def _controller_names(
+    controllers: dict[str, int],
+) -> dict[int, str]:
+    return {type_id: name for name, type_id in controllers.items()}
+
+
+_MESH_CONTROLLER_NAMES: dict[int, str] = _controller_names(_MESH_CONTROLLERS)
+_LIGHT_CONTROLLER_NAMES: dict[int, str] = _controller_names(_LIGHT_CONTROLLERS)
+_EMITTER_CONTROLLER_NAMES: dict[int, str] = _controller_names(_EMITTER_CONTROLLERS)
+
+
+def _to_bool(
+    token: str,
+) -> bool:
+    return bool(int(float(token)))
+
+
+def _to_int(
+    token: str,
+) -> int:
+    return int(float(token))
+
+
+def _to_str(
+    token: str,
+) -> str:
+    return token
+
+
+# (ASCII name, attribute, type) of the properties of each kind of node that are a single value.
+_MESH_PROPERTIES: tuple[tuple[str, str, Callable[[str], Any]], ...] = (
+    ("transparencyhint", "transparency_hint", _to_int),
+    ("animateuv", "animate_uv", _to_bool),
+    ("uvdirectionx", "uv_direction_x", float),
+    ("uvdirectiony", "uv_direction_y", float),
+    ("uvjitter", "uv_jitter", float),
+    ("uvjitterspeed", "uv_jitter_speed", float),
+    ("lightmapped", "has_lightmap", _to_bool),
+    ("rotatetexture", "rotate_texture", _to_bool),
+    ("m_bIsBackgroundGeometry", "background_geometry", _to_bool),
+    ("shadow", "shadow", _to_bool),
+    ("beaming", "beaming", _to_bool),
+    ("render", "render", _to_bool),
+    ("dirt_enabled", "dirt_enabled", _to_bool),
+    ("dirt_texture", "dirt_texture", _to_int),
+    ("dirt_worldspace", "dirt_coordinate_space", _to_int),
+    ("hologram_donotdraw", "hide_in_hologram", _to_bool),
+)
+_LIGHT_PROPERTIES: tuple[tuple[str, str, Callable[[str], Any]], ...] = (
+    ("flareradius", "flare_radius", float),
+    ("lightpriority", "light_priority", _to_int),
+    ("ambientonly", "ambient_only", _to_int),
+    ("nDynamicType", "dynamic_type", _to_int),
+    ("affectDynamic", "affect_dynamic", _to_int),
+    ("shadow", "shadow", _to_int),
+    ("flare", "flare", _to_int),
+    ("fadingLight", "fading_light", _to_int),
+)
+_EMITTER_PROPERTIES: tuple[tuple[str, str, Callable[[str], Any]], ...] = (
+    ("deadspace", "dead_space", float),
+    ("blastRadius", "blast_radius", float),
+    ("blastLength", "blast_length", float),
+    ("numBranches", "branch_count", _to_int),
+    ("controlptsmoothing", "control_point_smoothing", float),
+    ("xgrid", "x_grid", _to_int),
+    ("ygrid", "y_grid", _to_int),
+    ("spawntype", "spawn_type", _to_int),
+    ("update", "update", _to_str),
+    ("render", "render", _to_str),
+    ("blend", "blend", _to_str),
+    ("texture", "texture", _to_str),
+    ("chunkName", "chunk_name", _to_str),
+    ("twosidedtex", "two_sided_texture", _to_int),
+    ("loop", "loop", _to_int),
+    ("renderorder", "render_order", _to_int),
+    ("m_bFrameBlending", "frame_blender", _to_int),
+    ("m_sDepthTextureName", "depth_texture", _to_str),
+)
+_REFERENCE_PROPERTIES: tuple[tuple[str, str, Callable[[str], Any]], ...] = (
+    ("refModel", "model", _to_str),
+    ("reattachable", "reattachable", _to_bool),
+)
+# The bits of MDLEmitter.flags, from the lowest.
+_EMITTER_FLAGS: tuple[str, ...] = (
+    "p2p",
+    "p2p_sel",
+    "affectedByWind",
+    "m_isTinted",
+    "bounce",
+    "random",
+    "inherit",
+    "inheritvel",
+    "inherit_local",
+    "splat",
+    "inherit_part",
+    "depth_texture",
+)
+
+
+def _property_lookup(
+    properties: tuple[tuple[str, str, Callable[[str], Any]], ...],
+) -> dict[str, tuple[str, Callable[[str], Any]]]:
+    return {name.lower(): (attribute, convert) for name, attribute, convert in properties}
+
+
+_MESH_PROPERTY_LOOKUP = _property_lookup(_MESH_PROPERTIES)
+_LIGHT_PROPERTY_LOOKUP = _property_lookup(_LIGHT_PROPERTIES)
+_EMITTER_PROPERTY_LOOKUP = _property_lookup(_EMITTER_PROPERTIES)
+_REFERENCE_PROPERTY_LOOKUP = _property_lookup(_REFERENCE_PROPERTIES)
+_EMITTER_FLAG_LOOKUP: dict[str, int] = {name.lower(): 1 << bit for bit, name in enumerate(_EMITTER_FLAGS)}
+# ASCII names are case-insensitive, and each name is the same controller whatever the kind of node.
+_CONTROLLER_LOOKUP: dict[str, int] = {
+    name.lower(): type_id
+    for controllers in (_MESH_CONTROLLERS, _LIGHT_CONTROLLERS, _EMITTER_CONTROLLERS)
+    for name, type_id in controllers.items()
+}
+_MESH_NODE_TYPES = {"trimesh", "danglymesh", "skin", "aabb", "lightsaber"}
+# Key lists shorter than this are parsed faster without numpy.
+_ARRAY_KEY_COUNT = 64
+# Keywords that cannot appear inside a node.
+_BLOCK_KEYWORDS = {"node", "endmodelgeom", "newanim", "doneanim", "donemodel"}
+
+
+def _axis_angle_to_quaternion(
+    x: float,
+    y: float,
+    z: float,
+    angle: float,
+) -> tuple[float, float, float, float]:
+    length: float = math.sqrt(x * x + y * y + z * z)
+    if length == 0.0:
+        return 0.0, 0.0, 0.0, math.cos(angle / 2)
+    scale: float = math.sin(angle / 2) / length
+    return x * scale, y * scale, z * scale, math.cos(angle / 2)
+
+
+def _quaternion_to_axis_angle(
+    x: float,
+    y: float,
+    z: float,
+    w: float,
+) -> tuple[float, float, float, float]:
+    length: float = math.sqrt(x * x + y * y + z * z)
+    if length == 0.0:
+        return 0.0, 0.0, 0.0, 2 * math.atan2(0.0, w)  # An angle of 2 pi keeps the sign of a (0, 0, 0, -1) quaternion.
+    return x / length, y / length, z / length, 2 * math.atan2(length, w)
+
+
+def _axis_angles_to_quaternions(
+    axis_angles: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Converts (n, 4) rows of axis and angle to (n, 4) rows of quaternion x, y, z and w."""
+    lengths: NDArray[np.float64] = np.linalg.norm(axis_angles[:, :3], axis=1)
+    halves: NDArray[np.float64] = axis_angles[:, 3] / 2
+    scales: NDArray[np.float64] = np.divide(np.sin(halves), lengths, out=np.zeros_like(lengths), where=lengths != 0)
+    return np.column_stack((axis_angles[:, :3] * scales[:, None], np.cos(halves)))
+
+
+def _number(
+    value: float,
+) -> str:
+    return repr(float(value))
+
+
+class _Lines:
+    """The lines of an ASCII model, read one at a time as tokens or in blocks of numbers.
+
+    Everything after a '#' is a comment. Lines without tokens are skipped, except in blocks that are read by line count.
+    """
+
+    def __init__(
+        self,
+        text: str,
+    ):
+        self._lines: list[str] = text.splitlines()
+        self._index: int = 0
+
+    def next(self) -> list[str] | None:
+        """Returns the tokens of the next line that has any, or None at the end of the model."""
+        lines: list[str] = self._lines
+        while self._index < len(lines):
+            line: str = lines[self._index]
+            self._index += 1
+            if "#" in line:
+                line = line[: line.index("#")]
+            tokens: list[str] = line.split()
+            if tokens:
+                return tokens
+        return None
+
+    def peek(self) -> list[str] | None:
+        """Returns the tokens of the next line that has any, without moving past it."""
+        index: int = self._index
+        tokens: list[str] | None = self.next()
+        self._index = index
+        return tokens
+
+    def take(
+        self,
+        count: int,
+    ) -> list[str]:
+        """Returns the next `count` lines as they are."""
+        if count < 0 or self._index + count > len(self._lines):
+            raise self.error(f"Expected {count} more lines")
+        lines: list[str] = self._lines[self._index : self._index + count]
+        self._index += count
+        return lines
+
+    def take_list(self) -> list[str]:
+        """Returns the lines up to the next 'endlist' line, and moves past it."""
+        for index in range(self._index, len(self._lines)):
+            tokens: list[str] = self._lines[index].split(None, 1)
+            if tokens and tokens[0].lower() == "endlist":
+                lines: list[str] = [line for line in self._lines[self._index : index] if line.split("#", 1)[0].strip()]
+                self._index = index + 1
+                return lines
+        raise self.error("Missing 'endlist'")
+
+    def take_rows(
+        self,
+        count: int | None,
+    ) -> list[str]:
+        """Returns the lines of a list of `count` rows, or of the rows up to 'endlist' when the count is not known.
+
+        An 'endlist' after a counted list is skipped too.
+        """
+        if count is None:
+            return self.take_list()
+        lines: list[str] = self.take(count)
+        tokens: list[str] | None = self.peek()
+        if tokens is not None and tokens[0].lower() == "endlist":
+            self.next()
+        return lines
+
+    def numbers(
+        self,
+        lines: list[str],
+        width: int,
+    ) -> NDArray[np.float64] | list[list[float]]:
+        """Parses one row of `width` numbers from each line into an array, or into lists without numpy.
+
+        With numpy, the whole block is converted in one call, only blocks with comments or extra columns fall back to
+        parsing line by line.
+        """
+        if not numpy_available:
+            return self.rows(lines, width)
+        try:
+            values: NDArray[np.float64] = np.array(" ".join(lines).split(), dtype=np.float64)
+        except ValueError:
+            pass
+        else:
+            if values.size == len(lines) * width:
+                return values.reshape(len(lines), width)
+        return np.array(self.rows(lines, width), dtype=np.float64).reshape(len(lines), width)
+
+    def rows(
+        self,
+        lines: list[str],
+        width: int,
+    ) -> list[list[float]]:
+        """Parses one row of `width` numbers from each line into lists. Numbers past `width` are ignored."""
+        rows: list[list[float]] = []
+        for line in lines:
+            tokens: list[str] = line.split("#", 1)[0].split()
+            if len(tokens) < width:
+                raise self.error(f"Expected {width} numbers in '{line.strip()}'")
+            try:
+                rows.append([float(token) for token in tokens[:width]])
+            except ValueError:
+                raise self.error(f"Expected numbers in '{line.strip()}'") from None
+        return rows
+
+    def error(
+        self,
+        message: str,
+    ) -> ValueError:
+        return ValueError(f"{message} near line {self._index} of the ASCII model.")
+
+
+class _MeshBlocks:
+    """The per-vertex blocks of a mesh node as they are written, before they are indexed by the faces."""
+
+    def __init__(self):
+        self.vertices: NDArray[np.float64] | list[list[float]] | None = None
+        self.faces: NDArray[np.float64] | list[list[float]] | None = None
+        self.uv1: NDArray[np.float64] | list[list[float]] | None = None
+        self.uv2: NDArray[np.float64] | list[list[float]] | None = None
+        self.normals: NDArray[np.float64] | list[list[float]] | None = None
+        self.tangents: NDArray[np.float64] | list[list[float]] | None = None
+        self.weights: list[tuple[list[str], list[float]]] | None = None
+        self.constraints: list[float] | None = None
+
 
 class MDLAsciiReader:
     def __init__(
@@ -19,292 +408,833 @@ class MDLAsciiReader:
         size: int = 0,
     ):
         self._mdl: MDL | None = None
-        self._reader: BinaryReader = BinaryReader.from_auto(source, offset)
+        self._reader: BinaryReader = BinaryReader.from_auto(source, offset, size or None)
+        self._lines: _Lines = _Lines("")
+        self._skin_weights: list[tuple[MDLNode, list[tuple[list[str], list[float]]]]] = []
 
     def load(
         self,
         auto_close: bool = True,
     ) -> MDL:
+        """Reads an ASCII model, the format written by MDLAsciiWriter and by the common modelling tools.
+
+        Args:
+        ----
+            auto_close: Whether to close the reader after reading is complete (default True).
+
+        Returns:
+        -------
+            The model.
+
+        Raises:
+        ------
+            ValueError: If the model is malformed, with the line the problem was found at.
+
+        Processing Logic:
+        ----------------
+            - Reads the model one line at a time, except blocks of numbers (vertices, faces, texture coordinates and
+              keys), which are parsed in one go, straight into arrays if numpy is installed
+            - Links the nodes of the geometry and of each animation to their parents by name once they are all read
+            - Numbers the geometry nodes in the order they appear and resolves the bones of the skin weights by name
+            - Texture coordinates indexed apart from the vertices are merged into them, splitting vertices where needed
+        """
         self._mdl = MDL()
+        self._lines = _Lines(self._reader.read_all().decode("windows-1252", errors="replace"))
+        self._skin_weights = []
+
+        nodes: list[tuple[MDLNode, str]] = []
+        while True:
+            tokens: list[str] | None = self._lines.next()
+            if tokens is None:
+                break
+            keyword: str = tokens[0].lower()
+            if keyword == "newmodel":
+                self._mdl.name = self._argument(tokens, 1)
+            elif keyword == "setsupermodel":
+                self._mdl.supermodel = self._argument(tokens, 2)
+            elif keyword == "ignorefog":
+                self._mdl.fog = not _to_bool(self._argument(tokens, 1))
+            elif keyword == "node":
+                nodes.append(self._load_node(tokens, anim=False))
+            elif keyword == "newanim":
+                self._mdl.anims.append(self._load_anim(tokens))
+            elif keyword == "donemodel":
+                break
+
+        for node_id, (node, _) in enumerate(nodes):
+            node.node_id = node_id
+        if nodes:
+            self._mdl.root = self._link(nodes)
+        self._load_weights([node for node, _ in nodes])
 
         if auto_close:
             self._reader.close()
 
         return self._mdl
 
+    def _argument(
+        self,
+        tokens: list[str],
+        index: int,
+    ) -> str:
+        if len(tokens) <= index:
+            raise self._lines.error(f"Expected a value after '{tokens[0]}'")
+        return tokens[index]
 
-class MDLAsciiWriter:
-    def __init__(
+    def _link(
         self,
-        mdl: MDL,
-        target: TARGET_TYPES,
-    ):
-        self._mdl = mdl
-        self._writer = BinaryWriter.to_auto(target)
+        nodes: list[tuple[MDLNode, str]],
+    ) -> MDLNode:
+        """Attaches each node to the first node named like its parent and returns the first node without a parent."""
+        by_name: dict[str, MDLNode] = {}
+        for node, _ in nodes:
+            by_name.setdefault(node.name.lower(), node)
+        root: MDLNode | None = None
+        for node, parent_name in nodes:
+            if parent_name.lower() == "null":
+                if root is None:
+                    root = node
+                    continue
+                parent: MDLNode | None = root
+            else:
+                parent = by_name.get(parent_name.lower())
+                if parent is None or parent is node:
+                    msg = f"The parent '{parent_name}' of node '{node.name}' is not in the ASCII model."
+                    raise ValueError(msg)
+            parent.children.append(node)
+        if root is None:
+            msg = "The ASCII model has no root node."
+            raise ValueError(msg)
+        return root
 
-    def write(
+    def _load_anim(
         self,
-        auto_close: bool = True,
-    ):
-        """Writes a 3D model to a .mdl file.
+        tokens: list[str],
+    ) -> MDLAnimation:
+        anim = MDLAnimation()
+        anim.name = self._argument(tokens, 1)
+        nodes: list[tuple[MDLNode, str]] = []
+        while True:
+            tokens = self._lines.next()  # type: ignore[assignment]
+            if tokens is None:
+                raise self._lines.error(f"Missing 'doneanim' for animation '{anim.name}'")
+            keyword: str = tokens[0].lower()
+            if keyword == "doneanim":
+                break
+            if keyword == "length":
+                anim.anim_length = float(self._argument(tokens, 1))
+            elif keyword == "transtime":
+                anim.transition_length = float(self._argument(tokens, 1))
+            elif keyword == "animroot":
+                anim.root_model = tokens[1] if len(tokens) > 1 else ""
+            elif keyword == "event":
+                anim.events.append(self._event(tokens[1:]))
+            elif keyword == "eventlist":
+                anim.events.extend(self._event(line.split("#", 1)[0].split()) for line in self._lines.take_list())
+            elif keyword == "node":
+                nodes.append(self._load_node(tokens, anim=True))
+        if nodes:
+            anim.root = self._link(nodes)
+        return anim
 
-        Args:
-        ----
-            auto_close: Whether to close the writer after writing is complete (default True).
+    def _event(
+        self,
+        tokens: list[str],
+    ) -> MDLEvent:
+        if len(tokens) < 2:  # noqa: PLR2004
+            raise self._lines.error("Expected the time and name of an event")
+        event = MDLEvent()
+        event.activation_time = float(tokens[0])
+        event.name = tokens[1]
+        return event
 
-        Returns:
-        -------
-            None: Does not return anything, writes directly to the writer
+    def _load_node(
+        self,
+        tokens: list[str],
+        anim: bool,
+    ) -> tuple[MDLNode, str]:
+        """Reads a node up to its 'endnode' and returns it with the name of its parent."""
+        if len(tokens) < 3:  # noqa: PLR2004
+            raise self._lines.error("Expected the type and name of the node")
+        node_type: str = tokens[1].lower()
+        node = MDLNode()
+        node.name = tokens[2]
+        blocks: _MeshBlocks | None = None
+        if not anim:
+            if node_type in _MESH_NODE_TYPES:
+                node.mesh = MDLMesh()
+                blocks = _MeshBlocks()
+            if node_type == "skin":
+                node.skin = MDLSkin()
+            elif node_type == "danglymesh":
+                node.dangly = MDLDangly()
+            elif node_type == "aabb":
+                node.aabb = MDLWalkmesh()
+            elif node_type == "lightsaber":
+                node.saber = MDLSaber()
+            elif node_type == "light":
+                node.light = MDLLight()
+            elif node_type == "emitter":
+                node.emitter = MDLEmitter()
+            elif node_type == "reference":
+                node.reference = MDLReference()
 
-        Processing Logic:
-        ----------------
-            - Writes header information for the model
-            - Writes geometry bounds and info
-            - Writes each node in the model
-            - Writes header for each animation
-            - Writes animation length, transition and root node
-            - Writes each node for the animation
-            - Closes the writer if auto_close is True.
-        """
-        self._writer.write_line(0, f"newmodel {self._mdl.name}")
-        self._writer.write_line(0, f"setsupermodel {self._mdl.name} {self._mdl.supermodel}")
-        self._writer.write_line(0, f"ignorefog {int(not self._mdl.fog)}")
+        parent_name: str = "NULL"
+        while True:
+            tokens = self._lines.next()  # type: ignore[assignment]
+            if tokens is None:
+                raise self._lines.error(f"Missing 'endnode' for node '{node.name}'")
+            keyword: str = tokens[0].lower()
+            if keyword == "endnode":
+                break
+            if keyword in _BLOCK_KEYWORDS:
+                raise self._lines.error(f"Missing 'endnode' for node '{node.name}'")
+            if keyword == "parent":
+                parent_name = tokens[1] if len(tokens) > 1 else "NULL"
+            elif blocks is not None and self._load_mesh_line(node, blocks, keyword, tokens):
+                continue
+            elif node.light is not None and self._load_light_line(node.light, keyword, tokens):
+                continue
+            elif node.emitter is not None and self._load_emitter_line(node.emitter, keyword, tokens):
+                continue
+            elif node.reference is not None and keyword in _REFERENCE_PROPERTY_LOOKUP:
+                attribute, convert = _REFERENCE_PROPERTY_LOOKUP[keyword]
+                setattr(node.reference, attribute, convert(self._argument(tokens, 1)))
+            elif keyword.endswith("key") and self._load_keys(node, keyword, tokens):
+                continue
+            elif keyword in _CONTROLLER_LOOKUP and len(tokens) > 1:
+                self._load_static_controller(node, _CONTROLLER_LOOKUP[keyword], tokens, anim)
 
-        self._writer.write_line(0, f"beginmodelgeom {self._mdl.name}")
-        self._writer.write_line(1, "bmin 0 0 0")
-        self._writer.write_line(1, "bmax 0 0 0")
-        self._writer.write_line(1, "radius 0")
+        if blocks is not None:
+            self._load_mesh(node, blocks)
+        return node, parent_name
 
-        all_nodes = self._mdl.all_nodes()
-        for node in all_nodes:
-            self._write_node(node, anim=False, indent=0)
-        self._writer.write_line(0, f"endmodelgeom {self._mdl.name}")
+    def _load_static_controller(
+        self,
+        node: MDLNode,
+        controller_type: int,
+        tokens: list[str],
+        anim: bool,
+    ):
+        try:
+            data: list[float] = [float(token) for token in tokens[1:]]
+        except ValueError:
+            raise self._lines.error(f"Expected numbers after '{tokens[0]}'") from None
+        if controller_type == _ORIENTATION_CONTROLLER and len(data) == 4:  # noqa: PLR2004
+            data = list(_axis_angle_to_quaternion(*data))
+        controller = MDLController()
+        controller.controller_type = controller_type  # type: ignore[assignment]
+        controller.rows = [MDLControllerRow(0.0, data)]
+        node.controllers.append(controller)
+        if not anim and controller_type == _BASE_CONTROLLERS["position"] and len(data) == 3:  # noqa: PLR2004
+            node.position = Vector3(*data)
+        elif not anim and controller_type == _ORIENTATION_CONTROLLER and len(data) == 4:  # noqa: PLR2004
+            node.orientation = Vector4(*data)
 
-        for anim in self._mdl.anims:
-            self._writer.write_line(0, f"newanim {anim.name} {anim.root_model}")
+    def _load_keys(
+        self,
+        node: MDLNode,
+        keyword: str,
+        tokens: list[str],
+    ) -> bool:
+        """Reads a '<controller>key' or '<controller>bezierkey' list, returns False if the keyword is not a controller."""
+        name: str = keyword[:-3]
+        bezier: bool = name.endswith("bezier")
+        if bezier:
+            name = name[:-6]
+        controller_type: int | None = _CONTROLLER_LOOKUP.get(name)
+        if controller_type is None:
+            return False
+        lines: list[str] = self._lines.take_rows(_to_int(tokens[1]) if len(tokens) > 1 else None)
+        controller = MDLController()
+        controller.controller_type = controller_type  # type: ignore[assignment]
+        controller.bezier = bezier
+        if lines:
+            width: int = len(lines[0].split("#", 1)[0].split())
+            if width < 2:  # noqa: PLR2004
+                raise self._lines.error(f"Expected a time and values in the keys of '{tokens[0]}'")
+            orientation: bool = controller_type == _ORIENTATION_CONTROLLER and width == 5  # noqa: PLR2004
+            if numpy_available and len(lines) >= _ARRAY_KEY_COUNT:
+                keys: NDArray[np.float64] = self._lines.numbers(lines, width)  # type: ignore[assignment]
+                if orientation:
+                    keys = np.column_stack((keys[:, 0], _axis_angles_to_quaternions(keys[:, 1:])))
+                controller.key_array = keys.astype(np.float32)
+            else:
+                rows: list[list[float]] = self._lines.rows(lines, width)
+                if orientation:
+                    rows = [[row[0], *_axis_angle_to_quaternion(*row[1:])] for row in rows]
+                controller.rows = [MDLControllerRow(row[0], row[1:]) for row in rows]
+        node.controllers.append(controller)
+        return True
 
-            self._writer.write_line(1, f"length {anim.anim_length}")
-            self._writer.write_line(1, f"transtime {anim.transition_length}")
-            self._writer.write_line(1, f"animroot {anim.root_model}")  # ???
+    def _load_mesh_line(
+        self,
+        node: MDLNode,
+        blocks: _MeshBlocks,
+        keyword: str,
+        tokens: list[str],
+    ) -> bool:
+        """Reads a mesh property or block, returns False if the keyword is not one."""
+        mesh: MDLMesh = node.mesh  # type: ignore[assignment]
+        if keyword in ("diffuse", "ambient"):
+            if len(tokens) < 4:  # noqa: PLR2004
+                raise self._lines.error(f"Expected a color after '{tokens[0]}'")
+            setattr(mesh, keyword, Color(float(tokens[1]), float(tokens[2]), float(tokens[3])))
+        elif keyword in ("bitmap", "texture0"):
+            mesh.texture_1 = self._argument(tokens, 1)
+        elif keyword in ("lightmap", "bitmap2", "texture1"):
+            mesh.texture_2 = self._argument(tokens, 1)
+        elif keyword == "verts":
+            blocks.vertices = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 3)
+        elif keyword == "faces":
+            blocks.faces = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 8)
+        elif keyword == "tverts":
+            blocks.uv1 = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 2)
+        elif keyword == "tverts1":
+            blocks.uv2 = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 2)
+        elif keyword == "normals":
+            blocks.normals = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 3)
+        elif keyword == "tangents":
+            blocks.tangents = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 9)
+        elif keyword == "weights" and node.skin is not None:
+            blocks.weights = []
+            for line in self._lines.take(_to_int(self._argument(tokens, 1))):
+                values: list[str] = line.split("#", 1)[0].split()
+                try:
+                    blocks.weights.append((values[0::2], [float(weight) for weight in values[1::2]]))
+                except ValueError:
+                    raise self._lines.error(f"Expected bone names and weights in '{line.strip()}'") from None
+        elif keyword == "constraints" and node.dangly is not None:
+            constraints = self._lines.numbers(self._lines.take(_to_int(self._argument(tokens, 1))), 1)
+            blocks.constraints = [row[0] for row in constraints.tolist()] if numpy_available else [row[0] for row in constraints]
+        elif keyword in ("displacement", "tightness", "period") and node.dangly is not None:
+            setattr(node.dangly, keyword, float(self._argument(tokens, 1)))
+        elif keyword == "aabb" and node.aabb is not None:
+            node.aabb.aabbs = self._aabbs(tokens[1:])
+        elif keyword in _MESH_PROPERTY_LOOKUP:
+            attribute, convert = _MESH_PROPERTY_LOOKUP[keyword]
+            setattr(mesh, attribute, convert(self._argument(tokens, 1)))
+        else:
+            return False
+        return True
 
-            for node in anim.all_nodes():
-                self._write_node(node, anim=True, indent=1)
+    def _aabbs(
+        self,
+        tokens: list[str],
+    ) -> list[tuple[Vector3, Vector3, int]]:
+        """Reads the rows of 7 numbers of an 'aabb' block, the first of which may be on the 'aabb' line."""
+        rows: list[list[str]] = [tokens] if tokens else []
+        while True:
+            tokens = self._lines.peek()  # type: ignore[assignment]
+            if tokens is None:
+                break
+            try:
+                float(tokens[0])
+            except ValueError:
+                break
+            rows.append(tokens)
+            self._lines.next()
+        aabbs: list[tuple[Vector3, Vector3, int]] = []
+        for row in rows:
+            if len(row) < 7:  # noqa: PLR2004
+                raise self._lines.error("Expected 7 numbers in each row of 'aabb'")
+            values: list[float] = [float(value) for value in row[:6]]
+            aabbs.append((Vector3(*values[:3]), Vector3(*values[3:6]), _to_int(row[6])))
+        return aabbs
 
-            self._writer.write_line(0, f"doneanim {anim.name} {anim.root_model}")
+    def _load_light_line(
+        self,
+        light: MDLLight,
+        keyword: str,
+        tokens: list[str],
+    ) -> bool:
+        """Reads a light property or list, returns False if the keyword is not one."""
+        if keyword in _LIGHT_PROPERTY_LOOKUP:
+            attribute, convert = _LIGHT_PROPERTY_LOOKUP[keyword]
+            setattr(light, attribute, convert(self._argument(tokens, 1)))
+        elif keyword == "texturenames":
+            light.flare_textures = [line.split()[0] for line in self._lines.take_rows(_to_int(self._argument(tokens, 1)))]
+        elif keyword in ("flaresizes", "flarepositions"):
+            rows = self._lines.numbers(self._lines.take_rows(_to_int(self._argument(tokens, 1))), 1)
+            values: list[float] = [row[0] for row in (rows.tolist() if numpy_available else rows)]
+            if keyword == "flaresizes":
+                light.flare_sizes = values
+            else:
+                light.flare_positions = values
+        elif keyword == "flarecolorshifts":
+            rows = self._lines.numbers(self._lines.take_rows(_to_int(self._argument(tokens, 1))), 3)
+            light.flare_color_shifts = [Color(*row) for row in (rows.tolist() if numpy_available else rows)]
+        else:
+            return False
+        return True
 
-        if auto_close:
-            self._writer.close()
+    def _load_emitter_line(
+        self,
+        emitter: MDLEmitter,
+        keyword: str,
+        tokens: list[str],
+    ) -> bool:
+        """Reads an emitter property or flag, returns False if the keyword is not one."""
+        if keyword in _EMITTER_PROPERTY_LOOKUP:
+            attribute, convert = _EMITTER_PROPERTY_LOOKUP[keyword]
+            setattr(emitter, attribute, convert(self._argument(tokens, 1)))
+        elif keyword in _EMITTER_FLAG_LOOKUP:
+            if _to_bool(self._argument(tokens, 1)):
+                emitter.flags |= _EMITTER_FLAG_LOOKUP[keyword]
+            else:
+                emitter.flags &= ~_EMITTER_FLAG_LOOKUP[keyword]
+        else:
+            return False
+        return True
 
-    def _write_node(
+    def _load_mesh(
         self,
         node: MDLNode,
-        anim: bool,
-        indent: int,
+        blocks: _MeshBlocks,
     ):
-        """Writes a node to the MDL file.
+        """Fills in the mesh of a node from its blocks.
 
-        Args:
-        ----
-            node: MDLNode: The node to write
-            anim: bool: Whether to write animation controllers
-            indent: int: The indentation level
-
-        Writes the node header and properties. Then:
-        1. Writes the parent, orientation, and position
-        2. Writes mesh properties if it has a mesh
-        3. Writes skinning weights if it has a skin
-        4. Writes animation controllers if writing animation
-        5. Writes the node closing tag.
+        In ASCII models the faces index the vertices and the texture coordinates separately. Where the two indices are
+        the same everywhere the blocks are used as they are, otherwise each distinct (vertex, texture coordinate) pair
+        becomes a vertex, in the order the faces first use them.
         """
-        parent = self._mdl.find_parent(node)
+        if numpy_available:
+            vertex_map: list[int] | None = self._load_mesh_arrays(node, blocks)
+        else:
+            vertex_map = self._load_mesh_objects(node, blocks)
+
+        if node.skin is not None and blocks.weights is not None:
+            weights: list[tuple[list[str], list[float]]] = blocks.weights
+            if vertex_map is not None:
+                weights = [weights[index] for index in vertex_map] if max(vertex_map, default=-1) < len(weights) else []
+            self._skin_weights.append((node, weights))
+        if node.dangly is not None and blocks.constraints is not None:
+            constraints: list[float] = blocks.constraints
+            if vertex_map is not None:
+                constraints = [constraints[index] for index in vertex_map] if max(vertex_map, default=-1) < len(constraints) else []
+            node.dangly.constraints = constraints
+
+    def _check_indices(
+        self,
+        node_name: str,
+        largest: int,
+        count: int,
+        what: str,
+    ):
+        if largest >= count:
+            msg = f"A face of node '{node_name}' uses {what} {largest}, but there are only {count}."
+            raise ValueError(msg)
+
+    def _check_count(
+        self,
+        node_name: str,
+        count: int,
+        vertex_count: int,
+        what: str,
+    ):
+        if count != vertex_count:
+            msg = f"Node '{node_name}' has {count} {what}, but {vertex_count} vertices."
+            raise ValueError(msg)
+
+    def _load_mesh_arrays(
+        self,
+        node: MDLNode,
+        blocks: _MeshBlocks,
+    ) -> list[int] | None:
+        mesh: MDLMesh = node.mesh  # type: ignore[assignment]
+        vertices: NDArray[np.float64] = blocks.vertices if blocks.vertices is not None else np.zeros((0, 3))  # type: ignore[assignment]
+        faces: NDArray[np.float64] = blocks.faces if blocks.faces is not None else np.zeros((0, 8))  # type: ignore[assignment]
+        indices: NDArray[np.int64] = faces[:, 0:3].astype(np.int64)
+        texture_indices: NDArray[np.int64] = faces[:, 4:7].astype(np.int64)
+        uvs: list[NDArray[np.float64]] = [uv for uv in (blocks.uv1, blocks.uv2) if uv is not None]  # type: ignore[misc]
+        if faces.size:
+            self._check_indices(node.name, int(indices.max()), len(vertices), "vertex")
+            for uv in uvs:
+                self._check_indices(node.name, int(texture_indices.max()), len(uv), "texture coordinate")
+
+        vertex_map: NDArray[np.int64] | None = None
+        uv_map: NDArray[np.int64] | None = None
+        if uvs and (any(len(uv) != len(vertices) for uv in uvs) or not np.array_equal(indices, texture_indices)):
+            pairs: NDArray[np.int64] = np.stack((indices.ravel(), texture_indices.ravel()), axis=1)
+            unique, first, inverse = np.unique(pairs, axis=0, return_index=True, return_inverse=True)
+            order: NDArray[np.int64] = np.argsort(first, kind="stable")
+            rank: NDArray[np.int64] = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            vertex_map, uv_map = unique[order, 0], unique[order, 1]
+            indices = rank[inverse.ravel()].reshape(-1, 3)
+
+        mesh.position_array = (vertices if vertex_map is None else vertices[vertex_map]).astype(np.float32)
+        if blocks.uv1 is not None:
+            mesh.uv1_array = (blocks.uv1 if uv_map is None else blocks.uv1[uv_map]).astype(np.float32)  # type: ignore[index, union-attr]
+        if blocks.uv2 is not None:
+            mesh.uv2_array = (blocks.uv2 if uv_map is None else blocks.uv2[uv_map]).astype(np.float32)  # type: ignore[index, union-attr]
+        if blocks.normals is not None:
+            self._check_count(node.name, len(blocks.normals), len(vertices), "normals")
+            mesh.normal_array = (blocks.normals if vertex_map is None else blocks.normals[vertex_map]).astype(np.float32)  # type: ignore[index, union-attr]
+        if blocks.tangents is not None:
+            self._check_count(node.name, len(blocks.tangents), len(vertices), "tangents")
+            tangents: NDArray[np.float64] = blocks.tangents if vertex_map is None else blocks.tangents[vertex_map]  # type: ignore[assignment, index]
+            mesh.tangent_space_array = tangents.astype(np.float32).reshape(-1, 3, 3)
+        face_array: NDArray = np.zeros(len(faces), dtype=FACE_DTYPE)
+        face_array["vertices"] = indices
+        face_array["material"] = faces[:, 7]
+        mesh.face_array = face_array
+        return None if vertex_map is None else vertex_map.tolist()
+
+    def _load_mesh_objects(
+        self,
+        node: MDLNode,
+        blocks: _MeshBlocks,
+    ) -> list[int] | None:
+        mesh: MDLMesh = node.mesh  # type: ignore[assignment]
+        vertices: list[list[float]] = blocks.vertices or []  # type: ignore[assignment]
+        faces: list[list[float]] = blocks.faces or []  # type: ignore[assignment]
+        uvs: list[list[list[float]]] = [uv for uv in (blocks.uv1, blocks.uv2) if uv is not None]  # type: ignore[misc]
+        rows: list[tuple[list[int], list[int], int]] = [([int(v) for v in row[0:3]], [int(t) for t in row[4:7]], int(row[7])) for row in faces]
+        if rows:
+            self._check_indices(node.name, max(max(row[0]) for row in rows), len(vertices), "vertex")
+            for uv in uvs:
+                self._check_indices(node.name, max(max(row[1]) for row in rows), len(uv), "texture coordinate")
 
-        newline = self._writer.write_line
+        vertex_map: list[int] | None = None
+        uv_map: list[int] | None = None
+        if uvs and (any(len(uv) != len(vertices) for uv in uvs) or any(row[0] != row[1] for row in rows)):
+            new_indices: dict[tuple[int, int], int] = {}
+            vertex_map, uv_map = [], []
+            split_rows: list[tuple[list[int], list[int], int]] = []
+            for vertex_indices, texture_indices, material in rows:
+                face_indices: list[int] = []
+                for pair in zip(vertex_indices, texture_indices):
+                    index: int | None = new_indices.get(pair)
+                    if index is None:
+                        index = new_indices[pair] = len(vertex_map)
+                        vertex_map.append(pair[0])
+                        uv_map.append(pair[1])
+                    face_indices.append(index)
+                split_rows.append((face_indices, face_indices, material))
+            rows = split_rows
 
-        newline(indent + 0, f"node {self._node_type(node)} {node.name}")
-        newline(indent + 1, f'parent {"NULL" if parent is None else parent.name}')
+        mesh.vertex_positions = [Vector3(*vertices[index]) for index in (range(len(vertices)) if vertex_map is None else vertex_map)]
+        for attribute, uv in (("vertex_uv1", blocks.uv1), ("vertex_uv2", blocks.uv2)):
+            if uv is not None:
+                setattr(mesh, attribute, [Vector2(*uv[index]) for index in (range(len(uv)) if uv_map is None else uv_map)])  # type: ignore[index]
+        if blocks.normals is not None:
+            self._check_count(node.name, len(blocks.normals), len(vertices), "normals")
+            mesh.vertex_normals = [Vector3(*blocks.normals[index]) for index in (range(len(vertices)) if vertex_map is None else vertex_map)]  # type: ignore[index]
+        mesh.faces = []
+        for (v1, v2, v3), _, material in rows:
+            face = MDLFace()
+            face.v1, face.v2, face.v3 = v1, v2, v3
+            face.material = surface_material(material)
+            mesh.faces.append(face)
+        return vertex_map
 
-        if parent is not None or not anim:
-            newline(indent + 1, f"orientation {node.orientation.x} {node.orientation.y} {node.orientation.z} {node.orientation.w}")
-            newline(indent + 1, f"position {node.position.x} {node.position.y} {node.position.z}")
-            self._write_controllers(node, node.controllers, indent + 1)
+    def _load_weights(
+        self,
+        nodes: list[MDLNode],
+    ):
+        """Resolves the bone names of the skin weights to nodes, now that every node has its id.
 
-            if node.mesh:
-                self._write_mesh_data(newline, indent, node)
-        if anim:
-            self._write_anim_controllers(node, node.controllers, indent + 1)
+        The bones of a skin are numbered in the order its weights first use them.
+        """
+        node_ids: dict[str, int] = {}
+        for node in nodes:
+            node_ids.setdefault(node.name.lower(), node.node_id)
+        for node, weights in self._skin_weights:
+            skin: MDLSkin = node.skin  # type: ignore[assignment]
+            bones: dict[int, int] = {}
+            vertex_bones: list[tuple[list[float], list[float]]] = []
+            for names, values in weights:
+                vertex_weights: list[float] = [0.0, 0.0, 0.0, 0.0]
+                vertex_indices: list[float] = [-1.0, -1.0, -1.0, -1.0]
+                for i, (name, weight) in enumerate(zip(names[:4], values[:4])):
+                    node_id: int | None = node_ids.get(name.lower())
+                    if node_id is None:
+                        msg = f"The weights of skin '{node.name}' use the bone '{name}', which is not in the ASCII model."
+                        raise ValueError(msg)
+                    vertex_indices[i] = float(bones.setdefault(node_id, len(bones)))
+                    vertex_weights[i] = weight
+                vertex_bones.append((vertex_weights, vertex_indices))
 
-        newline(indent + 0, "endnode")
+            skin.bonemap = [-1.0] * len(nodes)  # type: ignore[list-item]
+            for node_id, bone in bones.items():
+                skin.bonemap[node_id] = float(bone)  # type: ignore[call-overload]
+            skin.bone_indices = tuple([*list(bones)[:16], *[0] * max(0, 16 - len(bones))])  # type: ignore[assignment]
+            if numpy_available:
+                skin.vertex_bone_array = np.array(vertex_bones, dtype=np.float32).reshape(len(vertex_bones), 2, 4)
+            else:
+                skin.vertex_bones = []
+                for vertex_weights, vertex_indices in vertex_bones:
+                    bone_vertex = MDLBoneVertex()
+                    bone_vertex.vertex_weights = tuple(vertex_weights)  # type: ignore[assignment]
+                    bone_vertex.vertex_indices = tuple(vertex_indices)  # type: ignore[assignment]
+                    skin.vertex_bones.append(bone_vertex)
 
-    def _write_mesh_data(self, newline: Callable, indent: int, node: MDLNode):
-        """Writes mesh node data to a file in MDL format.
+
+class MDLAsciiWriter:
+    def __init__(
+        self,
+        mdl: MDL,
+        target: TARGET_TYPES,
+    ):
+        self._mdl: MDL = mdl
+        self._writer: BinaryWriter = BinaryWriter.to_auto(target)
+        self._lines: list[str] = []
+        self._node_names: dict[int, str] = {}
+
+    def write(
+        self,
+        auto_close: bool = True,
+    ):
+        """Writes a 3D model as an ASCII model.
 
         Args:
         ----
-            self: The class instance
-            newline: Function to write a new line
-            indent: String of spaces for indentation
-            node: Mesh node object
+            auto_close: Whether to close the writer after writing is complete (default True).
 
         Processing Logic:
         ----------------
-            - Writes mesh properties like diffuse color, texture, etc
-            - Writes vertex position data
-            - Writes UV data if present
-            - Writes face index data
-            - Writes bone weight data if node has skin.
+            - Writes the model header, then the geometry nodes with each parent before its children
+            - Writes single key controllers of the geometry as plain properties and the others as key lists
+            - Writes orientations as axis and angle, the model itself is left untouched
+            - Writes each animation with its events and nodes, then closes the writer if auto_close is True.
         """
-        newline(
-            indent + 1,
-            f"diffuse {node.mesh.diffuse.r} {node.mesh.diffuse.g} {node.mesh.diffuse.b}",
-        )
-        newline(
-            indent + 1,
-            f"ambient {node.mesh.ambient.r} {node.mesh.ambient.g} {node.mesh.ambient.b}",
-        )
-        newline(indent + 1, f"bitmap {node.mesh.texture_1}")
-        newline(indent + 1, f"transparencyhint {node.mesh.transparency_hint}")
-        newline(indent + 1, f"animateuv {int(node.mesh.animate_uv)}")
-        newline(indent + 1, f"uvdirectionx {int(node.mesh.uv_direction_x)}")
-        newline(indent + 1, f"uvjitter {int(node.mesh.uv_jitter)}")
-        newline(indent + 1, f"uvjitterspeed {int(node.mesh.uv_jitter_speed)}")
-        newline(indent + 1, f"lightmapped {int(node.mesh.has_lightmap)}")
-        newline(indent + 1, f"rotatetexture {int(node.mesh.rotate_texture)}")
-        newline(
-            indent + 1,
-            f"m_bIsBackgroundGeometry {int(node.mesh.background_geometry)}",
-        )
-        newline(indent + 1, f"shadow {int(node.mesh.shadow)}")
-        newline(indent + 1, f"beaming {int(node.mesh.beaming)}")
-        newline(indent + 1, f"render {int(node.mesh.render)}")
-        newline(indent + 1, f"dirt_enabled {int(node.mesh.dirt_enabled)}")
-        newline(indent + 1, f"dirt_texture {int(node.mesh.dirt_texture)}")
-        newline(indent + 1, f"hologram_donotdraw {int(node.mesh.hide_in_hologram)}")
-
-        newline(indent + 1, f"verts {len(node.mesh.vertex_positions)}")
-        for vertex_v3 in node.mesh.vertex_positions:
-            newline(indent + 2, f"{vertex_v3.x} {vertex_v3.y} {vertex_v3.z}")
-
-        if node.mesh.vertex_uv1:
-            newline(indent + 1, f"tverts {len(node.mesh.vertex_positions)}")
-            for vertex_v2 in node.mesh.vertex_uv1:
-                newline(indent + 2, f"{vertex_v2.x} {vertex_v2.y}")
-
-        newline(indent + 1, f"faces {len(node.mesh.faces)}")
-        for face in node.mesh.faces:
-            # 4th value -> smoothing group
-            newline(indent + 2, f"{face.v1} {face.v2} {face.v3}  0  {face.v1} {face.v2} {face.v3}  {face.material.value}")
+        mdl: MDL = self._mdl
+        self._lines = []
+        self._node_names = {node.node_id: node.name for node in mdl.all_nodes()}
+        line = self._lines.append
 
-        if node.skin:
-            newline(indent + 1, f"weights {len(node.skin.vertex_bones)}")
-            for bone in node.skin.vertex_bones:
-                line = ""
-                if bone.vertex_indices[0] != -1.0:
-                    node_id = int(node.skin.bone_indices[int(bone.vertex_indices[0])])
-                    name = self._mdl.get_by_node_id(node_id).name
-                    line += f"{name} {bone.vertex_weights[0]} "
-                if bone.vertex_indices[1] != -1.0:
-                    node_id = node.skin.bone_indices[int(bone.vertex_indices[1])]
-                    name = self._mdl.get_by_node_id(node_id).name
-                    line += f"{name} {bone.vertex_weights[1]} "
-                if bone.vertex_indices[2] != -1.0:
-                    node_id = node.skin.bone_indices[int(bone.vertex_indices[2])]
-                    name = self._mdl.get_by_node_id(node_id).name
-                    line += f"{name} {bone.vertex_weights[2]} "
-                if bone.vertex_indices[3] != -1.0:
-                    node_id = node.skin.bone_indices[int(bone.vertex_indices[3])]
-                    name = self._mdl.get_by_node_id(node_id).name
-                    line += f"{name} {bone.vertex_weights[3]} "
-                newline(indent + 2, line)
+        line(f"newmodel {mdl.name}")
+        line(f"setsupermodel {mdl.name} {mdl.supermodel or 'NULL'}")
+        line(f"ignorefog {int(not mdl.fog)}")
+        line(f"beginmodelgeom {mdl.name}")
+        for node, parent in _walk(mdl.root):
+            self._write_node(node, parent, anim=False)
+        line(f"endmodelgeom {mdl.name}")
+
+        for anim in mdl.anims:
+            line(f"newanim {anim.name} {mdl.name}")
+            line(f"  length {_number(anim.anim_length)}")
+            line(f"  transtime {_number(anim.transition_length)}")
+            if anim.root_model:
+                line(f"  animroot {anim.root_model}")
+            for event in anim.events:
+                line(f"  event {_number(event.activation_time)} {event.name}")
+            for node, parent in _walk(anim.root):
+                self._write_node(node, parent, anim=True)
+            line(f"doneanim {anim.name} {mdl.name}")
+        line(f"donemodel {mdl.name}")
+
+        self._writer.write_bytes(("\n".join(self._lines) + "\n").encode("windows-1252"))
+        if auto_close:
+            self._writer.close()
+
+    def _write_node(
+        self,
+        node: MDLNode,
+        parent: MDLNode | None,
+        anim: bool,
+    ):
+        pad: str = "  " if anim else ""
+        line = self._lines.append
+        line(f"{pad}node {'dummy' if anim else self._node_type(node)} {node.name}")
+        line(f"{pad}  parent {'NULL' if parent is None else parent.name}")
+        self._write_controllers(node, f"{pad}  ", anim)
+        if not anim:
+            if node.mesh is not None:
+                self._write_mesh(node, f"{pad}  ")
+            if node.light is not None:
+                self._write_light(node.light, f"{pad}  ")
+            if node.emitter is not None:
+                self._write_properties(node.emitter, _EMITTER_PROPERTIES, f"{pad}  ")
+                for bit, name in enumerate(_EMITTER_FLAGS):
+                    line(f"{pad}  {name} {int(bool(node.emitter.flags & 1 << bit))}")
+            if node.reference is not None:
+                self._write_properties(node.reference, _REFERENCE_PROPERTIES, f"{pad}  ")
+        line(f"{pad}endnode")
 
     def _write_controllers(
         self,
         node: MDLNode,
-        controllers: list[MDLController],
-        indent: int,
+        pad: str,
+        anim: bool,
     ):
-        """Writes MDL controllers to the MDL file.
+        """Writes the controllers of a node.
 
-        Args:
-        ----
-            node: MDLNode - The node to write controllers for
-            controllers: list[MDLController] - The controllers to write
-            indent: int - The indentation level
+        Controllers of the geometry with a single key are written as plain properties, like the modelling tools do. A
+        geometry node without position or orientation controllers gets them from its position and orientation.
+        """
+        line = self._lines.append
+        names: dict[int, str] = _controller_names_of(node)
+        controller_types: set[int] = {int(controller.controller_type) for controller in node.controllers}
+        if not anim:
+            position: tuple[float, float, float] = (node.position.x, node.position.y, node.position.z)
+            if _BASE_CONTROLLERS["position"] not in controller_types and position != (0.0, 0.0, 0.0):
+                line(f"{pad}position {' '.join(map(_number, position))}")
+            orientation: tuple[float, float, float, float] = (node.orientation.x, node.orientation.y, node.orientation.z, node.orientation.w)
+            if _ORIENTATION_CONTROLLER not in controller_types and orientation != (0.0, 0.0, 0.0, 1.0):
+                line(f"{pad}orientation {' '.join(map(_number, _quaternion_to_axis_angle(*orientation)))}")
 
-        Returns:
-        -------
-            None: Writes controller values to the MDL file
+        for controller in node.controllers:
+            controller_type = int(controller.controller_type)
+            name: str | None = names.get(controller_type)
+            if numpy_available:
+                keys: list[list[float]] = controller.key_array.tolist()
+            else:
+                keys = [[row.time, *row.data] for row in controller.rows]
+            if name is None or not keys:
+                RobustRootLogger().warning("Skipped controller %s of node '%s', ASCII models have no name for it.", controller_type, node.name)
+                continue
+            orientation_keys: bool = controller_type == _ORIENTATION_CONTROLLER and not controller.bezier
+            if not anim and len(keys) == 1 and not controller.bezier:
+                line(f"{pad}{name} {_controller_values(keys[0][1:], orientation_keys)}")
+                continue
+            line(f"{pad}{name}{'bezier' if controller.bezier else ''}key {len(keys)}")
+            self._lines.extend(f"{pad}  {_number(key[0])} {_controller_values(key[1:], orientation_keys)}" for key in keys)
+            line(f"{pad}endlist")
+
+    def _write_properties(
+        self,
+        component: Any,
+        properties: tuple[tuple[str, str, Callable[[str], Any]], ...],
+        pad: str,
+    ):
+        """Writes the single value properties of a node, strings only when set."""
+        line = self._lines.append
+        for name, attribute, convert in properties:
+            value: Any = getattr(component, attribute)
+            if convert is _to_str:
+                if value:
+                    line(f"{pad}{name} {value}")
+            elif convert is float:
+                line(f"{pad}{name} {_number(value)}")
+            else:
+                line(f"{pad}{name} {int(value)}")
+
+    def _write_light(
+        self,
+        light: MDLLight,
+        pad: str,
+    ):
+        line = self._lines.append
+        self._write_properties(light, _LIGHT_PROPERTIES, pad)
+        if light.flare_textures:
+            line(f"{pad}texturenames {len(light.flare_textures)}")
+            self._lines.extend(f"{pad}  {texture}" for texture in light.flare_textures)
+        if light.flare_sizes:
+            line(f"{pad}flaresizes {len(light.flare_sizes)}")
+            self._lines.extend(f"{pad}  {_number(size)}" for size in light.flare_sizes)
+        if light.flare_positions:
+            line(f"{pad}flarepositions {len(light.flare_positions)}")
+            self._lines.extend(f"{pad}  {_number(position)}" for position in light.flare_positions)
+        if light.flare_color_shifts:
+            line(f"{pad}flarecolorshifts {len(light.flare_color_shifts)}")
+            self._lines.extend(f"{pad}  {_number(color.r)} {_number(color.g)} {_number(color.b)}" for color in light.flare_color_shifts)
+
+    def _write_mesh(
+        self,
+        node: MDLNode,
+        pad: str,
+    ):
+        """Writes the properties and the blocks of a mesh node.
 
         Processing Logic:
         ----------------
-            - Loops through each controller
-            - Checks the controller type
-            - Writes the appropriate line to the MDL file with the controller values formatted correctly
-            - Supported controller types are ILLUM_COLOR, ALPHA, SCALE.
+            - Writes the colors, the textures that are set and the other mesh properties
+            - Writes the vertices, the faces and the texture coordinates, from the arrays if numpy is installed
+            - Faces use the same indices for the vertices and the texture coordinates, with no smoothing group
+            - Writes the vertex normals, and the tangent space of bump mapped meshes if numpy is installed
+            - Writes the skin weights with bone names, the dangly constraints and the walkmesh AABB tree.
         """
-        for controller in controllers:
-            if controller.controller_type == MDLControllerType.ILLUM_COLOR:
-                red, green, blue = (
-                    controller.rows[0].data[0],
-                    controller.rows[0].data[1],
-                    controller.rows[0].data[2],
-                )
-                self._writer.write_line(indent, f"selfillumcolor {red} {green} {blue}")
+        mesh: MDLMesh = node.mesh  # type: ignore[assignment]
+        line = self._lines.append
+        lines = self._lines.extend
+        line(f"{pad}diffuse {_number(mesh.diffuse.r)} {_number(mesh.diffuse.g)} {_number(mesh.diffuse.b)}")
+        line(f"{pad}ambient {_number(mesh.ambient.r)} {_number(mesh.ambient.g)} {_number(mesh.ambient.b)}")
+        if mesh.texture_1:
+            line(f"{pad}bitmap {mesh.texture_1}")
+        if mesh.texture_2:
+            line(f"{pad}lightmap {mesh.texture_2}")
+        self._write_properties(mesh, _MESH_PROPERTIES, pad)
+
+        if numpy_available:
+            positions: list[list[float]] = mesh.position_array.tolist()
+            face_vertices: list[list[int]] = mesh.face_array["vertices"].tolist()
+            materials: list[int] = mesh.face_array["material"].tolist()
+            uv1: list[list[float]] | None = None if mesh.uv1_array is None else mesh.uv1_array.tolist()
+            uv2: list[list[float]] | None = None if mesh.uv2_array is None else mesh.uv2_array.tolist()
+            normals: list[list[float]] | None = None if mesh.normal_array is None else mesh.normal_array.tolist()
+            tangents: list[list[float]] | None = None if mesh.tangent_space_array is None else mesh.tangent_space_array.reshape(-1, 9).tolist()
+        else:
+            positions = [[v.x, v.y, v.z] for v in mesh.vertex_positions]
+            face_vertices = [[face.v1, face.v2, face.v3] for face in mesh.faces]
+            materials = [int(face.material) for face in mesh.faces]
+            uv1 = None if mesh.vertex_uv1 is None else [[v.x, v.y] for v in mesh.vertex_uv1]
+            uv2 = None if mesh.vertex_uv2 is None else [[v.x, v.y] for v in mesh.vertex_uv2]
+            normals = None if mesh.vertex_normals is None else [[v.x, v.y, v.z] for v in mesh.vertex_normals]
+            tangents = None
 
-            if controller.controller_type == MDLControllerType.ALPHA:
-                self._writer.write_line(indent, f"alpha {controller.rows[0].data[0]}")
+        line(f"{pad}verts {len(positions)}")
+        lines(f"{pad}  {x!r} {y!r} {z!r}" for x, y, z in positions)
+        line(f"{pad}faces {len(face_vertices)}")
+        lines(f"{pad}  {v1} {v2} {v3} 0 {v1} {v2} {v3} {material}" for (v1, v2, v3), material in zip(face_vertices, materials))
+        if uv1:
+            line(f"{pad}tverts {len(uv1)}")
+            lines(f"{pad}  {u!r} {v!r}" for u, v in uv1)
+        if uv2:
+            line(f"{pad}tverts1 {len(uv2)}")
+            lines(f"{pad}  {u!r} {v!r}" for u, v in uv2)
+        if normals:
+            line(f"{pad}normals {len(normals)}")
+            lines(f"{pad}  {x!r} {y!r} {z!r}" for x, y, z in normals)
+        if tangents:
+            line(f"{pad}tangents {len(tangents)}")
+            lines(f"{pad}  {' '.join(map(repr, row))}" for row in tangents)
 
-            if controller.controller_type == MDLControllerType.SCALE:
-                self._writer.write_line(indent, f"scale {controller.rows[0].data[0]}")
+        if node.skin is not None:
+            self._write_weights(node, pad)
+        if node.dangly is not None:
+            line(f"{pad}displacement {_number(node.dangly.displacement)}")
+            line(f"{pad}tightness {_number(node.dangly.tightness)}")
+            line(f"{pad}period {_number(node.dangly.period)}")
+            line(f"{pad}constraints {len(node.dangly.constraints)}")
+            lines(f"{pad}  {_number(constraint)}" for constraint in node.dangly.constraints)
+        if node.aabb is not None:
+            line(f"{pad}aabb")
+            lines(
+                f"{pad}  {_number(bb_min.x)} {_number(bb_min.y)} {_number(bb_min.z)} {_number(bb_max.x)} {_number(bb_max.y)} {_number(bb_max.z)} {face}"
+                for bb_min, bb_max, face in node.aabb.aabbs
+            )
 
-    def _write_anim_controllers(
+    def _write_weights(
         self,
         node: MDLNode,
-        controllers: list[MDLController],
-        indent: int,
+        pad: str,
     ):
-        """Writes animation controllers to the ASCII file.
-
-        Args:
-        ----
-            node: MDLNode - The node the controllers belong to
-            controllers: list[MDLController] - The controllers to write
-            indent: int - The indentation level
+        """Writes the bone weights of a skin, naming each bone after its node."""
+        skin: MDLSkin = node.skin  # type: ignore[assignment]
+        bone_nodes: dict[int, int] = {int(bone): node_id for node_id, bone in enumerate(skin.bonemap) if bone >= 0}
+        bone_names: dict[int, str] = {}
 
-        Returns:
-        -------
-            None - Writes controllers directly to the file
+        def bone_name(bone: int) -> str:
+            name: str | None = bone_names.get(bone)
+            if name is None:
+                node_id: int = bone_nodes[bone] if bone in bone_nodes else int(skin.bone_indices[bone])
+                if node_id not in self._node_names:
+                    msg = f"Bone {bone} of skin '{node.name}' is node {node_id}, which is not in the model."
+                    raise ValueError(msg)
+                name = bone_names[bone] = self._node_names[node_id]
+            return name
 
-        Writes animation controllers to the ASCII file:
-            - Converts position controllers to be relative to the node's global position
-            - Converts orientation controllers from quaternions to axis-angle format
-            - Writes each controller and row with the correct indentation.
-        """
-        for controller in controllers:
-            if controller.controller_type == MDLControllerType.POSITION:
-                self._writer.write_line(indent, "positionkey")
-
-                # Ascii position controller values are offset by the nodes global position contrary to binary
-                for row in controller.rows:
-                    global_position = self._mdl.global_position(node)
-                    row.data[0] += global_position.x
-                    row.data[1] += global_position.y
-                    row.data[2] += global_position.y
-
-            if controller.controller_type == MDLControllerType.ORIENTATION:
-                self._writer.write_line(indent, "orientationkey")
-
-                # Ascii rotation controller values are axis-aligned as opposed to binary which are quaternions
-                for row in controller.rows:
-                    aa = AxisAngle.from_quaternion(
-                        Vector4(row.data[0], row.data[1], row.data[2], row.data[3]),
-                    )
-                    row.data[0] = aa.axis.x
-                    row.data[1] = aa.axis.y
-                    row.data[2] = aa.axis.z
-                    row.data[3] = aa.angle
-
-            for row in controller.rows:
-                self._writer.write_line(indent + 1, f"{row}")
+        if numpy_available:
+            vertex_bones: list[list[list[float]]] = skin.vertex_bone_array.tolist()
+        else:
+            vertex_bones = [[list(bone.vertex_weights), list(bone.vertex_indices)] for bone in skin.vertex_bones]
+        self._lines.append(f"{pad}weights {len(vertex_bones)}")
+        self._lines.extend(
+            f"{pad}  " + " ".join(f"{bone_name(int(bone))} {_number(weight)}" for weight, bone in zip(weights, bones) if bone >= 0)
+            for weights, bones in vertex_bones
+        )
 
     def _node_type(
         self,
@@ -313,9 +1243,9 @@ class MDLAsciiWriter:
         if node.skin:
             return "skin"
         if node.dangly:
-            return "dangly"
+            return "danglymesh"
         if node.saber:
-            return "saber"
+            return "lightsaber"
         if node.aabb:
             return "aabb"
         if node.emitter:
@@ -327,3 +1257,46 @@ class MDLAsciiWriter:
         if node.mesh:
             return "trimesh"
         return "dummy"
+
+
+def _walk(
+    root: MDLNode,
+) -> list[tuple[MDLNode, MDLNode | None]]:
+    """Returns every node of the tree with its parent, each parent before its children and the children in order."""
+    nodes: list[tuple[MDLNode, MDLNode | None]] = []
+    scan: list[tuple[MDLNode, MDLNode | None]] = [(root, None)]
+    while scan:
+        node, parent = scan.pop()
+        nodes.append((node, parent))
+        scan.extend((child, node) for child in reversed(node.children))
+    return nodes
+
+
+def _controller_names_of(
+    node: MDLNode,
+) -> dict[int, str]:
+    """Returns the ASCII names of the controllers of a node, by controller type.
+
+    Nodes without a light, emitter or mesh, such as the nodes of animations, get the names of the first kind of node that
+    has all of their controllers.
+    """
+    if node.light is not None:
+        return _LIGHT_CONTROLLER_NAMES
+    if node.emitter is not None:
+        return _EMITTER_CONTROLLER_NAMES
+    if node.mesh is not None:
+        return _MESH_CONTROLLER_NAMES
+    controller_types: set[int] = {int(controller.controller_type) for controller in node.controllers}
+    for names in (_MESH_CONTROLLER_NAMES, _LIGHT_CONTROLLER_NAMES, _EMITTER_CONTROLLER_NAMES):
+        if controller_types <= names.keys():
+            return names
+    return _MESH_CONTROLLER_NAMES
+
+
+def _controller_values(
+    data: list[float],
+    orientation: bool,
+) -> str:
+    if orientation and len(data) == 4:  # noqa: PLR2004
+        data = list(_quaternion_to_axis_angle(*data))
+    return " ".join(map(_number, data))
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import os
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
+from pykotor.common.parallel import parallel_map
 from pykotor.common.stream import BinaryReader
 from pykotor.resource.formats.mdl.io_mdl import MDLBinaryReader, MDLBinaryWriter
 from pykotor.resource.formats.mdl.io_mdl_ascii import MDLAsciiReader, MDLAsciiWriter
 from pykotor.resource.type import ResourceType
+from utility.error_handling import universal_simplify_exception
+from utility.system.path import Path
 
 if TYPE_CHECKING:
     from pykotor.resource.formats.mdl.mdl_data import MDL
@@ -172,3 +175,60 @@ def bytes_mdl(
     data = bytearray()
     write_mdl(mdl, data, file_format)
     return data
+
+
+def _convert_mdl_file(
+    source: str,
+    target: str,
+    file_format: ResourceType,
+) -> str | None:
+    """Converts one model for convert_mdl_files, returns why it failed or None. Runs in worker processes."""
+    try:
+        source_ext = Path(source).with_suffix(".mdx")
+        mdl: MDL = read_mdl(source, source_ext=source_ext if source_ext.safe_isfile() else None)
+        write_mdl(mdl, target, file_format, Path(target).with_suffix(".mdx") if file_format is ResourceType.MDL else None)
+    except Exception as e:  # noqa: BLE001
+        return ": ".join(universal_simplify_exception(e))
+    return None
+
+
+def convert_mdl_files(
+    conversions: Iterable[tuple[os.PathLike | str, os.PathLike | str]],
+    file_format: ResourceType = ResourceType.MDL,
+    *,
+    max_workers: int | None = None,
+) -> dict[str, str]:
+    """Reads many model files and writes each one to its target in the specified format, spread over a pool of processes.
+
+    Binary models are read with the MDX next to them (same name, .mdx extension) and written with an MDX next to the
+    target.
+
+    Args:
+    ----
+        conversions: (source, target) pairs of file paths. The source format is detected like in read_mdl.
+        file_format: The format to write, MDL or MDL_ASCII.
+        max_workers: The number of processes to use, defaults to the number of processors. 1 converts in this process.
+
+    Returns:
+    -------
+        The reason each failed conversion failed, keyed by source path. Empty if every model was converted.
+    """
+    sources: list[str] = []
+    targets: list[str] = []
+    for source, target in conversions:
+        sources.append(str(source))
+        targets.append(str(target))
+    formats: list[ResourceType] = [file_format] * len(sources)
+
+    # A few chunks per process: models are small, but their sizes vary a lot.
+    chunksize: int = max(1, len(sources) // (4 * (max_workers or os.cpu_count() or 1)))
+    results: list[str | None] = parallel_map(
+        _convert_mdl_file,
+        sources,
+        targets,
+        formats,
+        max_workers=max_workers,
+        chunksize=chunksize,
+        task="convert models",
+    )
+    return {source: error for source, error in zip(sources, results) if error is not None}
@@ -1,14 +1,209 @@
 from __future__ import annotations
 
 from enum import IntEnum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from pykotor.common.geometry import SurfaceMaterial, Vector3, Vector4
+from pykotor.common.geometry import SurfaceMaterial, Vector2, Vector3, Vector4
 from pykotor.common.misc import Color
 from pykotor.resource.type import ResourceType
 
+try:
+    import numpy as np
+
+    numpy_available = True
+
+    # The layout of a face in the binary MDL format.
+    FACE_DTYPE = np.dtype(
+        [
+            ("normal", "<f4", 3),
+            ("coefficient", "<f4"),
+            ("material", "<u4"),
+            ("adjacent", "<u2", 3),
+            ("vertices", "<u2", 3),
+        ],
+    )
+except ImportError:
+    numpy_available = False
+
 if TYPE_CHECKING:
-    from pykotor.common.geometry import Vector2
+    from collections.abc import Callable
+
+    from numpy.typing import NDArray
+
+
+def surface_material(
+    value: int,
+) -> SurfaceMaterial | int:
+    """Returns the surface material of a face, or the value itself for render meshes that store something else in the field."""
+    try:
+        return SurfaceMaterial(value)
+    except ValueError:
+        return value
+
+
+def _object_list(
+    attribute: str,
+    to_objects: Callable[[Any], list[Any]],
+) -> property:
+    """A property holding a list of objects, built on first access if the reader stored a NumPy array instead.
+
+    Once built, the list replaces the array, so changes made to the objects are never lost to a stale array.
+    """
+
+    def getter(self) -> list[Any] | None:
+        value = getattr(self, attribute)
+        if numpy_available and isinstance(value, np.ndarray):
+            value = to_objects(value)
+            setattr(self, attribute, value)
+        return value
+
+    def setter(self, value: list[Any] | None):
+        setattr(self, attribute, value)
+
+    return property(getter, setter)
+
+
+def _array(
+    attribute: str,
+    from_objects: Callable[[list[Any]], NDArray[Any]],
+) -> property:
+    """A property returning the same data as an `_object_list` property as a NumPy array.
+
+    If the data is held as a list of objects, a new array is built from them on every access. Assigning an array stores it
+    in place of the list.
+    """
+
+    def getter(self) -> NDArray[Any] | None:
+        value = getattr(self, attribute)
+        if value is None or (numpy_available and isinstance(value, np.ndarray)):
+            return value
+        if not numpy_available:
+            msg = "numpy is required for the array views of model data."
+            raise ImportError(msg)
+        return from_objects(value)
+
+    def setter(self, value: NDArray[Any] | None):
+        setattr(self, attribute, value)
+
+    return property(getter, setter)
+
+
+def _vectors_to_array(
+    vectors: list[Any],
+    width: int,
+) -> NDArray[np.float32]:
+    components: str = "xyzw"[:width]
+    return np.array([[getattr(vector, component) for component in components] for vector in vectors], dtype=np.float32).reshape(-1, width)
+
+
+def _faces_to_objects(
+    faces: NDArray[Any],
+) -> list[MDLFace]:
+    objects: list[MDLFace] = []
+    columns = (faces[field].tolist() for field in ("normal", "coefficient", "material", "adjacent", "vertices"))
+    for normal, coefficient, material, adjacent, vertices in zip(*columns):
+        face = MDLFace()
+        face.v1, face.v2, face.v3 = vertices
+        face.a1, face.a2, face.a3 = adjacent
+        face.normal = Vector3(*normal)
+        face.coefficient = int(coefficient)
+        face.material = surface_material(material)
+        objects.append(face)
+    return objects
+
+
+def _faces_to_array(
+    faces: list[MDLFace],
+) -> NDArray[Any]:
+    return np.array(
+        [
+            (
+                (face.normal.x, face.normal.y, face.normal.z),
+                face.coefficient,
+                int(face.material),
+                (face.a1, face.a2, face.a3),
+                (face.v1, face.v2, face.v3),
+            )
+            for face in faces
+        ],
+        dtype=FACE_DTYPE,
+    )
+
+
+def _bones_to_objects(
+    bones: NDArray[np.float32],
+) -> list[MDLBoneVertex]:
+    objects: list[MDLBoneVertex] = []
+    for weights, indices in bones.tolist():
+        vertex_bone = MDLBoneVertex()
+        vertex_bone.vertex_weights = tuple(weights)
+        vertex_bone.vertex_indices = tuple(indices)
+        objects.append(vertex_bone)
+    return objects
+
+
+def _bones_to_array(
+    vertex_bones: list[MDLBoneVertex],
+) -> NDArray[np.float32]:
+    return np.array([(bone.vertex_weights, bone.vertex_indices) for bone in vertex_bones], dtype=np.float32).reshape(-1, 2, 4)
+
+
+def _keys_to_rows(
+    keys: NDArray[np.float32],
+) -> list[MDLControllerRow]:
+    return [MDLControllerRow(key[0], key[1:]) for key in keys.tolist()]
+
+
+def _rows_to_keys(
+    rows: list[MDLControllerRow],
+) -> NDArray[np.float32]:
+    if not rows:
+        return np.zeros((0, 1), dtype=np.float32)
+    return np.array([[row.time, *row.data] for row in rows], dtype=np.float32).reshape(len(rows), -1)
+
+
+def _slerp(
+    start: NDArray[np.float64],
+    end: NDArray[np.float64],
+    amount: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Interpolates (n, 4) rows of x, y, z, w quaternions along the shortest arc, `amount` is (n, 1)."""
+    dot: NDArray[np.float64] = np.sum(start * end, axis=1, keepdims=True)
+    end = np.where(dot < 0, -end, end)
+    dot = np.minimum(np.abs(dot), 1.0)
+    angle: NDArray[np.float64] = np.arccos(dot)
+    sine: NDArray[np.float64] = np.sin(angle)
+    close: NDArray[np.bool_] = sine < 1e-6  # noqa: PLR2004
+    safe_sine: NDArray[np.float64] = np.where(close, 1.0, sine)
+    start_weight = np.where(close, 1 - amount, np.sin((1 - amount) * angle) / safe_sine)
+    end_weight = np.where(close, amount, np.sin(amount * angle) / safe_sine)
+    result: NDArray[np.float64] = start_weight * start + end_weight * end
+    lengths: NDArray[np.float64] = np.linalg.norm(result, axis=1, keepdims=True)
+    return result / np.where(lengths == 0, 1.0, lengths)
+
+
+def _transforms(
+    positions: NDArray[np.float64],
+    orientations: NDArray[np.float64],
+    scales: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Builds (n, 4, 4) matrices that scale, then rotate by x, y, z, w quaternions, then translate."""
+    lengths: NDArray[np.float64] = np.linalg.norm(orientations, axis=1, keepdims=True)
+    x, y, z, w = (orientations / np.where(lengths == 0, 1.0, lengths)).T
+    transforms: NDArray[np.float64] = np.zeros((len(positions), 4, 4))
+    transforms[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    transforms[:, 0, 1] = 2 * (x * y - z * w)
+    transforms[:, 0, 2] = 2 * (x * z + y * w)
+    transforms[:, 1, 0] = 2 * (x * y + z * w)
+    transforms[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    transforms[:, 1, 2] = 2 * (y * z - x * w)
+    transforms[:, 2, 0] = 2 * (x * z - y * w)
+    transforms[:, 2, 1] = 2 * (y * z + x * w)
+    transforms[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    transforms[:, :3, :3] *= scales[:, None, :1]
+    transforms[:, :3, 3] = positions
+    transforms[:, 3, 3] = 1.0
+    return transforms
 
 
 class MDL:
@@ -179,6 +374,62 @@ class MDL:
                 return node
         raise ValueError
 
+    def posed_transforms(
+        self,
+        anim: MDLAnimation,
+        times: Any,
+    ) -> tuple[list[str], NDArray[np.float64]]:
+        """Returns the transform of every node of the model relative to the model root, posed by an animation at many times.
+
+        Args:
+        ----
+            anim: The animation, matched to the nodes of the model by node name.
+            times: The times to pose the model at, in seconds.
+
+        Returns:
+        -------
+            The names of the nodes in the order of all_nodes, and a (times, nodes, 4, 4) array of their transforms.
+
+        Processing Logic:
+        ----------------
+            - Samples the position, orientation and scale controllers of the animation for all times at once
+            - Nodes the animation does not move keep their own position, orientation and scale
+            - Composes each node with its parent, parents first, for all times at once.
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        anim_nodes: dict[str, MDLNode] = {}
+        for anim_node in anim.all_nodes():
+            anim_nodes.setdefault(anim_node.name.lower(), anim_node)
+
+        nodes: list[MDLNode] = self.all_nodes()
+        parents: dict[int, int] = {id(child): index for index, node in enumerate(nodes) for child in node.children}
+        transforms: NDArray[np.float64] = np.zeros((len(times), len(nodes), 4, 4))
+        for index, node in enumerate(nodes):
+            position = np.array([[node.position.x, node.position.y, node.position.z]])
+            orientation = np.array([[node.orientation.x, node.orientation.y, node.orientation.z, node.orientation.w]])
+            scale = np.ones((1, 1))
+            for controller in node.controllers:
+                if controller.controller_type == MDLControllerType.SCALE and len(controller.key_array):
+                    scale = controller.sample(times[:1])[:, :1]
+            anim_node: MDLNode | None = anim_nodes.get(node.name.lower())
+            for controller in () if anim_node is None else anim_node.controllers:
+                if not len(controller.key_array):
+                    continue
+                if controller.controller_type == MDLControllerType.POSITION:
+                    position = controller.sample(times)[:, :3]
+                elif controller.controller_type == MDLControllerType.ORIENTATION:
+                    orientation = controller.sample(times)[:, :4]
+                elif controller.controller_type == MDLControllerType.SCALE:
+                    scale = controller.sample(times)[:, :1]
+            local: NDArray[np.float64] = _transforms(
+                np.broadcast_to(position, (len(times), 3)),
+                np.broadcast_to(orientation, (len(times), 4)),
+                np.broadcast_to(scale, (len(times), 1)),
+            )
+            parent: int | None = parents.get(id(node))
+            transforms[:, index] = local if parent is None else transforms[:, parent] @ local
+        return [node.name for node in nodes], transforms
+
     def all_textures(
         self,
     ) -> set[str]:
@@ -272,6 +523,27 @@ class MDLAnimation:
             scan.extend(node.children)
         return nodes
 
+    def sample(
+        self,
+        times: Any,
+    ) -> dict[str, dict[int, NDArray[np.float64]]]:
+        """Evaluates every controller of every node of the animation at many times at once.
+
+        Args:
+        ----
+            times: The times to evaluate the animation at, in seconds.
+
+        Returns:
+        -------
+            The (times, columns) values of each controller, by controller type, by node name.
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        return {
+            node.name: {int(controller.controller_type): controller.sample(times) for controller in node.controllers if len(controller.key_array)}
+            for node in self.all_nodes()
+            if node.controllers
+        }
+
 
 class MDLEvent:
     def __init__(
@@ -418,6 +690,7 @@ class MDLLight:
         shadow:
         flare:
         fading_light:
+        affect_dynamic:
     """
 
     def __init__(
@@ -431,6 +704,7 @@ class MDLLight:
         self.shadow: int = 0
         self.flare: int = 0
         self.fading_light: int = 0
+        self.affect_dynamic: int = 0
         self.flare_sizes: list = []
         self.flare_positions: list = []
         self.flare_color_shifts: list = []
@@ -505,7 +779,30 @@ class MDLReference:
 
 
 class MDLMesh:
-    """Mesh data that can be attached to a node."""
+    """Mesh data that can be attached to a node.
+
+    The per-vertex data and the faces are available both as lists of objects and, if numpy is installed, as arrays. The
+    binary reader fills in the arrays and the lists are only built when first used:
+
+        position_array: (vertices, 3) float32 positions, the same data as vertex_positions.
+        normal_array: (vertices, 3) float32 normals, the same data as vertex_normals.
+        uv1_array: (vertices, 2) float32 texture coordinates, the same data as vertex_uv1.
+        uv2_array: (vertices, 2) float32 lightmap coordinates, the same data as vertex_uv2.
+        face_array: (faces,) array of FACE_DTYPE records, the same data as faces.
+        tangent_space_array: (vertices, 3, 3) float32 bitangent, tangent and normal of bump mapped meshes, or None.
+    """
+
+    faces = _object_list("_faces", _faces_to_objects)
+    vertex_positions = _object_list("_vertex_positions", lambda array: [Vector3(*row) for row in array.tolist()])
+    vertex_normals = _object_list("_vertex_normals", lambda array: [Vector3(*row) for row in array.tolist()])
+    vertex_uv1 = _object_list("_vertex_uv1", lambda array: [Vector2(*row) for row in array.tolist()])
+    vertex_uv2 = _object_list("_vertex_uv2", lambda array: [Vector2(*row) for row in array.tolist()])
+
+    face_array = _array("_faces", _faces_to_array)
+    position_array = _array("_vertex_positions", lambda vectors: _vectors_to_array(vectors, 3))
+    normal_array = _array("_vertex_normals", lambda vectors: _vectors_to_array(vectors, 3))
+    uv1_array = _array("_vertex_uv1", lambda vectors: _vectors_to_array(vectors, 2))
+    uv2_array = _array("_vertex_uv2", lambda vectors: _vectors_to_array(vectors, 2))
 
     def __init__(
         self,
@@ -543,6 +840,7 @@ class MDLMesh:
         self.vertex_normals: list[Vector3] | None = None
         self.vertex_uv1: list[Vector2] | None = None
         self.vertex_uv2: list[Vector2] | None = None
+        self.tangent_space_array: NDArray[np.float32] | None = None
 
         # KotOR 2 Only
         self.dirt_enabled: bool = False
@@ -556,7 +854,15 @@ class MDLMesh:
 
 
 class MDLSkin:
-    """Skin data that can be attached to a node."""
+    """Skin data that can be attached to a node.
+
+    If numpy is installed, vertex_bone_array holds the same data as vertex_bones as a (vertices, 2, 4) float32 array of
+    the weights and bone indices of every vertex. The binary reader fills in the array and the list is only built when
+    first used.
+    """
+
+    vertex_bones = _object_list("_vertex_bones", _bones_to_objects)
+    vertex_bone_array = _array("_vertex_bones", _bones_to_array)
 
     def __init__(
         self,
@@ -570,11 +876,38 @@ class MDLSkin:
 
 
 class MDLDangly:
-    """Dangly data that can be attached to a node."""
+    """Dangly data that can be attached to a node.
+
+    Attributes:
+    ----------
+        constraints: How free each vertex of the mesh is to move, from 0 (fixed) to 255.
+        displacement: How far the vertices can move.
+        tightness: How strongly the vertices are pulled back.
+        period: How fast the vertices swing.
+    """
+
+    def __init__(
+        self,
+    ):
+        self.constraints: list[float] = []
+        self.displacement: float = 0.0
+        self.tightness: float = 0.0
+        self.period: float = 0.0
 
 
 class MDLWalkmesh:
-    """AABB data that can be attached to a node."""
+    """AABB data that can be attached to a node.
+
+    Attributes:
+    ----------
+        aabbs: The bounding box tree of the faces of the mesh, depth first. Each box is its minimum corner, its maximum
+            corner and the index of its face, -1 for boxes that are not leaves.
+    """
+
+    def __init__(
+        self,
+    ):
+        self.aabbs: list[tuple[Vector3, Vector3, int]] = []
 
 
 class MDLSaber:
@@ -600,7 +933,7 @@ class MDLFace:
         self.v1: int = 0
         self.v2: int = 0
         self.v3: int = 0
-        self.material: SurfaceMaterial = SurfaceMaterial.GRASS
+        self.material: SurfaceMaterial | int = SurfaceMaterial.GRASS
         self.a1: int = 0
         self.a2: int = 0
         self.a3: int = 0
@@ -625,14 +958,66 @@ class MDLControllerType(IntEnum):
 
 
 class MDLController:
-    """A controller is an object that gets attached to the node and influences some sort of change that is either static or animated."""
+    """A controller is an object that gets attached to the node and influences some sort of change that is either static or animated.
+
+    The keys are available both as rows and, if numpy is installed, as key_array, a (keys, 1 + columns) float32 array of
+    the time of each key followed by its values. The readers fill in the array and the rows are only built when first used.
+
+    The keys of Bezier controllers have three times the columns: the value, then the in and out tangents, both relative to
+    the value.
+    """
+
+    rows = _object_list("_rows", _keys_to_rows)
+    key_array = _array("_rows", _rows_to_keys)
 
     def __init__(
         self,
     ):
         self.controller_type: MDLControllerType = MDLControllerType.INVALID
+        self.bezier: bool = False
         self.rows: list[MDLControllerRow] = []
 
+    def sample(
+        self,
+        times: Any,
+    ) -> NDArray[np.float64]:
+        """Evaluates the controller at many times at once.
+
+        Args:
+        ----
+            times: The times to evaluate the controller at, in seconds.
+
+        Returns:
+        -------
+            A (times, columns) array of the values, without the tangents of Bezier controllers.
+
+        Processing Logic:
+        ----------------
+            - Finds the pair of keys around each time with a single search over the key times
+            - Holds the first and last values before the first key and after the last key
+            - Interpolates Bezier controllers along their cubic curves, orientations with slerp and anything else linearly.
+        """
+        keys: NDArray[np.float64] = self.key_array.astype(np.float64)
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        key_times, values = keys[:, 0], keys[:, 1:]
+        columns: int = values.shape[1] // 3 if self.bezier else values.shape[1]
+        if len(keys) <= 1:
+            return np.repeat(values[:1, :columns], len(times), axis=0).reshape(len(times), columns)
+
+        index: NDArray[np.intp] = np.clip(np.searchsorted(key_times, times, side="right") - 1, 0, len(keys) - 2)
+        start_times, spans = key_times[index], key_times[index + 1] - key_times[index]
+        amount: NDArray[np.float64] = np.divide(times - start_times, spans, out=np.zeros_like(times), where=spans > 0)
+        amount = np.clip(amount, 0.0, 1.0)[:, None]
+        start, end = values[index, :columns], values[index + 1, :columns]
+        if self.bezier:
+            start_control = start + values[index, 2 * columns :]
+            end_control = end + values[index + 1, columns : 2 * columns]
+            remaining = 1 - amount
+            return remaining**3 * start + 3 * remaining**2 * amount * start_control + 3 * remaining * amount**2 * end_control + amount**3 * end
+        if self.controller_type == MDLControllerType.ORIENTATION and columns == 4:  # noqa: PLR2004
+            return _slerp(start, end, amount)
+        return start + (end - start) * amount
+
 
 class MDLControllerRow:
     def __init__(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from pykotor.common.stream import BinaryReader
 from pykotor.resource.formats.rim.rim_data import RIM
 from pykotor.resource.type import ResourceReader, ResourceType, ResourceWriter, autoclose
 
@@ -41,23 +42,13 @@ class RIMBinaryReader(ResourceReader):
         entry_count = self._reader.read_uint32()
         offset_to_keys = self._reader.read_uint32()
 
-        resrefs: list[str] = []
-        resids: list[int] = []
-        restypes: list[int] = []
-        resoffsets: list[int] = []
-        ressizes: list[int] = []
         self._reader.seek(offset_to_keys)
-        for _ in range(entry_count):
-            resrefs.append(self._reader.read_string(16))
-            restypes.append(self._reader.read_uint32())
-            resids.append(self._reader.read_uint32())
-            resoffsets.append(self._reader.read_uint32())
-            ressizes.append(self._reader.read_uint32())
-
-        for i in range(entry_count):
-            self._reader.seek(resoffsets[i])
-            resdata = self._reader.read_bytes(ressizes[i])
-            self._rim.set_data(resrefs[i], ResourceType.from_id(restypes[i]), resdata)
+        keys: list[tuple[bytes, int, int, int, int]] = self._reader.read_records("16sIIII", entry_count)  # resref, restype, resid, offset, size
+
+        for resref, restype, _resid, resoffset, ressize in keys:
+            self._reader.seek(resoffset)
+            resdata = self._reader.read_bytes(ressize)
+            self._rim.set_data(BinaryReader.decode_fixed_string(resref), ResourceType.from_id(restype), resdata)
 
         return self._rim
 
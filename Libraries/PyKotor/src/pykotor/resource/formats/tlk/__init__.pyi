@@ -1,4 +1,5 @@
 from pykotor.resource.formats.tlk.io_tlk import (
+    LazyTLKEntries as LazyTLKEntries,
     TLKBinaryReader as TLKBinaryReader,
     TLKBinaryWriter as TLKBinaryWriter,
 )
@@ -1,19 +1,184 @@
 from __future__ import annotations
 
+import array
+import struct
+import sys
+
+from collections.abc import MutableSequence
 from typing import TYPE_CHECKING
 
 from pykotor.common.language import Language
-from pykotor.common.misc import ResRef, WrappedInt
-from pykotor.common.stream import ArrayHead
-from pykotor.resource.formats.tlk.tlk_data import TLK
+from pykotor.common.misc import ResRef
+from pykotor.common.stream import BinaryReader
+from pykotor.resource.formats.tlk.tlk_data import TLK, TLKEntry
 from pykotor.resource.type import ResourceReader, ResourceWriter, autoclose
+from pykotor.tools.encoding import decode_bytes_with_fallbacks
 
 if TYPE_CHECKING:
-    from pykotor.resource.formats.tlk.tlk_data import TLKEntry
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
 
 _FILE_HEADER_SIZE = 20
 _ENTRY_SIZE = 40
+_ENTRY_WORDS = _ENTRY_SIZE // 4
+_ENTRY = struct.Struct("<I16sIIIIf")
+_SOUND_LENGTH = struct.Struct("<f")
+_FLAGS_MASK = 0x0007
+
+
+def _decode_text(
+    data: bytes,
+    encoding: str | None,
+) -> str:
+    """Decodes a text as BinaryReader.read_string does: undecodable bytes are dropped and the text ends at the first null."""
+    text: str = decode_bytes_with_fallbacks(data, errors="ignore") if encoding is None else data.decode(encoding, errors="ignore")
+    null: int = text.find("\0")
+    return text if null == -1 else text[:null]
+
+
+class _TLKSource:
+    """The entry table and text data of a binary TLK that entries of a LazyTLKEntries are decoded from."""
+
+    def __init__(
+        self,
+        table: bytes,
+        texts: bytes,
+        encoding: str | None,
+    ):
+        self.table: bytes = table
+        self.texts: bytes = texts
+        self.encoding: str | None = encoding
+        self.words: array.array[int] = array.array("I")
+        self.words.frombytes(table)
+        if sys.byteorder == "big":
+            self.words.byteswap()
+
+    def text_bytes(
+        self,
+        index: int,
+    ) -> bytes:
+        i: int = index * _ENTRY_WORDS
+        offset: int = self.words[i + 7]
+        return self.texts[offset : offset + self.words[i + 8]]
+
+    def sound_bytes(
+        self,
+        index: int,
+    ) -> bytes:
+        """Returns the sound resref field as TLKBinaryWriter would write it back after reading it into a ResRef."""
+        start: int = index * _ENTRY_SIZE + 4
+        return self.table[start : start + 16].split(b"\0", 1)[0].strip()
+
+    def flags(
+        self,
+        index: int,
+    ) -> int:
+        return self.words[index * _ENTRY_WORDS]
+
+    def entry(
+        self,
+        index: int,
+    ) -> TLKEntry:
+        flags: int = self.flags(index)
+        sound_resref: str = BinaryReader.decode_fixed_string(self.table[index * _ENTRY_SIZE + 4 : index * _ENTRY_SIZE + 20])
+        entry = TLKEntry(_decode_text(self.text_bytes(index), self.encoding), ResRef(sound_resref))
+        entry.sound_length = _SOUND_LENGTH.unpack_from(self.table, index * _ENTRY_SIZE + 36)[0]
+        entry.text_present = (flags & 0x0001) != 0
+        entry.sound_present = (flags & 0x0002) != 0
+        entry.soundlength_present = (flags & 0x0004) != 0
+        return entry
+
+
+class LazyTLKEntries(MutableSequence):
+    """The entries of a TLK loaded with `lazy=True`.
+
+    Entries that were never accessed are stored as their index into the entry table of the source data and are only
+    decoded into a TLKEntry the first time they are accessed. TLKBinaryWriter copies the raw bytes of entries that
+    were never accessed instead of decoding and encoding them again.
+    """
+
+    def __init__(
+        self,
+        source: _TLKSource,
+        items: list[TLKEntry | int],
+    ):
+        self._source: _TLKSource = source
+        self._items: list[TLKEntry | int] = items
+
+    def __len__(
+        self,
+    ) -> int:
+        return len(self._items)
+
+    def __getitem__(
+        self,
+        item,
+    ):
+        if isinstance(item, slice):
+            return LazyTLKEntries(self._source, self._items[item])
+        entry: TLKEntry | int = self._items[item]
+        if isinstance(entry, int):
+            entry = self._items[item] = self._source.entry(entry)
+        return entry
+
+    def __setitem__(
+        self,
+        item,
+        value,
+    ):
+        self._items[item] = list(value) if isinstance(item, slice) else value
+
+    def __delitem__(
+        self,
+        item,
+    ):
+        del self._items[item]
+
+    def __iter__(
+        self,
+    ):
+        for i in range(len(self._items)):
+            yield self[i]
+
+    def insert(
+        self,
+        index: int,
+        value: TLKEntry,
+    ):
+        self._items.insert(index, value)
+
+    def extend(
+        self,
+        values,
+    ):
+        self._items.extend(values.materialized() if isinstance(values, LazyTLKEntries) else values)
+
+    def materialized(
+        self,
+    ) -> list[TLKEntry]:
+        """Decodes every entry that was not accessed yet and returns them as a list."""
+        return list(self)
+
+    @property
+    def source_texts(
+        self,
+    ) -> bytes:
+        """The text data of the source TLK that the raw entries' text offsets are relative to."""
+        return self._source.texts
+
+    def raw(
+        self,
+        index: int,
+        encoding: str | None,
+    ) -> tuple[int, bytes, int, int] | None:
+        """Returns the flags, sound resref, text offset and text length of an entry that was never accessed, or None if it was.
+
+        None is also returned if the text would have to be encoded differently than it is stored in the source data.
+        """
+        entry: TLKEntry | int = self._items[index]
+        if isinstance(entry, int) and encoding == self._source.encoding:
+            i: int = entry * _ENTRY_WORDS
+            return self._source.flags(entry) & _FLAGS_MASK, self._source.sound_bytes(entry), self._source.words[i + 7], self._source.words[i + 8]
+        return None
 
 
 class TLKBinaryReader(ResourceReader):
@@ -23,35 +188,46 @@ class TLKBinaryReader(ResourceReader):
         offset: int = 0,
         size: int = 0,
         language: Language | None = None,
+        *,
+        lazy: bool = False,
     ):
         super().__init__(source, offset, size)
         self._tlk: TLK
         self._texts_offset = 0
-        self._text_headers: list[ArrayHead] = []
         self._language: Language | None = language
+        self._lazy: bool = lazy
 
     @autoclose
     def load(
         self,
         auto_close: bool = True,
     ) -> TLK:
+        """Loads the TLK.
+
+        The entry table is read in one call. Unless the reader is lazy, every text is then decoded from the text
+        data, which is also read in one call. A lazy reader leaves the entries as a LazyTLKEntries instead.
+        """
         self._tlk = TLK()
         self._texts_offset = 0
-        self._text_headers = []
 
         self._reader.seek(0)
 
-        self._load_file_header()
-        for stringref, _entry in self._tlk:
-            self._load_entry(stringref)
-        for stringref, _entry in self._tlk:
-            self._load_text(stringref)
+        string_count: int = self._load_file_header()
+        table: bytes = self._reader.read_bytes(string_count * _ENTRY_SIZE)
+        self._reader.seek(self._texts_offset)
+        texts: bytes = self._reader.read_bytes(self._size - self._texts_offset) if self._size > self._texts_offset else b""
+        source = _TLKSource(table, texts, self._tlk.language.get_encoding())
+
+        if self._lazy:
+            self._tlk.entries = LazyTLKEntries(source, list(range(string_count)))  # type: ignore[assignment]
+        else:
+            self._tlk.entries = [source.entry(stringref) for stringref in range(string_count)]
 
         return self._tlk
 
     def _load_file_header(
         self,
-    ):
+    ) -> int:
         file_type = self._reader.read_string(4)
         file_version = self._reader.read_string(4)
         language_id = self._reader.read_uint32()
@@ -66,39 +242,8 @@ class TLKBinaryReader(ResourceReader):
             raise ValueError(msg)
 
         self._tlk.language = Language(language_id) if self._language is None else self._language
-        self._tlk.resize(string_count)
-
         self._texts_offset = entries_offset
-
-    def _load_entry(
-        self,
-        stringref: int,
-    ):
-        entry: TLKEntry = self._tlk.entries[stringref]
-
-        entry_flags = self._reader.read_uint32()
-        sound_resref = self._reader.read_string(16)
-        _volume_variance = self._reader.read_uint32()  # unused
-        _pitch_variance = self._reader.read_uint32()  # unused
-        text_offset = self._reader.read_uint32()
-        text_length = self._reader.read_uint32()
-        entry.sound_length = self._reader.read_single()  # unused
-        entry.text_present = (entry_flags & 0x0001) != 0  # Check if the TEXT_PRESENT flag is set
-        entry.sound_present = (entry_flags & 0x0002) != 0  # Check if the SND_PRESENT flag is set
-        entry.soundlength_present = (entry_flags & 0x0004) != 0  # Check if the SND_LENGTH flag is set
-        entry.voiceover = ResRef(sound_resref)
-        self._text_headers.append(ArrayHead(text_offset, text_length))
-
-    def _load_text(
-        self,
-        stringref: int,
-    ):
-        text_header: ArrayHead = self._text_headers[stringref]
-
-        self._reader.seek(text_header.offset + self._texts_offset)
-        text: str = self._reader.read_string(text_header.length, encoding=self._tlk.language.get_encoding())
-
-        self._tlk.entries[stringref].text = text
+        return string_count
 
 
 class TLKBinaryWriter(ResourceWriter):
@@ -106,24 +251,61 @@ class TLKBinaryWriter(ResourceWriter):
         self,
         tlk: TLK,
         target: TARGET_TYPES,
+        *,
+        keep_source_texts: bool = False,
     ):
+        """Initializes the writer.
+
+        Args:
+        ----
+            tlk: The TLK to write.
+            target: Where to write to.
+            keep_source_texts: If the TLK's entries are a LazyTLKEntries, write its source's text data unchanged
+                followed by only the texts of new or accessed entries, rather than the texts of every entry. This
+                leaves the texts of replaced or removed entries behind as unreferenced data, so it is only worth it
+                when entries are mostly appended (as when patching dialog.tlk).
+        """
         super().__init__(target)
         self._tlk: TLK = tlk
+        self._keep_source_texts: bool = keep_source_texts
 
     @autoclose
     def write(
         self,
         auto_close: bool = True,
     ):
-        self._write_file_header()
+        """Writes the TLK with the entry table and the text data each built up front and written in one call.
 
-        text_offset = WrappedInt(0)
+        Entries of a LazyTLKEntries that were never accessed are written from their raw bytes without being decoded.
+        """
         encoding: str | None = self._tlk.language.get_encoding()
-        for entry in self._tlk.entries:
-            self._write_entry(entry, text_offset)
+        entries: list[TLKEntry] | LazyTLKEntries = self._tlk.entries
+        lazy: bool = isinstance(entries, LazyTLKEntries)
+        source_texts: bytes = entries.source_texts if lazy else b""  # type: ignore[union-attr]
+        keep_source_texts: bool = lazy and self._keep_source_texts
 
-        for entry in self._tlk.entries:
-            self._writer.write_string(entry.text, encoding or "cp1252", errors="replace")
+        table = bytearray()
+        texts: list[bytes] = [source_texts] if keep_source_texts else []
+        text_offset: int = len(source_texts) if keep_source_texts else 0
+        for stringref in range(len(entries)):
+            raw: tuple[int, bytes, int, int] | None = entries.raw(stringref, encoding) if lazy else None  # type: ignore[union-attr]
+            if raw is None:
+                entry: TLKEntry = entries[stringref]
+                flags, sound, text = self._entry_flags(entry), str(entry.voiceover).encode("windows-1252"), entry.text.encode(encoding or "cp1252", errors="replace")
+            else:
+                flags, sound, source_offset, length = raw
+                if keep_source_texts and source_offset + length <= len(source_texts):
+                    table += _ENTRY.pack(flags, sound, 0, 0, source_offset, length, 0.0)
+                    continue
+                text = source_texts[source_offset : source_offset + length]
+            # Volume variance, pitch variance and sound length are unused by the games and always written as zero.
+            table += _ENTRY.pack(flags, sound, 0, 0, text_offset, len(text), 0.0)
+            texts.append(text)
+            text_offset += len(text)
+
+        self._write_file_header()
+        self._writer.write_bytes(bytes(table))
+        self._writer.write_bytes(b"".join(texts))
 
     def _calculate_entries_offset(
         self,
@@ -143,15 +325,10 @@ class TLKBinaryWriter(ResourceWriter):
         self._writer.write_uint32(string_count)
         self._writer.write_uint32(entries_offset)
 
-    def _write_entry(
+    def _entry_flags(
         self,
         entry: TLKEntry,
-        previous_offset: WrappedInt,
-    ):
-        sound_resref = str(entry.voiceover)
-        text_offset = previous_offset.get()
-        text_length = len(entry.text)
-
+    ) -> int:
         entry_flags = 0  # Initialize entry_flags as zero
         if entry.text_present:
             entry_flags |= 0x0001  # TEXT_PRESENT: As we're writing text, let's assume it's always present
@@ -159,13 +336,4 @@ class TLKBinaryWriter(ResourceWriter):
             entry_flags |= 0x0002  # SND_PRESENT: If sound_resref is defined in this entry.
         if entry.soundlength_present:
             entry_flags |= 0x0004  # SND_LENGTH: Unused by KOTOR1 and 2. Determines whether the sound length field is utilized.
-
-        self._writer.write_uint32(entry_flags)
-        self._writer.write_string(sound_resref, string_length=16)
-        self._writer.write_uint32(0)  # unused - volume variance
-        self._writer.write_uint32(0)  # unused - pitch variance
-        self._writer.write_uint32(text_offset)
-        self._writer.write_uint32(text_length)
-        self._writer.write_uint32(0)  # unused - sound length
-
-        previous_offset += text_length
+        return entry_flags
@@ -77,6 +77,8 @@ def read_tlk(
     offset: int = 0,
     size: int | None = None,
     language: Language | None = None,
+    *,
+    lazy: bool = False,
 ) -> TLK:
     """Returns an TLK instance from the source.
 
@@ -87,6 +89,8 @@ def read_tlk(
         source: The source of the data.
         offset: The byte offset of the file inside the data.
         size: Number of bytes to allowed to read from the stream. If not specified, uses the whole stream.
+        language: Overrides the language stored in the file.
+        lazy: For binary TLKs, decode each entry only when it is first accessed. See LazyTLKEntries.
 
     Raises:
     ------
@@ -106,7 +110,7 @@ def read_tlk(
         raise ValueError(msg)
 
     if file_format is ResourceType.TLK:
-        return TLKBinaryReader(source, offset, size or 0, language).load()
+        return TLKBinaryReader(source, offset, size or 0, language, lazy=lazy).load()
     if file_format is ResourceType.TLK_XML:
         return TLKXMLReader(source, offset, size or 0).load()
     if file_format is ResourceType.TLK_JSON:
@@ -3,6 +3,8 @@ from pykotor.resource.formats.tpc.tpc_data import (
     TPC,
     TPCTextureFormat,
 )
+from pykotor.resource.formats.tpc.tpc_dxt import DXTQuality
+from pykotor.resource.formats.tpc.tpc_mipmaps import MipmapFilter
 from pykotor.resource.formats.tpc.io_tpc import (
     TPCBinaryReader,
     TPCBinaryWriter,
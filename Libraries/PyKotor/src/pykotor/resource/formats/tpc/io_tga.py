@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import io
 import mmap
-import struct
 
 from enum import IntEnum
 from typing import TYPE_CHECKING
@@ -16,7 +15,14 @@ try:
 except ImportError:
     pillow_available = False
 
-from pykotor.common.stream import BinaryReader, BinaryWriterFile
+try:
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+from pykotor.common.stream import BinaryWriterFile
 from pykotor.resource.formats.tpc.tpc_data import TPC, TPCTextureFormat
 from pykotor.resource.type import ResourceReader, ResourceWriter, autoclose
 
@@ -36,6 +42,145 @@ class _DataTypes(IntEnum):
     COMPRESSED_COLOR_MAPPED_B = 33
 
 
+_COLOR_MAPPED = {
+    _DataTypes.UNCOMPRESSED_COLOR_MAPPED,
+    _DataTypes.RLE_COLOR_MAPPED,
+    _DataTypes.COMPRESSED_COLOR_MAPPED_A,
+    _DataTypes.COMPRESSED_COLOR_MAPPED_B,
+}
+_RLE_PACKET = 0b10000000
+_MAX_PACKET_PIXELS = 128
+
+
+def _decode_rle(
+    data: bytes,
+    pixel_count: int,
+    bytes_per_pixel: int,
+) -> bytearray:
+    """Decodes run-length encoded pixels a packet at a time.
+
+    Raw packets are copied with a single slice and run packets repeat their pixel with a single multiplication, so the
+    cost is per packet rather than per pixel.
+    """
+    view = memoryview(data)
+    size: int = pixel_count * bytes_per_pixel
+    pixels = bytearray(size)
+    position: int = 0
+    offset: int = 0
+    while offset < size:
+        if position >= len(view):
+            msg = "The run-length encoded image data ends before the last pixel."
+            raise ValueError(msg)
+        packet: int = view[position]
+        position += 1
+        length: int = min(((packet & ~_RLE_PACKET) + 1) * bytes_per_pixel, size - offset)
+        if packet & _RLE_PACKET:
+            pixel: bytes = view[position : position + bytes_per_pixel].tobytes()
+            pixels[offset : offset + length] = (pixel * (length // bytes_per_pixel))[:length]
+            position += bytes_per_pixel
+        else:
+            pixels[offset : offset + length] = view[position : position + length]
+            position += length
+        offset += length
+    if position > len(view):
+        msg = "The run-length encoded image data ends before the last pixel."
+        raise ValueError(msg)
+    return pixels
+
+
+def _rle_segments(
+    data: bytes,
+    width: int,
+    height: int,
+    bytes_per_pixel: int,
+) -> list[tuple[int, int, bool]]:
+    """Splits every row into runs of a repeated pixel and spans of pixels that differ from their neighbors.
+
+    Returns:
+    -------
+        (first pixel, pixel count, whether the pixels differ) for every run and span, in order.
+    """
+    pixel_count: int = width * height
+    if numpy_available:
+        pixels = np.frombuffer(data, dtype=np.uint8, count=pixel_count * bytes_per_pixel).reshape(pixel_count, bytes_per_pixel)
+        run_start = np.ones(pixel_count, dtype=bool)
+        run_start[1:] = (pixels[1:] != pixels[:-1]).any(axis=1)
+        run_start[::width] = True
+        starts = np.flatnonzero(run_start)
+        single = np.diff(starts, append=pixel_count) == 1
+        # Consecutive single pixels in the same row join one span.
+        segment_start = np.ones(len(starts), dtype=bool)
+        segment_start[1:] = ~(single[1:] & single[:-1]) | (starts[1:] % width == 0)
+        segment_starts = starts[segment_start]
+        lengths = np.diff(segment_starts, append=pixel_count)
+        return list(zip(segment_starts.tolist(), lengths.tolist(), single[segment_start].tolist()))
+
+    segments: list[tuple[int, int, bool]] = []
+    for row_start in range(0, pixel_count, width):
+        row_end: int = row_start + width
+        start: int = row_start
+        while start < row_end:
+            pixel: bytes = data[start * bytes_per_pixel : (start + 1) * bytes_per_pixel]
+            end: int = start + 1
+            while end < row_end and data[end * bytes_per_pixel : (end + 1) * bytes_per_pixel] == pixel:
+                end += 1
+            if end - start == 1 and segments and segments[-1][2] and segments[-1][0] >= row_start:
+                segments[-1] = (segments[-1][0], segments[-1][1] + 1, True)
+            else:
+                segments.append((start, end - start, end - start == 1))
+            start = end
+    return segments
+
+
+def _encode_rle(
+    data: bytes,
+    width: int,
+    height: int,
+    bytes_per_pixel: int,
+) -> bytearray:
+    """Run-length encodes pixels, no packet crosses from one row to the next as the TGA specification recommends."""
+    view = memoryview(data)
+    encoded = bytearray()
+    for start, length, raw in _rle_segments(data, width, height, bytes_per_pixel):
+        while length:
+            count: int = min(length, _MAX_PACKET_PIXELS)
+            if raw:
+                encoded.append(count - 1)
+                encoded += view[start * bytes_per_pixel : (start + count) * bytes_per_pixel]
+            else:
+                encoded.append(_RLE_PACKET | (count - 1))
+                encoded += view[start * bytes_per_pixel : (start + 1) * bytes_per_pixel]
+            start += count
+            length -= count
+    return encoded
+
+
+def _swap_red_blue(
+    data: bytes,
+    channels: int,
+) -> bytearray:
+    """Swaps the first and third channel of every pixel, turning BGR(A) into RGB(A) and back."""
+    swapped = bytearray(data)
+    swapped[0::channels] = data[2::channels]
+    swapped[2::channels] = data[0::channels]
+    return swapped
+
+
+def _to_bgra(
+    data: bytes,
+    channels: int,
+) -> bytearray:
+    """Expands greyscale, RGB or RGBA pixels to the BGRA pixels of a 32 bit TGA."""
+    count: int = len(data) // channels
+    pixels = bytearray(b"\xff") * (count * 4)
+    if channels == 1:
+        pixels[0::4] = pixels[1::4] = pixels[2::4] = data[:count]
+        return pixels
+    for channel, target in zip(range(channels), (2, 1, 0, 3)):
+        pixels[target::4] = data[channel : count * channels : channels]
+    return pixels
+
+
 class TPCTGAReader(ResourceReader):
     """Used to read TGA binary data."""
     def __init__(
@@ -49,100 +194,39 @@ class TPCTGAReader(ResourceReader):
 
     def _read_color_map(
         self,
+        origin: int,
         length: int,
         depth: int,
-    ) -> list[bytes]:
-        color_map: list[bytes] = []
-        bytes_per_entry = depth // 8
-
-        for _ in range(length):
-            entry: bytes = self._reader.read_bytes(bytes_per_entry)
-            if bytes_per_entry == 3:  # RGB format, append alpha value
-                entry += b"\xff"  # Append alpha value of 255
-            color_map.append(entry)
-
-        return color_map
-
-    @staticmethod
-    def _convert_grayscale_to_rgba(grayscale_value: int) -> list[int]:
-        """Convert a grayscale value to RGBA."""
-        return [grayscale_value, grayscale_value, grayscale_value, 255]
-
-    def _process_rle_data(
+    ) -> tuple[list[bytes], int]:
+        """Returns the colors of the color map as tables for bytes.translate, one per channel, and the channel count."""
+        if depth not in {24, 32}:
+            msg = f"Color maps with {depth} bits per entry are not supported."
+            raise ValueError(msg)
+        channels: int = depth // 8
+        entries: bytearray = _swap_red_blue(self._reader.read_bytes(length * channels), channels)
+        tables: list[bytes] = []
+        for channel in range(channels):
+            table = bytearray(256)
+            colors: bytearray = entries[channel::channels][: max(0, 256 - origin)]
+            table[origin : origin + len(colors)] = colors
+            tables.append(bytes(table))
+        return tables, channels
+
+    def _read_pixels(
         self,
-        width: int,
-        height: int,
-        bits_per_pixel: int,
-        color_map: list[bytes] | None = None,
+        pixel_count: int,
+        bytes_per_pixel: int,
         *,
-        is_direct_rgb: bool = False,
-    ) -> bytearray:
-        """Process RLE compressed data."""
-        data = bytearray()
-        n = 0
-        pixel: list[int]
-        rgb_len = 3
-        while self._reader.remaining():  # while n < width * height:
-            packet = self._reader.read_uint8()
-            count = (packet & 0b01111111) + 1
-            is_raw_packet: bool = (packet >> 7) == 0
-            # count = (packet & 0x7f) + 1
-            # is_raw_packet = packet & 0x80
-            n += count
-
-            if is_raw_packet:
-                for _ in range(count):
-                    if is_direct_rgb:
-                        b, g, r = (
-                            self._reader.read_uint8(),
-                            self._reader.read_uint8(),
-                            self._reader.read_uint8(),
-                        )
-                        pixel = [r, g, b, self._reader.read_uint8()] if bits_per_pixel == 32 else [r, g, b, 255]
-                    elif color_map:
-                        index = self._reader.read_uint8()
-                        color = list(color_map[index])
-                        if len(color) == rgb_len:  # Check the length of the color map entry
-                            color.append(255)  # Append alpha value 255
-                        pixel = color
-                    else:
-                        pixel = self._convert_grayscale_to_rgba(self._reader.read_uint8())
-
-                    data.extend(pixel)
-            else:
-                if is_direct_rgb:
-                    b, g, r = (
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                    )
-                    pixel = [r, g, b, self._reader.read_uint8()] if bits_per_pixel == 32 else [r, g, b, 255]
-                elif color_map:
-                    index = self._reader.read_uint8()
-                    color = list(color_map[index])
-                    if len(color) == rgb_len:  # Check the length of the color map entry
-                        color.append(255)  # Append alpha value 255
-                    pixel = color
-                else:
-                    pixel = self._convert_grayscale_to_rgba(self._reader.read_uint8())
-                for _ in range(count):
-                    data.extend(pixel)
-            if n == width * height:
-                break
-        return data
-
-    def _process_non_rle_color_mapped(
-        self,
-        width: int,
-        height: int,
-        color_map: list[bytes],
-    ) -> bytearray:
-        """Process non-RLE color-mapped data."""
-        data = bytearray()
-        for _ in range(width * height):
-            index = self._reader.read_uint8()
-            data.extend(color_map[index])
-        return data
+        rle: bool,
+    ) -> bytes | bytearray:
+        """Reads the pixels as stored in the file, decoding them first if they are run-length encoded."""
+        if not rle:
+            data: bytes = self._reader.read_bytes(min(pixel_count * bytes_per_pixel, self._reader.remaining()))
+            if len(data) < pixel_count * bytes_per_pixel:
+                msg = "The image data ends before the last pixel."
+                raise ValueError(msg)
+            return data
+        return _decode_rle(self._reader.read_bytes(self._reader.remaining()), pixel_count, bytes_per_pixel)
 
     @autoclose
     def load(
@@ -162,13 +246,11 @@ class TPCTGAReader(ResourceReader):
 
         Processing Logic:
         ----------------
-            - Check if Pillow is available and use it to load the image if so.
-            - If Pillow is not available, do the following:
-                - Read header values from the reader
-                - Check for uncompressed or RLE encoded RGB data
-                - Load pixel data into rows or run lengths
-                - Assemble pixel data into a single bytearray
-                - Set the loaded data on the TPC texture.
+            - Read header values from the reader
+            - Read the pixels, decoding run-length encoded packets and color maps
+            - Swap BGR to RGB and flip top-down images to bottom-up rows
+            - Set the loaded data on the TPC texture.
+            - If the image is in a format this reader does not support, use Pillow to load it if it is available.
         """
         self._tpc = TPC()
         # Preliminary format determination
@@ -180,12 +262,14 @@ class TPCTGAReader(ResourceReader):
         # Move the reader back to the start after reading the header
         self._reader.seek(0)
 
-        if pillow_available:
-            # Use Pillow for supported formats
-            self._load_with_pillow()
-        else:
-            # Fallback to custom logic for all other cases
+        try:
             self._load_with_custom_logic()
+        except ValueError:
+            if not pillow_available:
+                raise
+            RobustRootLogger().debug("Unsupported TGA, loading it with Pillow instead.", exc_info=True)
+            self._reader.seek(0)
+            self._load_with_pillow()
 
         datacode_name = next((c.name for c in _DataTypes if c.value == datatype_code), _DataTypes.NO_IMAGE_DATA.name)
         self._tpc.original_datatype_code = _DataTypes.__members__[datacode_name]
@@ -229,7 +313,7 @@ class TPCTGAReader(ResourceReader):
         id_length = self._reader.read_uint8()
         colormap_type = self._reader.read_uint8()
         datatype_code = self._reader.read_uint8()
-        _colormap_origin = self._reader.read_uint16()
+        colormap_origin = self._reader.read_uint16()
         colormap_length = self._reader.read_uint16()
         colormap_depth = self._reader.read_uint8()
         _x_origin = self._reader.read_uint16()
@@ -240,78 +324,61 @@ class TPCTGAReader(ResourceReader):
         image_descriptor = self._reader.read_uint8()
         self._reader.skip(id_length)
 
-        # Read the color map if necessary
-        color_map = None
+        if self._tpc is None:
+            raise ValueError("Call load() instead of this directly.")
+
+        color_tables: list[bytes] = []
+        color_channels: int = 0
         if colormap_type and colormap_length:
-            color_map = self._read_color_map(colormap_length, colormap_depth)
+            if datatype_code in _COLOR_MAPPED:
+                color_tables, color_channels = self._read_color_map(colormap_origin, colormap_length, colormap_depth)
+            else:
+                self._reader.skip(colormap_length * ((colormap_depth + 7) // 8))
 
-        y_flipped = bool(image_descriptor & 0b00100000)
+        top_down = bool(image_descriptor & 0b00100000)
         interleaving_id = (image_descriptor & 0b11000000) >> 6
         if interleaving_id:
-            ValueError("The image data must not be interleaved.")
-
-        data: bytearray = bytearray()
-        if datatype_code == _DataTypes.UNCOMPRESSED_COLOR_MAPPED:
-            if color_map is None:
-                msg = "Expected color map not found for uncompressed color-mapped data"
-                raise ValueError(msg)
-            data = self._process_non_rle_color_mapped(width, height, color_map)
-        elif datatype_code == _DataTypes.UNCOMPRESSED_RGB:
-            self._reader.skip(colormap_length * colormap_depth // 8)
+            msg = "The image data must not be interleaved."
+            raise ValueError(msg)
 
+        pixel_count: int = width * height
+        if datatype_code in {_DataTypes.UNCOMPRESSED_RGB, _DataTypes.RLE_RGB}:
             if bits_per_pixel not in {24, 32}:
-                ValueError("The image must store 24 or 32 bits per pixel.")
-
-            pixel_rows: list[bytearray] = []
-            for y in range(height):
-                pixel_rows.append(bytearray())
-                for _ in range(width):
-                    b, g, r = (
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                    )
-                    if bits_per_pixel == 32:
-                        pixel_rows[y].extend([r, g, b, self._reader.read_uint8()])
-                    else:
-                        pixel_rows[y].extend([r, g, b])
-
-            if y_flipped:
-                for pixels in reversed(pixel_rows):
-                    data.extend(pixels)
-            else:
-                for pixels in pixel_rows:
-                    data.extend(pixels)
-        elif datatype_code == _DataTypes.UNCOMPRESSED_BLACK_WHITE:
-            data = bytearray()
-            for _ in range(width * height):
-                # Read the grayscale value (should be 1 byte per pixel)
-                gray_value = self._reader.read_uint8()
-                # Convert grayscale to RGB
-                data.extend([gray_value, gray_value, gray_value])
-        elif datatype_code == _DataTypes.RLE_COLOR_MAPPED:
-            if color_map is None:
-                msg = "Expected color map not found for RLE color-mapped data"
+                msg = "The image must store 24 or 32 bits per pixel."
                 raise ValueError(msg)
-            data = self._process_rle_data(width, height, bits_per_pixel, color_map=color_map)
-        elif datatype_code == _DataTypes.RLE_RGB:
-            data = self._process_rle_data(width, height, bits_per_pixel, is_direct_rgb=True)
-        elif datatype_code == _DataTypes.COMPRESSED_BLACK_WHITE:
-            data = self._process_rle_data(width, height, bits_per_pixel)
-        elif datatype_code in {_DataTypes.COMPRESSED_COLOR_MAPPED_A, _DataTypes.COMPRESSED_COLOR_MAPPED_B}:
-            if color_map is None:
-                msg = "Expected color map not found for compressed color-mapped data"
+            channels: int = bits_per_pixel // 8
+            pixels = self._read_pixels(pixel_count, channels, rle=datatype_code == _DataTypes.RLE_RGB)
+            data: bytes | bytearray = _swap_red_blue(pixels, channels)
+            texture_format = TPCTextureFormat.RGBA if channels == 4 else TPCTextureFormat.RGB  # noqa: PLR2004
+        elif datatype_code in {_DataTypes.UNCOMPRESSED_BLACK_WHITE, _DataTypes.COMPRESSED_BLACK_WHITE}:
+            if bits_per_pixel != 8:  # noqa: PLR2004
+                msg = "Greyscale images must store 8 bits per pixel."
                 raise ValueError(msg)
-            data = self._process_rle_data(width, height, bits_per_pixel, color_map=color_map)
+            data = self._read_pixels(pixel_count, 1, rle=datatype_code == _DataTypes.COMPRESSED_BLACK_WHITE)
+            texture_format = TPCTextureFormat.Greyscale
+        elif datatype_code in _COLOR_MAPPED:
+            if not color_tables:
+                msg = "Expected color map not found for color-mapped data"
+                raise ValueError(msg)
+            if bits_per_pixel != 8:  # noqa: PLR2004
+                msg = "Color-mapped images must store 8 bits per pixel."
+                raise ValueError(msg)
+            indices = bytes(self._read_pixels(pixel_count, 1, rle=datatype_code != _DataTypes.UNCOMPRESSED_COLOR_MAPPED))
+            data = bytearray(pixel_count * color_channels)
+            for channel, table in enumerate(color_tables):
+                data[channel::color_channels] = indices.translate(table)
+            texture_format = TPCTextureFormat.RGBA if color_channels == 4 else TPCTextureFormat.RGB  # noqa: PLR2004
         else:
             msg = "The image format is not currently supported."
             raise ValueError(msg)
 
-        # Set the texture format based on the bits per pixel
+        # Textures store the bottom row first, as TGAs do unless the image descriptor says otherwise.
+        if top_down:
+            data = TPC.flip_image_data(data, width, height, texture_format.bytes_per_pixel())
+
         datacode_name = next((c.name for c in _DataTypes if c.value == datatype_code), _DataTypes.NO_IMAGE_DATA.name)
         self._tpc.original_datatype_code = _DataTypes.__members__[datacode_name]
-        RobustRootLogger().debug("tga datatype_code:", datacode_name, "y_flipped:", y_flipped, "bits_per_pixel:", bits_per_pixel)
-        texture_format = TPCTextureFormat.RGBA if bits_per_pixel == 32 else TPCTextureFormat.RGB
+        RobustRootLogger().debug(f"tga datatype_code: {datacode_name} top_down: {top_down} bits_per_pixel: {bits_per_pixel}")
         self._tpc.set_data(width, height, [bytes(data)], texture_format)
 
 
@@ -321,9 +388,12 @@ class TPCTGAWriter(ResourceWriter):
         self,
         tpc: TPC,
         target: TARGET_TYPES,
+        *,
+        rle: bool = False,
     ):
         super().__init__(target)
         self._tpc: TPC = tpc
+        self._rle: bool = rle
 
     @autoclose
     def write(
@@ -371,31 +441,19 @@ class TPCTGAWriter(ResourceWriter):
 
         self._writer.write_uint8(0)  # id length
         self._writer.write_uint8(0)  # colormap_type
-        self._writer.write_uint8(2)  # datatype_code
+        self._writer.write_uint8(_DataTypes.RLE_RGB if self._rle else _DataTypes.UNCOMPRESSED_RGB)  # datatype_code
         self._writer.write_bytes(bytes(5))  # colormap_origin
         self._writer.write_uint16(0)  # colormap_length, colormap_depth
         self._writer.write_uint16(0)  # x,y origin
         self._writer.write_uint16(width)
         self._writer.write_uint16(height)
 
+        self._writer.write_uint8(32)  # bits_per_pixel, image_descriptor
+        self._writer.write_uint8(0)
         if self._tpc.format() in {TPCTextureFormat.RGB, TPCTextureFormat.DXT1}:
-            self._writer.write_uint8(32)  # bits_per_pixel, image_descriptor
-            self._writer.write_uint8(0)
-            data: bytearray = self._tpc.convert(TPCTextureFormat.RGB).data
-            pixel_reader: BinaryReader = BinaryReader.from_bytes(data)
-            for _ in range(len(data) // 3):
-                r = pixel_reader.read_uint8()
-                g = pixel_reader.read_uint8()
-                b = pixel_reader.read_uint8()
-                self._writer.write_bytes(struct.pack("BBBB", b, g, r, 255))
+            pixels: bytearray = _to_bgra(self._tpc.convert(TPCTextureFormat.RGB).data, 3)
+        elif self._tpc.format() == TPCTextureFormat.Greyscale:
+            pixels = _to_bgra(self._tpc.get().data, 1)
         else:
-            self._writer.write_uint8(32)
-            self._writer.write_uint8(0)
-            width, height, data = self._tpc.convert(TPCTextureFormat.RGBA)
-            pixel_reader = BinaryReader.from_bytes(data)
-            for _ in range(len(data) // 4):
-                r = pixel_reader.read_uint8()
-                g = pixel_reader.read_uint8()
-                b = pixel_reader.read_uint8()
-                a = pixel_reader.read_uint8()
-                self._writer.write_bytes(struct.pack("BBBB", b, g, r, a))
+            pixels = _to_bgra(self._tpc.convert(TPCTextureFormat.RGBA).data, 4)
+        self._writer.write_bytes(bytes(_encode_rle(pixels, width, height, 4) if self._rle else pixels))
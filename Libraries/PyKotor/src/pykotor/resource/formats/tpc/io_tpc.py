@@ -78,7 +78,7 @@ class TPCBinaryReader(ResourceReader):
         ----------------
             - Reads header values like size, dimensions, format
             - Skips unnecessary data
-            - Loops to read each mipmap level
+            - Loops to read each mipmap level, cube maps store every mipmap of a face before the next face
             - Sets TPC data and returns the object
         """
         self._tpc = TPC()
@@ -115,17 +115,21 @@ class TPCBinaryReader(ResourceReader):
             size = width * height * 4
             min_size = 4
 
-        mipmaps: list[bytes] = []
-        mm_width, mm_height = width, height
-        for _ in range(mipmap_count):
-            mm_size = _get_size(mm_width, mm_height, tpc_format) or min_size
-            mm_data = self._reader.read_bytes(mm_size)
-            mipmaps.append(mm_data)
-
-            mm_width >>= 1
-            mm_height >>= 1
-            mm_width = max(mm_width, 1)
-            mm_height = max(mm_height, 1)
+        # Cube maps have their six square faces stacked, the mipmaps keep them stacked the same way.
+        faces: int = 6 if height == 6 * width else 1
+        face_mipmaps: list[list[bytes]] = [[] for _ in range(mipmap_count)]
+        for _ in range(faces):
+            mm_width, mm_height = width, height // faces
+            for mipmap in range(mipmap_count):
+                mm_size = _get_size(mm_width, mm_height, tpc_format) or min_size
+                mm_data = self._reader.read_bytes(mm_size)
+                face_mipmaps[mipmap].append(mm_data)
+
+                mm_width >>= 1
+                mm_height >>= 1
+                mm_width = max(mm_width, 1)
+                mm_height = max(mm_height, 1)
+        mipmaps: list[bytes] = [b"".join(face_data) for face_data in face_mipmaps]
 
         file_size = self._reader.size()
         txi = self._reader.read_string(file_size - self._reader.position(), encoding="ascii")
@@ -160,20 +164,26 @@ class TPCBinaryWriter(ResourceWriter):
         Writes TPC texture data to file stream:
             - Gets texture data from TPC object
             - Writes header information like size, dimensions, encoding
-            - Writes raw texture data
+            - Writes raw texture data, every mipmap of a cube map face before the next face
             - Writes TXI data
             - Optionally closes file stream..
         """
         data = bytearray()
         size: int = 0
 
+        faces: int = 6 if self._tpc.is_cube_map() else 1
+        face_data: list[bytearray] = [bytearray() for _ in range(faces)]
         for i in range(self._tpc.mipmap_count()):
             width, height, texture_format, mm_data = self._tpc.get(i)
             assert mm_data is not None
-            data += mm_data
-            detsize = _get_size(width, height, texture_format)
+            face_size: int = len(mm_data) // faces
+            for face in range(faces):
+                face_data[face] += mm_data[face * face_size : (face + 1) * face_size]
+            detsize = _get_size(width, height // faces, texture_format)
             assert detsize is not None
-            size += detsize
+            size += detsize * faces
+        for face in face_data:
+            data += face
 
         if self._tpc.format() == TPCTextureFormat.RGBA:
             encoding = 4
@@ -5,11 +5,18 @@ from __future__ import annotations
 import itertools as tpc_itertools
 
 from enum import IntEnum
-from typing import NamedTuple, Tuple, cast
+from typing import TYPE_CHECKING, NamedTuple, Tuple, cast
 
+from pykotor.common.parallel import parallel_map
 from pykotor.common.stream import BinaryReader
+from pykotor.resource.formats.tpc import tpc_dxt, tpc_mipmaps
+from pykotor.resource.formats.tpc.tpc_dxt import DXTQuality
+from pykotor.resource.formats.tpc.tpc_mipmaps import MipmapFilter
 from pykotor.resource.type import ResourceType
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
 
 class TPCGetResult(NamedTuple):
     width: int
@@ -110,6 +117,7 @@ class TPC:
         ----
             convert_format: The format the texture data should be converted to.
             mipmap: The index of the mipmap.
+            y_flip: Whether to flip the image vertically.
 
         Returns:
         -------
@@ -120,6 +128,10 @@ class TPC:
         if self._texture_format == convert_format and not y_flip:  # Is conversion needed?
             return TPCConvertResult(width, height, bytearray(raw_data))
 
+        if convert_format in {TPCTextureFormat.DXT1, TPCTextureFormat.DXT5}:
+            rgba: bytearray = self.convert(TPCTextureFormat.RGBA, mipmap, y_flip).data
+            return TPCConvertResult(width, height, self._encode_faces(rgba, 4, width, height, convert_format, DXTQuality.RANGE_FIT))
+
         if y_flip:
             bytes_per_pixel = 0
             if self._texture_format == TPCTextureFormat.Greyscale:
@@ -134,10 +146,10 @@ class TPC:
         data: bytearray = bytearray(raw_data)
         if convert_format == TPCTextureFormat.Greyscale:
             if self._texture_format == TPCTextureFormat.DXT5:
-                rgba_data = TPC._dxt5_to_rgba(raw_data, width, height)
+                rgba_data = self._decode_faces(TPC._dxt5_to_rgba, raw_data, width, height)
                 data = TPC._rgba_to_grey(rgba_data, width, height)
             elif self._texture_format == TPCTextureFormat.DXT1:
-                rgba_data = TPC._dxt1_to_rgba(raw_data, width, height)
+                rgba_data = self._decode_faces(TPC._dxt1_to_rgba, raw_data, width, height)
                 data = TPC._rgba_to_grey(rgba_data, width, height)
             elif self._texture_format == TPCTextureFormat.RGBA:
                 data = TPC._rgba_to_grey(raw_data, width, height)
@@ -147,9 +159,9 @@ class TPC:
 
         if convert_format == TPCTextureFormat.RGBA:
             if self._texture_format == TPCTextureFormat.DXT5:
-                data = TPC._dxt5_to_rgba(raw_data, width, height)
+                data = self._decode_faces(TPC._dxt5_to_rgba, raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.DXT1:
-                data = TPC._dxt1_to_rgba(raw_data, width, height)
+                data = self._decode_faces(TPC._dxt1_to_rgba, raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.RGB:
                 data = TPC._rgb_to_rgba(raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.Greyscale:
@@ -157,17 +169,166 @@ class TPC:
 
         if convert_format == TPCTextureFormat.RGB:
             if self._texture_format == TPCTextureFormat.DXT5:
-                data = TPC._dxt5_to_rgb(raw_data, width, height)
+                data = self._decode_faces(TPC._dxt5_to_rgb, raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.DXT1:
-                data = TPC._dxt1_to_rgb(raw_data, width, height)
+                data = self._decode_faces(TPC._dxt1_to_rgb, raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.RGBA:
                 data = TPC._rgba_to_rgb(raw_data, width, height)
             elif self._texture_format == TPCTextureFormat.Greyscale:
                 rgba_data = TPC._grey_to_rgba(raw_data, width, height)
                 data = TPC._rgba_to_rgb(rgba_data, width, height)
 
+        if y_flip:  # A compressed texture is flipped once decoded.
+            data = bytearray(self.flip_image_data(data, width, height, convert_format.bytes_per_pixel()))
+
         return TPCConvertResult(width, height, data)
 
+    def compress(
+        self,
+        texture_format: TPCTextureFormat,
+        quality: DXTQuality = DXTQuality.RANGE_FIT,
+    ):
+        """Compresses every mipmap of the texture to DXT1 or DXT5.
+
+        Args:
+        ----
+            texture_format: TPCTextureFormat.DXT1 or TPCTextureFormat.DXT5.
+            quality: How hard to search for the block endpoints, see tpc_dxt for the error bounds of the output.
+
+        Raises:
+        ------
+            ValueError: The texture format is not a compressed format.
+        """
+        if texture_format not in {TPCTextureFormat.DXT1, TPCTextureFormat.DXT5}:
+            msg = f"Cannot compress a texture to {texture_format.name}."
+            raise ValueError(msg)
+        if self._texture_format == texture_format:
+            return
+
+        mipmaps: list[bytes] = []
+        for mipmap in range(self.mipmap_count()):
+            width, height = self._mipmap_size(mipmap)
+            if self.is_compressed() or not tpc_dxt.numpy_available:
+                data, channels = self.convert(TPCTextureFormat.RGBA, mipmap).data, 4
+            else:
+                data, channels = self._mipmaps[mipmap], self._texture_format.bytes_per_pixel()
+            mipmaps.append(self._encode_faces(data, channels, width, height, texture_format, quality))
+        self.set_data(self._width, self._height, mipmaps, texture_format)
+
+    def generate_mipmaps(
+        self,
+        mipmap_filter: MipmapFilter = MipmapFilter.BOX,
+        *,
+        srgb: bool = True,
+        quality: DXTQuality = DXTQuality.RANGE_FIT,
+    ):
+        """Replaces the smaller mipmaps with a full chain, down to 1x1, filtered from the largest mipmap.
+
+        Args:
+        ----
+            mipmap_filter: The filter to shrink each level with, see tpc_mipmaps.
+            srgb: Whether the colors are sRGB encoded and filtered in linear light. Pass False for normal maps.
+            quality: How hard to search for the block endpoints of the new levels of DXT1 and DXT5 textures.
+
+        Processing Logic:
+        ----------------
+            - Compressed textures are decoded to RGBA, filtered and the new levels compressed, the largest is kept as is
+            - Each face of a cube map is filtered on its own
+            - If numpy is not available, every level is a 2x2 box filter of the previous one, computed per pixel
+        """
+        texture_format: TPCTextureFormat = self._texture_format
+        faces: int = 6 if self.is_cube_map() else 1
+        if self.is_compressed():
+            data, channels = self.convert(TPCTextureFormat.RGBA).data, 4
+        else:
+            data, channels = self._mipmaps[0], texture_format.bytes_per_pixel()
+
+        if tpc_mipmaps.numpy_available:
+            mipmaps: list[bytes] = list(tpc_mipmaps.mipmap_chain(data, self._width, self._height, channels, mipmap_filter, srgb=srgb, faces=faces))
+        else:
+            mipmaps = TPC._box_mipmap_chain(data, self._width, self._height, channels, faces, srgb=srgb)
+
+        if self.is_compressed():
+            # The largest level is kept as it is, only the new levels are compressed.
+            width, face_height = self._width, self._height // faces
+            for level in range(1, len(mipmaps)):
+                width, face_height = max(1, width >> 1), max(1, face_height >> 1)
+                mipmaps[level] = self._encode_faces(mipmaps[level], 4, width, face_height * faces, texture_format, quality)
+            mipmaps[0] = self._mipmaps[0]
+        self.set_data(self._width, self._height, mipmaps, texture_format)
+
+    @staticmethod
+    def _box_mipmap_chain(
+        data: bytes,
+        width: int,
+        height: int,
+        channels: int,
+        faces: int,
+        *,
+        srgb: bool,
+    ) -> list[bytes]:
+        """Returns a full mipmap chain where every level averages 2x2 pixels of the previous one, in linear light."""
+        to_linear: list[float] = [(value / 255 / 12.92 if value <= 10 else ((value / 255 + 0.055) / 1.055) ** 2.4) if srgb else value / 255 for value in range(256)]  # noqa: PLR2004
+
+        def to_srgb(value: float) -> int:
+            if srgb:
+                value = value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055  # noqa: PLR2004
+            return round(min(max(value, 0.0), 1.0) * 255)
+
+        colors: int = min(channels, 3)
+        face_height: int = height // faces
+        level: bytes = bytes(data[: width * height * channels])
+        mipmaps: list[bytes] = [level]
+        while width > 1 or face_height > 1:
+            new_width, new_height = max(1, width >> 1), max(1, face_height >> 1)
+            new_level = bytearray()
+            for face, y, x in tpc_itertools.product(range(faces), range(new_height), range(new_width)):
+                indices: list[int] = [
+                    ((face * face_height + min(2 * y + dy, face_height - 1)) * width + min(2 * x + dx, width - 1)) * channels
+                    for dy in range(2)
+                    for dx in range(2)
+                ]
+                for channel in range(channels):
+                    if channel < colors:
+                        new_level.append(to_srgb(sum(to_linear[level[i + channel]] for i in indices) / 4))
+                    else:
+                        new_level.append(round(sum(level[i + channel] for i in indices) / 4))
+            level, width, face_height = bytes(new_level), new_width, new_height
+            mipmaps.append(level)
+        return mipmaps
+
+    @staticmethod
+    def compress_many(
+        tpcs: Sequence[TPC],
+        texture_format: TPCTextureFormat,
+        quality: DXTQuality = DXTQuality.RANGE_FIT,
+        max_workers: int | None = None,
+    ):
+        """Compresses many textures like `compress`, spread over a pool of processes.
+
+        Args:
+        ----
+            tpcs: The textures to compress, they are updated in place.
+            texture_format: TPCTextureFormat.DXT1 or TPCTextureFormat.DXT5.
+            quality: How hard to search for the block endpoints.
+            max_workers: The number of processes to use, defaults to the number of processors. 1 compresses in this process.
+        """
+        if texture_format not in {TPCTextureFormat.DXT1, TPCTextureFormat.DXT5}:
+            msg = f"Cannot compress a texture to {texture_format.name}."
+            raise ValueError(msg)
+        pending: list[TPC] = [tpc for tpc in tpcs if tpc.format() != texture_format]
+        compressed: list[TPC] = parallel_map(
+            _compress_tpc,
+            pending,
+            [texture_format] * len(pending),
+            [quality] * len(pending),
+            max_workers=max_workers,
+            task="compress textures",
+        )
+        for tpc, result in zip(pending, compressed):
+            if result is not tpc:  # Compressed in a worker process, a copy came back.
+                tpc.set_data(result._width, result._height, result._mipmaps, result._texture_format)  # noqa: SLF001
+
     def get_bytes_per_pixel(self):
         bytes_per_pixel = 0
         if self._texture_format == TPCTextureFormat.Greyscale:
@@ -179,16 +340,9 @@ class TPC:
     @staticmethod
     def flip_image_data(data: bytes | bytearray, width: int, height: int, bytes_per_pixel: int) -> bytes:
         """Flip the image data vertically."""
-        flipped_data = bytearray(len(data))
-        row_length = width * bytes_per_pixel
-
-        for row in range(height):
-            source_start = row * row_length
-            source_end = source_start + row_length
-            dest_start = (height - 1 - row) * row_length
-            flipped_data[dest_start : dest_start + row_length] = data[source_start:source_end]
-
-        return bytes(flipped_data)
+        view = memoryview(data)
+        row_length: int = width * bytes_per_pixel
+        return b"".join(view[row * row_length : (row + 1) * row_length] for row in reversed(range(height)))
 
     def set_single(
         self,
@@ -254,6 +408,49 @@ class TPC:
     ) -> bool:
         return self._texture_format in {TPCTextureFormat.DXT1, TPCTextureFormat.DXT5}
 
+    def is_cube_map(
+        self,
+    ) -> bool:
+        """Returns whether the texture is a cube map, whose six square faces are stacked top to bottom in every mipmap."""
+        return self._height == 6 * self._width  # noqa: PLR2004
+
+    def _decode_faces(
+        self,
+        decode: Callable[[bytes, int, int], bytearray],
+        data: bytes,
+        width: int,
+        height: int,
+    ) -> bytearray:
+        """Decodes the blocks of a mipmap, one face at a time for cube maps as each face is compressed on its own."""
+        if not self.is_cube_map():
+            return decode(data, width, height)
+        face_size: int = len(data) // 6
+        return bytearray().join(decode(data[face * face_size : (face + 1) * face_size], width, height // 6) for face in range(6))
+
+    def _encode_faces(
+        self,
+        data: bytes,
+        channels: int,
+        width: int,
+        height: int,
+        texture_format: TPCTextureFormat,
+        quality: DXTQuality,
+    ) -> bytearray:
+        """Compresses a mipmap to DXT1 or DXT5, one face at a time for cube maps, faces smaller than a block get blocks of their own."""
+        faces: int = 6 if self.is_cube_map() else 1
+        face_height: int = height // faces
+        face_size: int = width * face_height * channels
+        compressed = bytearray()
+        for face in range(faces):
+            face_data = data[face * face_size : (face + 1) * face_size]
+            if not tpc_dxt.numpy_available:
+                compressed += TPC.rgba_to_dxt1(face_data, width, face_height) if texture_format == TPCTextureFormat.DXT1 else TPC.rgba_to_dxt5(face_data, width, face_height)
+            elif texture_format == TPCTextureFormat.DXT1:
+                compressed += tpc_dxt.rgba_to_dxt1(face_data, width, face_height, quality, channels)
+            else:
+                compressed += tpc_dxt.rgba_to_dxt5(face_data, width, face_height, quality, channels)
+        return compressed
+
     def _mipmap_size(
         self,
         mipmap: int,
@@ -276,12 +473,13 @@ class TPC:
             msg = "The index for the mipmap is out of range."
             raise IndexError(msg)
 
+        faces: int = 6 if self.is_cube_map() else 1
         width = self._width
-        height = self._height
+        height = self._height // faces
         for _ in range(mipmap):
-            width >>= 1
-            height >>= 1
-        return width, height
+            width = max(1, width >> 1)
+            height = max(1, height >> 1)
+        return width, height * faces
 
     @staticmethod
     def _calculate_color_indices(
@@ -308,27 +506,85 @@ class TPC:
         return colors[0][:3], colors[-1][:3]
 
     @staticmethod
-    def rgba_to_dxt1(
+    def _rgba_blocks(
         rgba_data: bytes,
         width: int,
         height: int,
-    ) -> bytearray:
-        """Convert RGBA data to DXT1 compressed format."""
-        compressed_data = bytearray()
+    ) -> Iterator[list[tuple[int, int, int, int]]]:
+        """Yields the 16 pixels of every 4x4 block, repeating the edge pixels where a block goes past the image."""
         for y, x in tpc_itertools.product(range(0, height, 4), range(0, width, 4)):
-            rgba_block: list[tuple[int, int, int, int]] = [
+            yield [
                 cast(Tuple[int, int, int, int], tuple(rgba_data[i : i + 4]))
-                for dy in range(4)
-                for dx in range(4)
-                for i in range((y * width + x + dy * width + dx) * 4, (y * width + x + dy * width + dx) * 4 + 4, 4)
+                for i in ((min(y + dy, height - 1) * width + min(x + dx, width - 1)) * 4 for dy in range(4) for dx in range(4))
             ]
-            c0, c1 = TPC._select_representative_colors(rgba_block)
-            c0_565 = TPC._rgb_to_rgba565(c0)
-            c1_565 = TPC._rgb_to_rgba565(c1)
-            indices = TPC._calculate_color_indices(rgba_block, c0, c1)
-            compressed_data += c0_565.to_bytes(2, byteorder="little")
-            compressed_data += c1_565.to_bytes(2, byteorder="little")
-            compressed_data += indices.to_bytes(4, byteorder="little")
+
+    @staticmethod
+    def _dxt1_block(
+        rgba_block: list[tuple[int, int, int, int]],
+    ) -> bytes:
+        c0, c1 = TPC._select_representative_colors(rgba_block)
+        c0_565 = TPC._rgb_to_rgba565(c0)
+        c1_565 = TPC._rgb_to_rgba565(c1)
+        indices = TPC._calculate_color_indices(rgba_block, c0, c1)
+        return c0_565.to_bytes(2, byteorder="little") + c1_565.to_bytes(2, byteorder="little") + indices.to_bytes(4, byteorder="little")
+
+    @staticmethod
+    def _dxt5_alpha_block(
+        rgba_block: list[tuple[int, int, int, int]],
+    ) -> bytes:
+        """Encodes the alpha of a 4x4 block with the largest and smallest alpha as endpoints."""
+        alphas: list[int] = [pixel[3] for pixel in rgba_block]
+        a0, a1 = max(alphas), min(alphas)
+        codes: list[int] = [a0, a1, *(((7 - i) * a0 + i * a1 + 3) // 7 for i in range(1, 7))] if a0 > a1 else [a0] * 8
+        indices: int = 0
+        for i, alpha in enumerate(alphas):
+            index = min(range(8), key=lambda code: abs(codes[code] - alpha))  # noqa: B023
+            indices |= index << (i * 3)
+        return bytes((a0, a1)) + indices.to_bytes(6, byteorder="little")
+
+    @staticmethod
+    def rgba_to_dxt1(
+        rgba_data: bytes,
+        width: int,
+        height: int,
+        quality: DXTQuality = DXTQuality.RANGE_FIT,
+    ) -> bytearray:
+        """Convert RGBA data to DXT1 compressed format.
+
+        Processing Logic:
+        ----------------
+            - If numpy is available, encodes every block at once with tpc_dxt at the given quality
+            - Otherwise encodes block by block, between the darkest and brightest color of each block
+        """
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.rgba_to_dxt1(rgba_data, width, height, quality)
+
+        compressed_data = bytearray()
+        for rgba_block in TPC._rgba_blocks(rgba_data, width, height):
+            compressed_data += TPC._dxt1_block(rgba_block)
+        return compressed_data
+
+    @staticmethod
+    def rgba_to_dxt5(
+        rgba_data: bytes,
+        width: int,
+        height: int,
+        quality: DXTQuality = DXTQuality.RANGE_FIT,
+    ) -> bytearray:
+        """Convert RGBA data to DXT5 compressed format.
+
+        Processing Logic:
+        ----------------
+            - If numpy is available, encodes every block at once with tpc_dxt at the given quality
+            - Otherwise encodes block by block, the colors like rgba_to_dxt1 and the alpha between its extremes
+        """
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.rgba_to_dxt5(rgba_data, width, height, quality)
+
+        compressed_data = bytearray()
+        for rgba_block in TPC._rgba_blocks(rgba_data, width, height):
+            compressed_data += TPC._dxt5_alpha_block(rgba_block)
+            compressed_data += TPC._dxt1_block(rgba_block)
         return compressed_data
 
     # region Convert to RGBA
@@ -352,6 +608,7 @@ class TPC:
 
         Processing Logic:
         ----------------
+            - If numpy is available, decodes every block at once with tpc_dxt instead
             - Reads the compressed DXT5 data using a BinaryReader
             - Loops through each 4x4 block
                 - Decodes the alpha and color data
@@ -359,6 +616,9 @@ class TPC:
                 - Writes the RGBA values to the output byte array
             - Returns the uncompressed pixel data.
         """
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.dxt5_to_rgba(data, width, height)
+
         dxt_reader: BinaryReader = BinaryReader.from_bytes(data)
         new_data = bytearray(width * height * 4)
 
@@ -447,12 +707,16 @@ class TPC:
 
         Processing Logic:
         ----------------
+            - If numpy is available, decodes every block at once with tpc_dxt instead
             - Parse the DXT1 data using a BinaryReader
             - Iterate over 4x4 pixel blocks
             - Decode the color values and interpolation data
             - Extract and interpolate the RGBA values for each pixel
             - Write the uncompressed RGBA values to a bytearray.
         """
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.dxt1_to_rgba(data, width, height)
+
         dxt_reader: BinaryReader = BinaryReader.from_bytes(data)
         new_data = bytearray(width * height * 4)
 
@@ -493,19 +757,10 @@ class TPC:
         width: int,
         height: int,
     ) -> bytearray:
-        new_data = bytearray()
-        rgb_reader = BinaryReader.from_bytes(data)
-
-        for _ty, _x in tpc_itertools.product(range(4, height + 4, 4), range(width)):
-            new_data.extend(
-                [
-                    rgb_reader.read_uint8(),
-                    rgb_reader.read_uint8(),
-                    rgb_reader.read_uint8(),
-                    255,
-                ],
-            )
-
+        count: int = width * height
+        new_data = bytearray(b"\xff") * (count * 4)
+        for channel in range(3):
+            new_data[channel::4] = data[channel : count * 3 : 3]
         return new_data
 
     @staticmethod
@@ -514,13 +769,9 @@ class TPC:
         width: int,
         height: int,
     ) -> bytearray:
-        new_data = bytearray()
-        rgb_reader = BinaryReader.from_bytes(data)
-
-        for _y, _x in tpc_itertools.product(range(height), range(width)):
-            brightness = rgb_reader.read_uint8()
-            new_data.extend([brightness, brightness, brightness, 255])
-
+        count: int = width * height
+        new_data = bytearray(b"\xff") * (count * 4)
+        new_data[0::4] = new_data[1::4] = new_data[2::4] = data[:count]
         return new_data
 
     # endregion
@@ -558,6 +809,9 @@ class TPC:
         width: int,
         height: int,
     ) -> bytearray:
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.dxt5_to_rgb(data, width, height)
+
         dxt_reader = BinaryReader.from_bytes(data)
         new_data = bytearray(width * height * 3)
 
@@ -599,6 +853,9 @@ class TPC:
         width: int,
         height: int,
     ) -> bytearray:
+        if tpc_dxt.numpy_available:
+            return tpc_dxt.dxt1_to_rgb(data, width, height)
+
         dxt_reader = BinaryReader.from_bytes(data)
         new_data = bytearray(width * height * 3)
 
@@ -638,19 +895,10 @@ class TPC:
         width: int,
         height: int,
     ) -> bytearray:
-        new_data = bytearray()
-        rgb_reader: BinaryReader = BinaryReader.from_bytes(data)
-
-        for _y, _x in tpc_itertools.product(range(height), range(width)):
-            new_data.extend(
-                [
-                    rgb_reader.read_uint8(),
-                    rgb_reader.read_uint8(),
-                    rgb_reader.read_uint8(),
-                ],
-            )
-            rgb_reader.skip(1)
-
+        count: int = width * height
+        new_data = bytearray(count * 3)
+        for channel in range(3):
+            new_data[channel::3] = data[channel : count * 4 : 4]
         return new_data
 
     # endregion
@@ -761,6 +1009,15 @@ class TPC:
         return bytes48[0] + (bytes48[1] << 8) + (bytes48[2] << 16) + (bytes48[3] << 24) + (bytes48[4] << 32) + (bytes48[5] << 40)
 
 
+def _compress_tpc(
+    tpc: TPC,
+    texture_format: TPCTextureFormat,
+    quality: DXTQuality,
+) -> TPC:
+    tpc.compress(texture_format, quality)
+    return tpc
+
+
 class TPCTextureFormat(IntEnum):
     Invalid = -1
     Greyscale = 0
@@ -0,0 +1,513 @@
+"""Whole-image DXT1/DXT5 block decoding and encoding with NumPy.
+
+Every function here works on all the blocks of a mipmap at once and requires numpy, check `numpy_available` first.
+The decoders reproduce the per-block decoding in TPC exactly, including its 5:6:5 expansion by plain shifts and its
+interpolation weights, so either path gives the same pixels.
+
+The encoders target standard DXT decoding, which is what the game uses: 5:6:5 colors are expanded by bit replication
+and the interpolated colors are (2 * c0 + c1) // 3 and (c0 + 2 * c1) // 3. Under that decoding the output is within
+these bounds of the source:
+
+- A block of a single color decodes within 4 of it in red and blue and within 2 in green.
+- Any other pixel decodes within a (red, green, blue) distance of its block's extent along its principal axis / 6, plus
+  its own distance from that axis, plus 8 for the 5:6:5 quantization and rounding.
+- DXT5 alpha decodes within (largest alpha - smallest alpha) / 14 + 1 of the block's source alphas with
+  `DXTQuality.RANGE_FIT`.
+- `DXTQuality.CLUSTER_FIT` never gives a block a higher squared error, color or alpha, than `DXTQuality.RANGE_FIT`.
+
+DXT1 alpha is not encoded, DXT1 blocks are always opaque.
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_DXT1_BLOCK_SIZE = 8
+_DXT5_BLOCK_SIZE = 16
+
+# Blocks encoded per batch of array operations, this bounds the size of the intermediate arrays.
+_RANGE_FIT_CHUNK = 16384
+_CLUSTER_FIT_CHUNK = 64
+
+
+if numpy_available:
+    _SNAP_SCALE = np.array([31 / 255, 63 / 255, 31 / 255], dtype=np.float32)
+    _SNAP_SHIFT = np.array([8, 4, 8], dtype=np.float32)
+    _SNAP_REPLICATE = np.array([1 / 4, 1 / 16, 1 / 4], dtype=np.float32)
+
+
+class DXTQuality(IntEnum):
+    """How hard the DXT encoders search for the endpoints of each block."""
+
+    RANGE_FIT = 0  # The extremes of the block's colors along their principal axis.
+    CLUSTER_FIT = 1  # The least squares endpoints of the best split of the colors into the four palette entries, slower.
+
+
+def _block_counts(
+    width: int,
+    height: int,
+) -> tuple[int, int]:
+    return max(1, (height + 3) // 4), max(1, (width + 3) // 4)
+
+
+def _blocks(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    block_size: int,
+) -> NDArray[np.uint8]:
+    """Returns the blocks of a mipmap as a (block count, block size) array."""
+    blocks_y, blocks_x = _block_counts(width, height)
+    count: int = blocks_y * blocks_x
+    if len(data) < count * block_size:
+        msg = f"Expected {count * block_size} bytes of block data for a {width}x{height} mipmap, got {len(data)}."
+        raise ValueError(msg)
+    return np.frombuffer(data, dtype=np.uint8, count=count * block_size).reshape(count, block_size)
+
+
+def _color_palettes(
+    color_blocks: NDArray[np.uint8],
+) -> NDArray[np.uint8]:
+    """Returns the four RGB palette entries of every 8 byte color block as a (block count, 4, 3) array."""
+    c0: NDArray[np.int64] = color_blocks[:, 0].astype(np.int64) | (color_blocks[:, 1].astype(np.int64) << 8)
+    c1: NDArray[np.int64] = color_blocks[:, 2].astype(np.int64) | (color_blocks[:, 3].astype(np.int64) << 8)
+    rgb0: NDArray[np.int64] = np.stack((((c0 >> 11) & 0x1F) << 3, ((c0 >> 5) & 0x3F) << 2, (c0 & 0x1F) << 3), axis=1)
+    rgb1: NDArray[np.int64] = np.stack((((c1 >> 11) & 0x1F) << 3, ((c1 >> 5) & 0x3F) << 2, (c1 & 0x1F) << 3), axis=1)
+
+    # Same float weights and operation order as TPC._interpolate_rgb, truncated like int().
+    four_colors: NDArray[np.bool_] = (c0 > c1)[:, None]
+    third: NDArray[np.int64] = ((1.0 - 0.3333333) * rgb0 + 0.3333333 * rgb1).astype(np.int64)
+    two_thirds: NDArray[np.int64] = ((1.0 - 0.6666666) * rgb0 + 0.6666666 * rgb1).astype(np.int64)
+    middle: NDArray[np.int64] = ((1.0 - 0.5555555) * rgb0 + 0.5555555 * rgb1).astype(np.int64)
+
+    palettes: NDArray[np.uint8] = np.empty((len(color_blocks), 4, 3), dtype=np.uint8)
+    palettes[:, 0] = rgb0
+    palettes[:, 1] = rgb1
+    palettes[:, 2] = np.where(four_colors, third, middle)
+    palettes[:, 3] = np.where(four_colors, two_thirds, 0)
+    return palettes
+
+
+def _color_indices(
+    color_blocks: NDArray[np.uint8],
+) -> NDArray[np.intp]:
+    """Returns the 2 bit palette index of every pixel of every color block as a (block count, 4, 4) array."""
+    rows: NDArray[np.uint8] = color_blocks[:, 4:8]
+    return ((rows[:, :, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).astype(np.intp)
+
+
+def _alpha_palettes(
+    a0: NDArray[np.integer],
+    a1: NDArray[np.integer],
+) -> NDArray[np.int64]:
+    """Returns the eight alpha codes of every DXT5 alpha block with endpoints `a0` and `a1` as a (block count, 8) array."""
+    f0: NDArray[np.float64] = a0.astype(np.float64)
+    f1: NDArray[np.float64] = a1.astype(np.float64)
+
+    # Same formulas as TPC._dxt5_to_rgba, truncated like int().
+    eight_alphas: NDArray[np.bool_] = f0 > f1
+    codes: NDArray[np.int64] = np.empty((len(a0), 8), dtype=np.int64)
+    codes[:, 0] = a0
+    codes[:, 1] = a1
+    for i, (w0, w1) in enumerate(((6.0, 1.0), (5.0, 2.0), (4.0, 3.0), (3.0, 4.0), (2.0, 5.0), (1.0, 6.0))):
+        codes[:, 2 + i] = ((w0 * f0 + w1 * f1 + 3) / 7).astype(np.int64)
+    six_alphas: list[NDArray[np.int64]] = [
+        ((4.0 * f0 + 1.0 * f1 + 1) / 5).astype(np.int64),
+        ((3.0 * f0 + 2.0 * f1 + 2) / 5).astype(np.int64),
+        ((2.0 * f0 + 3.0 * f1 + 2) / 5).astype(np.int64),
+        ((1.0 * f0 + 4.0 * f1 + 2) / 5).astype(np.int64),
+        np.zeros(len(a0), dtype=np.int64),
+        np.full(len(a0), 255, dtype=np.int64),
+    ]
+    for i, alphas in enumerate(six_alphas):
+        codes[:, 2 + i] = np.where(eight_alphas, codes[:, 2 + i], alphas)
+    return codes
+
+
+def _alpha_values(
+    alpha_blocks: NDArray[np.uint8],
+) -> NDArray[np.uint8]:
+    """Returns the alpha of every pixel of every 8 byte DXT5 alpha block as a (block count, 4, 4) array."""
+    codes: NDArray[np.int64] = _alpha_palettes(alpha_blocks[:, 0], alpha_blocks[:, 1])
+    bits: NDArray[np.uint64] = np.zeros(len(alpha_blocks), dtype=np.uint64)
+    for i in range(6):
+        bits |= alpha_blocks[:, 2 + i].astype(np.uint64) << np.uint64(8 * i)
+    indices: NDArray[np.intp] = ((bits[:, None] >> (np.arange(16, dtype=np.uint64) * np.uint64(3))) & np.uint64(7)).astype(np.intp)
+    return np.take_along_axis(codes, indices, axis=1).astype(np.uint8).reshape(-1, 4, 4)
+
+
+def _to_image(
+    pixels: NDArray[np.uint8],
+    width: int,
+    height: int,
+) -> bytearray:
+    """Lays out (block count, 4, 4, channels) block pixels as rows of the image and crops the padding blocks."""
+    blocks_y, blocks_x = _block_counts(width, height)
+    channels: int = pixels.shape[-1]
+    image: NDArray[np.uint8] = pixels.reshape(blocks_y, blocks_x, 4, 4, channels).transpose(0, 2, 1, 3, 4).reshape(blocks_y * 4, blocks_x * 4, channels)
+    return bytearray(np.ascontiguousarray(image[:height, :width]).tobytes())
+
+
+def _decode_colors(
+    color_blocks: NDArray[np.uint8],
+    channels: int,
+) -> NDArray[np.uint8]:
+    """Returns the (block count, 4, 4, channels) pixels of color blocks. A fourth channel is filled with 255."""
+    # Pack each palette entry into one little endian RGBA word so picking a pixel's color is a single gather.
+    palettes: NDArray[np.uint32] = _color_palettes(color_blocks).astype(np.uint32)
+    packed: NDArray[np.uint32] = (palettes[..., 0] | (palettes[..., 1] << 8) | (palettes[..., 2] << 16) | np.uint32(0xFF000000)).astype("<u4")
+    indices: NDArray[np.intp] = _color_indices(color_blocks).reshape(-1, 16)
+    pixels: NDArray[np.uint8] = np.take_along_axis(packed, indices, axis=1).view(np.uint8).reshape(-1, 4, 4, 4)
+    return pixels if channels == 4 else pixels[..., :channels]  # noqa: PLR2004
+
+
+def dxt1_to_rgba(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Decodes a DXT1 mipmap to RGBA bytes. DXT1 alpha is not decoded, every pixel is opaque."""
+    return _to_image(_decode_colors(_blocks(data, width, height, _DXT1_BLOCK_SIZE), 4), width, height)
+
+
+def dxt1_to_rgb(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Decodes a DXT1 mipmap to RGB bytes."""
+    return _to_image(_decode_colors(_blocks(data, width, height, _DXT1_BLOCK_SIZE), 3), width, height)
+
+
+def dxt5_to_rgba(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Decodes a DXT5 mipmap to RGBA bytes."""
+    blocks: NDArray[np.uint8] = _blocks(data, width, height, _DXT5_BLOCK_SIZE)
+    pixels: NDArray[np.uint8] = _decode_colors(blocks[:, 8:], 4)
+    pixels[..., 3] = _alpha_values(blocks[:, :8])
+    return _to_image(pixels, width, height)
+
+
+def dxt5_to_rgb(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Decodes a DXT5 mipmap to RGB bytes, the alpha blocks are skipped."""
+    return _to_image(_decode_colors(_blocks(data, width, height, _DXT5_BLOCK_SIZE)[:, 8:], 3), width, height)
+
+
+def _pixel_blocks(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    channels: int,
+) -> NDArray[np.uint8]:
+    """Returns the pixels of an image as (block count, 16, 4) RGBA blocks, repeating the edge pixels into the padding blocks."""
+    count: int = width * height * channels
+    if len(data) < count:
+        msg = f"Expected {count} bytes of pixel data for a {width}x{height} mipmap, got {len(data)}."
+        raise ValueError(msg)
+    pixels: NDArray[np.uint8] = np.frombuffer(data, dtype=np.uint8, count=count).reshape(height, width, channels)
+    image: NDArray[np.uint8] = np.full((height, width, 4), 255, dtype=np.uint8)
+    image[..., : min(channels, 3)] = pixels[..., : min(channels, 3)]
+    if channels == 1:
+        image[..., 1:3] = pixels
+    elif channels == 4:  # noqa: PLR2004
+        image[..., 3] = pixels[..., 3]
+
+    blocks_y, blocks_x = _block_counts(width, height)
+    image = np.pad(image, ((0, blocks_y * 4 - height), (0, blocks_x * 4 - width), (0, 0)), mode="edge")
+    return image.reshape(blocks_y, 4, blocks_x, 4, 4).transpose(0, 2, 1, 3, 4).reshape(-1, 16, 4)
+
+
+def _quantize_565(
+    rgb: NDArray[np.floating],
+) -> NDArray[np.int64]:
+    """Rounds (..., 3) RGB colors to the nearest 5:6:5 colors."""
+    clipped: NDArray[np.floating] = np.clip(rgb, 0, 255)
+    red: NDArray[np.int64] = np.rint(clipped[..., 0] * (31 / 255)).astype(np.int64)
+    green: NDArray[np.int64] = np.rint(clipped[..., 1] * (63 / 255)).astype(np.int64)
+    blue: NDArray[np.int64] = np.rint(clipped[..., 2] * (31 / 255)).astype(np.int64)
+    return (red << 11) | (green << 5) | blue
+
+
+def _expand_565(
+    color: NDArray[np.int64],
+) -> NDArray[np.int64]:
+    """Expands 5:6:5 colors to (..., 3) RGB colors the way standard DXT decoding does, by bit replication."""
+    red: NDArray[np.int64] = (color >> 11) & 0x1F
+    green: NDArray[np.int64] = (color >> 5) & 0x3F
+    blue: NDArray[np.int64] = color & 0x1F
+    return np.stack(((red << 3) | (red >> 2), (green << 2) | (green >> 4), (blue << 3) | (blue >> 2)), axis=-1)
+
+
+def _fit_colors(
+    colors: NDArray[np.float32],
+    end0: NDArray[np.floating],
+    end1: NDArray[np.floating],
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.intp], NDArray[np.float32]]:
+    """Quantizes the endpoints of (block count, 16, 3) color blocks and picks the nearest palette entry for every pixel.
+
+    Returns:
+    -------
+        The 5:6:5 endpoints, the (block count, 16) palette indices and the squared error of every block.
+    """
+    c0: NDArray[np.int64] = _quantize_565(end0)
+    c1: NDArray[np.int64] = _quantize_565(end1)
+    c0, c1 = np.maximum(c0, c1), np.minimum(c0, c1)  # c0 > c1 selects the four color palette.
+
+    rgb0: NDArray[np.int64] = _expand_565(c0)
+    rgb1: NDArray[np.int64] = _expand_565(c1)
+    four_colors: NDArray[np.bool_] = (c0 > c1)[:, None]
+    palettes: NDArray[np.float32] = np.empty((len(colors), 4, 3), dtype=np.float32)
+    palettes[:, 0] = rgb0
+    palettes[:, 1] = rgb1
+    palettes[:, 2] = np.where(four_colors, (2 * rgb0 + rgb1) // 3, (rgb0 + rgb1) // 2)
+    palettes[:, 3] = np.where(four_colors, (rgb0 + 2 * rgb1) // 3, 0)
+
+    # |color - entry|^2 without the |color|^2 term, which is the same for every entry.
+    distances: NDArray[np.float32] = np.square(palettes).sum(axis=2)[:, None, :] - 2 * np.matmul(colors, palettes.transpose(0, 2, 1))
+    indices: NDArray[np.intp] = distances.argmin(axis=2)
+    errors: NDArray[np.float32] = np.take_along_axis(distances, indices[..., None], axis=2)[..., 0].sum(axis=1) + np.square(colors).sum(axis=(1, 2))
+    return c0, c1, indices, np.maximum(errors, 0)
+
+
+def _principal_axes(
+    covariance: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Returns the unit eigenvector of the largest eigenvalue of every symmetric (block count, 3, 3) covariance matrix.
+
+    Solves the characteristic cubic in closed form, which is several times faster than np.linalg.eigh on many small
+    matrices. Blocks with no single principal direction get some unit vector of their largest eigenspace.
+    """
+    xx, yy, zz = covariance[:, 0, 0], covariance[:, 1, 1], covariance[:, 2, 2]
+    xy, yz, xz = covariance[:, 0, 1], covariance[:, 1, 2], covariance[:, 0, 2]
+    mean: NDArray[np.float64] = (xx + yy + zz) / 3
+    spread: NDArray[np.float64] = np.sqrt(((xx - mean) ** 2 + (yy - mean) ** 2 + (zz - mean) ** 2 + 2 * (xy * xy + yz * yz + xz * xz)) / 6)
+    scale: NDArray[np.float64] = np.where(spread > 0, spread, 1)
+    bx, by, bz = (xx - mean) / scale, (yy - mean) / scale, (zz - mean) / scale
+    bxy, byz, bxz = xy / scale, yz / scale, xz / scale
+    half_det: NDArray[np.float64] = (bx * (by * bz - byz * byz) - bxy * (bxy * bz - byz * bxz) + bxz * (bxy * byz - by * bxz)) / 2
+    largest: NDArray[np.float64] = mean + 2 * spread * np.cos(np.arccos(np.clip(half_det, -1, 1)) / 3)
+
+    # The rows of covariance - largest * I span the space orthogonal to the eigenvector, so their cross products lie on it.
+    shifted: NDArray[np.float64] = covariance - largest[:, None, None] * np.eye(3)
+    rows: tuple[NDArray[np.float64], ...] = (shifted[:, 0], shifted[:, 1], shifted[:, 2])
+    candidates: NDArray[np.float64] = np.stack((np.cross(rows[0], rows[1]), np.cross(rows[0], rows[2]), np.cross(rows[1], rows[2])), axis=1)
+    norms: NDArray[np.float64] = np.linalg.norm(candidates, axis=2)
+    best: NDArray[np.intp] = norms.argmax(axis=1)
+    axes: NDArray[np.float64] = np.take_along_axis(candidates, best[:, None, None], axis=1)[:, 0]
+    length: NDArray[np.float64] = np.take_along_axis(norms, best[:, None], axis=1)
+
+    # Otherwise the largest eigenvalue is repeated, any direction orthogonal to the remaining row will do.
+    degenerate: NDArray[np.bool_] = length[:, 0] <= 1e-9 * np.maximum(largest, 1) ** 2
+    if degenerate.any():
+        row_norms: NDArray[np.float64] = np.linalg.norm(shifted[degenerate], axis=2)
+        row: NDArray[np.float64] = np.take_along_axis(shifted[degenerate], row_norms.argmax(axis=1)[:, None, None], axis=1)[:, 0]
+        fallback: NDArray[np.float64] = np.cross(row, np.eye(3)[np.abs(row).argmin(axis=1)])
+        fallback_length: NDArray[np.float64] = np.linalg.norm(fallback, axis=1, keepdims=True)
+        fallback = np.where(fallback_length > 0, fallback, 1.0)  # Every direction is principal, the block has one color.
+        axes[degenerate] = fallback
+        length[degenerate] = np.linalg.norm(fallback, axis=1, keepdims=True)
+    return axes / length
+
+
+def _snap_565(
+    rgb: NDArray[np.float32],
+) -> NDArray[np.float32]:
+    """Returns the colors `_quantize_565` and `_expand_565` would give (..., 3) RGB colors, in floating point."""
+    levels: NDArray[np.float32] = np.rint(np.clip(rgb, 0, 255) * _SNAP_SCALE)
+    return levels * _SNAP_SHIFT + np.floor(levels * _SNAP_REPLICATE)
+
+
+@lru_cache(maxsize=None)
+def _cluster_partitions() -> tuple[NDArray[np.intp], NDArray[np.float32], NDArray[np.float32], NDArray[np.float32], NDArray[np.float32]]:
+    """Returns every split of 16 ordered pixels into the four palette entries of a block, as the ends of the first three
+    clusters and the least squares sums of their interpolation weights. Splits that leave one cluster are left out,
+    their endpoints are undetermined.
+    """
+    splits: list[tuple[int, int, int]] = []
+    alpha2: list[float] = []
+    beta2: list[float] = []
+    alphabeta: list[float] = []
+    for a in range(17):
+        for b in range(17 - a):
+            for c in range(17 - a - b):
+                d: int = 16 - a - b - c
+                if max(a, b, c, d) == 16:  # noqa: PLR2004
+                    continue
+                splits.append((a, a + b, a + b + c))
+                alpha2.append(a + b * 4 / 9 + c / 9)
+                beta2.append(b / 9 + c * 4 / 9 + d)
+                alphabeta.append((b + c) * 2 / 9)
+    a2: NDArray[np.float64] = np.array(alpha2)
+    b2: NDArray[np.float64] = np.array(beta2)
+    ab: NDArray[np.float64] = np.array(alphabeta)
+    factor: NDArray[np.float64] = 1 / (a2 * b2 - ab * ab)
+    return (
+        np.array(splits, dtype=np.intp),
+        a2.astype(np.float32)[:, None],
+        b2.astype(np.float32)[:, None],
+        ab.astype(np.float32)[:, None],
+        factor.astype(np.float32)[:, None],
+    )
+
+
+def _cluster_endpoints(
+    colors: NDArray[np.float32],
+    projections: NDArray[np.float32],
+) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """Returns the endpoints of the split of every block's colors, ordered along its principal axis, with the least error."""
+    splits, a2, b2, ab, factor = _cluster_partitions()
+    order: NDArray[np.intp] = projections.argsort(axis=1)
+    ordered: NDArray[np.float32] = np.take_along_axis(colors, order[..., None], axis=1)
+    sums: NDArray[np.float32] = np.zeros((len(colors), 17, 3), dtype=np.float32)
+    np.cumsum(ordered, axis=1, out=sums[:, 1:])
+
+    # With the weights 1, 2/3, 1/3 and 0 of the clusters, the weighted sum of the colors reduces to the sum of the
+    # prefix sums at the cluster ends / 3.
+    alphax: NDArray[np.float32] = (sums[:, splits[:, 0]] + sums[:, splits[:, 1]] + sums[:, splits[:, 2]]) * np.float32(1 / 3)
+    betax: NDArray[np.float32] = sums[:, 16:17] - alphax
+
+    # Measure each split with its endpoints snapped to 5:6:5 colors, as they will be stored.
+    end0: NDArray[np.float32] = _snap_565((alphax * b2 - betax * ab) * factor)
+    end1: NDArray[np.float32] = _snap_565((betax * a2 - alphax * ab) * factor)
+    errors: NDArray[np.float32] = (end0 * (end0 * a2 + 2 * (end1 * ab - alphax)) + end1 * (end1 * b2 - 2 * betax)).sum(axis=2)
+    best: NDArray[np.intp] = errors.argmin(axis=1)[:, None, None]
+    return np.take_along_axis(end0, best, axis=1)[:, 0], np.take_along_axis(end1, best, axis=1)[:, 0]
+
+
+def _encode_colors(
+    colors: NDArray[np.float32],
+    quality: DXTQuality,
+) -> NDArray[np.uint8]:
+    """Encodes (block count, 16, 3) color blocks to 8 byte DXT1 color blocks."""
+    mean: NDArray[np.float32] = colors.mean(axis=1)
+    centered: NDArray[np.float32] = colors - mean[:, None]
+    covariance: NDArray[np.float32] = np.matmul(centered.transpose(0, 2, 1), centered)
+
+    axis: NDArray[np.float32] = _principal_axes(covariance.astype(np.float64)).astype(np.float32)
+    projections: NDArray[np.float32] = np.matmul(centered, axis[:, :, None])[..., 0]
+
+    c0, c1, indices, errors = _fit_colors(
+        colors,
+        mean + axis * projections.max(axis=1, keepdims=True),
+        mean + axis * projections.min(axis=1, keepdims=True),
+    )
+    refine: NDArray[np.intp] = np.flatnonzero(errors) if quality == DXTQuality.CLUSTER_FIT else np.empty(0, dtype=np.intp)
+    if len(refine):
+        cluster_c0, cluster_c1, cluster_indices, cluster_errors = _fit_colors(
+            colors[refine],
+            *_cluster_endpoints(colors[refine], projections[refine]),
+        )
+        better: NDArray[np.bool_] = cluster_errors < errors[refine]
+        c0[refine[better]] = cluster_c0[better]
+        c1[refine[better]] = cluster_c1[better]
+        indices[refine[better]] = cluster_indices[better]
+
+    encoded: NDArray[np.uint8] = np.empty((len(colors), 8), dtype=np.uint8)
+    encoded[:, 0] = c0 & 0xFF
+    encoded[:, 1] = c0 >> 8
+    encoded[:, 2] = c1 & 0xFF
+    encoded[:, 3] = c1 >> 8
+    rows: NDArray[np.intp] = indices.reshape(-1, 4, 4)
+    encoded[:, 4:8] = rows[..., 0] | (rows[..., 1] << 2) | (rows[..., 2] << 4) | (rows[..., 3] << 6)
+    return encoded
+
+
+def _fit_alphas(
+    alphas: NDArray[np.int32],
+    a0: NDArray[np.int32],
+    a1: NDArray[np.int32],
+) -> tuple[NDArray[np.intp], NDArray[np.int32]]:
+    """Picks the nearest alpha code for every pixel of (block count, 16) alpha blocks, returns the indices and the errors."""
+    distances: NDArray[np.int32] = np.square(alphas[:, :, None] - _alpha_palettes(a0, a1).astype(np.int32)[:, None, :])
+    indices: NDArray[np.intp] = distances.argmin(axis=2)
+    return indices, np.take_along_axis(distances, indices[..., None], axis=2)[..., 0].sum(axis=1)
+
+
+def _encode_alphas(
+    alphas: NDArray[np.int32],
+    quality: DXTQuality,
+) -> NDArray[np.uint8]:
+    """Encodes (block count, 16) alpha blocks to 8 byte DXT5 alpha blocks."""
+    a0: NDArray[np.int32] = alphas.max(axis=1)
+    a1: NDArray[np.int32] = alphas.min(axis=1)
+    indices, errors = _fit_alphas(alphas, a0, a1)
+    if quality == DXTQuality.CLUSTER_FIT:
+        # The six alpha palette has exact 0 and 255 entries, so only the alphas in between need to span its endpoints.
+        inner: NDArray[np.bool_] = (alphas > 0) & (alphas < 255)  # noqa: PLR2004
+        low: NDArray[np.int32] = np.where(inner, alphas, 255).min(axis=1)
+        high: NDArray[np.int32] = np.where(inner, alphas, 0).max(axis=1)
+        low, high = np.minimum(low, high), np.maximum(low, high)
+        six_indices, six_errors = _fit_alphas(alphas, low, high)
+        better: NDArray[np.bool_] = six_errors < errors
+        a0 = np.where(better, low, a0)
+        a1 = np.where(better, high, a1)
+        indices = np.where(better[:, None], six_indices, indices)
+
+    bits: NDArray[np.uint64] = (indices.astype(np.uint64) << (np.arange(16, dtype=np.uint64) * np.uint64(3))).sum(axis=1, dtype=np.uint64)
+    encoded: NDArray[np.uint8] = np.empty((len(alphas), 8), dtype=np.uint8)
+    encoded[:, 0] = a0
+    encoded[:, 1] = a1
+    encoded[:, 2:8] = (bits[:, None] >> (np.arange(6, dtype=np.uint64) * np.uint64(8))) & np.uint64(0xFF)
+    return encoded
+
+
+def _encode(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    channels: int,
+    quality: DXTQuality,
+    *,
+    alpha: bool,
+) -> bytearray:
+    blocks: NDArray[np.uint8] = _pixel_blocks(data, width, height, channels)
+    chunk: int = _CLUSTER_FIT_CHUNK if quality == DXTQuality.CLUSTER_FIT else _RANGE_FIT_CHUNK
+    encoded: list[NDArray[np.uint8]] = []
+    for start in range(0, len(blocks), chunk):
+        pixels: NDArray[np.uint8] = blocks[start : start + chunk]
+        colors: NDArray[np.uint8] = _encode_colors(pixels[..., :3].astype(np.float32), quality)
+        if alpha:
+            colors = np.concatenate((_encode_alphas(pixels[..., 3].astype(np.int32), quality), colors), axis=1)
+        encoded.append(colors)
+    return bytearray(np.concatenate(encoded).tobytes())
+
+
+def rgba_to_dxt1(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    quality: DXTQuality = DXTQuality.RANGE_FIT,
+    channels: int = 4,
+) -> bytearray:
+    """Encodes a mipmap to DXT1. `channels` is 4 for RGBA, 3 for RGB or 1 for greyscale pixel data."""
+    return _encode(data, width, height, channels, quality, alpha=False)
+
+
+def rgba_to_dxt5(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    quality: DXTQuality = DXTQuality.RANGE_FIT,
+    channels: int = 4,
+) -> bytearray:
+    """Encodes a mipmap to DXT5. `channels` is 4 for RGBA, 3 for RGB or 1 for greyscale pixel data."""
+    return _encode(data, width, height, channels, quality, alpha=True)
@@ -0,0 +1,151 @@
+"""Mipmap chain generation with NumPy.
+
+`mipmap_chain` requires numpy, check `numpy_available` first. Levels are filtered in linear light: color channels are
+decoded from sRGB before filtering and encoded again afterwards, alpha is filtered as is. Each level is filtered from the
+unquantized previous level, so rounding errors do not add up down the chain.
+
+Level sizes halve and round down to at least 1, like the game's own mipmaps, so odd sizes are filtered with fractional
+footprints rather than by dropping the last row or column.
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_KAISER_RADIUS = 3  # In pixels of the smaller level.
+_KAISER_ALPHA = 4.0
+
+
+class MipmapFilter(IntEnum):
+    """The filter used to shrink one mipmap level into the next."""
+
+    BOX = 0  # The average of the pixels each pixel of the smaller level covers. Fast and never rings.
+    KAISER = 1  # A Kaiser windowed sinc, keeps more detail in the smaller levels at the cost of slight ringing.
+
+
+def mipmap_count(
+    width: int,
+    height: int,
+) -> int:
+    """Returns the number of levels of a full mipmap chain, down to 1x1."""
+    return max(width, height, 1).bit_length()
+
+
+@lru_cache(maxsize=64)
+def _taps(
+    size: int,
+    new_size: int,
+    mipmap_filter: MipmapFilter,
+) -> tuple[NDArray[np.intp], NDArray[np.float32]]:
+    """Returns the source indices and weights of every pixel along one axis of the smaller level, as (new size, taps) arrays."""
+    scale: float = size / new_size
+    if mipmap_filter == MipmapFilter.BOX:
+        starts: NDArray[np.float64] = np.arange(new_size) * scale
+        first: NDArray[np.intp] = np.floor(starts).astype(np.intp)
+        indices: NDArray[np.intp] = first[:, None] + np.arange(int(np.ceil(scale)) + 1)
+        overlap: NDArray[np.float64] = np.minimum(indices + 1, starts[:, None] + scale) - np.maximum(indices, starts[:, None])
+        weights: NDArray[np.float64] = np.clip(overlap, 0, None)
+    else:
+        centers: NDArray[np.float64] = (np.arange(new_size) + 0.5) * scale - 0.5
+        radius: float = _KAISER_RADIUS * scale
+        indices = np.floor(centers - radius).astype(np.intp)[:, None] + np.arange(int(np.ceil(2 * radius)) + 2)
+        offsets: NDArray[np.float64] = (indices - centers[:, None]) / radius
+        window: NDArray[np.float64] = np.i0(_KAISER_ALPHA * np.sqrt(np.clip(1 - offsets * offsets, 0, None))) / np.i0(_KAISER_ALPHA)
+        weights = np.where(np.abs(offsets) < 1, np.sinc((indices - centers[:, None]) / scale) * window, 0)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, size - 1), weights.astype(np.float32)
+
+
+def _resample(
+    image: NDArray[np.float32],
+    axis: int,
+    new_size: int,
+    mipmap_filter: MipmapFilter,
+) -> NDArray[np.float32]:
+    """Shrinks an image along one axis. Pixels past the edges repeat the edge pixels."""
+    indices, weights = _taps(image.shape[axis], new_size, mipmap_filter)
+    shape: list[int] = [1] * image.ndim
+    shape[axis] = new_size
+    result: NDArray[np.float32] = np.zeros((*image.shape[:axis], new_size, *image.shape[axis + 1 :]), dtype=np.float32)
+    for tap in range(indices.shape[1]):
+        result += np.take(image, indices[:, tap], axis=axis) * weights[:, tap].reshape(shape)
+    return result
+
+
+def _srgb_to_linear(
+    values: NDArray[np.uint8],
+) -> NDArray[np.float32]:
+    table: NDArray[np.float64] = np.arange(256) / 255
+    table = np.where(table <= 0.04045, table / 12.92, ((table + 0.055) / 1.055) ** 2.4)  # noqa: PLR2004
+    return table.astype(np.float32)[values]
+
+
+def _linear_to_srgb(
+    values: NDArray[np.float32],
+) -> NDArray[np.float32]:
+    values = np.clip(values, 0, 1)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055) * 255  # noqa: PLR2004
+
+
+def mipmap_chain(
+    data: bytes | bytearray | memoryview,
+    width: int,
+    height: int,
+    channels: int,
+    mipmap_filter: MipmapFilter = MipmapFilter.BOX,
+    *,
+    srgb: bool = True,
+    faces: int = 1,
+) -> list[bytearray]:
+    """Returns every level of a full mipmap chain of an image, starting with the image itself.
+
+    Args:
+    ----
+        data: The pixels of the image, `channels` bytes each. 1 is greyscale, 3 is RGB and 4 is RGBA.
+        width: The width of the image.
+        height: The height of the image, for cube maps the height of all the faces stacked.
+        channels: The number of bytes per pixel.
+        mipmap_filter: The filter to shrink each level with.
+        srgb: Whether the colors are sRGB encoded and filtered in linear light. Pass False for normal maps and other
+            data that is already linear.
+        faces: The number of equally tall images stacked in `data`, 6 for a cube map. Each one is filtered on its own
+            and the levels keep them stacked.
+
+    Returns:
+    -------
+        The pixels of every level, the first being a copy of `data`.
+    """
+    face_height: int = height // faces
+    count: int = width * height * channels
+    if len(data) < count:
+        msg = f"Expected {count} bytes of pixel data for a {width}x{height} image, got {len(data)}."
+        raise ValueError(msg)
+    pixels: NDArray[np.uint8] = np.frombuffer(data, dtype=np.uint8, count=count).reshape(faces, face_height, width, channels)
+
+    colors: int = channels if channels < 4 else 3  # noqa: PLR2004
+    image: NDArray[np.float32] = np.empty(pixels.shape, dtype=np.float32)
+    image[..., :colors] = _srgb_to_linear(pixels[..., :colors]) if srgb else pixels[..., :colors] / np.float32(255)
+    image[..., colors:] = pixels[..., colors:] / np.float32(255)
+
+    levels: list[bytearray] = [bytearray(data[:count])]
+    level_width, level_height = width, face_height
+    for _ in range(1, mipmap_count(width, face_height)):
+        level_width, level_height = max(1, level_width >> 1), max(1, level_height >> 1)
+        image = _resample(_resample(image, 1, level_height, mipmap_filter), 2, level_width, mipmap_filter)
+        encoded: NDArray[np.float32] = np.empty(image.shape, dtype=np.float32)
+        encoded[..., :colors] = _linear_to_srgb(image[..., :colors]) if srgb else np.clip(image[..., :colors], 0, 1) * 255
+        encoded[..., colors:] = np.clip(image[..., colors:], 0, 1) * 255
+        levels.append(bytearray(np.rint(encoded).astype(np.uint8).tobytes()))
+    return levels
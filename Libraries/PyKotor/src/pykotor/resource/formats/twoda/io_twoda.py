@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import struct
+
 from typing import TYPE_CHECKING
 
 from pykotor.resource.formats.twoda.twoda_data import TwoDA
@@ -9,6 +11,23 @@ if TYPE_CHECKING:
     from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES
 
 
+def _read_cell(
+    cell_data: bytes,
+    offset: int,
+) -> str:
+    """Decodes the null terminated ascii string at `offset` of the cell data, cut at the first byte that is not ascii."""
+    end: int = cell_data.find(b"\0", offset)
+    data: bytes = cell_data[offset:] if end == -1 else cell_data[offset:end]
+    try:
+        cell: str = data.decode("ascii")
+    except UnicodeDecodeError as e:
+        return data[: e.start].decode("ascii")
+    if end == -1:
+        msg = "A cell's string exceeds the file boundaries."
+        raise OSError(msg)
+    return cell
+
+
 class TwoDABinaryReader(ResourceReader):
     def __init__(
         self,
@@ -39,11 +58,9 @@ class TwoDABinaryReader(ResourceReader):
             - Read file header and validate type and version
             - Read column headers
             - Read row count and populate rows
-            - Read cell offsets
-            - Seek to cell data and populate cells
+            - Read the cell offset table and the cell data in one read each
+            - Decode each distinct offset of the cell data once and populate cells
         """
-        self._twoda = TwoDA()
-
         file_type = self._reader.read_string(4)
         file_version = self._reader.read_string(4)
 
@@ -57,37 +74,33 @@ class TwoDABinaryReader(ResourceReader):
 
         self._reader.read_uint8()  # \n
 
-        columns = []
+        headers: list[str] = []
         while self._reader.peek() != b"\0":
-            column_header = self._reader.read_terminated_string("\t")
-            self._twoda.add_column(column_header)
-            columns.append(column_header)
+            headers.append(self._reader.read_terminated_string("\t"))
 
         self._reader.read_uint8()  # \0
 
         row_count = self._reader.read_uint32()
-        column_count = self._twoda.get_width()
+        column_count = len(headers)
         cell_count = row_count * column_count
-        for _ in range(row_count):
-            row_header = self._reader.read_terminated_string("\t")
-            row_label = row_header
-            self._twoda.add_row(row_label)
-
-        cell_offsets: list[int] = [0] * cell_count
-        for i in range(cell_count):
-            cell_offsets[i] = self._reader.read_uint16()
+        labels: list[str] = [self._reader.read_terminated_string("\t") for _ in range(row_count)]
 
+        cell_offsets = self._reader.read_array("H", cell_count)
         self._reader.read_uint16()
-        cell_data_offset = self._reader.position()
-
-        for i in range(cell_count):
-            column_id = i % column_count
-            row_id = i // column_count
-            column_header = columns[column_id]
-            self._reader.seek(cell_data_offset + cell_offsets[i])
-            cell_value = self._reader.read_terminated_string("\0")
-            self._twoda.set_cell(row_id, column_header, cell_value)
+        cell_data: bytes = self._reader.read_all()
 
+        cells: dict[int, str] = {}
+        values: list[str] = []
+        for cell_offset in cell_offsets:
+            cell: str | None = cells.get(cell_offset)
+            if cell is None:
+                cell = cells[cell_offset] = _read_cell(cell_data, cell_offset)
+            values.append(cell)
+        self._twoda = TwoDA.from_columns(
+            headers,
+            labels,
+            [values[column_id::column_count] for column_id in range(column_count)],
+        )
         return self._twoda
 
 
@@ -120,7 +133,8 @@ class TwoDABinaryWriter(ResourceWriter):
             - Get the headers and row labels from the 2DA
             - Write the header string and version
             - Write the headers and row labels
-            - Loop through each cell and writes the value offsets and data
+            - Intern each distinct cell value in a dict while building the cell offset table in one pass
+            - Write the offset table, then every distinct value in order of first use
             - Close the writer if auto_close is True
         """
         headers = self._twoda.get_headers()
@@ -137,25 +151,20 @@ class TwoDABinaryWriter(ResourceWriter):
         for row_label in self._twoda.get_labels():
             self._writer.write_string(str(row_label) + "\t")
 
-        values: list[str] = []
-        value_offsets: list[int] = []
+        value_offsets: dict[str, int] = {}
         cell_offsets: list[int] = []
         data_size = 0
 
-        for row in self._twoda:
-            for header in self._twoda.get_headers():
-                value = row.get_string(header) + "\0"
-                if value not in values:
-                    value_offset = len(values[-1]) + value_offsets[-1] if value_offsets else 0
-                    values.append(value)
-                    value_offsets.append(value_offset)
-                    data_size += len(value)
-                cell_offset = value_offsets[values.index(value)]
-                cell_offsets.append(cell_offset)
+        columns: list[list[str]] = [self._twoda.get_column(header) for header in headers]
+        for row in zip(*columns):
+            for cell in row:
+                value_offset: int | None = value_offsets.get(cell)
+                if value_offset is None:
+                    value_offset = value_offsets[cell] = data_size
+                    data_size += len(cell) + 1
+                cell_offsets.append(value_offset)
 
-        for cell_offset in cell_offsets:
-            self._writer.write_uint16(cell_offset)
+        self._writer.write_bytes(struct.pack(f"<{len(cell_offsets)}H", *cell_offsets))
         self._writer.write_uint16(data_size)
 
-        for value in values:
-            self._writer.write_string(value)
+        self._writer.write_string("".join(f"{value}\0" for value in value_offsets))
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from bisect import insort
+from collections.abc import MutableMapping
 from contextlib import suppress
 from copy import copy
-from typing import TYPE_CHECKING, Any, TypeVar
+from typing import TYPE_CHECKING, Any, Iterator, TypeVar
 
 from pykotor.resource.type import ResourceType
 
@@ -15,8 +17,23 @@ if TYPE_CHECKING:
 T = TypeVar("T")
 
 
+def _max_integer(
+    cells: list[str],
+) -> int:
+    max_found = -1
+    for cell in cells:
+        with suppress(ValueError):
+            max_found = max(int(cell), max_found)
+    return max_found
+
+
 class TwoDA:
-    """Represents a 2DA file."""
+    """Represents a 2DA file.
+
+    Cells are stored per column. Row labels are hashed on first lookup, and the cells of a column are hashed the first
+    time the column is searched with find_rows. Both indexes, and the cached maximums behind label_max and column_max,
+    are kept current as rows, cells, labels and columns change.
+    """
 
     BINARY_TYPE = ResourceType.TwoDA
 
@@ -24,21 +41,67 @@ class TwoDA:
         self,
         headers: list[str] | None = None,
     ):
-        self._rows: list[dict[str, str]] = []
         self._headers: list[str] = [] if headers is None else headers  # for columns
         self._labels: list[str] = []  # for rows
+        self._columns: dict[str, list[str]] = {header: [] for header in self._headers}
+
+        self._label_rows: dict[str, list[int]] | None = None  # label -> row indices, built when first searched
+        self._value_rows: dict[str, dict[str, list[int]]] = {}  # header -> cell -> row indices, for searched columns
+        self._label_max: int | None = None
+        self._column_max: dict[str, int] = {}
+
+    @classmethod
+    def from_columns(
+        cls,
+        headers: list[str],
+        labels: list[str],
+        columns: list[list[str]],
+    ) -> TwoDA:
+        """Creates a table from whole columns at once, without building it row by row.
+
+        Args:
+        ----
+            headers: The column headers.
+            labels: The row labels.
+            columns: The cells of each column, in the order of headers. The lists are used as is, not copied.
+
+        Raises:
+        ------
+            KeyError: If a column header is repeated.
+            ValueError: If the number of columns does not match the headers or a column does not have a cell per row.
+
+        Returns:
+        -------
+            The new table.
+        """
+        if len(columns) != len(headers):
+            msg = f"Expected {len(headers)} columns, got {len(columns)}."
+            raise ValueError(msg)
+        twoda = cls()
+        for header, column in zip(headers, columns):
+            if header in twoda._columns:
+                msg = f"The header '{header}' already exists."
+                raise KeyError(msg)
+            if len(column) != len(labels):
+                msg = f"The column '{header}' has {len(column)} cells, expected {len(labels)}."
+                raise ValueError(msg)
+            twoda._headers.append(header)
+            twoda._columns[header] = column
+        twoda._labels = labels
+        return twoda
 
     def __repr__(
         self,
     ):
-        return f"{self.__class__.__name__}(headers={self._headers!r}, labels={self._labels!r}, rows={self._rows!r})"
+        rows = [{header: self._columns[header][i] for header in self._headers} for i in range(len(self._labels))]
+        return f"{self.__class__.__name__}(headers={self._headers!r}, labels={self._labels!r}, rows={rows!r})"
 
     def __iter__(
         self,
     ):
-        """Iterates through each row yielding a new linked TwoDARow instance."""
-        for i, row in enumerate(self._rows):
-            yield TwoDARow(self.get_label(i), row)
+        """Iterates through each row yielding a new linked TwoDARow instance, a view of the row as described in get_row."""
+        for i, label in enumerate(self._labels):
+            yield TwoDARow(label, _TwoDARowCells(self, i))
 
     def get_headers(
         self,
@@ -69,11 +132,11 @@ class TwoDA:
         -------
             A list of cells.
         """
-        if header not in self._headers:
+        if header not in self._columns:
             msg = f"The header '{header}' does not exist."
             raise KeyError(msg)
 
-        return [self._rows[i][header] for i in range(self.get_height())]
+        return copy(self._columns[header])
 
     def add_column(
         self,
@@ -89,13 +152,12 @@ class TwoDA:
         ------
             KeyError: If the specified column header already exists.
         """
-        if header in self._headers:
+        if header in self._columns:
             msg = f"The header '{header}' already exists."
             raise KeyError(msg)
 
         self._headers.append(header)
-        for row in self._rows:
-            row[header] = ""
+        self._columns[header] = [""] * len(self._labels)
 
     def remove_column(
         self,
@@ -109,9 +171,10 @@ class TwoDA:
         ----
             header: The column header.
         """
-        if header in self._headers:
-            for row in self._rows:
-                row.pop(header)
+        if header in self._columns:
+            del self._columns[header]
+            self._value_rows.pop(header, None)
+            self._column_max.pop(header, None)
 
         self._headers.remove(header)
 
@@ -154,7 +217,15 @@ class TwoDA:
             row_index: The index of the row to change.
             value: The new row label.
         """
+        old_value: str = self._labels[row_index]
         self._labels[row_index] = value
+        if row_index < 0:
+            row_index += len(self._labels)
+        if self._label_rows is not None:
+            _unindex(self._label_rows, old_value, row_index)
+            _index(self._label_rows, value, row_index)
+        if self._label_max is not None:
+            self._label_max = _updated_max(self._label_max, old_value, value)
 
     def get_row(
         self,
@@ -163,6 +234,10 @@ class TwoDA:
     ) -> TwoDARow:
         """Returns a TwoDARow instance which can update and retrieve the values of the cells for the specified row.
 
+        The row is a view of the table, not a copy: it reads and writes the cells at its row index, so it sees later
+        changes to the table. After resize removes its row, reading it raises IndexError, and if the table grows back
+        it reads the new blank row at that index.
+
         Args:
         ----
             row_index: The row index.
@@ -180,7 +255,9 @@ class TwoDA:
         except IndexError as e:
             e.args = (f"Row index {row_index} not found in the 2DA." + (f" Context: {context}" if context is not None else ""),)
             raise
-        return TwoDARow(label_row, self._rows[row_index])
+        if row_index < 0:
+            row_index += len(self._labels)
+        return TwoDARow(label_row, _TwoDARowCells(self, row_index))
 
     def find_row(
         self,
@@ -194,16 +271,42 @@ class TwoDA:
 
         Returns:
         -------
-            row: The row object if found, else None
+            row: The first row with the label if found, else None. The row is a view of the table, as described in get_row.
+        """
+        row_indices: list[int] | None = self._label_lookup().get(row_label)
+        return None if not row_indices else self.get_row(row_indices[0])
 
-        Processing Logic:
-        ----------------
-            - Iterate through each row in the 2D array
-            - Check if the row's label matches the given label
-            - If a match is found, return the row
-            - If no match is found after iterating all rows, return None.
+    def find_rows(
+        self,
+        header: str,
+        value: str,
+    ) -> list[TwoDARow]:
+        """Returns every row whose cell under the specified column equals the value, in row order.
+
+        The first search of a column indexes its cells, later searches of the same column are a hash lookup.
+
+        Args:
+        ----
+            header: The column header.
+            value: The cell value to search for.
+
+        Raises:
+        ------
+            KeyError: If the specified column header does not exist.
+
+        Returns:
+        -------
+            The matching rows, empty if there are none.
         """
-        return next((row for row in self if row.label() == row_label), None)
+        column_rows: dict[str, list[int]] | None = self._value_rows.get(header)
+        if column_rows is None:
+            if header not in self._columns:
+                msg = f"The header '{header}' does not exist."
+                raise KeyError(msg)
+            column_rows = self._value_rows[header] = {}
+            for i, cell in enumerate(self._columns[header]):
+                _index(column_rows, cell, i)
+        return [self.get_row(i) for i in column_rows.get(value, ())]
 
     def row_index(
         self,
@@ -221,12 +324,13 @@ class TwoDA:
 
         Processing Logic:
         ----------------
-            - Iterate through the 2D array and enumerate the rows.
-            - Check if the current row equals the searching row.
-            - If a match is found, return the index i.
-            - If no match is found after full iteration, return None.
+            - Only the rows with the same label as the searched row are compared.
+            - Returns the index of the first of those whose cells all equal the searched row's cells.
         """
-        return next((i for i, searching in enumerate(self) if searching == row), None)
+        for i in self._label_lookup().get(row.label(), ()):
+            if self.get_row(i) == row:
+                return i
+        return None
 
     def add_row(
         self,
@@ -248,19 +352,13 @@ class TwoDA:
         -------
             The id of the new row.
         """
-        self._rows.append({})
-        self._labels.append(str(len(self._rows)) if row_label is None else row_label)
-
         if cells is None:
             cells = {}
 
         for header in cells:
             cells[header] = str(cells[header])
 
-        for header in self._headers:
-            self._rows[-1][header] = cells.get(header, "")
-
-        return len(self._rows) - 1
+        return self._append_row(str(len(self._labels) + 1) if row_label is None else row_label, cells)
 
     def copy_row(
         self,
@@ -281,19 +379,40 @@ class TwoDA:
         """
         source_index = self.row_index(source_row)
 
-        self._rows.append({})
-        self._labels.append(str(len(self._rows)) if row_label is None else row_label)
-
         if override_cells is None:
             override_cells = {}
 
         for header in override_cells:
             override_cells[header] = str(override_cells[header])
 
-        for header in self._headers:
-            self._rows[-1][header] = override_cells[header] if header in override_cells else self.get_cell(source_index, header)  # FIXME: source_index cannot be None
+        cells: dict[str, str] = {
+            header: override_cells[header] if header in override_cells else self.get_cell(source_index, header)  # FIXME: source_index cannot be None
+            for header in self._headers
+        }
+        return self._append_row(str(len(self._labels) + 1) if row_label is None else row_label, cells)
 
-        return len(self._rows) - 1
+    def _append_row(
+        self,
+        row_label: str,
+        cells: dict[str, str],
+    ) -> int:
+        row_index: int = len(self._labels)
+        self._labels.append(row_label)
+        if self._label_rows is not None:
+            _index(self._label_rows, row_label, row_index)
+        if self._label_max is not None:
+            self._label_max = _updated_max(self._label_max, "", row_label)
+
+        for header, column in self._columns.items():
+            cell: str = cells.get(header, "")
+            column.append(cell)
+            column_rows: dict[str, list[int]] | None = self._value_rows.get(header)
+            if column_rows is not None:
+                _index(column_rows, cell, row_index)
+            if header in self._column_max:
+                self._update_column_max(header, "", cell)
+
+        return row_index
 
     def get_cell(
         self,
@@ -316,7 +435,7 @@ class TwoDA:
         -------
             The cell value.
         """
-        return self._rows[row_index][column]
+        return self._columns[column][row_index]
 
     def set_cell(
         self,
@@ -337,8 +456,18 @@ class TwoDA:
             KeyError: If the specified column does not exist.
             IndexError: If the specified row does not exist.
         """
-        value = "" if value is None else value
-        self._rows[row_index][column] = str(value)
+        cells: list[str] = self._columns[column]
+        old_value: str = cells[row_index]
+        cells[row_index] = new_value = "" if value is None else str(value)
+
+        column_rows: dict[str, list[int]] | None = self._value_rows.get(column)
+        if column_rows is not None:
+            if row_index < 0:
+                row_index += len(cells)
+            _unindex(column_rows, old_value, row_index)
+            _index(column_rows, new_value, row_index)
+        if column in self._column_max:
+            self._update_column_max(column, old_value, new_value)
 
     def get_height(
         self,
@@ -349,7 +478,7 @@ class TwoDA:
         -------
             The number of rows.
         """
-        return len(self._rows)
+        return len(self._labels)
 
     def get_width(
         self,
@@ -381,11 +510,17 @@ class TwoDA:
         if self.get_height() < 0:
             msg = "The height of the table cannot be negative."
             raise ValueError(msg)
-        current_height = len(self._rows)
+        current_height = len(self._labels)
 
         if row_count < current_height:
-            # trim the _rows list
-            self._rows = self._rows[:row_count]
+            # trim the labels and every column, the indexes and maximums are rebuilt when next needed
+            del self._labels[row_count:]
+            for column in self._columns.values():
+                del column[row_count:]
+            self._label_rows = None
+            self._value_rows = {}
+            self._label_max = None
+            self._column_max = {}
         else:
             # insert the new rows with each cell filled in blank
             for _ in range(row_count - current_height):
@@ -401,11 +536,9 @@ class TwoDA:
         -------
             Highest numerical value underneath the column.
         """
-        max_found = -1
-        for cell in self.get_column(header):
-            with suppress(ValueError):
-                max_found = max(int(cell), max_found)
-
+        max_found: int | None = self._column_max.get(header)
+        if max_found is None:
+            max_found = self._column_max[header] = _max_integer(self.get_column(header))
         return max_found + 1
 
     def label_max(
@@ -423,17 +556,34 @@ class TwoDA:
 
         Processes labels:
         ----------------
-            - Initialize max_found to -1
-            - Iterate through labels
-            - Try converting each label to int and update max_found
+            - Labels that are not integers are skipped.
+            - The maximum is cached and kept current as rows are added and labels change.
             - Return max_found + 1 to get the next integer label.
         """
-        max_found = -1
-        for label in self.get_labels():
-            with suppress(ValueError):
-                max_found = max(int(label), max_found)
+        if self._label_max is None:
+            self._label_max = _max_integer(self._labels)
+        return self._label_max + 1
 
-        return max_found + 1
+    def _update_column_max(
+        self,
+        header: str,
+        old_value: str,
+        new_value: str,
+    ):
+        max_found: int | None = _updated_max(self._column_max[header], old_value, new_value)
+        if max_found is None:
+            del self._column_max[header]
+        else:
+            self._column_max[header] = max_found
+
+    def _label_lookup(
+        self,
+    ) -> dict[str, list[int]]:
+        if self._label_rows is None:
+            self._label_rows = {}
+            for i, label in enumerate(self._labels):
+                _index(self._label_rows, label, i)
+        return self._label_rows
 
     def compare(
         self,
@@ -510,10 +660,10 @@ class TwoDARow:
     def __init__(
         self,
         row_label: str,
-        row_data: dict[str, str],
+        row_data: MutableMapping[str, str],
     ):
         self._row_label: str = row_label
-        self._data: dict[str, str] = row_data
+        self._data: MutableMapping[str, str] = row_data
 
     def __repr__(
         self,
@@ -751,3 +901,103 @@ class TwoDARow:
             raise KeyError(msg)
         value_str = "" if value is None else str(value)
         self._data[header] = value_str
+
+
+class _TwoDARowCells(MutableMapping):
+    """The cells of one TwoDA row, keyed by column header. Writes go through TwoDA.set_cell so its indexes stay current.
+
+    The cells are read from the table at the row index, they are not copied.
+    """
+
+    def __init__(
+        self,
+        twoda: TwoDA,
+        row_index: int,
+    ):
+        self._twoda: TwoDA = twoda
+        self._row_index: int = row_index
+
+    def __repr__(
+        self,
+    ):
+        return repr(dict(self))
+
+    def __getitem__(
+        self,
+        header: str,
+    ) -> str:
+        return self._twoda._columns[header][self._row_index]  # noqa: SLF001
+
+    def __setitem__(
+        self,
+        header: str,
+        value: str,
+    ):
+        self._twoda.set_cell(self._row_index, header, value)
+
+    def __delitem__(
+        self,
+        header: str,
+    ):
+        msg = f"Cannot remove the cell under '{header}' from a single row, remove the column from the table instead."
+        raise TypeError(msg)
+
+    def __contains__(
+        self,
+        header: object,
+    ) -> bool:
+        return header in self._twoda._columns  # noqa: SLF001
+
+    def __iter__(
+        self,
+    ) -> Iterator[str]:
+        return iter(self._twoda._headers)  # noqa: SLF001
+
+    def __len__(
+        self,
+    ) -> int:
+        return len(self._twoda._headers)  # noqa: SLF001
+
+
+def _index(
+    rows: dict[str, list[int]],
+    key: str,
+    row_index: int,
+):
+    row_indices: list[int] | None = rows.get(key)
+    if row_indices is None:
+        rows[key] = [row_index]
+    elif row_indices[-1] < row_index:
+        row_indices.append(row_index)
+    else:
+        insort(row_indices, row_index)
+
+
+def _unindex(
+    rows: dict[str, list[int]],
+    key: str,
+    row_index: int,
+):
+    row_indices: list[int] = rows[key]
+    row_indices.remove(row_index)
+    if not row_indices:
+        del rows[key]
+
+
+def _updated_max(
+    max_found: int,
+    old_value: str,
+    new_value: str,
+) -> int | None:
+    """Returns the maximum integer of a column or the labels after one of its cells changed from old_value to new_value.
+
+    Returns None when the old value was the maximum and the new value is lower, the maximum must then be recomputed.
+    """
+    with suppress(ValueError):
+        new_max = int(new_value)
+        if new_max >= max_found:
+            return new_max
+    with suppress(ValueError):
+        if int(old_value) == max_found:
+            return None
+    return max_found
@@ -340,6 +340,7 @@ class ResourceType(Enum):
         )
 
     @classmethod
+    @lru_cache(maxsize=0xFFFF)
     def from_extension(
         cls,
         extension: str,
@@ -72,6 +72,21 @@ class MDLMDXTuple(NamedTuple):
     mdx: bytes
 
 
+class ModelInfo(NamedTuple):
+    """Metadata of a binary model, as read by scan_model."""
+
+    name: str
+    supermodel: str  # 'NULL' if the model has none.
+    game: Game
+    textures: tuple[str, ...]
+    lightmaps: tuple[str, ...]
+    node_names: tuple[str, ...]
+    animations: tuple[str, ...]
+    bounding_box_min: tuple[float, float, float]
+    bounding_box_max: tuple[float, float, float]
+    radius: float
+
+
 def rename(
     data: bytes,
     name: str,
@@ -79,6 +94,40 @@ def rename(
     return data[:20] + name.ljust(32, "\0").encode("ascii") + data[52:]
 
 
+def _iterate_nodes(
+    data: bytes | bytearray,
+    *,
+    breadth_first: bool = False,
+) -> Generator[tuple[int, int], Any, None]:
+    """Yields the (offset, type) of every node of the model's geometry, without building an MDL.
+
+    Offsets are relative to the start of the model data, i.e. 12 bytes into the file. A node referenced twice is only
+    yielded once.
+    """
+    (root_offset,) = struct.unpack_from("<I", data, 12 + 168)
+    nodes: deque[int] = deque([root_offset])
+    pop = nodes.popleft if breadth_first else nodes.pop
+    visited: set[int] = set()
+    while nodes:
+        node_offset: int = pop()
+        if node_offset in visited:
+            continue
+        visited.add(node_offset)
+        (node_type,) = struct.unpack_from("<H", data, 12 + node_offset)
+        child_offsets_offset, child_offsets_count = struct.unpack_from("<II", data, 12 + node_offset + 44)
+        nodes.extend(struct.unpack_from(f"<{child_offsets_count}I", data, 12 + child_offsets_offset))
+        yield node_offset, node_type
+
+
+def _read_name(
+    data: bytes | bytearray,
+    offset: int,
+) -> str:
+    """Returns the 32 character name at `offset` of the model data, cut at the first null."""
+    start: int = 12 + offset
+    return data[start : start + 32].split(b"\0", 1)[0].decode("ascii", errors="ignore").strip()
+
+
 def iterate_textures_and_lightmaps(data: bytes) -> Generator[str, Any, None]:
     """Extracts textures or lightmaps from a mdl file, and yields each one in lowercase.
 
@@ -92,44 +141,23 @@ def iterate_textures_and_lightmaps(data: bytes) -> Generator[str, Any, None]:
 
     Processing Logic:
     ----------------
-        - Uses a BinaryReader to parse the binary data.
-        - Starts at a root offset to traverse node offsets.
-        - Checks node IDs for resource nodes.
+        - Walks the node tree breadth first from the root node.
+        - Checks node types for mesh nodes.
         - Reads resource names and yields unique names.
     """
     seen_names: set[str] = set()
+    for node_offset, node_type in _iterate_nodes(data, breadth_first=True):
+        if not node_type & _NODE_TYPE_MESH:
+            continue
+        name = _read_name(data, node_offset + 168).lower()
+        if name and name != "null" and name not in seen_names and name != "dirt":
+            seen_names.add(name)
+            yield name
 
-    with BinaryReader.from_bytes(data, 12) as reader:
-        reader.seek(168)
-        root_offset = reader.read_uint32()
-
-        nodes: deque[int] = deque([root_offset])
-        while nodes:
-            node_offset = nodes.popleft()
-            reader.seek(node_offset)
-            node_id = reader.read_uint32()
-
-            reader.seek(node_offset + 44)
-            child_offsets_offset = reader.read_uint32()
-            child_offsets_count = reader.read_uint32()
-
-            reader.seek(child_offsets_offset)
-            nodes.extend(reader.read_uint32() for _ in range(child_offsets_count))
-
-            if node_id & 32:
-                # Extract texture name
-                reader.seek(node_offset + 168)
-                name = reader.read_string(32, encoding="ascii", errors="ignore").strip().lower()
-                if name and name != "null" and name not in seen_names and name != "dirt":
-                    seen_names.add(name)
-                    yield name
-
-                # Extract lightmap name
-                reader.seek(node_offset + 200)
-                name = reader.read_string(32, encoding="ascii", errors="ignore").strip().lower()
-                if name and name != "null" and name not in seen_names:
-                    seen_names.add(name)
-                    yield name
+        name = _read_name(data, node_offset + 200).lower()
+        if name and name != "null" and name not in seen_names:
+            seen_names.add(name)
+            yield name
 
 
 def iterate_textures(
@@ -147,41 +175,23 @@ def iterate_textures(
 
     Processing Logic:
     ----------------
-        - Uses a BinaryReader to parse the binary data
-        - Starts at a root offset to traverse node offsets
-        - Checks node IDs for texture nodes
-        - Reads texture names and adds unique names to the textures list
-        - Returns the list of unique textures.
+        - Walks the node tree depth first from the root node
+        - Checks node types for mesh nodes
+        - Reads texture names and yields unique names.
     """
     texture_caseset: set[str] = set()
-
-    with BinaryReader.from_bytes(data, 12) as reader:
-        reader.seek(168)
-        root_offset = reader.read_uint32()
-
-        nodes: list[int] = [root_offset]
-        while nodes:
-            node_offset: int = nodes.pop()
-            reader.seek(node_offset)
-            node_id = reader.read_uint32()
-
-            reader.seek(node_offset + 44)
-            child_offsets_offset = reader.read_uint32()
-            child_offsets_count = reader.read_uint32()
-
-            reader.seek(child_offsets_offset)
-            nodes.extend(reader.read_uint32() for _ in range(child_offsets_count))
-            if node_id & 32:
-                reader.seek(node_offset + 168)
-                texture = reader.read_string(32, encoding="ascii", errors="ignore").strip()
-                if (
-                    texture
-                    and texture != "NULL"
-                    and texture.lower() not in texture_caseset
-                    and texture.lower() != "dirt"  # TODO(th3w1zard1) determine if the game really prevents the literal resname of 'dirt'.
-                ):
-                    texture_caseset.add(texture.lower())
-                    yield texture.lower()
+    for node_offset, node_type in _iterate_nodes(data):
+        if not node_type & _NODE_TYPE_MESH:
+            continue
+        texture = _read_name(data, node_offset + 168)
+        if (
+            texture
+            and texture != "NULL"
+            and texture.lower() not in texture_caseset
+            and texture.lower() != "dirt"  # TODO(th3w1zard1) determine if the game really prevents the literal resname of 'dirt'.
+        ):
+            texture_caseset.add(texture.lower())
+            yield texture.lower()
 
 
 def iterate_lightmaps(
@@ -199,39 +209,94 @@ def iterate_lightmaps(
 
     Processing Logic:
     ----------------
-        - The function reads the lightmap data file using a BinaryReader
-        - It parses the node tree to extract all lightmap names
+        - Walks the node tree depth first from the root node
         - Duplicate and empty names are filtered out
-        - The unique lightmap names are returned as a list.
+        - The unique lightmap names are yielded.
     """
     lightmaps_caseset: set[str] = set()
-    with BinaryReader.from_bytes(data, 12) as reader:
-        reader.seek(168)
-        root_offset = reader.read_uint32()
+    for node_offset, node_type in _iterate_nodes(data):
+        if not node_type & _NODE_TYPE_MESH:
+            continue
+        lightmap = _read_name(data, node_offset + 200)
+        lowercase_lightmap = lightmap.lower()
+        if (
+            lightmap
+            and lightmap != "NULL"
+            and lowercase_lightmap not in lightmaps_caseset
+        ):
+            lightmaps_caseset.add(lowercase_lightmap)
+            yield lightmap
+
+
+def scan_model(
+    data: bytes | bytearray,
+) -> ModelInfo:
+    """Reads the metadata of a binary mdl file from its headers, without building an MDL.
 
-        nodes: list[int] = [root_offset]
-        while nodes:
-            node_offset = nodes.pop()
-            reader.seek(node_offset)
-            node_id = reader.read_uint32()
+    Args:
+    ----
+        data: The raw mdl data to parse.
 
-            reader.seek(node_offset + 44)
-            child_offsets_offset = reader.read_uint32()
-            child_offsets_count = reader.read_uint32()
+    Returns:
+    -------
+        The model's metadata. Texture and lightmap names are lowercase and unique.
 
-            reader.seek(child_offsets_offset)
-            nodes.extend(reader.read_uint32() for _ in range(child_offsets_count))
-            if node_id & 32:
-                reader.seek(node_offset + 200)
-                lightmap = reader.read_string(32, encoding="ascii", errors="ignore").strip()
-                lowercase_lightmap = lightmap.lower()
-                if (
-                    lightmap
-                    and lightmap != "NULL"
-                    and lowercase_lightmap not in lightmaps_caseset
-                ):
-                    lightmaps_caseset.add(lowercase_lightmap)
-                    yield lightmap
+    Raises:
+    ------
+        ValueError: If the data is not a binary mdl file or is truncated.
+
+    Processing Logic:
+    ----------------
+        - Reads the name, supermodel, bounding box and radius from the model header
+        - Reads the node names from the name table and the animation names from each animation header
+        - Walks the node tree once for the textures and lightmaps of the mesh nodes.
+    """
+    if len(data) < 12 + 196 or data[:4] != b"\0\0\0\0":  # noqa: PLR2004
+        msg = "The data is not a binary mdl file."
+        raise ValueError(msg)
+    try:
+        (function_pointer,) = struct.unpack_from("<I", data, 12)
+        offset_to_animations, animation_count = struct.unpack_from("<II", data, 12 + 88)
+        bounds: tuple[float, ...] = struct.unpack_from("<7f", data, 12 + 104)
+        offset_to_name_offsets, name_offsets_count = struct.unpack_from("<II", data, 12 + 184)
+
+        node_names: list[str] = []
+        for name_offset in struct.unpack_from(f"<{name_offsets_count}I", data, 12 + offset_to_name_offsets):
+            end: int = data.find(b"\0", 12 + name_offset)
+            node_names.append(data[12 + name_offset : end if end != -1 else len(data)].decode("ascii", errors="ignore"))
+
+        animations: list[str] = [
+            _read_name(data, animation_offset + 8)
+            for animation_offset in struct.unpack_from(f"<{animation_count}I", data, 12 + offset_to_animations)
+        ]
+
+        textures: dict[str, None] = {}
+        lightmaps: dict[str, None] = {}
+        for node_offset, node_type in _iterate_nodes(data, breadth_first=True):
+            if not node_type & _NODE_TYPE_MESH:
+                continue
+            texture: str = _read_name(data, node_offset + 168).lower()
+            if texture and texture not in ("null", "dirt"):
+                textures[texture] = None
+            lightmap: str = _read_name(data, node_offset + 200).lower()
+            if lightmap and lightmap != "null":
+                lightmaps[lightmap] = None
+    except struct.error as e:
+        msg = f"The mdl data is truncated or corrupted: {e}"
+        raise ValueError(msg) from e
+
+    return ModelInfo(
+        _read_name(data, 8),
+        _read_name(data, 136),
+        Game.K1 if function_pointer == _GEOM_ROOT_FP0_K1 else Game.K2,
+        tuple(textures),
+        tuple(lightmaps),
+        tuple(node_names),
+        tuple(animations),
+        bounds[0:3],
+        bounds[3:6],
+        bounds[6],
+    )
 
 
 def change_textures(
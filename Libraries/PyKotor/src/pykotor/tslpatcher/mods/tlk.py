@@ -4,8 +4,7 @@ from typing import TYPE_CHECKING
 
 from pykotor.common.misc import ResRef
 from pykotor.extract.talktable import TalkTable
-from pykotor.resource.formats.tlk.io_tlk import TLKBinaryReader
-from pykotor.resource.formats.tlk.tlk_auto import bytes_tlk
+from pykotor.resource.formats.tlk.io_tlk import TLKBinaryReader, TLKBinaryWriter
 from pykotor.tslpatcher.mods.template import PatcherModifications
 
 if TYPE_CHECKING:
@@ -61,9 +60,17 @@ class ModificationsTLK(PatcherModifications):
         log: PatchLogger,
         game: Game,
     ) -> bytes | Literal[True]:
-        dialog: TLK = TLKBinaryReader(source).load()
+        """Appends and replaces the entries of the TLK and returns the patched TLK.
+
+        Only appends and replacements are possible, so the TLK is read lazily and written with its existing text data
+        kept as it is: just the header and entry table are rebuilt, and only the texts of appended and replaced
+        entries are encoded and added after the existing text data.
+        """
+        dialog: TLK = TLKBinaryReader(source, lazy=True).load()
         self.apply(dialog, memory, log, game)
-        return bytes_tlk(dialog)
+        data = bytearray()
+        TLKBinaryWriter(dialog, data, keep_source_texts=True).write()
+        return bytes(data)
 
     def apply(
         self,
@@ -62,7 +62,7 @@ class Target:
             - Checks target_type and searches twoda accordingly
             - For row index, gets row directly
             - For row label, finds row by label
-            - For label column, checks for label column, then iterates rows to find match
+            - For label column, checks for label column, then looks the value up in the column's index, the last match wins
             - Returns matching row or None.
         """
         if isinstance(self.value, (RowValueTLKMemory, RowValue2DAMemory)):
@@ -78,12 +78,11 @@ class Target:
             if "label" not in twoda.get_headers():
                 msg = f"'label' could not be found in the twoda's headers: ({self.target_type.name}, {value})"
                 raise WarningError(msg)
-            if value not in twoda.get_column("label"):
+            label_rows: list[TwoDARow] = twoda.find_rows("label", value)
+            if not label_rows:
                 msg = f"The value '{value}' could not be found in the twoda's columns"
                 raise WarningError(msg)
-            for row in twoda:
-                if row.get_string("label") == value:
-                    source_row = row
+            source_row = label_rows[-1]
 
         return source_row
 
@@ -334,10 +333,9 @@ class AddRow2DA(Modify2DA):
                 twoda,
                 None,
             )
-            for row in twoda:
-                if row.get_string(self.exclusive_column) != exclusive_value:
-                    continue
-                target_row = row
+            exclusive_rows: list[TwoDARow] = twoda.find_rows(self.exclusive_column, exclusive_value)
+            if exclusive_rows:
+                target_row = exclusive_rows[-1]
 
         if target_row is None:
             row_label: str = str(twoda.get_height()) if self.row_label is None else self.row_label
@@ -427,10 +425,9 @@ class CopyRow2DA(Modify2DA):
                 twoda,
                 None,
             )
-            for row in twoda:
-                if row.get_string(self.exclusive_column) != exclusive_value:
-                    continue
-                target_row = row
+            exclusive_rows: list[TwoDARow] = twoda.find_rows(self.exclusive_column, exclusive_value)
+            if exclusive_rows:
+                target_row = exclusive_rows[-1]
 
         if target_row is not None:
             # If the row already exists (based on exclusive_column) then we update the cells
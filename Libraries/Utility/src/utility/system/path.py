@@ -30,17 +30,11 @@ _WINDOWS_EXTRA_SLASHES_RE = re.compile(r"(?<!^)\\+")
 _UNIX_EXTRA_SLASHES_RE = re.compile(r"/{2,}")
 
 
-def pathlib_to_override(cls: type) -> type:
-    class_map: dict[type, type] = {
-        pathlib.PurePath: PurePath,
-        pathlib.PureWindowsPath: PureWindowsPath,
-        pathlib.PurePosixPath: PurePosixPath,
-        pathlib.Path: Path,
-        pathlib.WindowsPath: WindowsPath,
-        pathlib.PosixPath: PosixPath,
-    }
+_PATHLIB_OVERRIDES: dict[type, type] = {}  # Filled in once the override classes below are defined.
 
-    return class_map.get(cls, cls)
+
+def pathlib_to_override(cls: type) -> type:
+    return _PATHLIB_OVERRIDES.get(cls, cls)
 
 def _handle_non_hashable(
     cache_func: Callable,
@@ -104,7 +98,12 @@ class PurePathType(type):
         return cls.__subclasscheck__(instance.__class__)
 
     def __subclasscheck__(cls, subclass: type) -> bool:  # sourcery skip: instance-method-first-arg-name
-        return pathlib_to_override(cls) in pathlib_to_override(subclass).__mro__
+        return _override_subclasscheck(cls, subclass)
+
+
+@lru_cache(maxsize=None)
+def _override_subclasscheck(cls: type, subclass: type) -> bool:
+    return pathlib_to_override(cls) in pathlib_to_override(subclass).__mro__
 
 
 class _PartialFlavourTypeHint:
@@ -989,6 +988,17 @@ class WindowsPath(Path):  # type: ignore[misc]
     _flavour = pathlib.PureWindowsPath._flavour  # noqa: SLF001  # pyright: ignore[reportAttributeAccessIssue]
 
 
+_PATHLIB_OVERRIDES.update(
+    {
+        pathlib.PurePath: PurePath,
+        pathlib.PureWindowsPath: PureWindowsPath,
+        pathlib.PurePosixPath: PurePosixPath,
+        pathlib.Path: Path,
+        pathlib.WindowsPath: WindowsPath,
+        pathlib.PosixPath: PosixPath,
+    },
+)
+
 
 class ChDir:
     def __init__(
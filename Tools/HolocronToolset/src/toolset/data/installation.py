@@ -91,6 +91,9 @@ class HTInstallation(Installation):
         self._cache2da: dict[str, TwoDA] = {}
         self._cacheTpc: dict[str, TPC] = {}
 
+        # The toolset lists every resource anyway, so load everything now while the loader dialog reports progress.
+        self.reload_all()
+
     @property
     def tsl(self) -> bool:
         if self._tsl is None:
@@ -0,0 +1,140 @@
+"""Micro-benchmarks of BinaryReader's scalar reads, bulk reads and terminated strings against the previous implementations.
+
+Usage:
+    python tests/benchmarks/benchmark_binary_reader.py [count]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import struct
+import sys
+import tempfile
+import time
+
+from typing import Callable
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
+
+from pykotor.common.stream import BinaryReader  # noqa: E402
+from pykotor.extract.capsule import Capsule  # noqa: E402
+from pykotor.resource.formats.erf import read_erf  # noqa: E402
+from pykotor.resource.type import ResourceType  # noqa: E402
+from synthetic_installation import write_capsule  # noqa: E402
+
+
+class LegacyBinaryReader(BinaryReader):
+    """The read methods as they were before the struct cache and bulk reads."""
+
+    def read_uint32(self, *, max_neg1: bool = False, big: bool = False) -> int:
+        self.exceed_check(4)
+        unpacked = struct.unpack(f"{'>' if big else '<'}I", self._stream.read(4) or b"")[0]
+        if unpacked == 0xFFFFFFFF and max_neg1:  # noqa: PLR2004
+            unpacked = -1
+        return unpacked
+
+    def read_single(self, *, big: bool = False) -> float:
+        self.exceed_check(4)
+        return struct.unpack(f"{'>' if big else '<'}f", self._stream.read(4) or b"")[0]
+
+    def read_terminated_string(self, terminator: str, length: int = -1, encoding: str = "ascii", *, strict: bool = True) -> str:
+        string: str = ""
+        char: str = ""
+        bytes_read: int = 0
+        while char != terminator and (length == -1 or bytes_read < length):
+            string += char
+            self.exceed_check(1)
+            char = self._stream.read(1).decode(encoding=encoding, errors="ignore")
+            bytes_read += 1
+            if not char and strict:
+                break
+        if length != -1 and length - bytes_read > 0:
+            self.skip(length - bytes_read)
+        return string
+
+
+def timed(label: str, function: Callable[[], object], baseline: float | None = None) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    speedup = f" ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<44} {elapsed:8.3f}s{speedup}")
+    return elapsed
+
+
+def main(count: int = 500_000):
+    numbers: bytes = struct.pack(f"<{count}I", *range(count))
+    records: bytes = b"".join(struct.pack("<16sIHH", f"res_{n}".encode(), n, 2027, 0) for n in range(count // 10))
+    strings: bytes = b"".join(f"model_node_{n}\0".encode() for n in range(count // 10))
+
+    def scalar(reader_type: type[BinaryReader]) -> Callable[[], object]:
+        def run():
+            reader = reader_type.from_bytes(numbers)
+            return [reader.read_uint32() for _ in range(count)]
+        return run
+
+    def floats(reader_type: type[BinaryReader]) -> Callable[[], object]:
+        def run():
+            reader = reader_type.from_bytes(numbers)
+            return [reader.read_single() for _ in range(count)]
+        return run
+
+    def loop_records():
+        reader = BinaryReader.from_bytes(records)
+        rows = []
+        for _ in range(count // 10):
+            resref = reader.read_string(16)
+            resid = reader.read_uint32()
+            restype = reader.read_uint16()
+            reader.skip(2)
+            rows.append((resref, resid, restype))
+        return rows
+
+    def bulk_records():
+        reader = BinaryReader.from_bytes(records)
+        return [
+            (BinaryReader.decode_fixed_string(resref), resid, restype)
+            for resref, resid, restype, _ in reader.read_records("16sIHH", count // 10)
+        ]
+
+    def terminated(reader_type: type[BinaryReader]) -> Callable[[], object]:
+        def run():
+            reader = reader_type.from_bytes(strings)
+            return [reader.read_terminated_string("\0") for _ in range(count // 10)]
+        return run
+
+    baseline = timed(f"read_uint32 x{count} (legacy)", scalar(LegacyBinaryReader))
+    timed(f"read_uint32 x{count}", scalar(BinaryReader), baseline)
+    timed(f"read_array('I', {count})", lambda: BinaryReader.from_bytes(numbers).read_array("I", count), baseline)
+    baseline = timed(f"read_single x{count} (legacy)", floats(LegacyBinaryReader))
+    timed(f"read_single x{count}", floats(BinaryReader), baseline)
+    baseline = timed(f"ERF key table x{count // 10} (per field)", loop_records)
+    timed(f"ERF key table x{count // 10} (read_records)", bulk_records, baseline)
+    baseline = timed(f"read_terminated_string x{count // 10} (legacy)", terminated(LegacyBinaryReader))
+    timed(f"read_terminated_string x{count // 10}", terminated(BinaryReader), baseline)
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        erf_path = pathlib.Path(tempdir, "benchmark.mod")
+        write_capsule(erf_path, [(f"res_{n}", ResourceType.UTC, b"data") for n in range(count // 25)])
+        timed(f"read_erf, {count // 25} resources", lambda: read_erf(erf_path))
+        timed(f"Capsule, {count // 25} resources", lambda: Capsule(erf_path))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,282 @@
+"""Times reading and writing a synthetic binary GFF with ~100k fields, the size of a large DLG or savegame GFF.
+
+Usage:
+    python tests/benchmarks/benchmark_gff.py [entry_count] [repeat]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+from typing import Any
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.common.geometry import Vector3  # noqa: E402
+from pykotor.common.language import Gender, Language, LocalizedString  # noqa: E402
+from pykotor.common.misc import ResRef  # noqa: E402
+from pykotor.common.stream import BinaryWriter  # noqa: E402
+from pykotor.resource.formats.gff import GFF, GFFContent, GFFFieldType, GFFList, GFFStruct, bytes_gff, read_gff  # noqa: E402
+from pykotor.resource.type import TARGET_TYPES, ResourceWriter, autoclose  # noqa: E402
+
+COMPLEX_FIELDS: set[GFFFieldType] = {
+    GFFFieldType.UInt64,
+    GFFFieldType.Int64,
+    GFFFieldType.Double,
+    GFFFieldType.String,
+    GFFFieldType.ResRef,
+    GFFFieldType.LocalizedString,
+    GFFFieldType.Binary,
+    GFFFieldType.Vector3,
+    GFFFieldType.Vector4,
+}
+
+
+def synthetic_gff(entry_count: int) -> GFF:
+    """A DLG-like GFF: every entry struct holds 10 fields and a nested list, ~10 fields per entry overall."""
+    gff = GFF(GFFContent.DLG)
+    entries: GFFList = gff.root.set_list("EntryList", GFFList())
+    for n in range(entry_count):
+        entry = entries.add(n % 4)
+        entry.set_uint32("ID", n)
+        entry.set_int32("Delay", -1)
+        entry.set_uint8("Camera", n % 255)
+        entry.set_int16("Emotion", -n % 100)
+        entry.set_single("FadeDelay", n / 3)
+        entry.set_string("Comment", f"entry {n}")
+        entry.set_resref("Script", ResRef(f"k_scr_{n % 1000}"))
+        entry.set_vector3("Position", Vector3(n, n + 1, n + 2))
+        text = LocalizedString(n)
+        text.set_data(Language.ENGLISH, Gender.MALE, f"line {n}")
+        entry.set_locstring("Text", text)
+        replies: GFFList = entry.set_list("RepliesList", GFFList())
+        replies.add(0).set_uint32("Index", n)
+    return gff
+
+
+class LegacyGFFBinaryWriter(ResourceWriter):
+    """The writer as it was before: labels found with list.index, index tables written by seeking back and patching."""
+
+    def __init__(
+        self,
+        gff: GFF,
+        target: TARGET_TYPES,
+    ):
+        super().__init__(target)
+        self._gff: GFF = gff
+
+        self._struct_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._field_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._field_data_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._field_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._list_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
+
+        self._labels: list[str] = []
+
+        self._struct_count: int = 0
+        self._field_count: int = 0
+
+    @autoclose
+    def write(
+        self,
+        auto_close: bool = True,
+    ):
+        self._build_struct(self._gff.root)
+
+        struct_offset = 56
+        struct_count = self._struct_writer.size() // 12
+        field_offset = struct_offset + self._struct_writer.size()
+        field_count = self._field_writer.size() // 12
+        label_offset = field_offset + self._field_writer.size()
+        label_count = len(self._labels)
+        field_data_offset = label_offset + len(self._labels) * 16
+        field_data_count = self._field_data_writer.size()
+        field_indices_offset = field_data_offset + self._field_data_writer.size()
+        field_indices_count = self._field_indices_writer.size()
+        list_indices_offset = field_indices_offset + self._field_indices_writer.size()
+        list_indices_count = self._list_indices_writer.size()
+
+        self._writer.write_string(self._gff.content.value)
+        self._writer.write_string("V3.2")
+        self._writer.write_uint32(struct_offset)
+        self._writer.write_uint32(struct_count)
+        self._writer.write_uint32(field_offset)
+        self._writer.write_uint32(field_count)
+        self._writer.write_uint32(label_offset)
+        self._writer.write_uint32(label_count)
+        self._writer.write_uint32(field_data_offset)
+        self._writer.write_uint32(field_data_count)
+        self._writer.write_uint32(field_indices_offset)
+        self._writer.write_uint32(field_indices_count)
+        self._writer.write_uint32(list_indices_offset)
+        self._writer.write_uint32(list_indices_count)
+
+        self._writer.write_bytes(self._struct_writer.data())
+        self._writer.write_bytes(self._field_writer.data())
+        for label in self._labels:
+            self._writer.write_string(label, string_length=16)
+        self._writer.write_bytes(self._field_data_writer.data())
+        self._writer.write_bytes(self._field_indices_writer.data())
+        self._writer.write_bytes(self._list_indices_writer.data())
+
+    def _build_struct(
+        self,
+        gff_struct: GFFStruct,
+    ):
+        self._struct_count += 1
+        struct_id = gff_struct.struct_id
+        field_count = len(gff_struct)
+
+        self._struct_writer.write_uint32(struct_id, max_neg1=True)
+
+        if field_count == 0:
+            self._struct_writer.write_uint32(0xFFFFFFFF)
+            self._struct_writer.write_uint32(0)
+        elif field_count == 1:
+            self._struct_writer.write_uint32(self._field_count)
+            self._struct_writer.write_uint32(field_count)
+
+            for label, field_type, value in gff_struct:
+                self._build_field(label, value, field_type)
+        elif field_count > 1:
+            self._write_large_struct(field_count, gff_struct)
+
+    def _write_large_struct(self, field_count: int, gff_struct: GFFStruct):
+        self._struct_writer.write_uint32(self._field_indices_writer.size())
+        self._struct_writer.write_uint32(field_count)
+
+        self._field_indices_writer.end()
+        pos = self._field_indices_writer.position()
+        self._field_indices_writer.write_bytes(b"\x00\x00\x00\x00" * field_count)
+
+        for i, (label, field_type, value) in enumerate(gff_struct):
+            self._field_indices_writer.seek(pos + i * 4)
+            self._field_indices_writer.write_uint32(self._field_count)
+            self._build_field(label, value, field_type)
+
+    def _build_list(
+        self,
+        gff_list: GFFList,
+    ):
+        self._list_indices_writer.end()
+        self._list_indices_writer.write_uint32(len(gff_list))
+        pos = self._list_indices_writer.position()
+        self._list_indices_writer.write_bytes(b"\x00\x00\x00\x00" * len(gff_list))
+        for i, gff_struct in enumerate(gff_list):
+            self._list_indices_writer.seek(pos + i * 4)
+            self._list_indices_writer.write_uint32(self._struct_count)
+            self._build_struct(gff_struct)
+
+    def _build_field(
+        self,
+        label: str,
+        value: Any,
+        field_type: GFFFieldType,
+    ):
+        self._field_count += 1
+        field_type_id = field_type.value
+        label_index = self._label_index(label)
+
+        self._field_writer.write_uint32(field_type_id)
+        self._field_writer.write_uint32(label_index)
+
+        if field_type in COMPLEX_FIELDS:
+            self._field_writer.write_uint32(self._field_data_writer.size())
+
+            self._field_data_writer.end()
+            if field_type is GFFFieldType.UInt64:
+                self._field_data_writer.write_uint64(value)
+            elif field_type is GFFFieldType.Int64:
+                self._field_data_writer.write_int64(value)
+            elif field_type is GFFFieldType.Double:
+                self._field_data_writer.write_double(value)
+            elif field_type is GFFFieldType.String:
+                self._field_data_writer.write_string(value, prefix_length=4)
+            elif field_type is GFFFieldType.ResRef:
+                self._field_data_writer.write_string(str(value), prefix_length=1)
+            elif field_type is GFFFieldType.LocalizedString:
+                self._field_data_writer.write_locstring(value)
+            elif field_type is GFFFieldType.Binary:
+                self._field_data_writer.write_uint32(len(value))
+                self._field_data_writer.write_bytes(value)
+            elif field_type is GFFFieldType.Vector4:
+                self._field_data_writer.write_vector4(value)
+            elif field_type is GFFFieldType.Vector3:
+                self._field_data_writer.write_vector3(value)
+        elif field_type is GFFFieldType.Struct:
+            self._field_writer.write_uint32(self._struct_count)
+            self._build_struct(value)
+        elif field_type is GFFFieldType.List:
+            self._field_writer.write_uint32(self._list_indices_writer.size())
+            self._build_list(value)
+        elif field_type is GFFFieldType.UInt8:
+            self._field_writer.write_uint32(value, max_neg1=True)
+        elif field_type is GFFFieldType.Int8:
+            self._field_writer.write_int32(value)
+        elif field_type is GFFFieldType.UInt16:
+            self._field_writer.write_uint32(value, max_neg1=True)
+        elif field_type is GFFFieldType.Int16:
+            self._field_writer.write_int32(value)
+        elif field_type is GFFFieldType.UInt32:
+            self._field_writer.write_uint32(value, max_neg1=True)
+        elif field_type is GFFFieldType.Int32:
+            self._field_writer.write_int32(value)
+        elif field_type is GFFFieldType.Single:
+            self._field_writer.write_single(value)
+        else:
+            msg = f"Unknown field type '{field_type}'"
+            raise ValueError(msg)
+
+    def _label_index(
+        self,
+        label: str,
+    ) -> int:
+        if label in self._labels:
+            return self._labels.index(label)
+        self._labels.append(label)
+        return len(self._labels) - 1
+
+
+def main(entry_count: int = 10_000, repeat: int = 3):
+    gff = synthetic_gff(entry_count)
+    data = bytes(bytes_gff(gff))
+    print(f"Synthetic GFF: {entry_count} entries, ~{entry_count * 11} fields, {len(data) // 1024} KiB")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        read_gff(data)
+    print(f"read_gff:  {(time.perf_counter() - start) / repeat:.3f}s")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_data = bytearray()
+        LegacyGFFBinaryWriter(gff, legacy_data).write()
+    legacy_time = (time.perf_counter() - start) / repeat
+    print(f"write (legacy): {legacy_time:.3f}s")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = bytes(bytes_gff(gff))
+    write_time = (time.perf_counter() - start) / repeat
+    print(f"bytes_gff: {write_time:.3f}s ({legacy_time / write_time:.1f}x)")
+    assert data == legacy_data, "The writers' output differs"
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,67 @@
+"""Times a cold Installation construction against a warm one that reuses the on-disk index cache.
+
+Usage:
+    python tests/benchmarks/benchmark_installation_cache.py [chitin_resource_count] [stream_file_count]
+"""
+
+from __future__ import annotations
+
+import gc
+import pathlib
+import sys
+import tempfile
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
+
+from pykotor.extract.installation import Installation  # noqa: E402
+from synthetic_installation import build_synthetic_installation  # noqa: E402
+
+
+def main(chitin_resources: int = 20_000, stream_files: int = 5_000):
+    with tempfile.TemporaryDirectory() as tempdir:
+        root = build_synthetic_installation(
+            pathlib.Path(tempdir, "k1"),
+            chitin_resources=chitin_resources,
+            bif_count=16,
+            module_count=100,
+            module_resources=100,
+            override_files=1_000,
+            stream_files=stream_files,
+        )
+        cache_path = pathlib.Path(tempdir, "k1_index.json")
+
+        gc.collect()  # Leftovers of the previous run would otherwise be collected during this one.
+        start = time.perf_counter()
+        Installation(root).reload_all()
+        print(f"Uncached:         {time.perf_counter() - start:.2f}s")
+
+        gc.collect()  # Leftovers of the previous run would otherwise be collected during this one.
+        start = time.perf_counter()
+        Installation(root, index_cache=cache_path).reload_all()
+        print(f"Cold (writes):    {time.perf_counter() - start:.2f}s ({cache_path.stat().st_size // 1024} KiB cache)")
+
+        gc.collect()  # Leftovers of the previous run would otherwise be collected during this one.
+        start = time.perf_counter()
+        Installation(root, index_cache=cache_path).reload_all()
+        print(f"Warm:             {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,105 @@
+"""Times Installation.locations() against the previous linear scan on a synthetic 100k+ resource install.
+
+Usage:
+    python tests/benchmarks/benchmark_installation_index.py [chitin_resource_count] [query_count]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
+
+from pykotor.extract.file import FileResource, ResourceIdentifier  # noqa: E402
+from pykotor.extract.installation import Installation, SearchLocation  # noqa: E402
+from pykotor.resource.type import ResourceType  # noqa: E402
+from synthetic_installation import build_synthetic_installation  # noqa: E402
+
+ORDER: list[SearchLocation] = [
+    SearchLocation.OVERRIDE,
+    SearchLocation.MODULES,
+    SearchLocation.RIMS,
+    SearchLocation.CHITIN,
+]
+
+
+def linear_locations(installation: Installation, queries: list[ResourceIdentifier]) -> int:
+    """The lookup strategy Installation.locations() used before the index: scan every resource list per query batch."""
+    found = 0
+    remaining = set(queries)
+
+    def check_list(values: list[FileResource]):
+        nonlocal found
+        for resource in values:
+            if resource.identifier() in remaining:
+                found += 1
+
+    check_list([res for values in installation._override.values() for res in values])
+    check_list([res for values in installation._modules.values() for res in values])
+    check_list([res for values in installation._rims.values() for res in values])
+    check_list(installation._chitin)
+    check_list(installation._patch_erf)
+    return found
+
+
+def main(chitin_resources: int = 100_000, query_count: int = 2_000):
+    with tempfile.TemporaryDirectory() as tempdir:
+        start = time.perf_counter()
+        root = build_synthetic_installation(
+            pathlib.Path(tempdir, "k1"),
+            chitin_resources=chitin_resources,
+            bif_count=16,
+            module_count=50,
+            module_resources=200,
+            override_files=2_000,
+        )
+        print(f"Built synthetic install in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        installation = Installation(root)
+        installation.reload_all()
+        print(f"Loaded installation in {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(0)
+        queries: list[ResourceIdentifier] = [
+            ResourceIdentifier(f"chit_{rng.randrange(chitin_resources)}", ResourceType.UTC)
+            for _ in range(query_count)
+        ]
+
+        start = time.perf_counter()
+        for query in queries:
+            installation.locations([query], ORDER)
+        indexed_time = time.perf_counter() - start
+        print(f"Indexed:  {query_count} single-resource lookups in {indexed_time:.3f}s")
+
+        linear_count = max(query_count // 100, 1)
+        start = time.perf_counter()
+        for query in queries[:linear_count]:
+            linear_locations(installation, [query])
+        linear_time = (time.perf_counter() - start) * (query_count / linear_count)
+        print(f"Linear:   {query_count} single-resource lookups in ~{linear_time:.3f}s (extrapolated from {linear_count})")
+        print(f"Speedup:  ~{linear_time / indexed_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
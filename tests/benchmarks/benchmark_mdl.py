@@ -0,0 +1,97 @@
+"""Times loading binary models with MDLBinaryReader and measures the memory the loaded models hold, with and without
+numpy, then times writing them back with MDLBinaryWriter and loading them from ASCII with MDLAsciiReader.
+
+Usage:
+    python tests/benchmarks/benchmark_mdl.py [directory]
+
+The directory defaults to the models in tests/files/mdl. Every .mdl in it with an .mdx next to it is loaded.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+import tracemalloc
+
+from unittest import mock
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.resource.formats.mdl import MDLAsciiReader, MDLAsciiWriter, MDLBinaryReader, MDLBinaryWriter, io_mdl  # noqa: E402
+
+
+def measure(mdl: bytes, mdx: bytes, repeat: int = 5) -> tuple[float, int]:
+    """Returns the average time to load a model and the memory the loaded model holds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        MDLBinaryReader(mdl, source_ext=mdx).load()
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    model = MDLBinaryReader(mdl, source_ext=mdx).load()  # noqa: F841
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained
+
+
+def measure_write(mdl: bytes, mdx: bytes, repeat: int = 5) -> float:
+    """Returns the average time to write a loaded model to an MDL and an MDX."""
+    model = MDLBinaryReader(mdl, source_ext=mdx).load()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        MDLBinaryWriter(model, bytearray(), bytearray()).write()
+    return (time.perf_counter() - start) / repeat
+
+
+def measure_ascii(mdl: bytes, mdx: bytes, repeat: int = 5) -> float:
+    """Returns the average time to load a model from the ASCII model MDLAsciiWriter writes for it."""
+    ascii_mdl = bytearray()
+    MDLAsciiWriter(MDLBinaryReader(mdl, source_ext=mdx).load(), ascii_mdl).write()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        MDLAsciiReader(ascii_mdl).load()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(directory: pathlib.Path = THIS_SCRIPT_PATH.parents[1].joinpath("files", "mdl")):
+    if not io_mdl.numpy_available:
+        print("numpy is not installed, there is nothing to compare against.")
+        return
+    for path in sorted(directory.glob("*.mdl")):
+        if not path.with_suffix(".mdx").exists():
+            continue
+        mdl, mdx = path.read_bytes(), path.with_suffix(".mdx").read_bytes()
+        try:
+            with mock.patch.object(io_mdl, "numpy_available", False):
+                baseline, baseline_retained = measure(mdl, mdx)
+                baseline_write = measure_write(mdl, mdx)
+            elapsed, retained = measure(mdl, mdx)
+            write = measure_write(mdl, mdx)
+            ascii_load = measure_ascii(mdl, mdx)
+        except Exception as e:  # noqa: BLE001
+            print(f"{path.name:<24} failed: {e}")
+            continue
+        print(
+            f"{path.name:<24} objects {baseline * 1000:7.1f}ms {baseline_retained / 1e6:6.2f}MB"
+            f"  numpy {elapsed * 1000:7.1f}ms {retained / 1e6:6.2f}MB ({baseline / elapsed:.1f}x)"
+            f"  write objects {baseline_write * 1000:6.1f}ms numpy {write * 1000:6.1f}ms"
+            f"  ascii {ascii_load * 1000:7.1f}ms",
+        )
+
+
+if __name__ == "__main__":
+    main(*map(pathlib.Path, sys.argv[1:2]))
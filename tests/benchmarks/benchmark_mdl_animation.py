@@ -0,0 +1,80 @@
+"""Times sampling every controller of the test models' animations, in bulk and one timestamp at a time.
+
+The "per key" line walks the keyframe rows in Python for each timestamp, as callers had to before
+MDLController.sample.
+
+Usage:
+    python tests/benchmarks/benchmark_mdl_animation.py [timestamps]
+"""
+
+from __future__ import annotations
+
+import bisect
+import pathlib
+import sys
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+import numpy as np  # noqa: E402
+
+from pykotor.resource.formats.mdl import MDLBinaryReader  # noqa: E402
+from pykotor.resource.formats.mdl.mdl_data import MDLAnimation, MDLController  # noqa: E402
+
+
+def sample_per_key(
+    controller: MDLController,
+    times: list[float],
+) -> list[list[float]]:
+    rows = controller.rows
+    keys = [row.time for row in rows]
+    values = []
+    for t in times:
+        index = min(max(bisect.bisect_right(keys, t) - 1, 0), len(rows) - 1)
+        if index == len(rows) - 1:
+            values.append(rows[index].data)
+            continue
+        start, end = rows[index], rows[index + 1]
+        amount = min(max((t - start.time) / (end.time - start.time), 0.0), 1.0)
+        values.append([a + (b - a) * amount for a, b in zip(start.data, end.data)])
+    return values
+
+
+def main(timestamps: int = 240):
+    anims: list[MDLAnimation] = []
+    for path in sorted(TESTS_PATH.joinpath("files", "mdl").glob("*.mdl")):
+        anims.extend(MDLBinaryReader(path, source_ext=path.with_suffix(".mdx")).load().anims)
+    controllers = [controller for anim in anims for node in anim.all_nodes() for controller in node.controllers]
+    print(f"{len(anims)} animations, {len(controllers)} controllers, {timestamps} timestamps")
+
+    start = time.perf_counter()
+    for anim in anims:
+        anim.sample(np.linspace(0.0, anim.anim_length, timestamps))
+    print(f"Bulk:    {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    for anim in anims:
+        times = np.linspace(0.0, anim.anim_length, timestamps).tolist()
+        for node in anim.all_nodes():
+            for controller in node.controllers:
+                sample_per_key(controller, times)
+    print(f"Per key: {time.perf_counter() - start:.3f}s (linear only)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,84 @@
+"""Times building the model metadata index of a synthetic install and querying it.
+
+Without the index, every reverse query (which models use this texture?) re-reads and walks every model, i.e. costs the
+"full scan" line.
+
+The models are copies of the test models in tests/files/mdl, renamed so each one is a distinct resource.
+
+Usage:
+    python tests/benchmarks/benchmark_model_index.py [module_count] [models_per_module]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import tempfile
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
+
+from pykotor.extract.installation import Installation, SearchLocation  # noqa: E402
+from pykotor.resource.type import ResourceType  # noqa: E402
+from pykotor.tools.model import iterate_textures_and_lightmaps  # noqa: E402
+from synthetic_installation import build_synthetic_installation, write_capsule  # noqa: E402
+
+
+def main(module_count: int = 40, models_per_module: int = 50):
+    models: list[bytes] = [path.read_bytes() for path in sorted(TESTS_PATH.joinpath("files", "mdl").glob("*.mdl"))]
+    with tempfile.TemporaryDirectory() as tempdir:
+        root = build_synthetic_installation(pathlib.Path(tempdir, "k1"), module_count=module_count, module_resources=1)
+        for m in range(module_count):
+            write_capsule(
+                root / "modules" / f"mod{m}.mod",
+                [(f"mdl{m}_{n}", ResourceType.MDL, models[n % len(models)]) for n in range(models_per_module)],
+            )
+        print(f"{module_count * models_per_module} models")
+
+        installation = Installation(root)
+        installation.reload_all()
+        start = time.perf_counter()
+        found = [
+            resource
+            for capsule_resources in installation._location_resource_lists(SearchLocation.MODULES)  # noqa: SLF001
+            for resource in capsule_resources
+            if resource.restype() is ResourceType.MDL and "lhr_dor02" in iterate_textures_and_lightmaps(resource.data())
+        ]
+        print(f"Full scan:      {time.perf_counter() - start:.2f}s (the cost of every reverse query without the index)")
+
+        start = time.perf_counter()
+        index = installation.model_index(max_workers=1)
+        print(f"Serial build:   {time.perf_counter() - start:.2f}s")
+
+        installation = Installation(root)
+        installation.reload_all()
+        start = time.perf_counter()
+        installation.model_index()
+        print(f"Parallel build: {time.perf_counter() - start:.2f}s")
+
+        index.models_using_texture("")  # Builds the lookup tables
+        start = time.perf_counter()
+        for _ in range(1000):
+            assert len(index.models_using_texture("lhr_dor02")) == len(found)
+            index.children("s_female02")
+        print(f"Queries:        {(time.perf_counter() - start) / 2000 * 1e6:.1f}us per query")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
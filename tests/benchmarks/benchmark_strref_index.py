@@ -0,0 +1,82 @@
+"""Times building the reverse stringref index of a synthetic install, serially and in parallel, and querying it.
+
+Before the index, every Installation.find_tlk_entry_references() call parsed every GFF/2DA, i.e. cost a serial build.
+
+Usage:
+    python tests/benchmarks/benchmark_strref_index.py [module_count] [gffs_per_module]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
+
+from pykotor.common.language import LocalizedString  # noqa: E402
+from pykotor.extract.installation import Installation  # noqa: E402
+from pykotor.resource.formats.gff import GFF, GFFContent, GFFList, bytes_gff  # noqa: E402
+from pykotor.resource.type import ResourceType  # noqa: E402
+from synthetic_installation import build_synthetic_installation, write_capsule  # noqa: E402
+
+
+def dialog_data(rng: random.Random, entry_count: int = 50) -> bytes:
+    dialog = GFF(GFFContent.DLG)
+    entries: GFFList = dialog.root.set_list("EntryList", GFFList())
+    for _ in range(entry_count):
+        entries.add(0).set_locstring("Text", LocalizedString(rng.randrange(50_000)))
+    return bytes_gff(dialog)
+
+
+def main(module_count: int = 40, gffs_per_module: int = 100):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tempdir:
+        root = build_synthetic_installation(pathlib.Path(tempdir, "k1"), module_count=module_count, module_resources=1)
+        for m in range(module_count):
+            write_capsule(
+                root / "modules" / f"mod{m}.mod",
+                [(f"dlg{m}_{n}", ResourceType.DLG, dialog_data(rng)) for n in range(gffs_per_module)],
+            )
+        print(f"{module_count * gffs_per_module} dialogs, {module_count * gffs_per_module * 50} localized strings")
+
+        installation = Installation(root)
+        installation.reload_all()
+        start = time.perf_counter()
+        installation.strref_index(max_workers=1)
+        print(f"Serial build:   {time.perf_counter() - start:.2f}s (the cost of every query before the index)")
+
+        installation = Installation(root)
+        installation.reload_all()
+        start = time.perf_counter()
+        index = installation.strref_index()
+        print(f"Parallel build: {time.perf_counter() - start:.2f}s")
+
+        queries = [rng.randrange(50_000) for _ in range(10_000)]
+        index.references(0)  # Builds the lookup table
+        start = time.perf_counter()
+        for stringref in queries:
+            index.references(stringref)
+        print(f"Queries:        {(time.perf_counter() - start) / len(queries) * 1e6:.1f}us per stringref")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
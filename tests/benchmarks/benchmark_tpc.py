@@ -0,0 +1,132 @@
+"""Times decoding synthetic 2048x2048 DXT1 and DXT5 textures with TPC.convert, encoding them with TPC.compress and
+generating their mipmaps with TPC.generate_mipmaps, with and without numpy, and reading and writing TGAs natively and
+with Pillow.
+
+Usage:
+    python tests/benchmarks/benchmark_tpc.py [size]
+"""
+
+from __future__ import annotations
+
+import copy
+import pathlib
+import random
+import sys
+import time
+
+from unittest import mock
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.resource.formats.tpc import (  # noqa: E402
+    TPC,
+    DXTQuality,
+    MipmapFilter,
+    TPCTextureFormat,
+    TPCTGAReader,
+    TPCTGAWriter,
+    io_tga,
+    tpc_dxt,
+    tpc_mipmaps,
+)
+
+
+def synthetic_tpc(size: int, texture_format: TPCTextureFormat) -> TPC:
+    """A texture of random blocks, which exercises both the four and three color block modes."""
+    block_size = 8 if texture_format is TPCTextureFormat.DXT1 else 16
+    rng = random.Random(0)
+    tpc = TPC()
+    tpc.set_data(size, size, [rng.randbytes((size // 4) ** 2 * block_size)], texture_format)
+    return tpc
+
+
+def synthetic_rgba(size: int) -> TPC:
+    """An RGBA texture of smooth gradients with some noise, closer to a real texture than random pixels."""
+    rng = random.Random(0)
+    data = bytearray(size * size * 4)
+    for y in range(size):
+        row = bytes(
+            channel
+            for x in range(size)
+            for channel in (x * 255 // size, y * 255 // size, (x ^ y) & 0xFF, 255 - (x + y) * 127 // size)
+        )
+        data[y * size * 4 : (y + 1) * size * 4] = row
+    for i in range(0, len(data), 7):
+        data[i] = min(255, data[i] + rng.randrange(16))
+    tpc = TPC()
+    tpc.set_data(size, size, [bytes(data)], TPCTextureFormat.RGBA)
+    return tpc
+
+
+def load_with_pillow(data: bytes) -> TPC:
+    reader = TPCTGAReader(data)
+    reader._tpc = TPC()  # noqa: SLF001
+    reader._load_with_pillow()  # noqa: SLF001
+    return reader._tpc  # noqa: SLF001
+
+
+def timed(label: str, function, baseline: float | None = None) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    speedup = f" ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<24} {elapsed:8.3f}s{speedup}")
+    return elapsed
+
+
+def main(size: int = 2048):
+    if not tpc_dxt.numpy_available:
+        print("numpy is not installed, there is nothing to compare against.")
+        return
+    for texture_format in (TPCTextureFormat.DXT1, TPCTextureFormat.DXT5):
+        tpc = synthetic_tpc(size, texture_format)
+        print(f"Synthetic {texture_format.name}: {size}x{size}")
+        for convert_format in (TPCTextureFormat.RGBA, TPCTextureFormat.RGB):
+            results: list[bytearray] = []
+            with mock.patch.object(tpc_dxt, "numpy_available", False):
+                baseline = timed(f"to {convert_format.name} (per block)", lambda: results.append(tpc.convert(convert_format).data))  # noqa: B023
+            timed(f"to {convert_format.name} (numpy)", lambda: results.append(tpc.convert(convert_format).data), baseline)  # noqa: B023
+            assert results[0] == results[1], "The decoders' output differs"
+
+    source = synthetic_rgba(size)
+    print(f"Synthetic RGBA: {size}x{size}")
+    for texture_format in (TPCTextureFormat.DXT1, TPCTextureFormat.DXT5):
+        with mock.patch.object(tpc_dxt, "numpy_available", False):
+            baseline = timed(f"to {texture_format.name} (per block)", lambda: copy.deepcopy(source).compress(texture_format))  # noqa: B023
+        for quality in DXTQuality:
+            timed(f"to {texture_format.name} ({quality.name.lower()})", lambda: copy.deepcopy(source).compress(texture_format, quality), baseline)  # noqa: B023
+
+    print(f"Mipmaps of synthetic RGBA: {size}x{size}")
+    with mock.patch.object(tpc_mipmaps, "numpy_available", False):
+        baseline = timed("box (per pixel)", lambda: copy.deepcopy(source).generate_mipmaps())
+    for mipmap_filter in MipmapFilter:
+        timed(f"{mipmap_filter.name.lower()} (numpy)", lambda: copy.deepcopy(source).generate_mipmaps(mipmap_filter), baseline)  # noqa: B023
+
+    print(f"TGA of synthetic RGBA: {size}x{size}")
+    for rle in (False, True):
+        label = "rle" if rle else "raw"
+        data = bytearray()
+        timed(f"write {label}", lambda: TPCTGAWriter(source, data, rle=rle).write())  # noqa: B023
+        with mock.patch.object(io_tga, "pillow_available", False):
+            native = timed(f"read {label} (native)", lambda: TPCTGAReader(data).load())  # noqa: B023
+        if io_tga.pillow_available:
+            baseline = timed(f"read {label} (Pillow)", lambda: load_with_pillow(data))  # noqa: B023
+            print(f"{'':<24} native is {baseline / native:.1f}x Pillow")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,138 @@
+"""Times reading and writing a synthetic 10k row, 50 column binary 2DA against the previous per-cell reader and writer.
+
+Usage:
+    python tests/benchmarks/benchmark_twoda.py [row_count] [column_count]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+import time
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.resource.formats.twoda import TwoDA, bytes_2da, read_2da  # noqa: E402
+from pykotor.resource.type import ResourceReader, ResourceWriter, autoclose  # noqa: E402
+
+
+class LegacyTwoDABinaryReader(ResourceReader):
+    """The reader as it was before: seeks to every cell and reads it with read_terminated_string."""
+
+    @autoclose
+    def load(self, auto_close: bool = True) -> TwoDA:  # noqa: FBT001, FBT002, ARG002
+        twoda = TwoDA()
+        self._reader.skip(9)
+        columns: list[str] = []
+        while self._reader.peek() != b"\0":
+            column_header = self._reader.read_terminated_string("\t")
+            twoda.add_column(column_header)
+            columns.append(column_header)
+        self._reader.read_uint8()
+
+        row_count = self._reader.read_uint32()
+        column_count = twoda.get_width()
+        cell_count = row_count * column_count
+        for _ in range(row_count):
+            twoda.add_row(self._reader.read_terminated_string("\t"))
+
+        cell_offsets: list[int] = [self._reader.read_uint16() for _ in range(cell_count)]
+        self._reader.read_uint16()
+        cell_data_offset = self._reader.position()
+        for i in range(cell_count):
+            self._reader.seek(cell_data_offset + cell_offsets[i])
+            twoda.set_cell(i // column_count, columns[i % column_count], self._reader.read_terminated_string("\0"))
+        return twoda
+
+
+class LegacyTwoDABinaryWriter(ResourceWriter):
+    """The writer as it was before: deduplicates cell values with list.index."""
+
+    def __init__(self, twoda: TwoDA, target: bytearray):
+        super().__init__(target)
+        self._twoda: TwoDA = twoda
+
+    @autoclose
+    def write(self, auto_close: bool = True):  # noqa: FBT001, FBT002, ARG002
+        self._writer.write_string("2DA V2.b\n")
+        for header in self._twoda.get_headers():
+            self._writer.write_string(header + "\t")
+        self._writer.write_string("\0")
+        self._writer.write_uint32(self._twoda.get_height())
+        for row_label in self._twoda.get_labels():
+            self._writer.write_string(str(row_label) + "\t")
+
+        values: list[str] = []
+        value_offsets: list[int] = []
+        cell_offsets: list[int] = []
+        data_size = 0
+        for row in self._twoda:
+            for header in self._twoda.get_headers():
+                value = row.get_string(header) + "\0"
+                if value not in values:
+                    value_offsets.append(len(values[-1]) + value_offsets[-1] if value_offsets else 0)
+                    values.append(value)
+                    data_size += len(value)
+                cell_offsets.append(value_offsets[values.index(value)])
+        for cell_offset in cell_offsets:
+            self._writer.write_uint16(cell_offset)
+        self._writer.write_uint16(data_size)
+        for value in values:
+            self._writer.write_string(value)
+
+
+def synthetic_twoda(row_count: int, column_count: int) -> TwoDA:
+    """An appearance.2da-like table: mostly small integers, resrefs and '****', with ~2000 distinct values."""
+    rng = random.Random(0)
+    twoda = TwoDA([f"column{c}" for c in range(column_count)])
+    for r in range(row_count):
+        twoda.add_row(
+            str(r),
+            {
+                f"column{c}": rng.choice(("****", str(rng.randrange(1000)), f"res_{rng.randrange(1000)}", "0.5"))
+                for c in range(column_count)
+            },
+        )
+    return twoda
+
+
+def timed(label: str, function, baseline: float | None = None) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    speedup = f" ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<24} {elapsed:8.3f}s{speedup}")
+    return elapsed
+
+
+def main(row_count: int = 10_000, column_count: int = 50):
+    twoda = synthetic_twoda(row_count, column_count)
+    data = bytes(bytes_2da(twoda))
+    print(f"Synthetic 2DA: {row_count} rows, {column_count} columns, {len(data) // 1024} KiB")
+
+    legacy_data = bytearray()
+    baseline = timed("write (legacy)", lambda: LegacyTwoDABinaryWriter(twoda, legacy_data).write())
+    timed("bytes_2da", lambda: bytes_2da(twoda), baseline)
+    assert data == legacy_data, "The writers' output differs"
+
+    baseline = timed("read (legacy)", lambda: LegacyTwoDABinaryReader(data).load())
+    timed("read_2da", lambda: read_2da(data), baseline)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
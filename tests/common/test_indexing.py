@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.common.indexing import chunk_sources, file_stamp, read_index_file, resource_table_checksum, write_index_file
+
+
+class TestIndexFile(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.temp_dir.name, "cache", "index.json")  # noqa: PTH118
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        self.assertTrue(write_index_file(self.filepath, 2, "test index", owner="a", rows=[[1, "x"]]))
+        self.assertEqual(["index.json"], os.listdir(os.path.dirname(self.filepath)))  # noqa: PTH120
+        self.assertEqual({"version": 2, "owner": "a", "rows": [[1, "x"]]}, read_index_file(self.filepath, 2, "test index", owner="a"))
+
+    def test_outdated_or_unreadable(self):
+        self.assertIsNone(read_index_file(self.filepath, 2, "test index"))
+        write_index_file(self.filepath, 2, "test index", owner="a")
+        self.assertIsNone(read_index_file(self.filepath, 3, "test index", owner="a"))
+        self.assertIsNone(read_index_file(self.filepath, 2, "test index", owner="b"))
+        with open(self.filepath, "w") as file:  # noqa: PTH123
+            file.write("{")
+        self.assertIsNone(read_index_file(self.filepath, 2, "test index", owner="a"))
+
+    def test_file_stamp(self):
+        self.assertIsNone(file_stamp(self.filepath))
+        write_index_file(self.filepath, 2, "test index")
+        self.assertEqual(os.path.getsize(self.filepath), file_stamp(self.filepath)[0])  # noqa: PTH202
+
+
+class TestSources(TestCase):
+    def test_chunk_sources(self):
+        sources = [("small", [1]), ("large", [1, 2, 3]), ("medium", [1, 2])]
+        self.assertEqual([[("large", [1, 2, 3])], [("medium", [1, 2]), ("small", [1])]], chunk_sources(sources, 3))
+        self.assertEqual([sorted(sources, key=lambda source: -len(source[1]))], chunk_sources(sources))
+        self.assertEqual([], chunk_sources([]))
+
+    def test_resource_table_checksum(self):
+        resources = [("a", 2017, 0, 10), ("b", 2027, 10, 4)]
+        self.assertEqual(resource_table_checksum(resources), resource_table_checksum(list(resources)))
+        self.assertNotEqual(resource_table_checksum(resources), resource_table_checksum([("a", 2017, 0, 11), ("b", 2027, 10, 4)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
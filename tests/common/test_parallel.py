@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pathlib
+import sys
+import unittest
+
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.common.parallel import parallel_map
+
+
+class TestParallelMap(TestCase):
+    def test_results_in_order(self):
+        self.assertEqual([1, 2, 3, 4], parallel_map(abs, [-1, 2, -3, 4], max_workers=2, chunksize=2))
+        self.assertEqual([1, 8, 9], parallel_map(pow, [1, 2, 3], [3, 3, 2], max_workers=1))
+        self.assertEqual([], parallel_map(abs, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import pathlib
 import sys
 import unittest
@@ -143,6 +144,50 @@ class TestBinaryReader(TestCase):
 
         self.assertEqual(b"\x03", self.reader1c.peek(1))
 
+    def test_read_struct(self):
+        self.assertEqual((1, 2, 3), self.reader1.read_struct("BHI"))
+        self.assertEqual((4,), self.reader1.read_struct("Q"))
+        self.assertEqual(15, self.reader1.position())
+        self.assertRaises(OSError, self.reader1c.read_struct, "Q")
+
+    def test_read_records(self):
+        reader = BinaryReader.from_bytes(b"abcd\x01\x00" + b"efg\x00\x02\x00" + b"\xff")
+        self.assertEqual([(b"abcd", 1), (b"efg\x00", 2)], reader.read_records("4sH", 2))
+        self.assertEqual([], reader.read_records("4sH", 0))
+        self.assertRaises(OSError, reader.read_records, "4sH", 1)
+        self.assertEqual("efg", BinaryReader.decode_fixed_string(b"efg\x00\x00h"))
+
+    def test_read_array(self):
+        self.assertEqual([-1, -2], self.reader3.read_array("b", 2).tolist())
+        self.assertEqual([0xFFFE, 0xFFFD], BinaryReader.from_bytes(self.data3, 1).read_array("H", 2).tolist())
+        self.assertEqual([0xFEFF, 0xFDFF], BinaryReader.from_bytes(self.data3, 1).read_array("H", 2, big=True).tolist())
+        self.assertRaises(OSError, self.reader1c.read_array, "I", 2)
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+    def test_read_array_numpy(self):
+        values = BinaryReader.from_bytes(self.data3, 1).read_array("H", 2, big=True, as_numpy=True)
+        self.assertEqual([0xFEFF, 0xFDFF], values.tolist())
+
+    def test_read_terminated_string(self):
+        reader = BinaryReader.from_bytes(b"abc\x00def\x00" + b"g" * 200 + b"\x00" + b"hi\xffjk\x00")
+        self.assertEqual("abc", reader.read_terminated_string("\0"))
+        self.assertEqual(4, reader.position())
+        self.assertEqual("de", reader.read_terminated_string("f", 3))
+        self.assertEqual(7, reader.position())
+        self.assertEqual("", reader.read_terminated_string("\0"))
+        self.assertEqual("g" * 200, reader.read_terminated_string("\0"))
+        self.assertEqual("hi", reader.read_terminated_string("\0"))
+        self.assertEqual(212, reader.position())
+
+        reader = BinaryReader.from_bytes(b"hi\xffjk\x00")
+        self.assertEqual("hijk", reader.read_terminated_string("\0", strict=False))
+        self.assertEqual(6, reader.position())
+
+        reader = BinaryReader.from_bytes(b"abcdefgh")
+        self.assertEqual("abcd", reader.read_terminated_string("\0", 4))
+        self.assertRaises(OSError, reader.read_terminated_string, "\0")
+        self.assertRaises(OSError, reader.read_terminated_string, "\0", 8)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -24,7 +24,8 @@ if PYKOTOR_PATH.joinpath("pykotor").exists():
 if UTILITY_PATH.joinpath("utility").exists():
     add_sys_path(UTILITY_PATH)
 
-from pykotor.extract.capsule import Capsule
+from pykotor.extract.capsule import Capsule, LazyCapsule
+from pykotor.extract.file import ResourceIdentifier
 from pykotor.resource.type import ResourceType
 
 TEST_ERF_FILE = "tests/files/capsule.mod"
@@ -124,6 +125,39 @@ class TestCapsule(TestCase):
         self.assertEqual(1655, len(rim_capsule.resource("module", ResourceType.IFO)))
         self.assertEqual("IFO ", rim_capsule.resource("module", ResourceType.IFO)[:4].decode())
 
+    def test_lazy_capsule_caches_table_of_contents(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            temp_rim_path = pathlib.Path(tmpdirname).joinpath("capsule.rim")
+            shutil.copy(TEST_RIM_FILE, temp_rim_path)
+            lazy_capsule = LazyCapsule(temp_rim_path)
+
+            self.assertTrue(lazy_capsule.contains("M13AA", ResourceType.ARE))
+            self.assertIs(lazy_capsule.info("m13aa", ResourceType.ARE), lazy_capsule.info("m13aa", ResourceType.ARE))
+            self.assertIsNone(lazy_capsule.info("m13aa", ResourceType.UTC))
+            self.assertFalse(lazy_capsule.contains("missing", ResourceType.ARE))
+
+            Capsule(temp_rim_path).add("image", ResourceType.PNG, b"image data")  # Modified through another object.
+            self.assertEqual(4, len(lazy_capsule))
+            self.assertEqual(b"image data", lazy_capsule.resource("image", ResourceType.PNG))
+
+            lazy_capsule.delete("image", ResourceType.PNG)
+            self.assertFalse(lazy_capsule.contains("image", ResourceType.PNG))
+            self.assertEqual(3, len(lazy_capsule))
+
+    def test_batch(self):
+        for capsule in (LazyCapsule(TEST_ERF_FILE), Capsule(TEST_ERF_FILE)):
+            queries = [
+                ResourceIdentifier("001ebo", ResourceType.PTH),
+                ResourceIdentifier("missing", ResourceType.PTH),
+                ResourceIdentifier("001EBO", ResourceType.ARE),
+            ]
+            results = capsule.batch(queries)
+
+            self.assertEqual(queries, list(results))
+            self.assertIsNone(results[queries[1]])
+            self.assertEqual(capsule.resource("001ebo", ResourceType.PTH), results[queries[0]].data)  # type: ignore[union-attr]
+            self.assertEqual(4865, len(results[queries[2]].data))  # type: ignore[union-attr]
+
 
 if __name__ == "__main__":
     unittest.main()
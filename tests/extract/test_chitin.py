@@ -3,13 +3,15 @@ from __future__ import annotations
 import os
 import pathlib
 import sys
+import tempfile
 import unittest
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
 PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
 UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
 
 
 def add_sys_path(p: pathlib.Path):
@@ -22,10 +24,15 @@ if PYKOTOR_PATH.joinpath("pykotor").exists():
     add_sys_path(PYKOTOR_PATH)
 if UTILITY_PATH.joinpath("utility").exists():
     add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
 
 
 from pykotor.tools.path import CaseAwarePath
-from pykotor.extract.chitin import Chitin
+from pykotor.common.misc import Game
+from pykotor.extract.chitin import BIF_MMAP_POOL, BIFMemoryMapPool, Chitin
+from pykotor.extract.file import FileResource
+from pykotor.resource.type import ResourceType
+from synthetic_installation import write_key_and_bifs
 
 NWN_BASE_PATH = r"C:\Program Files (x86)\Steam\steamapps\common\Neverwinter Nights"
 NWN_KEY_PATH = r"C:\Program Files (x86)\Steam\steamapps\common\Neverwinter Nights\data\nwn_base.key"
@@ -56,5 +63,109 @@ class TestCapsule(TestCase):
         chitin = Chitin(CaseAwarePath(K2_PATH, "chitin.key"))
 
 
+class TestLazyChitin(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self._tempdir.name)
+        write_key_and_bifs(
+            self.root,
+            {
+                "data/first.bif": [("alpha", ResourceType.UTC, b"alpha data"), ("shared", ResourceType.TwoDA, b"first shared")],
+                "data/second.bif": [("beta", ResourceType.UTI, b"beta data"), ("shared", ResourceType.TwoDA, b"second shared"), ("empty", ResourceType.TXT, b"")],
+            },
+        )
+        self.chitin = Chitin(self.root / "chitin.key")
+
+    def tearDown(self):
+        BIF_MMAP_POOL.close()  # Mapped files cannot be deleted on Windows.
+        self._tempdir.cleanup()
+
+    def test_bif_tables_are_read_on_demand(self):
+        chitin = self.chitin
+        self.assertEqual({}, chitin._bif_tables)  # noqa: SLF001
+
+        self.assertTrue(chitin.exists("BETA", ResourceType.UTI))
+        self.assertFalse(chitin.exists("beta", ResourceType.UTC))
+        self.assertEqual({}, chitin._bif_tables)  # noqa: SLF001
+
+        self.assertEqual(b"beta data", chitin.resource("beta", ResourceType.UTI))
+        self.assertEqual({1}, set(chitin._bif_tables))  # noqa: SLF001
+        self.assertEqual(b"", chitin.resource("empty", ResourceType.TXT))
+        self.assertIsNone(chitin.resource("missing", ResourceType.UTI))
+
+        self.assertEqual(b"first shared", chitin.resource("shared", ResourceType.TwoDA))
+        self.assertEqual({0, 1}, set(chitin._bif_tables))  # noqa: SLF001
+
+    def test_iteration_matches_bif_order(self):
+        resources = list(self.chitin)
+        self.assertEqual(5, len(self.chitin))
+        self.assertEqual(["alpha", "shared", "beta", "shared", "empty"], [res.resname() for res in resources])
+        self.assertEqual([b"alpha data", b"first shared", b"beta data", b"second shared", b""], [res.data() for res in resources])
+        self.assertEqual("second.bif", resources[2].filepath().name)
+
+    def test_compressed_bifs(self):
+        write_key_and_bifs(
+            self.root / "ios",
+            {"data/first.bif": [("alpha", ResourceType.UTC, b"alpha data" * 1000), ("empty", ResourceType.TXT, b"")]},
+            compressed=True,
+        )
+        chitin = Chitin(self.root / "ios" / "chitin.key", game=Game.K1_IOS)
+        self.assertEqual(b"alpha data" * 1000, chitin.resource("alpha", ResourceType.UTC))
+        self.assertEqual(b"", chitin.resource("empty", ResourceType.TXT))
+        resources = list(chitin)
+        self.assertEqual("first.bzf", resources[0].filepath().name)
+        self.assertEqual([b"alpha data" * 1000, b""], [data for _, data in FileResource.iter_data(resources)])
+
+    def test_mmap_pool(self):
+        pool = BIFMemoryMapPool(max_open=1)
+        first = self.root / "data" / "first.bif"
+        second = self.root / "data" / "second.bif"
+        alpha = self.chitin.info("alpha", ResourceType.UTC)
+        beta = self.chitin.info("beta", ResourceType.UTI)
+        assert alpha is not None and beta is not None
+
+        self.assertEqual(b"alpha data", pool.read(first, alpha.offset(), alpha.size()))
+        self.assertEqual(b"beta data", pool.read(second, beta.offset(), beta.size()))
+        self.assertEqual([str(second)], list(pool._maps))  # noqa: SLF001
+        self.assertRaises(OSError, pool.read, second, beta.offset(), 1000)
+        pool.close()
+        self.assertEqual({}, dict(pool._maps))  # noqa: SLF001
+
+    def test_mmap_pool_remaps_changed_files(self):
+        pool = BIFMemoryMapPool()
+        path = self.root / "data" / "changing.bif"
+        path.write_bytes(b"0123456789")
+        self.assertEqual(b"2345", pool.read(path, 2, 4))
+        path.write_bytes(b"abc")
+        self.assertEqual(b"bc", pool.read(path, 1, 2))
+        self.assertRaises(OSError, pool.read, path, 2, 4)
+        path.write_bytes(b"ABCDEFGHIJ")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        self.assertEqual(b"CDEF", pool.read(path, 2, 4))
+        pool.close()
+
+    def test_iteration_reads_no_bif_tables(self):
+        with mock.patch.object(Chitin, "read_bif", wraps=Chitin.read_bif) as read_bif:
+            chitin = Chitin(self.root / "chitin.key")
+            resources = list(chitin)
+            self.assertEqual(["alpha", "shared", "beta", "shared", "empty"], [res.resname() for res in resources])
+            read_bif.assert_not_called()
+            self.assertEqual(b"beta data", resources[2].data())
+            self.assertEqual(1, read_bif.call_count)
+            self.assertEqual(len(b"second shared"), resources[3].size())
+            self.assertEqual(1, read_bif.call_count)
+
+        rebuilt = Chitin.from_key_table(self.root / "chitin.key", *chitin.key_table())
+        self.assertEqual([(res.resname(), res.offset(), res.size()) for res in chitin], [(res.resname(), res.offset(), res.size()) for res in rebuilt])
+
+    def test_resource_dict_is_cached_until_reload(self):
+        chitin = self.chitin
+        resource_dict = chitin._resource_dict  # noqa: SLF001
+        self.assertEqual([2, 3], [len(resources) for resources in resource_dict.values()])
+        self.assertIs(resource_dict, chitin._resource_dict)  # noqa: SLF001
+        chitin.reload()
+        self.assertIsNot(resource_dict, chitin._resource_dict)  # noqa: SLF001
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import unittest
+
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.extract.capsule import Capsule
+from pykotor.extract.file import FileResource
+from pykotor.resource.type import ResourceType
+
+TEST_ERF_FILE = "tests/files/capsule.mod"
+
+
+class TestFileResourceHashing(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.filepath = pathlib.Path(self._tempdir.name, "test.2da")
+        self.filepath.write_bytes(b"first contents")
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_data_does_not_hash(self):
+        resource = FileResource.from_path(self.filepath)
+        thread_count = threading.active_count()
+        self.assertEqual(b"first contents", resource.data())
+        self.assertEqual(thread_count, threading.active_count())
+
+    def test_content_hash_is_memoized_until_file_changes(self):
+        resource = FileResource.from_path(self.filepath)
+        self.assertEqual(hashlib.sha1(b"first contents").hexdigest(), resource.get_sha1_hash())  # noqa: S324
+        self.assertEqual(hashlib.sha256(b"first contents").hexdigest(), resource.content_hash("sha256"))
+
+        self.filepath.write_bytes(b"other contents")
+        stat_result = self.filepath.stat()
+        os.utime(self.filepath, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        self.assertEqual(hashlib.sha1(b"other contents").hexdigest(), resource.get_sha1_hash())  # noqa: S324
+
+        self.filepath.unlink()
+        self.assertEqual("", resource.get_sha1_hash())
+
+    def test_content_hashes_batch(self):
+        capsule = Capsule(TEST_ERF_FILE)
+        resources = [*capsule.resources(), FileResource.from_path(self.filepath)]
+        missing = FileResource("missing", ResourceType.TXT, 0, 0, pathlib.Path(self._tempdir.name, "missing.txt"))
+
+        hashes = FileResource.content_hashes([*resources, missing])
+        self.assertEqual("", hashes[missing])
+        for resource in resources:
+            self.assertEqual(hashlib.sha1(resource.data()).hexdigest(), hashes[resource])  # noqa: S324
+            self.assertEqual(hashes[resource], resource.get_sha1_hash())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,15 @@ from __future__ import annotations
 import os
 import pathlib
 import sys
+import tempfile
 import unittest
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
 PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
 UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+TESTS_PATH = THIS_SCRIPT_PATH.parents[1]
 
 
 def add_sys_path(p: pathlib.Path):
@@ -22,13 +24,23 @@ if PYKOTOR_PATH.joinpath("pykotor").exists():
     add_sys_path(PYKOTOR_PATH)
 if UTILITY_PATH.joinpath("utility").exists():
     add_sys_path(UTILITY_PATH)
+add_sys_path(TESTS_PATH)
 
 from pykotor.common.language import LocalizedString
 from pykotor.extract.capsule import Capsule
+from pykotor.common.misc import Game
+from pykotor.extract.chitin import BIF_MMAP_POOL, Chitin
 from pykotor.extract.file import ResourceIdentifier
 from pykotor.extract.installation import Installation, SearchLocation
+from pykotor.extract.installation_cache import InstallationIndexCache
+from pykotor.extract.model_index import ModelIndex
+from pykotor.extract.strref_index import StrRefIndex
+from pykotor.resource.formats.gff import GFF, GFFContent, GFFList, bytes_gff
+from pykotor.resource.formats.twoda import TwoDA, bytes_2da
 from pykotor.resource.type import ResourceType
+from pykotor.tools.model import change_textures
 from pykotor.tools.path import CaseAwarePath
+from synthetic_installation import build_synthetic_installation, write_capsule, write_key_and_bifs
 
 K1_PATH: str | None = os.environ.get("K1_PATH")
 
@@ -383,5 +395,329 @@ class TestInstallation(TestCase):
         self.assertEqual("ERROR: FATAL COMPILER ERROR", results[locstring3])  # This test will fail on non-english versions of the game
 
 
+class TestInstallationIndex(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root: pathlib.Path = build_synthetic_installation(pathlib.Path(self._tempdir.name, "k1"))
+        self.installation = Installation(self.root)
+
+    def tearDown(self):
+        BIF_MMAP_POOL.close()  # Mapped files cannot be deleted on Windows.
+        self._tempdir.cleanup()
+
+    def test_locations_follow_search_order(self):
+        query = ResourceIdentifier("shared_1", ResourceType.TwoDA)
+
+        results = self.installation.locations([query], [SearchLocation.OVERRIDE, SearchLocation.CHITIN])[query]
+        self.assertEqual(2, len(results))
+        self.assertEqual("override", results[0].filepath.parent.name.lower())
+        self.assertEqual("synthetic0.bif", results[1].filepath.name)
+
+        results = self.installation.locations([query], [SearchLocation.CHITIN, SearchLocation.OVERRIDE])[query]
+        self.assertEqual("synthetic0.bif", results[0].filepath.name)
+        self.assertEqual(b"override shared 1", self.installation.resource("SHARED_1", ResourceType.TwoDA).data)  # type: ignore[union-attr]
+
+    def test_every_location_is_indexed(self):
+        installation: Installation = self.installation
+
+        self.assertTrue(installation.location("chit_3", ResourceType.UTC, [SearchLocation.CHITIN]))
+        self.assertTrue(installation.location("mod1_3", ResourceType.UTC, [SearchLocation.MODULES]))
+        self.assertTrue(installation.location("mod0", ResourceType.ARE, [SearchLocation.MODULES]))
+        self.assertTrue(installation.location("ovr_3", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        self.assertTrue(installation.location("tex_3", ResourceType.TPC, [SearchLocation.TEXTURES_TPA]))
+        self.assertTrue(installation.location("tex_3", ResourceType.TPC, [SearchLocation.TEXTURES_GUI]))
+        self.assertFalse(installation.location("tex_3", ResourceType.TPC, [SearchLocation.TEXTURES_TPB]))
+        self.assertTrue(installation.location("vo_3", ResourceType.WAV, [SearchLocation.VOICE]))
+        self.assertTrue(installation.location("snd_3", ResourceType.WAV, [SearchLocation.SOUND]))
+        self.assertTrue(installation.location("mus_3", ResourceType.WAV, [SearchLocation.MUSIC]))
+        self.assertFalse(installation.location("chit_3", ResourceType.UTC, [SearchLocation.MODULES, SearchLocation.OVERRIDE]))
+
+        self.assertIsNotNone(installation.texture("TEX_3"))
+        self.assertIsNone(installation.sound("snd_3", [SearchLocation.MUSIC]))
+
+    def test_determine_game_ignores_case(self):
+        self.assertEqual(Game.K1, Installation.determine_game(self.root))
+        self.root.joinpath("swkotor.exe").rename(self.root.joinpath("SWKotor.EXE"))
+        self.root.joinpath("streamwaves").rename(self.root.joinpath("StreamWaves"))
+        self.assertEqual(Game.K1, Installation.determine_game(self.root))
+
+    def test_sections_load_on_first_access(self):
+        installation = Installation(self.root)
+        self.assertEqual({}, installation._indexed_identifiers)  # noqa: SLF001
+
+        self.assertTrue(installation.location("ovr_3", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        self.assertEqual({SearchLocation.OVERRIDE}, set(installation._indexed_identifiers))  # noqa: SLF001
+
+        self.assertEqual(["mod0.mod", "mod0.rim", "mod1.mod", "mod1.rim"], sorted(installation.modules_list()))
+        self.assertEqual({SearchLocation.OVERRIDE, SearchLocation.MODULES}, set(installation._indexed_identifiers))  # noqa: SLF001
+
+        self.assertIsNotNone(installation.texture("tex_3", [SearchLocation.TEXTURES_GUI]))
+        self.assertNotIn(SearchLocation.VOICE, installation._indexed_identifiers)  # noqa: SLF001
+        self.assertNotIn(SearchLocation.CHITIN, installation._indexed_identifiers)  # noqa: SLF001
+
+        self.assertEqual(b"chitin 3", installation.resource("chit_3", ResourceType.UTC).data)  # type: ignore[union-attr]
+        self.assertIn(SearchLocation.CHITIN, installation._indexed_identifiers)  # noqa: SLF001
+
+    def test_iteration_loads_only_missing_sections(self):
+        installation = Installation(self.root)
+        self.assertTrue(installation.location("ovr_3", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        with mock.patch.object(Installation, "load_override") as load_override, mock.patch.object(Installation, "reload_all") as reload_all:
+            resources = list(installation)
+        load_override.assert_not_called()
+        reload_all.assert_not_called()
+        self.assertEqual({(str(res.identifier()), str(res.filepath())) for res in Installation(self.root)}, {(str(res.identifier()), str(res.filepath())) for res in resources})
+
+    def test_reload_keeps_index_consistent(self):
+        installation: Installation = self.installation
+        installation.reload_all()
+
+        new_override_file = installation.override_path() / "ovr_new.uti"
+        new_override_file.write_bytes(b"new")
+        self.assertFalse(installation.location("ovr_new", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        installation.reload_override_file(new_override_file)
+        self.assertTrue(installation.location("ovr_new", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        self.assertTrue(installation.location("ovr_3", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+
+        write_capsule(self.root / "modules" / "mod0.mod", [("replaced", ResourceType.UTC, b"replaced")])
+        installation.reload_module("mod0.mod")
+        self.assertTrue(installation.location("replaced", ResourceType.UTC, [SearchLocation.MODULES]))
+        self.assertFalse(installation.location("mod0_3", ResourceType.UTC, [SearchLocation.MODULES]))
+        self.assertTrue(installation.location("mod1_3", ResourceType.UTC, [SearchLocation.MODULES]))
+
+        installation.load_chitin()
+        self.assertEqual(1, len(installation.location("chit_3", ResourceType.UTC, [SearchLocation.CHITIN])))
+
+
+class TestInstallationIndexCache(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root: pathlib.Path = build_synthetic_installation(pathlib.Path(self._tempdir.name, "k1"))
+        self.cache_path: pathlib.Path = pathlib.Path(self._tempdir.name, "k1_index.json")
+
+    def tearDown(self):
+        BIF_MMAP_POOL.close()  # Mapped files cannot be deleted on Windows.
+        self._tempdir.cleanup()
+
+    def _snapshot(self, installation: Installation) -> set[tuple[str, str, int, int]]:
+        return {(str(res.identifier()), str(res.filepath()), res.offset(), res.size()) for res in installation}
+
+    def test_warm_start_matches_cold_start(self):
+        uncached = Installation(self.root)
+        cold = Installation(self.root, index_cache=self.cache_path)
+        cold.reload_all()
+        self.assertTrue(self.cache_path.is_file())
+        warm = Installation(self.root, index_cache=self.cache_path)
+        warm.reload_all()
+
+        self.assertEqual(self._snapshot(uncached), self._snapshot(cold))
+        self.assertEqual(self._snapshot(uncached), self._snapshot(warm))
+        self.assertEqual(b"module 1 3", warm.resource("mod1_3", ResourceType.UTC).data)  # type: ignore[union-attr]
+        self.assertEqual(b"chitin 3", warm.resource("chit_3", ResourceType.UTC).data)  # type: ignore[union-attr]
+
+    def test_cache_is_written_once_per_batch(self):
+        with mock.patch.object(InstallationIndexCache, "save", autospec=True) as save:
+            list(Installation(self.root, index_cache=self.cache_path))
+            self.assertEqual(1, save.call_count)
+            installation = Installation(self.root, index_cache=self.cache_path)
+            installation.location("chit_3", ResourceType.UTC, [SearchLocation.CHITIN, SearchLocation.MODULES, SearchLocation.OVERRIDE])
+            self.assertEqual(2, save.call_count)
+            installation.override_list()
+            self.assertEqual(2, save.call_count)
+            installation.lips_list()
+            self.assertEqual(3, save.call_count)
+
+    def test_changed_sources_are_reparsed(self):
+        Installation(self.root, index_cache=self.cache_path).reload_all()
+
+        module_path = self.root / "modules" / "mod0.mod"
+        write_capsule(module_path, [("replaced", ResourceType.UTC, b"replaced")])
+        os.utime(module_path, ns=(module_path.stat().st_atime_ns, module_path.stat().st_mtime_ns + 10**9))
+        override_path = self.root / "override"
+        override_path.joinpath("ovr_new.uti").write_bytes(b"new")
+        os.utime(override_path, ns=(override_path.stat().st_atime_ns, override_path.stat().st_mtime_ns + 10**9))
+        override_path.joinpath("ovr_1.uti").write_bytes(b"a longer override file")
+
+        installation = Installation(self.root, index_cache=self.cache_path)
+        self.assertTrue(installation.location("replaced", ResourceType.UTC, [SearchLocation.MODULES]))
+        self.assertFalse(installation.location("mod0_3", ResourceType.UTC, [SearchLocation.MODULES]))
+        self.assertTrue(installation.location("ovr_new", ResourceType.UTI, [SearchLocation.OVERRIDE]))
+        self.assertEqual(b"a longer override file", installation.resource("ovr_1", ResourceType.UTI).data)  # type: ignore[union-attr]
+        self.assertEqual(self._snapshot(Installation(self.root)), self._snapshot(installation))
+
+    def test_unusable_cache_is_rebuilt(self):
+        self.cache_path.write_text("not json")
+        installation = Installation(self.root, index_cache=self.cache_path)
+        self.assertTrue(installation.location("chit_3", ResourceType.UTC, [SearchLocation.CHITIN]))
+        self.assertEqual(self._snapshot(Installation(self.root)), self._snapshot(Installation(self.root, index_cache=self.cache_path)))
+
+
+class TestStrRefIndex(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root: pathlib.Path = build_synthetic_installation(pathlib.Path(self._tempdir.name, "k1"))
+        self.cache_path: pathlib.Path = pathlib.Path(self._tempdir.name, "k1_index.json")
+
+        item = GFF(GFFContent.UTI)
+        item.root.set_locstring("LocalizedName", LocalizedString(42))
+        item.root.set_locstring("Description", LocalizedString(-1))
+        properties: GFFList = item.root.set_list("PropertiesList", GFFList())
+        properties.add(0).set_locstring("Name", LocalizedString(7))
+        self.root.joinpath("override", "strref_item.uti").write_bytes(bytes_gff(item))
+
+        actions = TwoDA(["label", "string_ref"])
+        actions.add_row("0", {"label": "first", "string_ref": "****"})
+        actions.add_row("1", {"label": "second", "string_ref": "42"})
+        self.root.joinpath("override", "actions.2da").write_bytes(bytes_2da(actions))
+
+        creature = GFF(GFFContent.UTC)
+        creature.root.set_locstring("FirstName", LocalizedString(42))
+        write_capsule(self.root / "modules" / "mod0.mod", [("strref_creature", ResourceType.UTC, bytes_gff(creature))])
+
+    def tearDown(self):
+        BIF_MMAP_POOL.close()  # Mapped files cannot be deleted on Windows.
+        self._tempdir.cleanup()
+
+    def test_find_tlk_entry_references(self):
+        installation = Installation(self.root)
+        found = installation.find_tlk_entry_references(42)
+        self.assertEqual({"strref_item.uti", "actions.2da", "strref_creature.utc"}, {resource.filename() for resource in found})
+        self.assertEqual({"strref_item.uti"}, {resource.filename() for resource in installation.find_tlk_entry_references(7)})
+        self.assertEqual(set(), installation.find_tlk_entry_references(-1))
+        self.assertEqual(
+            {"strref_creature.utc"},
+            {resource.filename() for resource in installation.find_tlk_entry_references(42, [SearchLocation.MODULES])},
+        )
+
+        references = {(ref.resource.filename(), ref.location, ref.field_path, ref.row_index) for ref in installation.strref_index().references(42)}
+        self.assertEqual(
+            {
+                ("strref_item.uti", SearchLocation.OVERRIDE, "LocalizedName", None),
+                ("actions.2da", SearchLocation.OVERRIDE, "string_ref", 1),
+                ("strref_creature.utc", SearchLocation.MODULES, "FirstName", None),
+            },
+            references,
+        )
+        self.assertEqual(["PropertiesList\\0\\Name"], [ref.field_path for ref in installation.strref_index().references(7)])
+
+        batch = installation.strref_index().batch([7, 42, 1000])
+        self.assertEqual([1, 3, 0], [len(batch[7]), len(batch[42]), len(batch[1000])])
+        self.assertEqual({7, 42}, installation.strref_index().stringrefs())
+
+    def test_compressed_bifs(self):
+        creature = GFF(GFFContent.UTC)
+        creature.root.set_locstring("FirstName", LocalizedString(42))
+        ios_root: pathlib.Path = pathlib.Path(self._tempdir.name, "ios")
+        write_key_and_bifs(ios_root, {"data/templates.bif": [("ios_creature", ResourceType.UTC, bytes_gff(creature))]}, compressed=True)
+
+        index = StrRefIndex()
+        index.update([(SearchLocation.CHITIN, list(Chitin(ios_root / "chitin.key", game=Game.K1_IOS)))], {})
+        self.assertEqual(["ios_creature.utc"], [ref.resource.filename() for ref in index.references(42)])
+
+    def test_reloaded_sections_are_reindexed(self):
+        installation = Installation(self.root)
+        self.assertEqual(3, len(installation.find_tlk_entry_references(42)))
+
+        write_capsule(self.root / "modules" / "mod0.mod", [("replaced", ResourceType.UTC, b"replaced")])
+        installation.reload_module("mod0.mod")
+        self.assertEqual({"strref_item.uti", "actions.2da"}, {resource.filename() for resource in installation.find_tlk_entry_references(42)})
+
+    def test_index_is_persisted_and_invalidated_per_file(self):
+        Installation(self.root, index_cache=self.cache_path).strref_index()
+        strref_cache_path = self.cache_path.with_name("k1_index.strrefs.json")
+        self.assertTrue(strref_cache_path.is_file())
+
+        installation = Installation(self.root, index_cache=self.cache_path)
+        sources = [(location, resource_list) for location in (SearchLocation.OVERRIDE, SearchLocation.MODULES) for resource_list in installation._location_resource_lists(location)]  # noqa: SLF001
+        columns = installation._strref_columns()  # noqa: SLF001
+        index = StrRefIndex.load(strref_cache_path, installation.path())
+        self.assertEqual(0, index.update(sources, columns))
+        self.assertEqual(3, len(index.references(42)))
+
+        actions_path = self.root / "override" / "actions.2da"
+        actions = TwoDA(["label", "string_ref"])
+        actions.add_row("0", {"label": "first", "string_ref": "43"})
+        actions_path.write_bytes(bytes_2da(actions))
+        os.utime(actions_path, ns=(actions_path.stat().st_atime_ns, actions_path.stat().st_mtime_ns + 10**9))
+        self.assertEqual(1, index.update(sources, columns, max_workers=1))
+        self.assertEqual(2, len(index.references(42)))
+        self.assertEqual([("actions.2da", 0)], [(ref.resource.filename(), ref.row_index) for ref in index.references(43)])
+
+
+class TestModelIndex(TestCase):
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.root: pathlib.Path = build_synthetic_installation(pathlib.Path(self._tempdir.name, "k1"))
+        self.cache_path: pathlib.Path = pathlib.Path(self._tempdir.name, "k1_index.json")
+
+        mdl_path = TESTS_PATH / "files" / "mdl"
+        self.root.joinpath("override", "dor_lhr02.mdl").write_bytes(mdl_path.joinpath("dor_lhr02.mdl").read_bytes())
+        self.root.joinpath("override", "ascii.mdl").write_bytes(b"newmodel ascii\n")
+        write_capsule(
+            self.root / "modules" / "mod0.mod",
+            [
+                ("m12aa_c03_char02", ResourceType.MDL, mdl_path.joinpath("m12aa_c03_char02.mdl").read_bytes()),
+                ("m02aa_09b", ResourceType.MDL, mdl_path.joinpath("m02aa_09b.mdl").read_bytes()),
+            ],
+        )
+
+    def tearDown(self):
+        BIF_MMAP_POOL.close()  # Mapped files cannot be deleted on Windows.
+        self._tempdir.cleanup()
+
+    def test_queries(self):
+        index = Installation(self.root).model_index(max_workers=1)
+        self.assertEqual(
+            [("dor_lhr02.mdl", SearchLocation.OVERRIDE)],
+            [(ref.resource.filename(), ref.location) for ref in index.models_using_texture("LHR_DOR02")],
+        )
+        self.assertEqual(["dor_lhr02.mdl"], [ref.resource.filename() for ref in index.models_using_lightmap("dor_lhr02_a00004")])
+        self.assertEqual(["m12aa_c03_char02.mdl"], [ref.resource.filename() for ref in index.children("s_female02")])
+        self.assertEqual([], index.children("NULL"))
+        self.assertEqual([], index.models("ascii"))
+
+        (reference,) = index.models("M02AA_09B")
+        self.assertEqual(SearchLocation.MODULES, reference.location)
+        self.assertIn("lts_glass01", reference.info.textures)
+        self.assertEqual(9, len(reference.info.lightmaps))
+        self.assertEqual(reference.resource.data(), (TESTS_PATH / "files" / "mdl" / "m02aa_09b.mdl").read_bytes())
+        self.assertEqual({"lhr_dor02", "p_missionbb01", "pfha05", "pfhc02"}, index.textures() - set(reference.info.textures))
+
+    def test_compressed_bifs(self):
+        ios_root: pathlib.Path = pathlib.Path(self._tempdir.name, "ios")
+        door_data: bytes = (TESTS_PATH / "files" / "mdl" / "dor_lhr02.mdl").read_bytes()
+        write_key_and_bifs(ios_root, {"data/models.bif": [("ios_door", ResourceType.MDL, door_data)]}, compressed=True)
+
+        index = ModelIndex()
+        index.update([(SearchLocation.CHITIN, list(Chitin(ios_root / "chitin.key", game=Game.K1_IOS)))])
+        self.assertEqual(["ios_door.mdl"], [ref.resource.filename() for ref in index.models_using_texture("lhr_dor02")])
+
+    def test_reloaded_sections_are_reindexed(self):
+        installation = Installation(self.root)
+        self.assertEqual(1, len(installation.model_index().children("s_female02")))
+
+        write_capsule(self.root / "modules" / "mod0.mod", [("replaced", ResourceType.UTC, b"replaced")])
+        installation.reload_module("mod0.mod")
+        self.assertEqual([], installation.model_index().children("s_female02"))
+        self.assertEqual(1, len(installation.model_index().models_using_texture("lhr_dor02")))
+
+    def test_index_is_persisted_and_invalidated_per_file(self):
+        Installation(self.root, index_cache=self.cache_path).model_index()
+        model_cache_path = self.cache_path.with_name("k1_index.models.json")
+        self.assertTrue(model_cache_path.is_file())
+
+        installation = Installation(self.root, index_cache=self.cache_path)
+        sources = [(location, resource_list) for location in (SearchLocation.OVERRIDE, SearchLocation.MODULES) for resource_list in installation._location_resource_lists(location)]  # noqa: SLF001
+        index = ModelIndex.load(model_cache_path, installation.path())
+        self.assertEqual(0, index.update(sources))
+        self.assertEqual(installation.model_index().models("m02aa_09b")[0].info, index.models("m02aa_09b")[0].info)
+
+        door_path = self.root / "override" / "dor_lhr02.mdl"
+        door_path.write_bytes(change_textures(door_path.read_bytes(), {"lhr_dor02": "lhr_dor03"}))
+        os.utime(door_path, ns=(door_path.stat().st_atime_ns, door_path.stat().st_mtime_ns + 10**9))
+        self.assertEqual(1, index.update(sources, max_workers=1))
+        self.assertEqual([], index.models_using_texture("lhr_dor02"))
+        self.assertEqual(1, len(index.models_using_texture("lhr_dor03")))
+
+
 if __name__ == "__main__":
     unittest.main()
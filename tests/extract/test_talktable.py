@@ -19,10 +19,14 @@ if PYKOTOR_PATH.joinpath("pykotor").exists():
 if UTILITY_PATH.joinpath("utility").exists():
     add_sys_path(UTILITY_PATH)
 
+import os
+import shutil
+import tempfile
 import unittest
 
-from pykotor.common.language import Language
+from pykotor.common.language import Gender, Language
 from pykotor.extract.talktable import TalkTable
+from pykotor.resource.formats.tlk import TLK, write_tlk
 
 TEST_FILE = "tests/files/test.tlk"
 
@@ -39,6 +43,7 @@ class TestTalkTable(unittest.TestCase):
         self.assertEqual("qrstuvwxyz", talktable.string(2))
         self.assertEqual("", talktable.string(-1))
         self.assertEqual("", talktable.string(3))
+        self.assertEqual(["abcdef", "ghijklmnop", "qrstuvwxyz"], talktable.strings())
 
     def test_voiceover(self):
         talktable = TalkTable(TEST_FILE)
@@ -60,6 +65,65 @@ class TestTalkTable(unittest.TestCase):
         talktable = TalkTable(TEST_FILE)
         self.assertEqual(talktable.language(), Language.ENGLISH)
 
+    def test_entry(self):
+        talktable = TalkTable(TEST_FILE)
+        entry = talktable.entry(1)
+        assert entry is not None
+        self.assertEqual("resref02", entry.sound_resref)
+        self.assertEqual(10, entry.text_length)
+        self.assertIsNone(talktable.entry(3))
+        self.assertIsNone(talktable.entry(-1))
+
+
+class TestTalkTableFiles(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.dialog_path = os.path.join(self.temp_dir, "dialog.tlk")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, filename: str, *texts: str):
+        tlk = TLK()
+        for text in texts:
+            tlk.add(text)
+        write_tlk(tlk, os.path.join(self.temp_dir, filename))
+
+    def test_reloads_changed_file(self):
+        self._write("dialog.tlk", "first")
+        with TalkTable(self.dialog_path) as talktable:
+            self.assertEqual("first", talktable.string(0))
+            self._write("dialog.tlk", "second text", "added")
+            stat_result = os.stat(self.dialog_path)
+            os.utime(self.dialog_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+            self.assertEqual("second text", talktable.string(0))
+            self.assertEqual("added", talktable.string(1))
+            self.assertEqual(2, talktable.size())
+
+    def test_text_cache_is_bounded(self):
+        self._write("dialog.tlk", *(f"string {i}" for i in range(10)))
+        talktable = TalkTable(self.dialog_path, cache_size=3)
+        for i in range(10):
+            self.assertEqual(f"string {i}", talktable.string(i))
+        self.assertEqual(3, len(talktable._texts))
+        talktable.close()
+        self.assertEqual("string 4", talktable.string(4))
+
+    def test_feminine_table(self):
+        self._write("dialog.tlk", "He said", "neutral")
+        self._write("dialogf.tlk", "She said", "", "only feminine")
+        talktable = TalkTable(self.dialog_path)
+        self.assertEqual("He said", talktable.string(0))
+        self.assertEqual("She said", talktable.string(0, Gender.FEMALE))
+        self.assertEqual("only feminine", talktable.string(2))
+        self.assertEqual("only feminine", talktable.string(2, Gender.FEMALE))
+        self.assertEqual("", talktable.string(3, Gender.FEMALE))
+        self.assertEqual(2, talktable.size())
+        batch = talktable.batch([0, 2], Gender.FEMALE)
+        self.assertEqual("She said", batch[0].text)
+        self.assertEqual("only feminine", batch[2].text)
+        talktable.close()
+
 
 if __name__ == "__main__":
     unittest.main()
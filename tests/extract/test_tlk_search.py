@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "PyKotor", "src")
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("Libraries", "Utility", "src")
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+import unittest
+
+from pykotor.extract.talktable import TalkTable
+from pykotor.extract.tlk_search import TLKSearchIndex
+from pykotor.resource.formats.tlk import TLK, write_tlk
+
+TEXTS = [
+    "The Jedi Council will see you now.",
+    "A Sith Lord! Run!",
+    "The Republic needs every Jedi it can find.",
+    "jedi",
+    "Credits? I could use some credits.",
+]
+
+
+class TestTLKSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tlk = TLK()
+        for text in TEXTS:
+            self.tlk.add(text)
+        self.index = TLKSearchIndex.build(self.tlk)
+
+    def test_search(self):
+        self.assertEqual([3, 0, 2], self.index.search("JEDI"))
+        self.assertEqual([2], self.index.search("jedi repub"))
+        self.assertEqual([3, 0], self.index.search("jedi", limit=2))
+        self.assertEqual([1], self.index.search("sith lord"))
+        self.assertEqual([4], self.index.search("cred"))
+        self.assertEqual([], self.index.search("wookiee"))
+        self.assertEqual([], self.index.search("?!"))
+
+    def test_find(self):
+        for substring in ("jedi", "edi c", "s? i", "ORD! R", "it can", "e", "!", "credits."):
+            expected = [stringref for stringref, text in enumerate(TEXTS) if substring.casefold() in text.casefold()]
+            self.assertEqual(expected, self.index.find(substring), substring)
+
+    def test_update(self):
+        self.index.find("council")
+        self.index.update(0, "The Council has gone.")
+        self.index.update(6, "A new Jedi arrives.")
+        self.assertEqual(7, len(self.index))
+        self.assertEqual([3, 6, 2], self.index.search("jedi"))
+        self.assertEqual([0], self.index.find("has gone"))
+        self.assertEqual([], self.index.find("see you"))
+        self.assertEqual([], self.index.search("see"))
+
+        self.index.resize(2)
+        self.assertEqual([], self.index.search("jedi"))
+        self.assertEqual([1], self.index.find("sith"))
+
+    def test_sync(self):
+        self.tlk.entries[1].text = "A Sith Lady!"
+        self.tlk.add("Sith everywhere.")
+        self.assertEqual(2, self.index.sync(self.tlk))
+        self.assertEqual([1, 5], self.index.search("sith"))
+        self.assertEqual([1], self.index.find("lady"))
+        self.assertEqual(0, self.index.sync(self.tlk))
+
+
+class TestTLKSearchIndexFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tlk_path = os.path.join(self.temp_dir, "dialog.tlk")
+        tlk = TLK()
+        for text in TEXTS:
+            tlk.add(text)
+        write_tlk(tlk, self.tlk_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_persist(self):
+        talktable = TalkTable(self.tlk_path)
+        index = TLKSearchIndex.for_talktable(talktable)
+        index_path = os.path.join(self.temp_dir, "dialog.tlk.search.json")
+        self.assertTrue(os.path.isfile(index_path))
+
+        loaded = TLKSearchIndex.load(index_path, self.tlk_path)
+        self.assertEqual(len(TEXTS), len(loaded))
+        self.assertEqual(index.search("jedi"), loaded.search("jedi"))
+        self.assertEqual(index.find("ts? i"), loaded.find("ts? i"))
+
+        loaded.update(1, "Changed")
+        loaded.save()
+        self.assertEqual(0, len(TLKSearchIndex.load(index_path, self.tlk_path)))
+
+        write_tlk(TLK(), self.tlk_path)
+        stat_result = os.stat(self.tlk_path)
+        os.utime(self.tlk_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(0, len(TLKSearchIndex.for_talktable(TalkTable(self.tlk_path))))
+        talktable.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
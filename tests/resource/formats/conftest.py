@@ -365,7 +365,7 @@ def pytest_generate_tests(metafunc: pytest.Metafunc):
         print("Generating GFF conversion tests...")
         # Step 1: Generate IDs along with their corresponding data
         combined_data = [
-            (f"{game}_{resource._path_ident_obj}", (game, resource, conversion_path)) for game, gff_info in ALL_GFFS.items() for resource, conversion_path in gff_info
+            (f"{game}_{resource.path_ident()}", (game, resource, conversion_path)) for game, gff_info in ALL_GFFS.items() for resource, conversion_path in gff_info
         ]
 
         # Step 2 and 3: Sort combined data alphabetically by the ID
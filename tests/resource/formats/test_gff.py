@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import pathlib
+import struct
 import sys
 import unittest
 
@@ -25,7 +26,7 @@ if UTILITY_PATH.joinpath("utility").exists():
 
 from pykotor.common.geometry import Vector3, Vector4
 from pykotor.common.language import Gender, Language
-from pykotor.resource.formats.gff import GFF, GFFBinaryReader, GFFXMLReader, read_gff, write_gff
+from pykotor.resource.formats.gff import GFF, GFFBinaryReader, GFFXMLReader, bytes_gff, read_gff, write_gff
 from pykotor.resource.type import ResourceType
 
 BINARY_TEST_FILE = "tests/files/test.gff"
@@ -84,6 +85,62 @@ class TestGFF(TestCase):
         self.assertEqual(gff.root.get_list("list").at(0).struct_id, 1)
         self.assertEqual(gff.root.get_list("list").at(1).struct_id, 2)
 
+    def _nested_struct_gff(self, depth: int, last_field: tuple[int, int]) -> bytes:
+        """Builds a binary GFF where struct n holds a single 'child' Struct field pointing to struct n+1, the last struct holds `last_field` (type, data)."""
+        structs = b"".join(struct.pack("<iII", n, n, 1) for n in range(depth))
+        fields = b"".join(struct.pack("<III", 14, 0, n + 1) for n in range(depth - 1)) + struct.pack("<III", last_field[0], 0, last_field[1])
+        labels = b"child".ljust(16, b"\0")
+        struct_offset = 56
+        field_offset = struct_offset + len(structs)
+        label_offset = field_offset + len(fields)
+        end = label_offset + len(labels)
+        header = struct.pack("<12I", struct_offset, depth, field_offset, depth, label_offset, 1, end, 0, end, 0, end, 0)
+        return b"GFF V3.2" + header + structs + fields + labels
+
+    def test_binary_write_is_byte_identical(self):
+        with open(BINARY_TEST_FILE, "rb") as file:
+            data = file.read()
+        self.assertEqual(data, bytes(bytes_gff(read_gff(data))))
+
+    def test_binary_write_out_of_range_raises(self):
+        gff = GFF()
+        gff.root.set_int32("int32", 0x80000000)
+        self.assertRaises(ValueError, bytes_gff, gff)
+        gff.root.set_uint32("int32", -2)
+        self.assertRaises(ValueError, bytes_gff, gff)
+
+    def test_binary_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        gff_struct = read_gff(self._nested_struct_gff(depth, (0, 7))).root  # The deepest struct holds a UInt8
+        for n in range(depth - 1):
+            self.assertEqual(n, gff_struct.struct_id)
+            gff_struct = gff_struct.get_struct("child")
+        self.assertEqual(7, gff_struct.get_uint8("child"))
+
+    def test_binary_cyclic_structs_raise(self):
+        self.assertRaises(ValueError, read_gff, self._nested_struct_gff(3, (14, 0)))
+
+    def test_binary_shared_structs_are_copied(self):
+        # The root holds two Struct fields 'a' and 'b' that both point to struct 1.
+        structs = struct.pack("<iII", -1, 0, 2) + struct.pack("<iII", 5, 2, 1)
+        fields = struct.pack("<III", 14, 0, 1) + struct.pack("<III", 14, 1, 1) + struct.pack("<III", 0, 2, 7)
+        labels = b"".join(label.ljust(16, b"\0") for label in (b"a", b"b", b"value"))
+        field_indices = struct.pack("<II", 0, 1)
+        struct_offset = 56
+        field_offset = struct_offset + len(structs)
+        label_offset = field_offset + len(fields)
+        indices_offset = label_offset + len(labels)
+        end = indices_offset + len(field_indices)
+        header = struct.pack("<12I", struct_offset, 2, field_offset, 3, label_offset, 3, indices_offset, 0, indices_offset, len(field_indices), end, 0)
+        root = read_gff(b"GFF V3.2" + header + structs + fields + labels + field_indices).root
+
+        first, second = root.get_struct("a"), root.get_struct("b")
+        self.assertIsNot(first, second)
+        self.assertEqual((5, 7), (first.struct_id, first.get_uint8("value")))
+        self.assertEqual((5, 7), (second.struct_id, second.get_uint8("value")))
+        first.set_uint8("value", 1)
+        self.assertEqual(7, second.get_uint8("value"))
+
     def test_read_raises(self):
         if os.name == "nt":
             self.assertRaises(PermissionError, read_gff, ".")
@@ -0,0 +1,553 @@
+from __future__ import annotations
+
+import hashlib
+import pathlib
+import sys
+import tempfile
+import unittest
+
+from unittest import mock
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[3].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[5].joinpath("Utility", "src").resolve()
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.resource.formats.mdl import MDL, MDLBinaryReader, MDLBinaryWriter, convert_mdl_files
+from pykotor.resource.formats.mdl import io_mdl, io_mdl_ascii, mdl_data
+from pykotor.resource.formats.mdl.io_mdl_ascii import MDLAsciiReader, MDLAsciiWriter
+from pykotor.tools.model import scan_model
+
+if mdl_data.numpy_available:
+    import numpy as np
+
+MDL_FILES_PATH = THIS_SCRIPT_PATH.parents[2].joinpath("files", "mdl")
+MESH_FILES = ("dor_lhr02", "c_dewback", "m02aa_09b", "m12aa_c03_char02")
+ANIMATED_FILES = (*MESH_FILES, "m12aa_c04_cam")
+# SHA-256 of the MDL and MDX that MDLBinaryWriter writes for each of MESH_FILES, to catch any change to its output.
+WRITTEN_DIGESTS = {
+    "dor_lhr02": (
+        "4fb2ea0c8b57d733083281ddb4fd8f068851e7b960e8ad2ad7d3cfc30f2e86fb",
+        "4010e9427cbf3e2613603310f7bd83031147a3f21dbe9d75e271e25e72da4b47",
+    ),
+    "c_dewback": (
+        "cd182b8f31c1b2d1d806e2faad59394307d51562c96ec6399dd10249590bad90",
+        "bd97d5eb361f8146517ab3d56b363d58394df445a3dffa906f0d8b91ea22268c",
+    ),
+    "m02aa_09b": (
+        "f333345c3d56a6116110c4ed5be3a655030ff7e35406bf003e519fc1a7970cb3",
+        "551800adc092d404472932ce2c7c716185be4f534d5b0324893ea415b297fcbb",
+    ),
+    "m12aa_c03_char02": (
+        "300affb5c128ff87aed5f5d66debd6163e10e0f531b5587472aff6641df967a6",
+        "de46569a8da780cffc24585a47e0ad94bac3f81a5fc635219fad107113669f13",
+    ),
+}
+
+
+def load_mdl(
+    name: str,
+) -> MDL:
+    path = MDL_FILES_PATH.joinpath(f"{name}.mdl")
+    return MDLBinaryReader(path.read_bytes(), source_ext=path.with_suffix(".mdx").read_bytes()).load()
+
+
+def load_mdl_without_numpy(
+    name: str,
+) -> MDL:
+    with mock.patch.object(io_mdl, "numpy_available", False):
+        return load_mdl(name)
+
+
+def mesh_values(
+    mdl: MDL,
+) -> list[tuple]:
+    values = []
+    for node in mdl.all_nodes():
+        if node.mesh is not None:
+            mesh = node.mesh
+            values.append(
+                (
+                    node.name,
+                    [(v.x, v.y, v.z) for v in mesh.vertex_positions],
+                    [(v.x, v.y, v.z) for v in mesh.vertex_normals or ()],
+                    [(v.x, v.y) for v in mesh.vertex_uv1 or ()],
+                    [(v.x, v.y) for v in mesh.vertex_uv2 or ()],
+                    [(f.v1, f.v2, f.v3, f.a1, f.a2, f.a3, f.normal.x, f.normal.y, f.normal.z, f.coefficient, int(f.material)) for f in mesh.faces],
+                ),
+            )
+    return values
+
+
+def skin_values(
+    mdl: MDL,
+) -> list[list[tuple]]:
+    return [[(bone.vertex_indices, bone.vertex_weights) for bone in node.skin.vertex_bones] for node in mdl.all_nodes() if node.skin is not None]
+
+
+def controller_keys(
+    mdl: MDL,
+) -> tuple[list[tuple[str, int, bool, int, int]], list[float]]:
+    nodes = mdl.all_nodes() + [node for anim in mdl.anims for node in anim.all_nodes()]
+    controllers = [(node.name, c) for node in nodes for c in node.controllers]
+    layout = [(name, int(c.controller_type), c.bezier, len(c.rows), len(c.rows[0].data) if c.rows else 0) for name, c in controllers]
+    return layout, [value for _, c in controllers for row in c.rows for value in (row.time, *row.data)]
+
+
+def ascii_round_trip(
+    mdl: MDL,
+) -> MDL:
+    data = bytearray()
+    MDLAsciiWriter(mdl, data).write()
+    return MDLAsciiReader(data).load()
+
+
+def node_values(
+    root: mdl_data.MDLNode,
+    geometry: bool,
+) -> list[tuple]:
+    """The names, parents and controllers of a tree of nodes in a form that survives the trip through an ASCII model.
+
+    Controllers of the geometry with a single key are plain properties in ASCII models, their time is not kept.
+    """
+    values = []
+    scan = [(root, "")]
+    while scan:
+        node, parent = scan.pop()
+        controllers = [
+            (
+                int(c.controller_type),
+                [(0.0 if geometry and len(c.rows) == 1 else round(row.time, 4), [round(value, 4) for value in row.data]) for row in c.rows],
+            )
+            for c in node.controllers
+        ]
+        values.append((node.name, parent, controllers))
+        scan.extend((child, node.name) for child in reversed(node.children))
+    return values
+
+
+def ascii_values(
+    mdl: MDL,
+) -> list:
+    """Everything of a model that is written to ASCII models, with the bones of skin weights by name."""
+    names = {node.node_id: node.name for node in mdl.all_nodes()}
+    values: list = [mdl.name, mdl.supermodel, node_values(mdl.root, geometry=True)]
+    for anim in mdl.anims:
+        events = [(round(event.activation_time, 4), event.name) for event in anim.events]
+        values.append((anim.name, round(anim.anim_length, 4), round(anim.transition_length, 4), anim.root_model, events, node_values(anim.root, geometry=False)))
+    for node in mdl.all_nodes():
+        if node.mesh is None:
+            continue
+        mesh = node.mesh
+        values.append(
+            (
+                node.name,
+                mesh.texture_1,
+                mesh.texture_2,
+                [(v.x, v.y, v.z) for v in mesh.vertex_positions],
+                [(v.x, v.y) for v in mesh.vertex_uv1 or ()],
+                [(v.x, v.y) for v in mesh.vertex_uv2 or ()],
+                [(v.x, v.y, v.z) for v in mesh.vertex_normals or ()],
+                [(f.v1, f.v2, f.v3, int(f.material)) for f in mesh.faces],
+            ),
+        )
+        if node.skin is not None:
+            bones = {int(bone): node_id for node_id, bone in enumerate(node.skin.bonemap) if bone >= 0}
+            values.append(
+                [
+                    [(names[bones[int(bone)]], weight) for weight, bone in zip(vertex.vertex_weights, vertex.vertex_indices) if bone >= 0]
+                    for vertex in node.skin.vertex_bones
+                ],
+            )
+    return values
+
+
+ASCII_MODEL = """# A model written by hand
+newmodel hand
+setsupermodel hand NULL
+beginmodelgeom hand
+node dummy hand
+  parent NULL
+endnode
+node danglymesh cloth
+  parent hand
+  position 1.0 2.0 3.0
+  orientation 0.0 0.0 1.0 1.5707964
+  bitmap cloth01
+  verts 4
+    0 0 0
+    1 0 0
+    1 1 0
+    0 1 0
+  faces 2
+    0 1 2 1 0 1 2 3
+    0 2 3 1 0 3 4 3
+  tverts 5
+    0 0 0
+    1 0 0
+    1 1 0
+    0 1 0
+    0.5 0.5 0
+  constraints 4
+    0
+    255
+    255
+    0
+  period 2.5
+endnode
+node light lamp
+  parent hand
+  color 1 0.5 0.25
+  radius 5
+  shadow 1
+  flaresizes 2
+    0.5
+    1.5
+endnode
+node emitter sparks
+  parent hand
+  update Fountain
+  birthrate 20
+  bounce 1
+  inherit 1
+endnode
+node aabb walkmesh
+  parent hand
+  verts 3
+    0 0 0
+    1 0 0
+    0 1 0
+  faces 1
+    0 1 2 1 0 0 0 4
+  aabb 0 0 0 1 1 0 -1
+    0 0 0 1 1 0 0
+endnode
+endmodelgeom hand
+newanim wave hand
+  length 1.0
+  transtime 0.25
+  animroot hand
+  eventlist
+    0.5 snd_wave
+  endlist
+  node dummy hand
+    parent NULL
+  endnode
+  node dummy cloth
+    parent hand
+    positionkey
+      0.0 1 2 3
+      1.0 1 2 4
+    endlist
+  endnode
+doneanim wave hand
+donemodel hand
+"""
+
+
+class TestMDLBinaryReader(unittest.TestCase):
+    def test_load_without_numpy(self):
+        mdl = load_mdl_without_numpy("dor_lhr02")
+        meshes = [node.mesh for node in mdl.all_nodes() if node.mesh is not None]
+        self.assertEqual(326, sum(len(mesh.vertex_positions) for mesh in meshes))
+        for mesh in meshes:
+            self.assertEqual(len(mesh.vertex_positions), len(mesh.vertex_normals))
+            self.assertEqual(len(mesh.vertex_positions), len(mesh.vertex_uv1 or mesh.vertex_positions))
+            for face in mesh.faces:
+                self.assertLess(max(face.v1, face.v2, face.v3), len(mesh.vertex_positions))
+
+    def test_unknown_surface_materials(self):
+        materials = {int(face.material) for node in load_mdl_without_numpy("c_dewback").all_nodes() if node.mesh for face in node.mesh.faces}
+        self.assertTrue(materials)
+
+    def test_round_trip(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name):
+                mdl = load_mdl(name)
+                data, data_ext = bytearray(), bytearray()
+                MDLBinaryWriter(mdl, data, data_ext).write()
+                self.assertEqual(mesh_values(mdl), mesh_values(MDLBinaryReader(data, source_ext=data_ext).load()))
+
+    def test_controllers(self):
+        for name in ANIMATED_FILES:
+            with self.subTest(name=name):
+                mdl = load_mdl(name)
+                for node in mdl.all_nodes() + [node for anim in mdl.anims for node in anim.all_nodes()]:
+                    for controller in node.controllers:
+                        times = [row.time for row in controller.rows]
+                        self.assertEqual(sorted(times), times)
+                layout, values = controller_keys(mdl)
+                data, data_ext = bytearray(), bytearray()
+                MDLBinaryWriter(mdl, data, data_ext).write()
+                for other in (load_mdl_without_numpy(name), MDLBinaryReader(data, source_ext=data_ext).load()):
+                    other_layout, other_values = controller_keys(other)
+                    self.assertEqual(layout, other_layout)
+                    self.assertEqual(len(values), len(other_values))
+                    for value, other_value in zip(values, other_values):
+                        self.assertAlmostEqual(value, other_value, places=5)
+
+    def test_bezier_controllers(self):
+        camera = load_mdl("m12aa_c04_cam").anims[0].root.children[0]
+        controller = camera.controllers[0]
+        self.assertTrue(controller.bezier)
+        self.assertEqual(9, len(controller.rows[0].data))
+
+
+def write_digests(
+    mdl: MDL,
+) -> tuple[str, str]:
+    data, data_ext = bytearray(), bytearray()
+    MDLBinaryWriter(mdl, data, data_ext).write()
+    return hashlib.sha256(data).hexdigest(), hashlib.sha256(data_ext).hexdigest()
+
+
+class TestMDLBinaryWriter(unittest.TestCase):
+    def test_matches_previous_writer(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name):
+                self.assertEqual(WRITTEN_DIGESTS[name], write_digests(load_mdl(name)))
+
+    def test_matches_previous_writer_without_numpy(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name), mock.patch.object(io_mdl, "numpy_available", False):
+                self.assertEqual(WRITTEN_DIGESTS[name], write_digests(load_mdl(name)))
+
+    def test_convert_files(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            conversions = [(MDL_FILES_PATH.joinpath(f"{name}.mdl"), pathlib.Path(tempdir, f"{name}.mdl")) for name in MESH_FILES]
+            missing = str(MDL_FILES_PATH.joinpath("missing.mdl"))
+            failures = convert_mdl_files([*conversions, (missing, pathlib.Path(tempdir, "missing.mdl"))], max_workers=2)
+            self.assertEqual([missing], list(failures))
+            for _, target in conversions:
+                digests = (hashlib.sha256(target.read_bytes()).hexdigest(), hashlib.sha256(target.with_suffix(".mdx").read_bytes()).hexdigest())
+                self.assertEqual(WRITTEN_DIGESTS[target.stem], digests)
+
+
+@unittest.skipIf(not mdl_data.numpy_available, "numpy is not installed")
+class TestMDLBinaryReaderArrays(unittest.TestCase):
+    def test_matches_object_lists(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name):
+                mdl, mdl_without_numpy = load_mdl(name), load_mdl_without_numpy(name)
+                self.assertEqual(mesh_values(mdl_without_numpy), mesh_values(mdl))
+                self.assertEqual(skin_values(mdl_without_numpy), skin_values(mdl))
+
+    def test_arrays(self):
+        for node in load_mdl("c_dewback").all_nodes():
+            if node.mesh is None:
+                continue
+            mesh = node.mesh
+            count = mesh.position_array.shape[0]
+            self.assertEqual((count, 3), mesh.position_array.shape)
+            self.assertEqual(np.float32, mesh.position_array.dtype)
+            self.assertEqual((count, 3), mesh.normal_array.shape)
+            if mesh.uv1_array is not None:
+                self.assertEqual((count, 2), mesh.uv1_array.shape)
+            self.assertTrue((mesh.face_array["vertices"] < max(count, 1)).all())
+            self.assertIs(int, type(mesh.faces[0].v1) if mesh.faces else int)
+            if node.skin is not None:
+                self.assertEqual((count, 2, 4), node.skin.vertex_bone_array.shape)
+            if mesh.tangent_space_array is not None:
+                self.assertEqual((count, 3, 3), mesh.tangent_space_array.shape)
+
+    def test_object_lists_replace_arrays(self):
+        mesh = next(node.mesh for node in load_mdl("dor_lhr02").all_nodes() if node.mesh is not None and node.mesh.vertex_positions)
+        positions = mesh.position_array.copy()
+        mesh.vertex_positions[0].x += 1.0
+        self.assertEqual(positions[0, 0] + 1.0, mesh.position_array[0, 0])
+
+        mesh.face_array = mesh.face_array[:1]
+        self.assertEqual(1, len(mesh.faces))
+
+
+class TestMDLAscii(unittest.TestCase):
+    def test_round_trip(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name):
+                mdl = load_mdl(name)
+                self.assertEqual(ascii_values(mdl), ascii_values(ascii_round_trip(mdl)))
+
+    def test_round_trip_without_numpy(self):
+        for name in ("dor_lhr02", "c_dewback"):
+            with self.subTest(name=name), mock.patch.object(io_mdl_ascii, "numpy_available", False):
+                mdl = load_mdl_without_numpy(name)
+                self.assertEqual(ascii_values(mdl), ascii_values(ascii_round_trip(mdl)))
+
+    def test_writes_binary(self):
+        mdl = ascii_round_trip(load_mdl("m02aa_09b"))
+        data, data_ext = bytearray(), bytearray()
+        MDLBinaryWriter(mdl, data, data_ext).write()
+        self.assertEqual(mesh_values(mdl)[0][:2], mesh_values(MDLBinaryReader(data, source_ext=data_ext).load())[0][:2])
+
+        binary_data, binary_data_ext = bytearray(), bytearray()
+        MDLBinaryWriter(load_mdl("m02aa_09b"), binary_data, binary_data_ext).write()
+        self.assertEqual(binary_data_ext, data_ext)
+
+    @unittest.skipIf(not mdl_data.numpy_available, "numpy is not installed")
+    def test_round_trip_tangent_space(self):
+        mdl = load_mdl("m02aa_09b")
+        meshes = [node.mesh for node in mdl.all_nodes() if node.mesh is not None and node.mesh.tangent_space_array is not None]
+        self.assertTrue(meshes)
+        round_trip = {node.name: node.mesh for node in ascii_round_trip(mdl).all_nodes() if node.mesh is not None}
+        for node in mdl.all_nodes():
+            if node.mesh is not None:
+                with self.subTest(node=node.name):
+                    np.testing.assert_array_equal(node.mesh.normal_array, round_trip[node.name].normal_array)
+                    if node.mesh.tangent_space_array is None:
+                        self.assertIsNone(round_trip[node.name].tangent_space_array)
+                    else:
+                        np.testing.assert_array_equal(node.mesh.tangent_space_array, round_trip[node.name].tangent_space_array)
+
+    def test_hand_written(self):
+        for use_numpy in (True, False):
+            with self.subTest(numpy=use_numpy), mock.patch.object(io_mdl_ascii, "numpy_available", use_numpy and io_mdl_ascii.numpy_available):
+                mdl = MDLAsciiReader(ASCII_MODEL.encode()).load()
+                self.assertEqual(["hand", "cloth", "lamp", "sparks", "walkmesh"], [node.name for node in sorted(mdl.all_nodes(), key=lambda node: node.node_id)])
+
+                cloth = mdl.get("cloth")
+                self.assertEqual((1.0, 2.0, 3.0), (cloth.position.x, cloth.position.y, cloth.position.z))
+                self.assertAlmostEqual(0.7071068, cloth.orientation.z)
+                self.assertAlmostEqual(0.7071068, cloth.orientation.w)
+                self.assertEqual("cloth01", cloth.mesh.texture_1)
+                # The second face gives vertex 2 other texture coordinates than the first, so vertex 2 is split in two.
+                self.assertEqual([(0, 0, 0), (1, 0, 0), (1, 1, 0), (1, 1, 0), (0, 1, 0)], [(v.x, v.y, v.z) for v in cloth.mesh.vertex_positions])
+                self.assertEqual([(0, 0), (1, 0), (1, 1), (0, 1), (0.5, 0.5)], [(v.x, v.y) for v in cloth.mesh.vertex_uv1])
+                self.assertEqual([(0, 1, 2), (0, 3, 4)], [(f.v1, f.v2, f.v3) for f in cloth.mesh.faces])
+                self.assertEqual([0.0, 255.0, 255.0, 255.0, 0.0], cloth.dangly.constraints)
+                self.assertEqual(2.5, cloth.dangly.period)
+
+                lamp = mdl.get("lamp")
+                self.assertEqual(1, lamp.light.shadow)
+                self.assertEqual([0.5, 1.5], lamp.light.flare_sizes)
+                self.assertEqual({76: [1.0, 0.5, 0.25], 88: [5.0]}, {int(c.controller_type): c.rows[0].data for c in lamp.controllers})
+
+                sparks = mdl.get("sparks")
+                self.assertEqual("Fountain", sparks.emitter.update)
+                self.assertEqual(0x50, sparks.emitter.flags)
+                self.assertEqual([(88, [20.0])], [(int(c.controller_type), c.rows[0].data) for c in sparks.controllers])
+
+                walkmesh = mdl.get("walkmesh")
+                self.assertEqual([-1, 0], [face for _, _, face in walkmesh.aabb.aabbs])
+                self.assertEqual(4, int(walkmesh.mesh.faces[0].material))
+
+                anim = mdl.anims[0]
+                self.assertEqual(("wave", 1.0, 0.25, "hand"), (anim.name, anim.anim_length, anim.transition_length, anim.root_model))
+                self.assertEqual([(0.5, "snd_wave")], [(event.activation_time, event.name) for event in anim.events])
+                keys = anim.root.children[0].controllers[0]
+                self.assertEqual("cloth", anim.root.children[0].name)
+                self.assertEqual([(0.0, [1.0, 2.0, 3.0]), (1.0, [1.0, 2.0, 4.0])], [(row.time, row.data) for row in keys.rows])
+
+    def test_invalid_data(self):
+        self.assertRaises(ValueError, MDLAsciiReader(ASCII_MODEL.replace("faces 2", "faces 3").encode()).load)
+        self.assertRaises(ValueError, MDLAsciiReader(ASCII_MODEL.replace("parent hand\n  color", "parent nowhere\n  color").encode()).load)
+        self.assertRaises(ValueError, MDLAsciiReader(ASCII_MODEL.replace("0 2 3 1", "0 2 9 1").encode()).load)
+        self.assertRaises(ValueError, MDLAsciiReader(ASCII_MODEL.replace("endnode\nendmodelgeom", "endmodelgeom").encode()).load)
+
+
+@unittest.skipIf(not mdl_data.numpy_available, "numpy is not installed")
+class TestMDLAnimationSampling(unittest.TestCase):
+    def controller(
+        self,
+        controller_type: int,
+        keys: list[list[float]],
+        bezier: bool = False,
+    ) -> mdl_data.MDLController:
+        controller = mdl_data.MDLController()
+        controller.controller_type = controller_type
+        controller.bezier = bezier
+        controller.rows = [mdl_data.MDLControllerRow(key[0], key[1:]) for key in keys]
+        return controller
+
+    def test_linear(self):
+        controller = self.controller(8, [[1.0, 0.0, 0.0, 0.0], [2.0, 2.0, 4.0, 6.0], [4.0, 2.0, 4.0, 10.0]])
+        values = controller.sample([0.0, 1.0, 1.5, 2.0, 3.0, 5.0])
+        np.testing.assert_allclose([[0, 0, 0], [0, 0, 0], [1, 2, 3], [2, 4, 6], [2, 4, 8], [2, 4, 10]], values)
+        np.testing.assert_allclose([[7.0, 7.0, 7.0]] * 2, self.controller(8, [[0.0, 7.0, 7.0, 7.0]]).sample([0.0, 1.0]))
+
+    def test_slerp(self):
+        half = np.sqrt(0.5)
+        controller = self.controller(20, [[0.0, 0.0, 0.0, 0.0, 1.0], [1.0, 0.0, 0.0, half, half]])
+        values = controller.sample([0.0, 0.5, 1.0])
+        np.testing.assert_allclose([0.0, 0.0, np.sin(np.pi / 8), np.cos(np.pi / 8)], values[1], atol=1e-6)
+        np.testing.assert_allclose([0.0, 0.0, half, half], values[2], atol=1e-6)
+        # The opposite quaternion is the same rotation, the shorter arc is taken.
+        flipped = self.controller(20, [[0.0, 0.0, 0.0, 0.0, 1.0], [1.0, 0.0, 0.0, -half, -half]])
+        np.testing.assert_allclose(values[1], flipped.sample([0.5])[0], atol=1e-6)
+
+    def test_bezier(self):
+        # Value, in tangent, out tangent: the curve from 0 to 3 has control points 0 + 1 and 3 + -1.
+        controller = self.controller(8, [[0.0, 0.0, 0.0, 1.0], [1.0, 3.0, -1.0, 0.0]], bezier=True)
+        np.testing.assert_allclose([[0.0], [1.5], [3.0]], controller.sample([0.0, 0.5, 1.0]))
+        straight = self.controller(8, [[0.0, 0.0, 0.0, 1.0], [1.0, 3.0, -1.0, 0.0]])
+        self.assertEqual((1, 3), straight.sample([0.5]).shape)
+
+    def test_animation(self):
+        mdl = load_mdl("c_dewback")
+        anim = mdl.anims[0]
+        times = np.linspace(0.0, anim.anim_length, 25)
+        sampled = anim.sample(times)
+        for node in anim.all_nodes():
+            for controller in node.controllers:
+                values = sampled[node.name][int(controller.controller_type)]
+                self.assertEqual(len(times), len(values))
+                first, last = controller.rows[0], controller.rows[-1]
+                if first.time <= times[0] and controller.controller_type != 20:
+                    np.testing.assert_allclose(first.data, values[0], rtol=1e-5, atol=1e-6)
+                if last.time <= times[0]:
+                    np.testing.assert_allclose(last.data, values[-1], rtol=1e-5, atol=1e-6)
+
+    def test_posed_transforms(self):
+        mdl = load_mdl("c_dewback")
+        anim = mdl.anims[0]
+        names, transforms = mdl.posed_transforms(anim, [0.0, anim.anim_length / 2])
+        self.assertEqual([node.name for node in mdl.all_nodes()], names)
+        self.assertEqual((2, len(names), 4, 4), transforms.shape)
+        rotation = transforms[1, 1, :3, :3]
+        np.testing.assert_allclose(np.eye(3), rotation @ rotation.T, atol=1e-5)
+
+        # With an animation that moves nothing, every node is at its rest position.
+        names, transforms = mdl.posed_transforms(mdl_data.MDLAnimation(), [0.0])
+        rest = {node.name: node for node in mdl.all_nodes()}
+        for name, transform in zip(names, transforms[0]):
+            node = rest[name]
+            parent = mdl.find_parent(node)
+            expected = [node.position.x, node.position.y, node.position.z]
+            if parent is not None:
+                parent_transform = transforms[0, names.index(parent.name)]
+                expected = (parent_transform @ [*expected, 1.0])[:3]
+            np.testing.assert_allclose(expected, transform[:3, 3], atol=1e-5)
+
+
+class TestMDLScan(unittest.TestCase):
+    def test_matches_binary_reader(self):
+        for name in MESH_FILES:
+            with self.subTest(name=name):
+                data = MDL_FILES_PATH.joinpath(f"{name}.mdl").read_bytes()
+                info, mdl = scan_model(data), load_mdl(name)
+                self.assertEqual(mdl.name, info.name)
+                self.assertEqual(mdl.supermodel, info.supermodel)
+                self.assertEqual({anim.name for anim in mdl.anims}, set(info.animations))
+                self.assertTrue({node.name for node in mdl.all_nodes()} <= set(info.node_names))
+                meshes = [node.mesh for node in mdl.all_nodes() if node.mesh is not None]
+                self.assertEqual({mesh.texture_1.lower() for mesh in meshes} - {"", "null", "dirt"}, set(info.textures))
+                self.assertEqual({mesh.texture_2.lower() for mesh in meshes} - {"", "null"}, set(info.lightmaps))
+
+    def test_invalid_data(self):
+        data = MDL_FILES_PATH.joinpath("dor_lhr02.mdl").read_bytes()
+        self.assertRaises(ValueError, scan_model, b"newmodel ascii\n")
+        self.assertRaises(ValueError, scan_model, data[:1000])
+
+
+if __name__ == "__main__":
+    unittest.main()
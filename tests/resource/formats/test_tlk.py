@@ -25,10 +25,12 @@ from pykotor.common.language import Language
 from pykotor.common.misc import ResRef
 from pykotor.resource.formats.tlk import (
     TLK,
+    LazyTLKEntries,
     TLKBinaryReader,
     TLKEntry,
     TLKJSONReader,
     TLKXMLReader,
+    bytes_tlk,
     detect_tlk,
     read_tlk,
     write_tlk,
@@ -36,6 +38,7 @@ from pykotor.resource.formats.tlk import (
 from pykotor.resource.type import ResourceType
 
 BINARY_TEST_FILE = "tests/files/test.tlk"
+COMPLEX_BINARY_TEST_FILE = "tests/files/complex.tlk"
 XML_TEST_FILE = "tests/files/test.tlk.xml"
 JSON_TEST_FILE = "tests/files/test.tlk.json"
 DOES_NOT_EXIST_FILE = "./thisfiledoesnotexist"
@@ -68,6 +71,42 @@ class TestTLK(unittest.TestCase):
         tlk = read_tlk(data)
         self.validate_io(tlk)
 
+    def test_lazy_binary_io(self):
+        tlk: TLK = read_tlk(BINARY_TEST_FILE, lazy=True)
+        self.assertIsInstance(tlk.entries, LazyTLKEntries)
+        self.validate_io(tlk)
+
+        data = bytearray()
+        write_tlk(tlk, data, ResourceType.TLK)
+        self.validate_io(read_tlk(data, lazy=True))
+
+    def test_lazy_write_untouched(self):
+        for path in (BINARY_TEST_FILE, COMPLEX_BINARY_TEST_FILE):
+            expected: bytes = bytes_tlk(read_tlk(path))
+            tlk: TLK = read_tlk(path, lazy=True)
+            self.assertEqual(expected, bytes_tlk(tlk))
+            self.assertIsNone(next((item for item in tlk.entries._items if not isinstance(item, int)), None))  # type: ignore[attr-defined]
+
+    def test_lazy_edit(self):
+        tlk: TLK = read_tlk(BINARY_TEST_FILE, lazy=True)
+        tlk[1].text = "changed"
+        self.assertEqual(3, tlk.add("added", "resref03"))
+        tlk.replace(0, "replaced")
+        tlk.resize(5)
+        self.assertEqual(5, len(tlk))
+        self.assertEqual([(i, entry.text) for i, entry in tlk], [(0, "replaced"), (1, "changed"), (2, "qrstuvwxyz"), (3, "added"), (4, "")])
+
+        tlk = read_tlk(bytes_tlk(tlk))
+        self.assertEqual(TLKEntry("replaced", ResRef("resref01")), tlk.get(0))
+        self.assertEqual(TLKEntry("changed", ResRef("resref02")), tlk.get(1))
+        self.assertEqual(TLKEntry("qrstuvwxyz", ResRef("")), tlk.get(2))
+        self.assertEqual(TLKEntry("added", ResRef("resref03")), tlk.get(3))
+
+        tlk = read_tlk(BINARY_TEST_FILE, lazy=True)
+        tlk.resize(1)
+        self.assertEqual(TLKEntry("abcdef", ResRef("resref01")), tlk.get(0))
+        self.assertIsNone(tlk.get(1))
+
     def test_xml_io(self):
         self.assertEqual(detect_tlk(XML_TEST_FILE), ResourceType.TLK_XML)
 
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import pathlib
+import random
+import struct
+import sys
+import unittest
+
+from unittest import mock
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__).resolve()
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[3].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[5].joinpath("Utility", "src").resolve()
+
+
+def add_sys_path(p: pathlib.Path):
+    working_dir = str(p)
+    if working_dir not in sys.path:
+        sys.path.append(working_dir)
+
+
+if PYKOTOR_PATH.joinpath("pykotor").exists():
+    add_sys_path(PYKOTOR_PATH)
+if UTILITY_PATH.joinpath("utility").exists():
+    add_sys_path(UTILITY_PATH)
+
+from pykotor.resource.formats.tpc import TPC, DXTQuality, MipmapFilter, TPCBinaryReader, TPCTextureFormat, TPCTGAReader, TPCTGAWriter, bytes_tpc
+from pykotor.resource.formats.tpc import io_tga, tpc_dxt, tpc_mipmaps
+from pykotor.resource.formats.tpc.io_tpc import _get_size
+
+if tpc_dxt.numpy_available:
+    import numpy as np
+
+
+def random_blocks(
+    rng: random.Random,
+    width: int,
+    height: int,
+    block_size: int,
+) -> bytes:
+    count = max(1, (width + 3) // 4) * max(1, (height + 3) // 4)
+    return bytes(rng.getrandbits(8) for _ in range(count * block_size))
+
+
+@unittest.skipIf(not tpc_dxt.numpy_available, "numpy is not installed")
+class TestTPCDXTDecode(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1234)
+
+    def _convert_both(
+        self,
+        tpc: TPC,
+        convert_format: TPCTextureFormat,
+        mipmap: int,
+    ) -> tuple[bytearray, bytearray]:
+        vectorized = tpc.convert(convert_format, mipmap).data
+        with mock.patch.object(tpc_dxt, "numpy_available", False):
+            per_block = tpc.convert(convert_format, mipmap).data
+        return vectorized, per_block
+
+    def test_matches_per_block_decoding(self):
+        for texture_format, block_size in ((TPCTextureFormat.DXT1, 8), (TPCTextureFormat.DXT5, 16)):
+            for width, height in ((64, 64), (32, 8), (4, 16)):
+                mipmaps = []
+                w, h = width, height
+                while w >= 4 and h >= 4:  # The per block decoders do not handle mipmaps smaller than a block.
+                    mipmaps.append(random_blocks(self.rng, w, h, block_size))
+                    w, h = w >> 1, h >> 1
+                tpc = TPC()
+                tpc.set_data(width, height, mipmaps, texture_format)
+                for mipmap in range(tpc.mipmap_count()):
+                    for convert_format in (TPCTextureFormat.RGBA, TPCTextureFormat.RGB, TPCTextureFormat.Greyscale):
+                        vectorized, per_block = self._convert_both(tpc, convert_format, mipmap)
+                        self.assertEqual(per_block, vectorized, f"{texture_format.name} {width}x{height} mip {mipmap} to {convert_format.name}")
+
+    def test_mipmaps_smaller_than_a_block(self):
+        for texture_format, block_size, bytes_per_pixel in ((TPCTextureFormat.DXT1, 8, 4), (TPCTextureFormat.DXT5, 16, 4)):
+            block = random_blocks(self.rng, 4, 4, block_size)
+            tpc = TPC()
+            tpc.set_data(4, 4, [block], texture_format)
+            with mock.patch.object(tpc_dxt, "numpy_available", False):
+                full = tpc.convert(TPCTextureFormat.RGBA).data
+            for width, height in ((2, 2), (1, 1), (4, 2), (1, 4)):
+                tpc.set_data(width, height, [block], texture_format)
+                expected = b"".join(full[y * 4 * bytes_per_pixel : (y * 4 + width) * bytes_per_pixel] for y in range(height))
+                self.assertEqual(expected, tpc.convert(TPCTextureFormat.RGBA).data, f"{texture_format.name} {width}x{height}")
+
+    def test_truncated_data(self):
+        self.assertRaises(ValueError, tpc_dxt.dxt1_to_rgba, bytes(8), 8, 8)
+
+
+def decode_standard(
+    data: bytes,
+    block_count: int,
+    texture_format: TPCTextureFormat,
+) -> np.ndarray:
+    """Decodes DXT blocks the way the game does, to (block count, 16, 4) pixels."""
+    block_size = 8 if texture_format == TPCTextureFormat.DXT1 else 16
+    blocks = np.frombuffer(data, dtype=np.uint8).reshape(block_count, block_size)
+    color_blocks = blocks[:, block_size - 8 :]
+    c0 = color_blocks[:, 0].astype(np.int64) | (color_blocks[:, 1].astype(np.int64) << 8)
+    c1 = color_blocks[:, 2].astype(np.int64) | (color_blocks[:, 3].astype(np.int64) << 8)
+    rgb0, rgb1 = tpc_dxt._expand_565(c0), tpc_dxt._expand_565(c1)
+    four_colors = (c0 > c1)[:, None]
+    palettes = np.stack(
+        (
+            rgb0,
+            rgb1,
+            np.where(four_colors, (2 * rgb0 + rgb1) // 3, (rgb0 + rgb1) // 2),
+            np.where(four_colors, (rgb0 + 2 * rgb1) // 3, 0),
+        ),
+        axis=1,
+    )
+    indices = ((color_blocks[:, 4:8, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).reshape(-1, 16).astype(np.intp)
+    pixels = np.full((block_count, 16, 4), 255, dtype=np.int64)
+    pixels[..., :3] = np.take_along_axis(palettes, indices[..., None], axis=1)
+    if texture_format == TPCTextureFormat.DXT5:
+        pixels[..., 3] = tpc_dxt._alpha_values(blocks[:, :8]).reshape(-1, 16)
+    return pixels
+
+
+@unittest.skipIf(not tpc_dxt.numpy_available, "numpy is not installed")
+class TestTPCDXTEncode(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1234)
+
+    def smooth_image(
+        self,
+        width: int,
+        height: int,
+    ) -> np.ndarray:
+        y, x = np.mgrid[0:height, 0:width]
+        image = np.stack((x * 255 // width, y * 255 // height, (x + y) * 127 // (width + height), (x * y) % 256), axis=2)
+        return np.clip(image + self.rng.integers(-12, 12, image.shape), 0, 255).astype(np.uint8)
+
+    def test_solid_blocks(self):
+        colors = self.rng.integers(0, 256, (16, 16, 4), dtype=np.uint8)
+        image = colors.repeat(4, axis=0).repeat(4, axis=1)
+        source = tpc_dxt._pixel_blocks(image.tobytes(), 64, 64, 4).astype(np.int64)
+        for quality in DXTQuality:
+            decoded = decode_standard(tpc_dxt.rgba_to_dxt5(image.tobytes(), 64, 64, quality), 256, TPCTextureFormat.DXT5)
+            np.testing.assert_array_less(np.abs(decoded - source).max(axis=(0, 1)), [5, 3, 5, 1])
+
+    def test_error_bounds(self):
+        image = np.concatenate((self.smooth_image(64, 64), self.rng.integers(0, 256, (64, 64, 4), dtype=np.uint8)))
+        source = tpc_dxt._pixel_blocks(image.tobytes(), 64, 128, 4).astype(np.float64)
+        decoded = decode_standard(tpc_dxt.rgba_to_dxt5(image.tobytes(), 64, 128), 512, TPCTextureFormat.DXT5)
+
+        colors = source[..., :3]
+        centered = colors - colors.mean(axis=1, keepdims=True)
+        axis = np.linalg.eigh(np.einsum("npi,npj->nij", centered, centered))[1][:, :, 2]
+        projections = np.einsum("npi,ni->np", centered, axis)
+        extent = projections.max(axis=1) - projections.min(axis=1)
+        from_axis = np.linalg.norm(centered - projections[..., None] * axis[:, None], axis=2)
+        distance = np.linalg.norm(decoded[..., :3] - colors, axis=2)
+        np.testing.assert_array_less(distance, extent[:, None] / 6 + from_axis + 8)
+
+        alphas = source[..., 3]
+        alpha_bound = (alphas.max(axis=1) - alphas.min(axis=1)) / 14 + 1
+        self.assertTrue((np.abs(decoded[..., 3] - alphas) <= alpha_bound[:, None]).all())
+
+    def test_cluster_fit_is_not_worse(self):
+        for image in (self.smooth_image(32, 32), self.rng.integers(0, 256, (32, 32, 4), dtype=np.uint8)):
+            source = tpc_dxt._pixel_blocks(image.tobytes(), 32, 32, 4).astype(np.int64)
+            color_errors, alpha_errors = [], []
+            for quality in DXTQuality:
+                errors = np.square(decode_standard(tpc_dxt.rgba_to_dxt5(image.tobytes(), 32, 32, quality), 64, TPCTextureFormat.DXT5) - source)
+                color_errors.append(errors[..., :3].sum(axis=(1, 2)))
+                alpha_errors.append(errors[..., 3].sum(axis=1))
+            self.assertTrue((color_errors[1] <= color_errors[0]).all())
+            self.assertTrue((alpha_errors[1] <= alpha_errors[0]).all())
+            self.assertLess(color_errors[1].sum(), color_errors[0].sum())
+
+    def test_compress(self):
+        image = self.smooth_image(12, 6)
+        opaque = image.copy()
+        opaque[..., 3] = 255
+        grey = opaque.copy()
+        grey[..., 1:3] = grey[..., :1]
+        sources = {
+            TPCTextureFormat.RGBA: (image.tobytes(), image),
+            TPCTextureFormat.RGB: (image[..., :3].tobytes(), opaque),
+            TPCTextureFormat.Greyscale: (image[..., 0].tobytes(), grey),
+        }
+        for texture_format, encode in ((TPCTextureFormat.DXT1, tpc_dxt.rgba_to_dxt1), (TPCTextureFormat.DXT5, tpc_dxt.rgba_to_dxt5)):
+            for source_format, (data, rgba) in sources.items():
+                tpc = TPC()
+                tpc.set_data(12, 6, [data, data[: 6 * 3 * source_format.bytes_per_pixel()]], source_format)
+                tpc.compress(texture_format)
+                self.assertEqual(texture_format, tpc.format())
+                self.assertEqual(encode(rgba.tobytes(), 12, 6), tpc.get(0).data, f"{source_format.name} to {texture_format.name}")
+                self.assertEqual(encode(rgba.reshape(-1, 4)[:18].tobytes(), 6, 3), tpc.get(1).data, f"{source_format.name} to {texture_format.name}")
+
+                tpc.set_data(12, 6, [data, data[: 6 * 3 * source_format.bytes_per_pixel()]], source_format)
+                with mock.patch.object(tpc_dxt, "numpy_available", False):
+                    tpc.compress(texture_format)
+                for mipmap in range(2):
+                    width, height, _, compressed = tpc.get(mipmap)
+                    self.assertEqual(_get_size(width, height, texture_format), len(compressed))
+
+        tpc = TPC()
+        self.assertRaises(ValueError, tpc.compress, TPCTextureFormat.RGBA)
+
+    def test_compress_many(self):
+        tpcs = []
+        for _ in range(3):
+            tpc = TPC()
+            tpc.set_data(16, 16, [self.smooth_image(16, 16).tobytes()], TPCTextureFormat.RGBA)
+            tpcs.append(tpc)
+        expected = TPC.rgba_to_dxt5(tpcs[0].get(0).data, 16, 16, DXTQuality.CLUSTER_FIT)
+        TPC.compress_many(tpcs[:1], TPCTextureFormat.DXT5, DXTQuality.CLUSTER_FIT, max_workers=1)
+        TPC.compress_many(tpcs, TPCTextureFormat.DXT5, DXTQuality.CLUSTER_FIT, max_workers=2)
+        self.assertEqual([TPCTextureFormat.DXT5] * 3, [tpc.format() for tpc in tpcs])
+        self.assertEqual(expected, tpcs[0].get(0).data)
+
+
+class TestTPCMipmaps(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1234)
+
+    def random_tpc(
+        self,
+        width: int,
+        height: int,
+        texture_format: TPCTextureFormat,
+    ) -> TPC:
+        tpc = TPC()
+        tpc.set_data(width, height, [self.rng.randbytes(width * height * texture_format.bytes_per_pixel())], texture_format)
+        return tpc
+
+    def test_chain_sizes(self):
+        for width, height in ((16, 16), (10, 6), (1, 5), (7, 1)):
+            for texture_format in (TPCTextureFormat.Greyscale, TPCTextureFormat.RGB, TPCTextureFormat.RGBA):
+                for numpy_available in {False, tpc_mipmaps.numpy_available}:
+                    tpc = self.random_tpc(width, height, texture_format)
+                    with mock.patch.object(tpc_mipmaps, "numpy_available", numpy_available):
+                        tpc.generate_mipmaps()
+                    self.assertEqual(max(width, height).bit_length(), tpc.mipmap_count())
+                    level_width, level_height = width, height
+                    for mipmap in range(tpc.mipmap_count()):
+                        self.assertEqual((level_width, level_height), tpc.get(mipmap)[:2])
+                        self.assertEqual(level_width * level_height * texture_format.bytes_per_pixel(), len(tpc.get(mipmap).data))
+                        level_width, level_height = max(1, level_width >> 1), max(1, level_height >> 1)
+
+    def test_box_filter(self):
+        # Black and white average to the middle grey in linear light, which is brighter than 128 in sRGB.
+        tpc = TPC()
+        tpc.set_data(2, 2, [bytes([0, 0, 0, 0, 255, 255, 255, 255] * 2)], TPCTextureFormat.RGBA)
+        for numpy_available in {False, tpc_mipmaps.numpy_available}:
+            for srgb, expected in ((True, [188, 188, 188, 128]), (False, [128, 128, 128, 128])):
+                with mock.patch.object(tpc_mipmaps, "numpy_available", numpy_available):
+                    tpc.generate_mipmaps(srgb=srgb)
+                self.assertEqual(bytes(expected), tpc.get(1).data)
+
+    @unittest.skipIf(not tpc_mipmaps.numpy_available, "numpy is not installed")
+    def test_constant_image(self):
+        for mipmap_filter in MipmapFilter:
+            for channels in (1, 3, 4):
+                data = bytes(range(90, 90 + channels)) * 15 * 9
+                levels = tpc_mipmaps.mipmap_chain(data, 15, 9, channels, mipmap_filter)
+                for level in levels:
+                    self.assertEqual(bytes(level[:channels]) * (len(level) // channels), bytes(level))
+
+    @unittest.skipIf(not tpc_mipmaps.numpy_available, "numpy is not installed")
+    def test_matches_per_pixel_box_filter(self):
+        data = self.rng.randbytes(16 * 16 * 4)
+        expected = TPC._box_mipmap_chain(data, 16, 16, 4, 1, srgb=True)
+        levels = tpc_mipmaps.mipmap_chain(data, 16, 16, 4)
+        self.assertEqual(expected[0], bytes(levels[0]))
+        # The per pixel filter rounds every level, numpy only rounds what it returns.
+        for mipmap, (expected_level, level) in enumerate(zip(expected, levels)):
+            difference = np.abs(np.frombuffer(expected_level, np.uint8).astype(int) - np.frombuffer(level, np.uint8))
+            self.assertLessEqual(difference.max(), min(mipmap, 2))
+
+    def test_cube_map(self):
+        faces = [bytes([face * 40, 255 - face * 40, face, 255]) * 8 * 8 for face in range(6)]
+        tpc = TPC()
+        tpc.set_data(8, 48, [b"".join(faces)], TPCTextureFormat.RGBA)
+        self.assertTrue(tpc.is_cube_map())
+        tpc.generate_mipmaps()
+        self.assertEqual(4, tpc.mipmap_count())
+        for mipmap in range(4):
+            size = 8 >> mipmap
+            self.assertEqual((size, size * 6), tpc.get(mipmap)[:2])
+            self.assertEqual(b"".join(face[: size * size * 4] for face in faces), tpc.get(mipmap).data)
+
+        tpc.compress(TPCTextureFormat.DXT1)
+        for mipmap in range(4):
+            size = 8 >> mipmap
+            self.assertEqual(6 * _get_size(size, size, TPCTextureFormat.DXT1), len(tpc.get(mipmap).data))
+        decoded = tpc.convert(TPCTextureFormat.RGBA, 3).data
+        for face in range(6):
+            for channel in range(4):
+                self.assertLessEqual(abs(faces[face][channel] - decoded[face * 4 + channel]), 8)
+
+    def test_convert_to_dxt(self):
+        tpc = self.random_tpc(4, 24, TPCTextureFormat.RGBA)
+        tpc.generate_mipmaps()
+        compressed = TPC()
+        compressed.set_data(4, 24, [tpc.get(mipmap).data for mipmap in range(tpc.mipmap_count())], TPCTextureFormat.RGBA)
+        compressed.compress(TPCTextureFormat.DXT1)
+        for mipmap in range(tpc.mipmap_count()):
+            self.assertEqual(compressed.get(mipmap).data, tpc.convert(TPCTextureFormat.DXT1, mipmap).data)
+        self.assertEqual(6 * _get_size(2, 2, TPCTextureFormat.DXT1), len(tpc.convert(TPCTextureFormat.DXT1, 1).data))
+
+        flipped = TPC()
+        flipped.set_data(4, 24, [tpc.convert(TPCTextureFormat.RGBA, 0, y_flip=True).data], TPCTextureFormat.RGBA)
+        flipped.compress(TPCTextureFormat.DXT5)
+        self.assertEqual(flipped.get(0).data, tpc.convert(TPCTextureFormat.DXT5, 0, y_flip=True).data)
+        self.assertEqual(
+            compressed.convert(TPCTextureFormat.RGB, 0, y_flip=True).data,
+            TPC.flip_image_data(compressed.convert(TPCTextureFormat.RGB, 0).data, 4, 24, 3),
+        )
+
+    def test_binary_round_trip(self):
+        for width, height in ((16, 8), (8, 48)):
+            for texture_format in (TPCTextureFormat.RGBA, TPCTextureFormat.DXT1, TPCTextureFormat.DXT5):
+                tpc = self.random_tpc(width, height, TPCTextureFormat.RGBA)
+                tpc.generate_mipmaps()
+                if texture_format is not TPCTextureFormat.RGBA:
+                    tpc.compress(texture_format)
+                data = bytes_tpc(tpc)
+                if height == 6 * width:
+                    # Each face stores all of its mipmaps before the next face.
+                    face_size = _get_size(width, width, texture_format)
+                    chain_size = sum(_get_size(width >> mipmap, width >> mipmap, texture_format) for mipmap in range(tpc.mipmap_count()))
+                    self.assertEqual(tpc.get(0).data[face_size : 2 * face_size], data[128 + chain_size : 128 + chain_size + face_size])
+                loaded = TPCBinaryReader(data).load()
+                self.assertEqual(tpc.mipmap_count(), loaded.mipmap_count())
+                for mipmap in range(tpc.mipmap_count()):
+                    self.assertEqual(tpc.get(mipmap), loaded.get(mipmap))
+
+    def test_compressed_source(self):
+        tpc = self.random_tpc(16, 16, TPCTextureFormat.RGBA)
+        tpc.compress(TPCTextureFormat.DXT5)
+        largest = tpc.get(0).data
+        encode_faces = TPC._encode_faces
+        with mock.patch.object(TPC, "_encode_faces", autospec=True, side_effect=encode_faces) as encode:
+            tpc.generate_mipmaps(MipmapFilter.KAISER if tpc_mipmaps.numpy_available else MipmapFilter.BOX)
+        self.assertEqual(4, encode.call_count)  # Only the new levels are compressed.
+        self.assertEqual(TPCTextureFormat.DXT5, tpc.format())
+        self.assertEqual(5, tpc.mipmap_count())
+        self.assertEqual(largest, tpc.get(0).data)
+        for mipmap in range(5):
+            width, height, _, data = tpc.get(mipmap)
+            self.assertEqual(_get_size(width, height, TPCTextureFormat.DXT5), len(data))
+
+
+def tga_bytes(
+    datatype_code: int,
+    width: int,
+    height: int,
+    bits_per_pixel: int,
+    pixels: bytes,
+    *,
+    color_map: bytes = b"",
+    color_map_depth: int = 0,
+    top_down: bool = False,
+) -> bytes:
+    color_map_length = len(color_map) // (color_map_depth // 8) if color_map else 0
+    header = struct.pack(
+        "<BBBHHBHHHHBB",
+        0,
+        1 if color_map else 0,
+        datatype_code,
+        0,
+        color_map_length,
+        color_map_depth,
+        0,
+        0,
+        width,
+        height,
+        bits_per_pixel,
+        0b00100000 if top_down else 0,
+    )
+    return header + color_map + pixels
+
+
+class TestTGA(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1234)
+        patcher = mock.patch.object(io_tga, "pillow_available", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def runs_image(
+        self,
+        width: int,
+        height: int,
+        channels: int,
+    ) -> bytes:
+        """Pixels in runs of random lengths, some longer than a packet, mixed with spans of distinct pixels."""
+        data = bytearray()
+        while len(data) < width * height * channels:
+            pixel = self.rng.randbytes(channels)
+            data += pixel * self.rng.choice((1, 1, 2, 5, 200))
+        return bytes(data[: width * height * channels])
+
+    def test_rle_round_trip(self):
+        for texture_format in (TPCTextureFormat.Greyscale, TPCTextureFormat.RGB, TPCTextureFormat.RGBA):
+            channels = texture_format.bytes_per_pixel()
+            tpc = TPC()
+            tpc.set_data(37, 21, [self.runs_image(37, 21, channels)], texture_format)
+            expected = tpc.convert(TPCTextureFormat.RGBA).data
+            for rle in (False, True):
+                data = bytearray()
+                TPCTGAWriter(tpc, data, rle=rle).write()
+                self.assertEqual(10 if rle else 2, data[2])
+                loaded = TPCTGAReader(data).load()
+                self.assertEqual((37, 21), loaded.dimensions())
+                self.assertEqual(expected, loaded.convert(TPCTextureFormat.RGBA).data)
+
+    def test_rle_packets(self):
+        data = self.runs_image(300, 7, 4)
+        encoded = io_tga._encode_rle(data, 300, 7, 4)
+        self.assertEqual(data, io_tga._decode_rle(encoded, 300 * 7, 4))
+        self.assertLess(len(encoded), len(data))
+        with mock.patch.object(io_tga, "numpy_available", False):
+            self.assertEqual(encoded, io_tga._encode_rle(data, 300, 7, 4))
+
+        # Packets never span two rows.
+        position = 0
+        for _ in range(7):
+            pixels = 0
+            while pixels < 300:
+                packet = encoded[position]
+                count = (packet & 0x7F) + 1
+                position += 1 + (4 if packet & 0x80 else 4 * count)
+                pixels += count
+            self.assertEqual(300, pixels)
+        self.assertEqual(len(encoded), position)
+
+        self.assertRaises(ValueError, io_tga._decode_rle, encoded[:-1], 300 * 7, 4)
+
+    def test_read_formats(self):
+        bgr = bytes([10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120])
+        rgb = bytes([30, 20, 10, 60, 50, 40, 90, 80, 70, 120, 110, 100])
+        palette = bytes([1, 2, 3, 4, 5, 6])
+        cases = [
+            (tga_bytes(2, 2, 2, 24, bgr), TPCTextureFormat.RGB, rgb),
+            (tga_bytes(10, 2, 2, 24, b"\x81" + bgr[:3] + b"\x01" + bgr[6:]), TPCTextureFormat.RGB, rgb[:3] * 2 + rgb[6:]),
+            (tga_bytes(3, 2, 2, 8, b"\x01\x02\x03\x04"), TPCTextureFormat.Greyscale, b"\x01\x02\x03\x04"),
+            (tga_bytes(11, 2, 2, 8, b"\x83\x07"), TPCTextureFormat.Greyscale, b"\x07" * 4),
+            (tga_bytes(1, 2, 2, 8, b"\x00\x01\x01\x00", color_map=palette, color_map_depth=24), TPCTextureFormat.RGB, bytes([3, 2, 1, 6, 5, 4, 6, 5, 4, 3, 2, 1])),
+            (tga_bytes(9, 2, 2, 8, b"\x83\x01", color_map=palette, color_map_depth=24), TPCTextureFormat.RGB, bytes([6, 5, 4]) * 4),
+            # Top-down images are flipped so the bottom row comes first.
+            (tga_bytes(2, 2, 2, 24, bgr, top_down=True), TPCTextureFormat.RGB, rgb[6:] + rgb[:6]),
+        ]
+        for data, texture_format, expected in cases:
+            tpc = TPCTGAReader(data).load()
+            self.assertEqual(texture_format, tpc.format())
+            self.assertEqual(expected, tpc.get().data)
+
+        self.assertRaises(ValueError, TPCTGAReader(tga_bytes(2, 2, 2, 16, bytes(8))).load)
+        self.assertRaises(ValueError, TPCTGAReader(tga_bytes(10, 2, 2, 24, b"\x83")).load)
+
+    def test_flip_and_swizzle(self):
+        data = self.rng.randbytes(5 * 3 * 4)
+        flipped = TPC.flip_image_data(data, 5, 3, 4)
+        self.assertEqual(data[40:] + data[20:40] + data[:20], flipped)
+        self.assertEqual(data, TPC.flip_image_data(flipped, 5, 3, 4))
+
+        self.assertEqual(data, io_tga._swap_red_blue(io_tga._swap_red_blue(data, 4), 4))
+        self.assertEqual(data[2::4], io_tga._swap_red_blue(data, 4)[0::4])
+        self.assertEqual(bytes([3, 2, 1, 255, 6, 5, 4, 255]), io_tga._to_bgra(bytes([1, 2, 3, 4, 5, 6]), 3))
+        self.assertEqual(bytes([7, 7, 7, 255]), io_tga._to_bgra(b"\x07", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,7 +21,7 @@ if PYKOTOR_PATH.joinpath("pykotor").exists():
 if UTILITY_PATH.joinpath("utility").exists():
     add_sys_path(UTILITY_PATH)
 
-from pykotor.resource.formats.twoda import TwoDA, TwoDABinaryReader, TwoDACSVReader, detect_2da, read_2da, write_2da
+from pykotor.resource.formats.twoda import TwoDA, TwoDABinaryReader, TwoDACSVReader, bytes_2da, detect_2da, read_2da, write_2da
 from pykotor.resource.formats.twoda.io_twoda_json import TwoDAJSONReader
 from pykotor.resource.type import ResourceType
 
@@ -45,6 +45,33 @@ class TestTwoDA(unittest.TestCase):
         twoda = read_2da(data)
         self.validate_io(twoda)
 
+    def test_binary_shared_cells(self):
+        twoda = TwoDA(["a", "b"])
+        twoda.add_row("0", {"a": "x", "b": ""})
+        twoda.add_row("1", {"a": "", "b": "x"})
+        twoda.add_row("2", {"a": "xy", "b": "x"})
+
+        data = bytes(bytes_2da(twoda))
+        self.assertTrue(data.endswith(b"\x00\x00\x02\x00\x02\x00\x00\x00\x03\x00\x00\x00\x06\x00x\x00\x00xy\x00"))
+        twoda = read_2da(data)
+        self.assertEqual(["x", "", "xy"], twoda.get_column("a"))
+        self.assertEqual(["", "x", "x"], twoda.get_column("b"))
+        self.assertEqual(["0", "1", "2"], twoda.get_labels())
+
+    def test_from_columns(self):
+        twoda = TwoDA.from_columns(["a", "b"], ["0", "1"], [["x", "y"], ["", "z"]])
+        self.assertEqual(["a", "b"], twoda.get_headers())
+        self.assertEqual(["0", "1"], twoda.get_labels())
+        self.assertEqual("z", twoda.get_cell(1, "b"))
+        self.assertEqual(["0"], [row.label() for row in twoda.find_rows("a", "x")])
+        twoda.add_row("2", {"a": "w"})
+        self.assertEqual(["x", "y", "w"], twoda.get_column("a"))
+        self.assertEqual(["", "z", ""], twoda.get_column("b"))
+
+        self.assertRaises(KeyError, TwoDA.from_columns, ["a", "a"], ["0"], [["x"], ["y"]])
+        self.assertRaises(ValueError, TwoDA.from_columns, ["a", "b"], ["0"], [["x"], []])
+        self.assertRaises(ValueError, TwoDA.from_columns, ["a"], ["0"], [])
+
     def test_csv_io(self):
         self.assertEqual(detect_2da(CSV_TEST_FILE), ResourceType.TwoDA_CSV)
 
@@ -105,6 +132,75 @@ class TestTwoDA(unittest.TestCase):
 
         self.assertEqual(3, twoda.label_max())
 
+        twoda.set_label(2, "label")
+        self.assertEqual(2, twoda.label_max())
+        twoda.add_row("10")
+        self.assertEqual(11, twoda.label_max())
+
+    def test_column_max(self):
+        twoda = TwoDA(["id"])
+        for value in ("4", "****", "7"):
+            twoda.add_row(cells={"id": value})
+        self.assertEqual(8, twoda.column_max("id"))
+
+        twoda.set_cell(2, "id", "1")
+        self.assertEqual(5, twoda.column_max("id"))
+        twoda.get_row(1).set_integer("id", 20)
+        self.assertEqual(21, twoda.column_max("id"))
+        twoda.add_row(cells={"id": 30})
+        self.assertEqual(31, twoda.column_max("id"))
+        twoda.resize(2)
+        self.assertEqual(21, twoda.column_max("id"))
+
+    def test_row_lookups(self):
+        twoda = TwoDA(["label", "value"])
+        for i in range(100):
+            twoda.add_row(str(i), {"label": f"row{i % 10}", "value": i})
+
+        row = twoda.find_row("42")
+        assert row is not None
+        self.assertEqual("42", row.get_string("value"))
+        self.assertEqual(42, twoda.row_index(row))
+        self.assertIsNone(twoda.find_row("100"))
+        self.assertEqual([2, 12, 22], [int(row.label()) for row in twoda.find_rows("label", "row2")][:3])
+
+        twoda.set_label(42, "renamed")
+        twoda.set_cell(42, "label", "unique")
+        self.assertIsNone(twoda.find_row("42"))
+        self.assertEqual(42, twoda.row_index(twoda.get_row(42)))
+        self.assertEqual(["renamed"], [row.label() for row in twoda.find_rows("label", "unique")])
+        self.assertEqual(9, len(twoda.find_rows("label", "row2")))
+
+        index = twoda.copy_row(twoda.get_row(42), "copy")
+        self.assertEqual(index, twoda.row_index(twoda.find_row("copy")))  # type: ignore[arg-type]
+        self.assertEqual(2, len(twoda.find_rows("label", "unique")))
+
+        twoda.add_column("new")
+        twoda.get_row(7).set_string("new", "x")
+        self.assertEqual(["7"], [row.label() for row in twoda.find_rows("new", "x")])
+        self.assertRaises(KeyError, twoda.find_rows, "missing", "x")
+
+        twoda.resize(10)
+        self.assertEqual(10, len(twoda.get_labels()))
+        self.assertEqual(1, len(twoda.find_rows("label", "row2")))
+
+    def test_row_view(self):
+        twoda = TwoDA(["value"])
+        for i in range(3):
+            twoda.add_row(str(i), {"value": i})
+
+        row = twoda.get_row(2)
+        twoda.set_cell(2, "value", "changed")
+        self.assertEqual("changed", row.get_string("value"))
+        row.set_string("value", "written")
+        self.assertEqual("written", twoda.get_cell(2, "value"))
+        self.assertRaises(TypeError, row._data.pop, "value")  # noqa: SLF001
+
+        twoda.resize(2)
+        self.assertRaises(IndexError, row.get_string, "value")
+        twoda.resize(3)
+        self.assertEqual("", row.get_string("value"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+"""Builds small (or very large) fake KOTOR installations on disk for tests and benchmarks.
+
+Only the parts of the folder layout that `Installation` indexes are created: chitin.key and its BIFs,
+modules, texturepacks, the stream folders, override and dialog.tlk.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import lzma
+import struct
+
+from typing import Iterable, Sequence
+
+from pykotor.common.language import Language
+from pykotor.resource.formats.erf import ERF, ERFType, write_erf
+from pykotor.resource.formats.rim import RIM, write_rim
+from pykotor.resource.formats.tlk import TLK, write_tlk
+from pykotor.resource.formats.tpc import TPC, bytes_tpc
+from pykotor.resource.type import ResourceType
+
+KEY_HEADER_SIZE = 64
+KEY_FILE_ENTRY_SIZE = 12
+BIF_HEADER_SIZE = 20
+
+
+def write_key_and_bifs(
+    root: pathlib.Path,
+    bifs: dict[str, Sequence[tuple[str, ResourceType, bytes]]],
+    *,
+    compressed: bool = False,
+):
+    """Writes a chitin.key at `root` along with every BIF it references.
+
+    Args:
+    ----
+        root: The installation folder.
+        bifs: Maps a BIF path relative to `root` (e.g. 'data/templates.bif') to its (resname, restype, data) entries.
+        compressed: Write LZMA compressed .bzf files next to the .bif paths the chitin.key references, like the iOS releases.
+    """
+    bif_names: list[str] = list(bifs)
+    filenames: list[bytes] = [name.replace("/", "\\").encode("ascii") + b"\0" for name in bif_names]
+    keys = bytearray()
+    key_count = 0
+    file_table = bytearray()
+    filename_offset = KEY_HEADER_SIZE + KEY_FILE_ENTRY_SIZE * len(bif_names)
+    for bif_index, bif_name in enumerate(bif_names):
+        entries = bifs[bif_name]
+        bif_table = bytearray()
+        bif_data = bytearray()
+        data_offset = BIF_HEADER_SIZE + 16 * len(entries)
+        for res_index, (resname, restype, data) in enumerate(entries):
+            res_id = (bif_index << 20) | res_index
+            bif_table += struct.pack("<IIII", res_id, data_offset + len(bif_data), len(data), restype.type_id)
+            if compressed and data:
+                alone: bytes = lzma.compress(data, format=lzma.FORMAT_ALONE)
+                bif_data += alone[:5] + alone[13:]  # The properties and the stream, without the size of the .lzma header.
+            else:
+                bif_data += data
+            keys += struct.pack("<16sHI", resname.encode("ascii"), restype.type_id, res_id)
+            key_count += 1
+        bif_path = root.joinpath(bif_name)
+        if compressed:
+            bif_path = bif_path.with_suffix(".bzf")
+        bif_path.parent.mkdir(parents=True, exist_ok=True)
+        bif_path.write_bytes(b"BIFFV1  " + struct.pack("<III", len(entries), 0, BIF_HEADER_SIZE) + bif_table + bif_data)
+
+        file_table += struct.pack("<IIHH", bif_path.stat().st_size, filename_offset, len(filenames[bif_index]), 0)
+        filename_offset += len(filenames[bif_index])
+
+    key_table_offset = filename_offset
+    header = b"KEY V1  " + struct.pack("<IIIIII", len(bif_names), key_count, KEY_HEADER_SIZE, key_table_offset, 0, 0) + bytes(32)
+    root.joinpath("chitin.key").write_bytes(header + file_table + b"".join(filenames) + keys)
+
+
+def write_capsule(
+    filepath: pathlib.Path,
+    resources: Iterable[tuple[str, ResourceType, bytes]],
+):
+    """Writes an ERF/MOD or RIM capsule depending on the extension of `filepath`."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    if filepath.suffix.lower() == ".rim":
+        rim = RIM()
+        for resname, restype, data in resources:
+            rim.set_data(resname, restype, data)
+        write_rim(rim, filepath)
+    else:
+        erf = ERF(ERFType.from_extension(filepath))
+        for resname, restype, data in resources:
+            erf.set_data(resname, restype, data)
+        write_erf(erf, filepath)
+
+
+def build_synthetic_installation(  # noqa: PLR0913
+    root: pathlib.Path,
+    *,
+    chitin_resources: int = 50,
+    bif_count: int = 2,
+    module_count: int = 2,
+    module_resources: int = 20,
+    override_files: int = 10,
+    texture_resources: int = 10,
+    stream_files: int = 10,
+) -> pathlib.Path:
+    """Creates a fake K1 installation under `root` and returns `root`.
+
+    Resource names follow a predictable pattern so tests can query them:
+        chitin:        'chit_<n>.utc' (and 'shared_<n>.2da' which is also in override)
+        modules:       'mod<m>_<n>.utc' inside 'mod<m>.mod' plus an ARE/GIT in 'mod<m>.rim'
+        override:      'ovr_<n>.uti' and 'shared_<n>.2da'
+        texturepacks:  'tex_<n>.tpc' in swpc_tex_tpa.erf and swpc_tex_gui.erf
+        streams:       'vo_<n>.wav', 'snd_<n>.wav', 'mus_<n>.wav'
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    root.joinpath("swkotor.exe").write_bytes(b"")
+    root.joinpath("swkotor.ini").write_bytes(b"")
+
+    tlk = TLK(Language.ENGLISH)
+    tlk.add("synthetic", "")
+    write_tlk(tlk, root / "dialog.tlk")
+
+    shared_count = min(override_files, 5)
+    per_bif: dict[str, list[tuple[str, ResourceType, bytes]]] = {f"data/synthetic{b}.bif": [] for b in range(max(bif_count, 1))}
+    bif_names = list(per_bif)
+    for n in range(chitin_resources):
+        per_bif[bif_names[n % len(bif_names)]].append((f"chit_{n}", ResourceType.UTC, f"chitin {n}".encode()))
+    for n in range(shared_count):
+        per_bif[bif_names[0]].append((f"shared_{n}", ResourceType.TwoDA, f"chitin shared {n}".encode()))
+    write_key_and_bifs(root, per_bif)
+
+    modules_path = root / "modules"
+    modules_path.mkdir(exist_ok=True)
+    for m in range(module_count):
+        write_capsule(
+            modules_path / f"mod{m}.mod",
+            [(f"mod{m}_{n}", ResourceType.UTC, f"module {m} {n}".encode()) for n in range(module_resources)],
+        )
+        write_capsule(
+            modules_path / f"mod{m}.rim",
+            [(f"mod{m}", ResourceType.ARE, b"ARE "), (f"mod{m}", ResourceType.GIT, b"GIT ")],
+        )
+
+    texturepacks_path = root / "texturepacks"
+    blank_tpc = bytes(bytes_tpc(TPC()))
+    for pack in ("swpc_tex_tpa.erf", "swpc_tex_gui.erf"):
+        write_capsule(
+            texturepacks_path / pack,
+            [(f"tex_{n}", ResourceType.TPC, blank_tpc) for n in range(texture_resources)],
+        )
+
+    override_path = root / "override"
+    override_path.mkdir(exist_ok=True)
+    for n in range(override_files):
+        override_path.joinpath(f"ovr_{n}.uti").write_bytes(f"override {n}".encode())
+    for n in range(shared_count):
+        override_path.joinpath(f"shared_{n}.2da").write_bytes(f"override shared {n}".encode())
+
+    for folder, prefix in (("streamwaves", "vo"), ("streamsounds", "snd"), ("streammusic", "mus")):
+        folder_path = root / folder
+        folder_path.mkdir(exist_ok=True)
+        for n in range(stream_files):
+            folder_path.joinpath(f"{prefix}_{n}.wav").write_bytes(f"{folder} {n}".encode())
+
+    return root
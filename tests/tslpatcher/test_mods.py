@@ -31,6 +31,7 @@ from pykotor.resource.formats.gff.gff_auto import bytes_gff, read_gff
 from pykotor.resource.formats.gff.gff_data import GFF, GFFFieldType, GFFList, GFFStruct
 from pykotor.resource.formats.ssf.ssf_auto import bytes_ssf, read_ssf
 from pykotor.resource.formats.ssf.ssf_data import SSF, SSFSound
+from pykotor.resource.formats.tlk.tlk_auto import bytes_tlk, read_tlk
 from pykotor.resource.formats.tlk.tlk_data import TLK
 from pykotor.resource.formats.twoda.twoda_auto import bytes_2da, read_2da
 from pykotor.resource.formats.twoda.twoda_data import TwoDA
@@ -148,6 +149,35 @@ class TestManipulateTLK(TestCase):
         # 3        0        1       Append1
 
 
+    def test_patch_resource(self):
+        config = ModificationsTLK()
+        for token_id, (text, sound, is_replacement) in enumerate(
+            [("Append1", "append01", False), ("Replace2", "", True), ("Append2", "", False)],
+        ):
+            modifier = ModifyTLK(1 if is_replacement else token_id, is_replacement)
+            modifier.text = text
+            modifier.sound = ResRef(sound)
+            config.modifiers.append(modifier)
+
+        dialog_tlk = TLK()
+        dialog_tlk.add("Old1", "old01")
+        dialog_tlk.add("Old2", "old02")
+        dialog_tlk.add("Old3")
+        source = bytes(bytes_tlk(dialog_tlk))
+
+        patched_data = config.patch_resource(source, PatcherMemory(), PatchLogger(), Game.K1)
+        assert isinstance(patched_data, (bytes, bytearray))
+        self.assertTrue(patched_data.endswith(source[20 + 3 * 40 :] + b"Replace2Append1Append2"))
+
+        config.apply(dialog_tlk, PatcherMemory(), PatchLogger(), Game.K1)
+        patched_tlk = read_tlk(patched_data)
+        self.assertEqual(list(dialog_tlk), list(patched_tlk))
+        self.assertEqual(
+            [(entry.text, str(entry.voiceover)) for _, entry in patched_tlk],
+            [("Old1", "old01"), ("Replace2", "old02"), ("Old3", ""), ("Append1", "append01"), ("Append2", "")],
+        )
+
+
 class TestManipulate2DA(TestCase):
     # region Change Row
     def test_change_existing_rowindex(self):